@@ -23,8 +23,13 @@ from app.models import (
     User,
     Project,
     Task,
+    TaskTombstone,
     Notification,
     TelegramLinkCode,
+    JobCheckpoint,
+    NotificationDelivery,
+    DigestPayload,
+    DomainEventOutbox,
 )
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,57 @@
+"""add_task_tombstones
+
+Revision ID: a3f1c9d2e7b4
+Revises: 9b7ce5d38f19
+Create Date: 2026-10-19 10:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d2e7b4'
+down_revision: Union[str, None] = '9b7ce5d38f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create task_tombstones table for incremental task sync"""
+    # Check if table already exists
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'task_tombstones' not in inspector.get_table_names():
+        op.create_table(
+            'task_tombstones',
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('task_id', sa.String(36), nullable=False),
+            sa.Column('project_id', sa.String(36), nullable=False),
+            sa.Column('project_owner_id', sa.String(36), nullable=True),
+            sa.Column('responsible_id', sa.String(36), nullable=True),
+            sa.Column(
+                'reason',
+                sa.Enum('eliminada', 'reasignada', name='tombstonereason'),
+                nullable=False,
+                server_default='eliminada'
+            ),
+            sa.Column('removed_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            mysql_engine='InnoDB',
+            mysql_charset='utf8mb4',
+            mysql_collate='utf8mb4_unicode_ci'
+        )
+        op.create_index('ix_task_tombstones_id', 'task_tombstones', ['id'])
+        op.create_index('ix_task_tombstones_task_id', 'task_tombstones', ['task_id'])
+        op.create_index('ix_task_tombstones_removed_at', 'task_tombstones', ['removed_at'])
+
+
+def downgrade() -> None:
+    """Drop task_tombstones table"""
+    op.drop_index('ix_task_tombstones_removed_at', 'task_tombstones')
+    op.drop_index('ix_task_tombstones_task_id', 'task_tombstones')
+    op.drop_index('ix_task_tombstones_id', 'task_tombstones')
+    op.drop_table('task_tombstones')
@@ -0,0 +1,102 @@
+"""add_job_checkpoints_and_deliveries
+
+Revision ID: b8e3f5a1c6d9
+Revises: f1c7d4e9a2b5
+Create Date: 2026-10-19 18:04:51.226417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f5a1c6d9'
+down_revision: Union[str, None] = 'f1c7d4e9a2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create job_checkpoints and notification_deliveries tables (resumable, idempotent worker runs)"""
+    # Check if tables already exist
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'job_checkpoints' not in tables:
+        op.create_table(
+            'job_checkpoints',
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('run_id', sa.String(100), nullable=False),
+            sa.Column('shard', sa.Integer(), nullable=False),
+            sa.Column('start_after', sa.String(36), nullable=True),
+            sa.Column('end_at', sa.String(36), nullable=True),
+            sa.Column('position', sa.String(36), nullable=True),
+            sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sent', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('errors', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('skipped', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('completed_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('run_id', 'shard', name='uq_job_checkpoints_run_shard'),
+            mysql_engine='InnoDB',
+            mysql_charset='utf8mb4',
+            mysql_collate='utf8mb4_unicode_ci'
+        )
+        op.create_index('ix_job_checkpoints_id', 'job_checkpoints', ['id'])
+        op.create_index('ix_job_checkpoints_run_id', 'job_checkpoints', ['run_id'])
+        op.create_index('ix_job_checkpoints_created_at', 'job_checkpoints', ['created_at'])
+
+    if 'notification_deliveries' not in tables:
+        op.create_table(
+            'notification_deliveries',
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('idempotency_key', sa.String(191), nullable=False),
+            sa.Column('run_id', sa.String(100), nullable=False),
+            sa.Column('user_id', sa.String(36), nullable=False),
+            sa.Column('task_id', sa.String(36), nullable=True),
+            sa.Column(
+                'type',
+                sa.Enum(
+                    'nueva_tarea', 'recordatorio', 'completada', 'resumen_diario',
+                    'resumen_semanal', 'cambio_estado', name='notification_type'
+                ),
+                nullable=False
+            ),
+            sa.Column(
+                'status',
+                sa.Enum('pendiente', 'enviada', 'fallida', name='delivery_status'),
+                nullable=False,
+                server_default='pendiente'
+            ),
+            sa.Column('attempt_id', sa.String(36), nullable=False),
+            sa.Column('sent_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('idempotency_key'),
+            mysql_engine='InnoDB',
+            mysql_charset='utf8mb4',
+            mysql_collate='utf8mb4_unicode_ci'
+        )
+        op.create_index('ix_notification_deliveries_id', 'notification_deliveries', ['id'])
+        op.create_index('ix_notification_deliveries_run_id', 'notification_deliveries', ['run_id'])
+        op.create_index('ix_notification_deliveries_user_id', 'notification_deliveries', ['user_id'])
+        op.create_index('ix_notification_deliveries_created_at', 'notification_deliveries', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop job_checkpoints and notification_deliveries tables"""
+    op.drop_index('ix_notification_deliveries_created_at', 'notification_deliveries')
+    op.drop_index('ix_notification_deliveries_user_id', 'notification_deliveries')
+    op.drop_index('ix_notification_deliveries_run_id', 'notification_deliveries')
+    op.drop_index('ix_notification_deliveries_id', 'notification_deliveries')
+    op.drop_table('notification_deliveries')
+    op.drop_index('ix_job_checkpoints_created_at', 'job_checkpoints')
+    op.drop_index('ix_job_checkpoints_run_id', 'job_checkpoints')
+    op.drop_index('ix_job_checkpoints_id', 'job_checkpoints')
+    op.drop_table('job_checkpoints')
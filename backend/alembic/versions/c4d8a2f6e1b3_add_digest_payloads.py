@@ -0,0 +1,61 @@
+"""add_digest_payloads
+
+Revision ID: c4d8a2f6e1b3
+Revises: b8e3f5a1c6d9
+Create Date: 2026-10-19 20:37:12.904518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8a2f6e1b3'
+down_revision: Union[str, None] = 'b8e3f5a1c6d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create digest_payloads table (digests rendered ahead of the send window)"""
+    # Check if table already exists
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'digest_payloads' not in inspector.get_table_names():
+        op.create_table(
+            'digest_payloads',
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('run_id', sa.String(100), nullable=False),
+            sa.Column('user_id', sa.String(36), nullable=False),
+            sa.Column(
+                'type',
+                sa.Enum(
+                    'nueva_tarea', 'recordatorio', 'completada', 'resumen_diario',
+                    'resumen_semanal', 'cambio_estado', name='notification_type'
+                ),
+                nullable=False
+            ),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('summary', sa.Text(), nullable=False),
+            sa.Column('rendered_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('run_id', 'user_id', name='uq_digest_payloads_run_user'),
+            mysql_engine='InnoDB',
+            mysql_charset='utf8mb4',
+            mysql_collate='utf8mb4_unicode_ci'
+        )
+        op.create_index('ix_digest_payloads_id', 'digest_payloads', ['id'])
+        op.create_index('ix_digest_payloads_user_id', 'digest_payloads', ['user_id'])
+        op.create_index('ix_digest_payloads_rendered_at', 'digest_payloads', ['rendered_at'])
+
+
+def downgrade() -> None:
+    """Drop digest_payloads table"""
+    op.drop_index('ix_digest_payloads_rendered_at', 'digest_payloads')
+    op.drop_index('ix_digest_payloads_user_id', 'digest_payloads')
+    op.drop_index('ix_digest_payloads_id', 'digest_payloads')
+    op.drop_table('digest_payloads')
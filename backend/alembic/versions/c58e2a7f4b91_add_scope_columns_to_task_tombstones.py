@@ -0,0 +1,37 @@
+"""add_scope_columns_to_task_tombstones
+
+Revision ID: c58e2a7f4b91
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-19 11:40:05.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e2a7f4b91'
+down_revision: Union[str, None] = 'a3f1c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add area_id and created_by to task_tombstones (supervisor and creator visibility)"""
+    # Check if columns already exist
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns('task_tombstones')]
+
+    if 'area_id' not in columns:
+        op.add_column('task_tombstones', sa.Column('area_id', sa.String(36), nullable=True))
+    if 'created_by' not in columns:
+        op.add_column('task_tombstones', sa.Column('created_by', sa.String(36), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove area_id and created_by from task_tombstones"""
+    op.drop_column('task_tombstones', 'created_by')
+    op.drop_column('task_tombstones', 'area_id')
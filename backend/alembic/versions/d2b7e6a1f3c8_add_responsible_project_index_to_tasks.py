@@ -0,0 +1,38 @@
+"""add_responsible_project_index_to_tasks
+
+Revision ID: d2b7e6a1f3c8
+Revises: c58e2a7f4b91
+Create Date: 2026-10-19 12:21:37.446590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e6a1f3c8'
+down_revision: Union[str, None] = 'c58e2a7f4b91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace ix_tasks_responsible_id with covering index (responsible_id, project_id)"""
+    # Check if indexes already exist
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index['name'] for index in inspector.get_indexes('tasks')]
+
+    # Crear primero el compuesto: sigue sirviendo a la FK de responsible_id
+    if 'ix_tasks_responsible_project' not in indexes:
+        op.create_index('ix_tasks_responsible_project', 'tasks', ['responsible_id', 'project_id'])
+    if 'ix_tasks_responsible_id' in indexes:
+        op.drop_index('ix_tasks_responsible_id', 'tasks')
+
+
+def downgrade() -> None:
+    """Restore single-column ix_tasks_responsible_id"""
+    op.create_index('ix_tasks_responsible_id', 'tasks', ['responsible_id'])
+    op.drop_index('ix_tasks_responsible_project', 'tasks')
@@ -0,0 +1,49 @@
+"""add_digest_schedule_to_users
+
+Revision ID: d9f4b2c7a5e8
+Revises: c4d8a2f6e1b3
+Create Date: 2026-10-19 22:14:36.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f4b2c7a5e8'
+down_revision: Union[str, None] = 'c4d8a2f6e1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add per-user timezone and digest time to users with index (timezone, digest_time)"""
+    # Check if columns and index already exist
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns('users')]
+    indexes = [index['name'] for index in inspector.get_indexes('users')]
+
+    # Los usuarios existentes conservan el horario anterior (8:00 hora de Guatemala)
+    if 'timezone' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('timezone', sa.String(64), nullable=False, server_default='America/Guatemala')
+        )
+    if 'digest_time' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('digest_time', sa.Time(), nullable=False, server_default='08:00:00')
+        )
+
+    if 'ix_users_digest_bucket' not in indexes:
+        op.create_index('ix_users_digest_bucket', 'users', ['timezone', 'digest_time'])
+
+
+def downgrade() -> None:
+    """Remove timezone and digest_time from users"""
+    op.drop_index('ix_users_digest_bucket', 'users')
+    op.drop_column('users', 'digest_time')
+    op.drop_column('users', 'timezone')
@@ -0,0 +1,49 @@
+"""add_area_id_to_tasks
+
+Revision ID: e4a9c3b7d1f6
+Revises: d2b7e6a1f3c8
+Create Date: 2026-10-19 13:05:48.214377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c3b7d1f6'
+down_revision: Union[str, None] = 'd2b7e6a1f3c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add denormalized area_id to tasks with index (area_id, status, deadline)"""
+    # Check if column and index already exist
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns('tasks')]
+    indexes = [index['name'] for index in inspector.get_indexes('tasks')]
+
+    if 'area_id' not in columns:
+        op.add_column('tasks', sa.Column('area_id', sa.String(36), nullable=True))
+        op.create_foreign_key(
+            'fk_tasks_area', 'tasks', 'areas', ['area_id'], ['id'], ondelete='SET NULL'
+        )
+
+    # Copiar el área actual del proyecto de cada tarea
+    op.execute(
+        "UPDATE tasks SET area_id = "
+        "(SELECT projects.area_id FROM projects WHERE projects.id = tasks.project_id)"
+    )
+
+    if 'ix_tasks_area_status_deadline' not in indexes:
+        op.create_index('ix_tasks_area_status_deadline', 'tasks', ['area_id', 'status', 'deadline'])
+
+
+def downgrade() -> None:
+    """Remove area_id from tasks"""
+    op.drop_constraint('fk_tasks_area', 'tasks', type_='foreignkey')
+    op.drop_index('ix_tasks_area_status_deadline', 'tasks')
+    op.drop_column('tasks', 'area_id')
@@ -0,0 +1,46 @@
+"""add_domain_event_outbox
+
+Revision ID: e7a1c5d3b9f2
+Revises: d9f4b2c7a5e8
+Create Date: 2026-10-20 10:12:08.330417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c5d3b9f2'
+down_revision: Union[str, None] = 'd9f4b2c7a5e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create domain_event_outbox table (domain events written in the producing transaction)"""
+    # Check if table already exists
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'domain_event_outbox' not in inspector.get_table_names():
+        op.create_table(
+            'domain_event_outbox',
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('type', sa.String(50), nullable=False),
+            sa.Column('data', sa.Text(), nullable=False),
+            sa.Column('trace', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.Double(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            mysql_engine='InnoDB',
+            mysql_charset='utf8mb4',
+            mysql_collate='utf8mb4_unicode_ci'
+        )
+        op.create_index('ix_domain_event_outbox_created_at', 'domain_event_outbox', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop domain_event_outbox table"""
+    op.drop_index('ix_domain_event_outbox_created_at', 'domain_event_outbox')
+    op.drop_table('domain_event_outbox')
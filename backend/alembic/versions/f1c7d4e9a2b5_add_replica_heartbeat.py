@@ -0,0 +1,38 @@
+"""add_replica_heartbeat
+
+Revision ID: f1c7d4e9a2b5
+Revises: e4a9c3b7d1f6
+Create Date: 2026-10-19 15:22:07.503194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d4e9a2b5'
+down_revision: Union[str, None] = 'e4a9c3b7d1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create replica_heartbeat table (replication lag of read replicas)"""
+    # Check if table already exists
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'replica_heartbeat' not in inspector.get_table_names():
+        op.create_table(
+            'replica_heartbeat',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('beat_at', sa.Double(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    """Drop replica_heartbeat table"""
+    op.drop_table('replica_heartbeat')
@@ -0,0 +1,177 @@
+"""
+Respuestas condicionales (ETag / Last-Modified) para endpoints de lectura
+
+El validador de una respuesta combina el usuario (su alcance de visibilidad),
+la ruta con sus parámetros y las versiones en Redis de las tablas de las que
+depende el payload. En los endpoints filtrados por visibilidad se usan las
+versiones del alcance del usuario (ver app/core/data_versions.py): una
+escritura solo invalida los validadores de quien ve la fila. Si el cliente envía un validador vigente se responde
+`304 Not Modified` antes de ejecutar el endpoint: no se consulta la BD ni se
+serializa la respuesta.
+
+Las mismas versiones dicen cuándo cambiaron por última vez esas tablas: si el
+cambio es más reciente que el retraso tolerado en las réplicas, la respuesta
+se lee del primario para que el ETag nuevo nunca acompañe datos viejos.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Depends, Request, Response
+from fastapi.responses import Response as PlainResponse
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_user
+from app.core.config import settings
+from app.core.data_versions import get_versions
+from app.core.database import get_db
+from app.core.metrics import CONDITIONAL_GET_HIT, CONDITIONAL_GET_MISS
+from app.core.replicas import require_primary
+from app.core.visibility import VisibilityScope
+from app.models import User
+
+
+class NotModified(Exception):
+    """El recurso no cambió respecto al validador enviado por el cliente"""
+
+    def __init__(self, headers: dict[str, str]):
+        self.headers = headers
+
+
+async def not_modified_handler(request: Request, exc: NotModified) -> PlainResponse:
+    """Convertir NotModified en una respuesta 304 sin cuerpo"""
+    return PlainResponse(status_code=304, headers=exc.headers)
+
+
+def _matches_etag(if_none_match: str, etag: str) -> bool:
+    """
+    Comparación débil de If-None-Match (admite listas)
+
+    '*' no se acepta: el 304 se decide antes de comprobar que el recurso
+    existe y es accesible, así que solo vale un ETag emitido previamente.
+    """
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    weak = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == weak for candidate in candidates)
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """Evaluar If-Modified-Since con resolución de segundos"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def build_validators(
+    request: Request,
+    current_user: User,
+    tables: tuple[str, ...],
+    scoped: bool = False,
+) -> Optional[tuple[str, Optional[datetime], float]]:
+    """
+    Calcular ETag y Last-Modified de la respuesta
+
+    Args:
+        request: Petición actual
+        current_user: Usuario autenticado (define el alcance de visibilidad)
+        tables: Tablas de las que depende la respuesta
+        scoped: La respuesta solo incluye filas visibles para el usuario
+            (se usan las versiones de su alcance)
+
+    Returns:
+        (etag, last_modified, timestamp del último cambio) o None si no hay
+        versiones disponibles
+    """
+    versions = get_versions(tables, VisibilityScope.of(current_user) if scoped else None)
+    if versions is None:
+        return None
+    epoch, table_versions = versions
+
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    parts = [
+        epoch,
+        current_user.id,
+        current_user.role,
+        current_user.area_id or "",
+        request.url.path,
+        query,
+    ]
+    parts += [f"{table}:{table_versions[table][0]}" for table in tables]
+    etag = 'W/"' + hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest() + '"'
+
+    # Last-Modified solo tiene resolución de segundos: se omite si el último
+    # cambio ocurrió en el segundo en curso, para no validar escrituras posteriores
+    last_modified = None
+    latest = max(ts for _, ts in table_versions.values())
+    if latest and time.time() - latest >= 1:
+        last_modified = datetime.fromtimestamp(latest, tz=timezone.utc)
+
+    return etag, last_modified, latest
+
+
+def conditional_get(*tables: str, scoped: bool = False):
+    """
+    Dependencia que añade ETag/Last-Modified y responde 304 si nada cambió
+
+    Args:
+        tables: Tablas cuyo contenido determina la respuesta del endpoint
+        scoped: El endpoint filtra por visibilidad (task_visible/project_visible):
+            el validador solo cambia con las filas que ve el usuario
+
+    Returns:
+        Función de dependencia para usar en `dependencies=[Depends(...)]`
+
+    Ejemplo:
+        @router.get("/", dependencies=[Depends(conditional_get("tasks", "projects", "users", scoped=True))])
+        def list_tasks(...):
+            ...
+    """
+    def checker(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ):
+        if not settings.CONDITIONAL_GET_ENABLED:
+            return
+
+        validators = build_validators(request, current_user, tables, scoped)
+        if validators is None:
+            return
+        etag, last_modified, latest = validators
+
+        # Cambio reciente: puede que las réplicas aún no lo tengan
+        if time.time() - latest <= settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_SECONDS:
+            require_primary(db)
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if last_modified:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+
+        if if_none_match is not None:
+            not_modified = _matches_etag(if_none_match, etag)
+        else:
+            not_modified = bool(
+                if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified)
+            )
+        if not_modified:
+            CONDITIONAL_GET_HIT.inc()
+            raise NotModified(headers)
+
+        CONDITIONAL_GET_MISS.inc()
+        response.headers.update(headers)
+
+    return checker
@@ -7,6 +7,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.loaders import loader
+from app.core.replicas import bind_user
 from app.core.security import decode_access_token
 from app.models import User
 
@@ -14,22 +16,19 @@ from app.models import User
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+def authenticate_token(token: str, db: Session) -> User:
     """
-    Dependency para obtener el usuario actual desde el token JWT
+    Obtener el usuario activo de un token JWT
 
     Args:
-        credentials: Credenciales HTTP Bearer (token JWT)
+        token: Token JWT de acceso
         db: Sesión de base de datos
 
     Returns:
         User: Usuario autenticado
 
     Raises:
-        HTTPException: Si el token es inválido o el usuario no existe
+        HTTPException: Si el token es inválido, el usuario no existe o está inactivo
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +37,6 @@ async def get_current_user(
     )
 
     # Decodificar token
-    token = credentials.credentials
     payload = decode_access_token(token)
 
     if payload is None:
@@ -49,8 +47,11 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    # Buscar usuario en BD
-    user = db.query(User).filter(User.id == user_id).first()
+    # La sesión ve las escrituras recientes del usuario (réplicas de lectura)
+    bind_user(db, user_id)
+
+    # Buscar usuario en BD (queda en el cargador de la sesión para el resto de la petición)
+    user = loader(db, User).load(user_id)
     if user is None:
         raise credentials_exception
 
@@ -63,6 +64,26 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    Dependency para obtener el usuario actual desde el token JWT
+
+    Args:
+        credentials: Credenciales HTTP Bearer (token JWT)
+        db: Sesión de base de datos
+
+    Returns:
+        User: Usuario autenticado
+
+    Raises:
+        HTTPException: Si el token es inválido o el usuario no existe
+    """
+    return authenticate_token(credentials.credentials, db)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -0,0 +1,49 @@
+"""
+Middleware de métricas HTTP por ruta
+
+Registra la duración y el código de respuesta de cada petición con la
+plantilla de la ruta como etiqueta (`/api/v1/tasks/{task_id}`, no la URL
+concreta) para que el número de series no crezca con los ids. Las
+peticiones que no coinciden con ninguna ruta comparten la etiqueta
+`unmatched`.
+
+La duración incluye el envío del cuerpo: en el stream en vivo (SSE) mide
+lo que dura la conexión.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, UNMATCHED_ROUTE
+
+
+class HTTPMetricsMiddleware:
+    """Medir la latencia y el código de respuesta de cada ruta"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # Si la aplicación falla antes de responder
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # El router de FastAPI deja la ruta elegida en el scope
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, path, str(status_code)).inc()
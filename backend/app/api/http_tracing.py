@@ -0,0 +1,61 @@
+"""
+Middleware de trazas HTTP
+
+Abre el span raíz de cada petición (o continúa la traza del cliente si envía
+`traceparent`). El nombre del span es el método y la plantilla de la ruta,
+y la respuesta lleva `X-Trace-Id` para encontrar la traza a partir de un
+reporte ("no me llegó la notificación de la tarea que creé").
+"""
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import UNMATCHED_ROUTE
+from app.core.tracing import extract_context, tracer
+
+
+class TracingMiddleware:
+    """Span de servidor por petición HTTP"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+            if key in (b"traceparent", b"tracestate")
+        }
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            method, context=extract_context(carrier), kind=SpanKind.SERVER
+        ) as span:
+            if not span.is_recording():
+                await self.app(scope, receive, send)
+                return
+
+            trace_id = trace.format_trace_id(span.get_span_context().trace_id)
+            span.set_attribute("http.method", method)
+            span.set_attribute("http.target", scope["path"])
+
+            async def send_with_trace_id(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-trace-id", trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                # El router de FastAPI deja la ruta elegida en el scope
+                route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                span.set_attribute("http.route", route)
+                span.update_name(f"{method} {route}")
@@ -0,0 +1,59 @@
+"""
+Middleware de perfilado SQL por petición
+
+Perfila una fracción de las peticiones (SQL_PROFILER_SAMPLE_RATE) con
+app/core/query_profiler.py y añade a la respuesta:
+
+- `Server-Timing: db;dur=<ms>;desc="<n> consultas"` (visible en las
+  herramientas de desarrollo del navegador)
+- `X-DB-Queries: <n>`
+
+Es un middleware ASGI puro: no envuelve el cuerpo de la respuesta, solo
+reescribe las cabeceras al iniciarse.
+"""
+import random
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.query_profiler import profile_queries, report
+
+
+class SQLProfilerMiddleware:
+    """Contar las consultas y el tiempo de BD de cada petición muestreada"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or not settings.SQL_PROFILER_ENABLED
+            or random.random() >= settings.SQL_PROFILER_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries(f"{scope['method']} {scope['path']}", report_on_exit=False) as profile:
+
+            async def send_with_timing(message: Message):
+                # Las consultas de una StreamingResponse posteriores a este
+                # punto solo se reflejan en el log, no en las cabeceras
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((
+                        b"server-timing",
+                        f'db;dur={profile.duration_ms:.1f};desc="{profile.count} consultas"'.encode(),
+                    ))
+                    headers.append((b"x-db-queries", str(profile.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        if profile.slow and settings.SQL_EXPLAIN_SLOW_QUERIES:
+            # Los EXPLAIN consultan la BD: fuera del event loop
+            await run_in_threadpool(report, profile)
+        else:
+            report(profile)
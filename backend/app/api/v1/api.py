@@ -3,7 +3,7 @@ Router principal de API v1
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, projects, tasks, areas, telegram
+from app.api.v1.endpoints import auth, users, projects, tasks, areas, telegram, stream
 
 # Router principal de v1
 api_router = APIRouter()
@@ -15,3 +15,4 @@ api_router.include_router(projects.router, prefix="/projects", tags=["Proyectos"
 api_router.include_router(tasks.router, prefix="/tasks", tags=["Tareas"])
 api_router.include_router(areas.router, prefix="/areas", tags=["Áreas"])
 api_router.include_router(telegram.router, prefix="/users/me/telegram", tags=["Telegram"])
+api_router.include_router(stream.router, prefix="/stream", tags=["Stream"])
@@ -3,32 +3,35 @@ Endpoints para gestión de áreas
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 
 from app.core.database import get_db
+from app.core.reference_data import reference_data, AREAS
 from app.api.dependencies import get_current_user
+from app.api.conditional import conditional_get
 from app.models.user import User
 from app.models.area import Area
 from app.models.project import Project
-from app.models.task import Task
+from app.models.task import Task, TaskStatus
 from app.schemas.area import AreaCreate, AreaUpdate, AreaResponse, AreaWithStats
 
 router = APIRouter()
 
 
 @router.get("/public", response_model=list[AreaResponse])
-def list_areas_public(
-    db: Session = Depends(get_db)
-):
+def list_areas_public():
     """
     Listar todas las áreas activas (endpoint público para registro).
-    No requiere autenticación.
+    No requiere autenticación. Se sirve desde la caché de datos de referencia.
     """
-    areas = db.query(Area).filter(Area.is_active == True).all()
-    return areas
+    return reference_data.areas(active_only=True)
 
 
-@router.get("/", response_model=list[AreaResponse])
+@router.get(
+    "/",
+    response_model=list[AreaResponse],
+    dependencies=[Depends(conditional_get("areas"))],
+)
 def list_areas(
     skip: int = 0,
     limit: int = 100,
@@ -49,7 +52,11 @@ def list_areas(
     return areas
 
 
-@router.get("/with-stats", response_model=list[AreaWithStats])
+@router.get(
+    "/with-stats",
+    response_model=list[AreaWithStats],
+    dependencies=[Depends(conditional_get("areas", "users", "projects", "tasks"))],
+)
 def list_areas_with_stats(
     skip: int = 0,
     limit: int = 100,
@@ -60,36 +67,50 @@ def list_areas_with_stats(
     """
     Listar áreas con estadísticas (total de usuarios y proyectos).
     """
-    query = db.query(Area)
+    # Conteos agregados por área en subconsultas: una sola consulta para todo
+    # el listado. Las tareas se agrupan por tasks.area_id (índice
+    # area_id/status/deadline), sin unir proyectos.
+    users = db.query(
+        User.area_id.label("area_id"), func.count(User.id).label("total")
+    ).group_by(User.area_id).subquery()
+    projects = db.query(
+        Project.area_id.label("area_id"), func.count(Project.id).label("total")
+    ).group_by(Project.area_id).subquery()
+    tasks = db.query(
+        Task.area_id.label("area_id"),
+        func.count(Task.id).label("total"),
+        func.sum(case((Task.status == TaskStatus.SIN_EMPEZAR, 1), else_=0)).label("sin_empezar"),
+        func.sum(case((Task.status == TaskStatus.EN_CURSO, 1), else_=0)).label("en_curso"),
+        func.sum(case((Task.status == TaskStatus.COMPLETADO, 1), else_=0)).label("completado"),
+    ).group_by(Task.area_id).subquery()
+
+    query = db.query(
+        Area,
+        func.coalesce(users.c.total, 0),
+        func.coalesce(projects.c.total, 0),
+        func.coalesce(tasks.c.total, 0),
+        func.coalesce(tasks.c.sin_empezar, 0),
+        func.coalesce(tasks.c.en_curso, 0),
+        func.coalesce(tasks.c.completado, 0),
+    ).outerjoin(
+        users, users.c.area_id == Area.id
+    ).outerjoin(
+        projects, projects.c.area_id == Area.id
+    ).outerjoin(
+        tasks, tasks.c.area_id == Area.id
+    )
 
     if is_active is not None:
         query = query.filter(Area.is_active == is_active)
 
-    areas = query.offset(skip).limit(limit).all()
+    rows = query.order_by(Area.id).offset(skip).limit(limit).all()
 
     # Agregar estadísticas
     areas_with_stats = []
-    for area in areas:
-        total_users = db.query(func.count(User.id)).filter(User.area_id == area.id).scalar()
-        total_projects = db.query(func.count(Project.id)).filter(Project.area_id == area.id).scalar()
-
-        # Contar tareas a través de los proyectos del área
-        total_tasks = db.query(func.count(Task.id)).join(
-            Project, Task.project_id == Project.id
-        ).filter(Project.area_id == area.id).scalar()
-
-        tasks_sin_empezar = db.query(func.count(Task.id)).join(
-            Project, Task.project_id == Project.id
-        ).filter(Project.area_id == area.id, Task.status == 'sin_empezar').scalar()
-
-        tasks_en_curso = db.query(func.count(Task.id)).join(
-            Project, Task.project_id == Project.id
-        ).filter(Project.area_id == area.id, Task.status == 'en_curso').scalar()
-
-        tasks_completado = db.query(func.count(Task.id)).join(
-            Project, Task.project_id == Project.id
-        ).filter(Project.area_id == area.id, Task.status == 'completado').scalar()
-
+    for (
+        area, total_users, total_projects, total_tasks,
+        tasks_sin_empezar, tasks_en_curso, tasks_completado,
+    ) in rows:
         area_dict = {
             "id": area.id,
             "name": area.name,
@@ -165,6 +186,8 @@ def create_area(
     area = Area(**area_in.model_dump())
     db.add(area)
     db.commit()
+    # Los demás procesos se enteran por pub/sub; este, sin esperar el mensaje
+    reference_data.invalidate(AREAS)
     db.refresh(area)
     return area
 
@@ -210,6 +233,7 @@ def update_area(
         setattr(area, field, value)
 
     db.commit()
+    reference_data.invalidate(AREAS)
     db.refresh(area)
     return area
 
@@ -257,4 +281,5 @@ def delete_area(
 
     db.delete(area)
     db.commit()
+    reference_data.invalidate(AREAS)
     return None
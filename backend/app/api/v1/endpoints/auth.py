@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.reference_data import reference_data, USERS
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.models import User
 from app.schemas import (
@@ -66,6 +67,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
     db.add(db_user)
     db.commit()
+    reference_data.invalidate(USERS)
     db.refresh(db_user)
 
     return db_user
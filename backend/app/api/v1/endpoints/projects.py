@@ -1,22 +1,78 @@
 """
 Endpoints de Proyectos
 """
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, Query as SAQuery, aliased
+from sqlalchemy import func, case
 
-from app.core.database import get_db
+from app.core import domain_events as events
+from app.core.database import get_db, get_read_db_context
 from app.api.dependencies import get_current_user
+from app.api.conditional import conditional_get
 from app.core.permissions import can_access_project, can_modify_project
-from app.models import User, Project, Task
+from app.core.visibility import VisibilityScope, project_visible
+from app.models import User, Project, Task, Area
 from app.models.task import TaskStatus
 from app.schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectWithStats
+from app.services.exporters import ExportFormat, MEDIA_TYPES, iter_export, export_filename
 
 router = APIRouter()
 
+# Filas por lote al recorrer el cursor del servidor durante la exportación
+EXPORT_BATCH_SIZE = 1000
 
-@router.get("/", response_model=list[ProjectResponse])
+EXPORT_COLUMNS = [
+    "id", "nombre", "descripcion", "area", "propietario", "archivado",
+    "total_tareas", "completadas", "en_curso", "sin_empezar", "vencidas",
+    "creado_en", "actualizado_en",
+]
+
+
+def _apply_project_visibility(query: SAQuery, current_user: User, area_id: Optional[str] = None) -> SAQuery:
+    """
+    Restringir una consulta de proyectos a los visibles según el rol del usuario
+    (ver app/core/visibility.py):
+    - Administrador: Ve todos los proyectos (opcionalmente filtrados por área)
+    - Supervisor: Ve proyectos de su área
+    - Analista: Ve proyectos que le pertenecen O donde tiene tareas asignadas
+    """
+    if current_user.role == 'administrador' and area_id:
+        query = query.filter(Project.area_id == area_id)
+
+    return query.filter(project_visible(VisibilityScope.of(current_user)))
+
+
+def _task_stats_columns(now: datetime) -> list:
+    """
+    Columnas de la agregación de tareas por proyecto (agrupar por Task.project_id)
+
+    Args:
+        now: Momento de referencia para las tareas vencidas
+
+    Returns:
+        Columnas project_id, total, completed, in_progress, pending y overdue
+    """
+    return [
+        Task.project_id.label("project_id"),
+        func.count(Task.id).label("total"),
+        func.sum(case((Task.status == TaskStatus.COMPLETADO, 1), else_=0)).label("completed"),
+        func.sum(case((Task.status == TaskStatus.EN_CURSO, 1), else_=0)).label("in_progress"),
+        func.sum(case((Task.status == TaskStatus.SIN_EMPEZAR, 1), else_=0)).label("pending"),
+        func.sum(case(
+            ((Task.deadline < now) & (Task.status != TaskStatus.COMPLETADO), 1),
+            else_=0,
+        )).label("overdue"),
+    ]
+
+
+@router.get(
+    "/",
+    response_model=list[ProjectResponse],
+    dependencies=[Depends(conditional_get("projects", "tasks", "users", scoped=True))],
+)
 def list_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
@@ -42,28 +98,8 @@ def list_projects(
     Returns:
         Lista de proyectos según permisos
     """
-    query = db.query(Project)
-
     # Aplicar filtros según rol
-    if current_user.role == 'administrador':
-        # Administrador ve todos los proyectos
-        if area_id:
-            query = query.filter(Project.area_id == area_id)
-    elif current_user.role == 'supervisor':
-        # Supervisor ve proyectos de su área
-        if current_user.area_id:
-            query = query.filter(Project.area_id == current_user.area_id)
-        else:
-            # Si no tiene área asignada, no ve ningún proyecto
-            query = query.filter(False)
-    else:
-        # Analista ve proyectos que le pertenecen O donde tiene tareas asignadas
-        query = query.outerjoin(Task, Project.id == Task.project_id).filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        ).distinct()
+    query = _apply_project_visibility(db.query(Project), current_user, area_id)
 
     if not include_archived:
         query = query.filter(Project.is_archived == False)
@@ -72,7 +108,11 @@ def list_projects(
     return projects
 
 
-@router.get("/with-stats", response_model=list[ProjectWithStats])
+@router.get(
+    "/with-stats",
+    response_model=list[ProjectWithStats],
+    dependencies=[Depends(conditional_get("projects", "tasks", "users", scoped=True))],
+)
 def list_projects_with_stats(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
@@ -95,69 +135,106 @@ def list_projects_with_stats(
     Returns:
         Lista de proyectos con estadísticas según permisos
     """
-    from datetime import datetime
-
-    query = db.query(Project)
-
     # Aplicar filtros según rol
-    if current_user.role == 'administrador':
-        if area_id:
-            query = query.filter(Project.area_id == area_id)
-    elif current_user.role == 'supervisor':
-        if current_user.area_id:
-            query = query.filter(Project.area_id == current_user.area_id)
-        else:
-            query = query.filter(False)
-    else:
-        # Analista ve proyectos que le pertenecen O donde tiene tareas asignadas
-        query = query.outerjoin(Task, Project.id == Task.project_id).filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        ).distinct()
+    query = _apply_project_visibility(db.query(Project), current_user, area_id)
 
     if not include_archived:
         query = query.filter(Project.is_archived == False)
 
     projects = query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
 
-    # Agregar estadísticas a cada proyecto
+    # Estadísticas de todos los proyectos de la página en una sola agregación
+    stats = {}
+    if projects:
+        stats = {
+            row.project_id: row
+            for row in db.query(*_task_stats_columns(datetime.utcnow())).filter(
+                Task.project_id.in_([project.id for project in projects])
+            ).group_by(Task.project_id)
+        }
+
     projects_with_stats = []
     for project in projects:
-        # Contar tareas por estado
-        total_tasks = db.query(func.count(Task.id)).filter(Task.project_id == project.id).scalar()
-        completed_tasks = db.query(func.count(Task.id)).filter(
-            Task.project_id == project.id,
-            Task.status == TaskStatus.COMPLETADO
-        ).scalar()
-        in_progress_tasks = db.query(func.count(Task.id)).filter(
-            Task.project_id == project.id,
-            Task.status == TaskStatus.EN_CURSO
-        ).scalar()
-        pending_tasks = db.query(func.count(Task.id)).filter(
-            Task.project_id == project.id,
-            Task.status == TaskStatus.SIN_EMPEZAR
-        ).scalar()
-        overdue_tasks = db.query(func.count(Task.id)).filter(
-            Task.project_id == project.id,
-            Task.deadline < datetime.utcnow(),
-            Task.status != TaskStatus.COMPLETADO
-        ).scalar()
-
+        row = stats.get(project.id)
         project_dict = {
             **project.__dict__,
-            "total_tasks": total_tasks or 0,
-            "completed_tasks": completed_tasks or 0,
-            "in_progress_tasks": in_progress_tasks or 0,
-            "pending_tasks": pending_tasks or 0,
-            "overdue_tasks": overdue_tasks or 0,
+            "total_tasks": row.total if row else 0,
+            "completed_tasks": (row.completed or 0) if row else 0,
+            "in_progress_tasks": (row.in_progress or 0) if row else 0,
+            "pending_tasks": (row.pending or 0) if row else 0,
+            "overdue_tasks": (row.overdue or 0) if row else 0,
         }
         projects_with_stats.append(project_dict)
 
     return projects_with_stats
 
 
+@router.get("/export")
+def export_projects(
+    format: ExportFormat = Query("csv", description="Formato del archivo: csv o xlsx"),
+    include_archived: bool = Query(False),
+    area_id: Optional[str] = Query(None, description="Filtrar por área (opcional)"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exportar proyectos visibles por el usuario, con estadísticas de tareas, en streaming
+
+    Las estadísticas se calculan con una única agregación agrupada y los
+    resultados se recorren con un cursor del servidor (yield_per).
+
+    Args:
+        format: Formato del archivo (csv o xlsx)
+        include_archived: Incluir proyectos archivados
+        area_id: Filtrar por área (solo para administradores)
+        current_user: Usuario autenticado
+
+    Returns:
+        StreamingResponse con el archivo exportado
+    """
+    def rows():
+        # Sesión propia: debe vivir mientras se transmite la respuesta
+        with get_read_db_context(current_user.id) as db:
+            now = datetime.utcnow()
+            stats = db.query(*_task_stats_columns(now)).group_by(Task.project_id).subquery()
+            owner = aliased(User)
+
+            query = db.query(
+                Project.id,
+                Project.name,
+                Project.description,
+                Area.name,
+                owner.full_name,
+                Project.is_archived,
+                func.coalesce(stats.c.total, 0),
+                func.coalesce(stats.c.completed, 0),
+                func.coalesce(stats.c.in_progress, 0),
+                func.coalesce(stats.c.pending, 0),
+                func.coalesce(stats.c.overdue, 0),
+                Project.created_at,
+                Project.updated_at,
+            ).outerjoin(
+                Area, Project.area_id == Area.id
+            ).outerjoin(
+                owner, Project.owner_id == owner.id
+            ).outerjoin(
+                stats, stats.c.project_id == Project.id
+            )
+
+            query = _apply_project_visibility(query, current_user, area_id)
+
+            if not include_archived:
+                query = query.filter(Project.is_archived == False)
+
+            yield from query.order_by(Project.created_at.desc()).yield_per(EXPORT_BATCH_SIZE)
+
+    filename = export_filename("proyectos", format)
+    return StreamingResponse(
+        iter_export(format, EXPORT_COLUMNS, rows(), sheet_name="Proyectos"),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(
     project_data: ProjectCreate,
@@ -184,13 +261,22 @@ def create_project(
     )
 
     db.add(db_project)
+    db.flush()
+    events.emit(
+        db, events.PROJECT_CREATED,
+        project_id=db_project.id, area_id=db_project.area_id, actor_id=current_user.id,
+    )
     db.commit()
     db.refresh(db_project)
 
     return db_project
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
+@router.get(
+    "/{project_id}",
+    response_model=ProjectResponse,
+    dependencies=[Depends(conditional_get("projects", "tasks", "users", scoped=True))],
+)
 def get_project(
     project: Project = Depends(can_access_project),
 ):
@@ -210,6 +296,7 @@ def get_project(
 def update_project(
     project_update: ProjectUpdate,
     project: Project = Depends(can_modify_project),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -218,6 +305,7 @@ def update_project(
     Args:
         project_update: Datos a actualizar
         project: Proyecto validado por permisos
+        current_user: Usuario autenticado
         db: Sesión de base de datos
 
     Returns:
@@ -228,6 +316,10 @@ def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
 
+    events.emit(
+        db, events.PROJECT_UPDATED,
+        project_id=project.id, actor_id=current_user.id, fields=sorted(update_data),
+    )
     db.commit()
     db.refresh(project)
 
@@ -237,6 +329,7 @@ def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project: Project = Depends(can_modify_project),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -245,8 +338,13 @@ def delete_project(
 
     Args:
         project: Proyecto validado por permisos
+        current_user: Usuario autenticado
         db: Sesión de base de datos
     """
+    events.emit(
+        db, events.PROJECT_DELETED,
+        project_id=project.id, name=project.name, area_id=project.area_id, actor_id=current_user.id,
+    )
     db.delete(project)
     db.commit()
 
@@ -256,6 +354,7 @@ def delete_project(
 @router.patch("/{project_id}/archive", response_model=ProjectResponse)
 def archive_project(
     project: Project = Depends(can_modify_project),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -263,12 +362,14 @@ def archive_project(
 
     Args:
         project: Proyecto validado por permisos
+        current_user: Usuario autenticado
         db: Sesión de base de datos
 
     Returns:
         Proyecto archivado
     """
     project.is_archived = True
+    events.emit(db, events.PROJECT_ARCHIVED, project_id=project.id, actor_id=current_user.id)
     db.commit()
     db.refresh(project)
 
@@ -278,6 +379,7 @@ def archive_project(
 @router.patch("/{project_id}/unarchive", response_model=ProjectResponse)
 def unarchive_project(
     project: Project = Depends(can_modify_project),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -285,12 +387,14 @@ def unarchive_project(
 
     Args:
         project: Proyecto validado por permisos
+        current_user: Usuario autenticado
         db: Sesión de base de datos
 
     Returns:
         Proyecto desarchivado
     """
     project.is_archived = False
+    events.emit(db, events.PROJECT_UNARCHIVED, project_id=project.id, actor_id=current_user.id)
     db.commit()
     db.refresh(project)
 
@@ -0,0 +1,103 @@
+"""
+Endpoint de Stream en vivo (Server-Sent Events)
+"""
+import asyncio
+import json
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.api.dependencies import authenticate_token
+from app.core.config import settings
+from app.core.database import get_read_db_context
+from app.core.security import decode_access_token
+from app.core.visibility import VisibilityScope
+from app.services.live_updates import broadcaster
+
+router = APIRouter()
+
+# Bearer opcional: EventSource no permite cabeceras, el token puede ir en la URL
+optional_security = HTTPBearer(auto_error=False)
+
+# Milisegundos que el navegador espera antes de reconectar
+RECONNECT_MS = 3000
+
+
+def _load_scope(token: str) -> VisibilityScope:
+    """Autenticar y extraer el alcance del usuario sin retener la sesión de BD"""
+    with get_read_db_context() as db:
+        return VisibilityScope.of(authenticate_token(token, db))
+
+
+def _format_event(change: dict) -> str:
+    """Serializar un evento de cambio en formato SSE"""
+    return f"event: {change['entity']}\ndata: {json.dumps(change, default=str)}\n\n"
+
+
+@router.get("")
+async def stream_changes(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="Token JWT (alternativa a la cabecera Authorization)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
+    """
+    Recibir en vivo los cambios de tareas y proyectos visibles (text/event-stream)
+
+    Eventos:
+    - `ready`: conexión establecida; el cliente debe sincronizar con GET /tasks/changes
+    - `task` / `project`: cambio (action created|updated|deleted) con ids y alcance, sin contenido
+    - `resync`: pudieron perderse eventos; volver a sincronizar con GET /tasks/changes
+
+    La conexión se cierra al expirar el token; el cliente reconecta con un token vigente.
+
+    Args:
+        request: Petición actual (para detectar desconexiones)
+        access_token: Token JWT en la URL (EventSource no envía cabeceras)
+        credentials: Credenciales HTTP Bearer
+
+    Returns:
+        StreamingResponse con los eventos
+
+    Raises:
+        HTTPException: Si no se envía token o es inválido
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudo validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    scope = await run_in_threadpool(_load_scope, token)
+    expires_at = decode_access_token(token).get("exp")
+
+    async def events():
+        async with broadcaster.subscribe(scope) as subscription:
+            yield f"retry: {RECONNECT_MS}\nevent: ready\ndata: {{}}\n\n"
+
+            while not await request.is_disconnected():
+                if expires_at and time.time() >= expires_at:
+                    break
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comentario keep-alive: evita que proxies cierren la conexión inactiva
+                    yield ": ping\n\n"
+                    continue
+                yield _format_event(change)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Desactivar buffering en nginx
+        },
+    )
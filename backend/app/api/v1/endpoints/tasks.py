@@ -1,26 +1,70 @@
 """
 Endpoints de Tareas
 """
+import io
 import logging
 from typing import Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_db_context
+from app.core import domain_events as events
+from app.core.replicas import require_primary
+from app.core.loaders import loader
+from app.core.reference_data import reference_data
 from app.api.dependencies import get_current_user
-from app.models import User, Project, Task
+from app.api.conditional import conditional_get
+from app.core.permissions import can_access_task, can_modify_task, can_manage_task
+from app.core.visibility import VisibilityScope, project_modifiable, task_visible, tombstone_visible
+from app.models import User, Project, Task, TaskTombstone
 from app.models.task import TaskStatus, TaskPriority
-from app.schemas import TaskCreate, TaskUpdate, TaskStatusUpdate, TaskResponse, TaskWithDetails
-from app.bot.notifications import send_task_assignment_notification, send_task_reassignment_notification
+from app.schemas import TaskCreate, TaskUpdate, TaskStatusUpdate, TaskResponse, TaskWithDetails, TaskChanges, TaskImportResult
+from app.services.exporters import ExportFormat, MEDIA_TYPES, iter_export, export_filename
+from app.services.task_import import TaskImporter, TaskImportError, open_csv_reader
+from app.services.task_sync import (
+    PHASE_DELETED,
+    PHASE_UPDATED,
+    SyncTokenError,
+    decode_token,
+    encode_token,
+    window_page,
+)
 
 router = APIRouter()
 
+# Filas por lote al recorrer el cursor del servidor durante la exportación
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "proyecto", "titulo", "descripcion", "estado", "prioridad",
+    "responsable", "creador", "deadline", "completada_en", "archivada",
+    "creada_en", "actualizada_en",
+]
+
+
+def _emit_status_changed(db: Session, task: Task, old_status: TaskStatus, actor: User):
+    """Anotar el evento de cambio de estado de una tarea (se publica con el commit)"""
+    events.emit(
+        db, events.TASK_STATUS_CHANGED,
+        task_id=task.id,
+        project_id=task.project_id,
+        old_status=TaskStatus(old_status).value,
+        new_status=TaskStatus(task.status).value,
+        actor_id=actor.id,
+    )
+
 
-@router.get("/", response_model=list[TaskWithDetails])
+@router.get(
+    "/",
+    response_model=list[TaskWithDetails],
+    dependencies=[Depends(conditional_get("tasks", "projects", "users", scoped=True))],
+)
 def list_tasks(
     project_id: Optional[str] = Query(None),
     status: Optional[TaskStatus] = Query(None),
@@ -49,18 +93,8 @@ def list_tasks(
     Returns:
         Lista de tareas con información detallada
     """
-    # Query base:
-    # - Administradores ven todas las tareas
-    # - Otros usuarios ven solo tareas de sus proyectos O tareas asignadas a ellos
-    query = db.query(Task).join(Project)
-
-    if current_user.role != "administrador":
-        query = query.filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        )
+    # Query base restringida a las tareas visibles por el usuario
+    query = db.query(Task).filter(task_visible(VisibilityScope.of(current_user)))
 
     # Por defecto, excluir tareas archivadas
     if not include_archived:
@@ -78,22 +112,15 @@ def list_tasks(
 
     tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
 
-    # Enriquecer tareas con información adicional
+    # Enriquecer tareas con información adicional: proyectos en una consulta,
+    # nombres de usuario desde la caché de datos de referencia
+    projects = loader(db, Project).load_many(task.project_id for task in tasks)
+
     tasks_with_details = []
     for task in tasks:
-        # Obtener información del proyecto
-        project = db.query(Project).filter(Project.id == task.project_id).first()
-
-        # Obtener información del responsable
-        responsible_name = None
-        if task.responsible_id:
-            responsible = db.query(User).filter(User.id == task.responsible_id).first()
-            if responsible:
-                responsible_name = responsible.full_name
-
-        # Obtener información del creador
-        creator = db.query(User).filter(User.id == task.created_by).first()
-        creator_name = creator.full_name if creator else None
+        project = projects.get(task.project_id)
+        responsible_name = reference_data.user_name(task.responsible_id)
+        creator_name = reference_data.user_name(task.created_by)
 
         # Crear diccionario con todos los campos
         task_dict = {
@@ -108,6 +135,266 @@ def list_tasks(
     return tasks_with_details
 
 
+@router.get("/export")
+def export_tasks(
+    format: ExportFormat = Query("csv", description="Formato del archivo: csv o xlsx"),
+    project_id: Optional[str] = Query(None),
+    status: Optional[TaskStatus] = Query(None),
+    priority: Optional[TaskPriority] = Query(None),
+    responsible_id: Optional[str] = Query(None),
+    include_archived: bool = Query(False, description="Incluir tareas archivadas en la exportación"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exportar tareas visibles por el usuario como CSV o XLSX en streaming
+
+    Aplica los mismos filtros de visibilidad y de búsqueda que el listado, pero
+    recorre los resultados con un cursor del servidor (yield_per) y escribe el
+    archivo por bloques, por lo que la memoria no crece con el número de tareas.
+
+    Args:
+        format: Formato del archivo (csv o xlsx)
+        project_id: Filtrar por proyecto
+        status: Filtrar por estado
+        priority: Filtrar por prioridad
+        responsible_id: Filtrar por responsable
+        include_archived: Incluir tareas archivadas (por defecto False)
+        current_user: Usuario autenticado
+
+    Returns:
+        StreamingResponse con el archivo exportado
+    """
+    def rows():
+        # Sesión propia: debe vivir mientras se transmite la respuesta
+        with get_read_db_context(current_user.id) as db:
+            responsible = aliased(User)
+            creator = aliased(User)
+
+            query = db.query(
+                Task.id,
+                Project.name,
+                Task.title,
+                Task.description,
+                Task.status,
+                Task.priority,
+                responsible.full_name,
+                creator.full_name,
+                Task.deadline,
+                Task.completed_at,
+                Task.is_archived,
+                Task.created_at,
+                Task.updated_at,
+            ).join(
+                Project, Task.project_id == Project.id
+            ).outerjoin(
+                responsible, Task.responsible_id == responsible.id
+            ).outerjoin(
+                creator, Task.created_by == creator.id
+            )
+
+            query = query.filter(task_visible(VisibilityScope.of(current_user)))
+
+            if not include_archived:
+                query = query.filter(Task.is_archived == False)
+            if project_id:
+                query = query.filter(Task.project_id == project_id)
+            if status:
+                query = query.filter(Task.status == status)
+            if priority:
+                query = query.filter(Task.priority == priority)
+            if responsible_id:
+                query = query.filter(Task.responsible_id == responsible_id)
+
+            yield from query.order_by(Task.created_at.desc()).yield_per(EXPORT_BATCH_SIZE)
+
+    filename = export_filename("tareas", format)
+    return StreamingResponse(
+        iter_export(format, EXPORT_COLUMNS, rows(), sheet_name="Tareas"),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/changes", response_model=TaskChanges)
+def get_task_changes(
+    since: Optional[str] = Query(None, description="Token devuelto por la llamada anterior (omitir en la carga inicial)"),
+    limit: int = Query(500, ge=1, le=1000, description="Máximo de cambios por página"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Obtener los cambios en las tareas visibles desde un token de sincronización
+
+    Sin token devuelve todas las tareas visibles (incluidas las archivadas).
+    Con token devuelve solo las tareas creadas, modificadas o archivadas desde
+    entonces (por `updated_at`) y los IDs de las tareas eliminadas o que el
+    usuario dejó de ver por una reasignación (por las lápidas de
+    `task_tombstones`). El cliente aplica `deleted` y luego reemplaza por id
+    las tareas de `updated`; mientras `has_more` sea true debe repetir la
+    llamada con `next_token`.
+
+    Args:
+        since: Token de sincronización
+        limit: Máximo de cambios por página
+        current_user: Usuario autenticado
+        db: Sesión de base de datos
+
+    Returns:
+        Cambios y token para la siguiente llamada
+
+    Raises:
+        HTTPException: 400 si el token es inválido, 410 si expiró (recargar completo)
+    """
+    # El token asume que la lectura ve todos los commits hasta `now`: una
+    # réplica atrasada más que el margen de solapamiento perdería cambios
+    require_primary(db)
+
+    scope = VisibilityScope.of(current_user)
+    now = db.query(func.now()).scalar()
+
+    if since is None:
+        state = {"since": None, "until": now, "phase": PHASE_UPDATED, "cursor": None}
+    else:
+        try:
+            state = decode_token(since)
+        except SyncTokenError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        # Las lápidas se purgan tras el periodo de retención: no se puede garantizar el delta
+        retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        if state["since"] is not None and state["since"] < now - retention:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="El token de sincronización expiró, vuelve a cargar las tareas sin token"
+            )
+
+        if state["until"] is None:
+            # Nueva ventana: primero las bajas, después las altas y modificaciones
+            state.update(until=now, phase=PHASE_DELETED, cursor=None)
+
+    window = state["since"], state["until"]
+    phase, cursor = state["phase"], state["cursor"]
+    remaining = limit
+    deleted: list[str] = []
+    updated: list[dict] = []
+
+    if phase == PHASE_DELETED:
+        query = db.query(
+            TaskTombstone.task_id, TaskTombstone.removed_at, TaskTombstone.id
+        ).filter(tombstone_visible(scope))
+
+        rows, has_more = window_page(
+            query, TaskTombstone.removed_at, TaskTombstone.id, *window, cursor, remaining
+        )
+        deleted = list(dict.fromkeys(row.task_id for row in rows))
+        if has_more:
+            last = rows[-1]
+            return {
+                "deleted": deleted,
+                "next_token": encode_token(*window, PHASE_DELETED, (last.removed_at, last.id)),
+                "has_more": True,
+            }
+        phase, cursor = PHASE_UPDATED, None
+        remaining -= len(rows)
+
+    has_more = remaining == 0
+    if remaining:
+        responsible = aliased(User)
+        creator = aliased(User)
+        query = db.query(
+            Task, Project.name, responsible.full_name, creator.full_name
+        ).join(
+            Project, Task.project_id == Project.id
+        ).outerjoin(
+            responsible, Task.responsible_id == responsible.id
+        ).outerjoin(
+            creator, Task.created_by == creator.id
+        )
+        query = query.filter(task_visible(scope))
+
+        rows, has_more = window_page(query, Task.updated_at, Task.id, *window, cursor, remaining)
+        for task, project_name, responsible_name, creator_name in rows:
+            updated.append({
+                **task.__dict__,
+                "project_name": project_name,
+                "responsible_name": responsible_name,
+                "creator_name": creator_name,
+            })
+        if rows:
+            cursor = (rows[-1][0].updated_at, rows[-1][0].id)
+
+    if has_more:
+        next_token = encode_token(*window, phase, cursor)
+    else:
+        next_token = encode_token(state["until"] - timedelta(seconds=settings.TASK_SYNC_OVERLAP_SECONDS))
+
+    return {
+        "updated": updated,
+        "deleted": deleted,
+        "next_token": next_token,
+        "has_more": has_more,
+    }
+
+
+@router.post("/import", response_model=TaskImportResult)
+def import_tasks(
+    file: UploadFile = File(..., description="Archivo CSV (UTF-8) con cabecera"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Importar tareas de forma masiva desde un archivo CSV
+
+    El archivo se lee en streaming y se procesa por lotes: proyectos y
+    responsables se resuelven con consultas agrupadas y las tareas se insertan
+    con un INSERT multi-fila por lote. Las filas inválidas no detienen la
+    importación y se reportan con su número de línea. Al final se publica un
+    evento con las asignaciones: el consumidor de notificaciones envía un solo
+    mensaje por responsable.
+
+    Columnas: project_id, title (obligatorias), description, status, priority,
+    responsible_id o responsible_email, deadline (ISO 8601), reminder_hours_before
+
+    Args:
+        file: Archivo CSV
+        current_user: Usuario autenticado
+        db: Sesión de base de datos
+
+    Returns:
+        Resumen de la importación con los errores por fila
+
+    Raises:
+        HTTPException: Si el archivo no tiene las columnas obligatorias o no se puede leer
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    importer = TaskImporter(db, current_user)
+
+    try:
+        result = importer.run(open_csv_reader(stream))
+    except TaskImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    finally:
+        stream.detach()
+
+    # Notificaciones agrupadas por responsable (las envía el consumidor de eventos)
+    if importer.created:
+        events.publish(
+            events.TASKS_IMPORTED,
+            actor_id=current_user.id,
+            assigned_by=importer.creator_name,
+            count=importer.created,
+            digests=importer.pending_digests(),
+        )
+
+    return result
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     task_data: TaskCreate,
@@ -126,20 +413,14 @@ def create_task(
         Tarea creada
 
     Raises:
-        HTTPException: Si el proyecto no existe o no pertenece al usuario
+        HTTPException: Si el proyecto no existe o el usuario no puede modificarlo
     """
-    # Verificar que el proyecto existe
-    # Los administradores pueden crear tareas en cualquier proyecto
-    # Los demás usuarios solo en sus propios proyectos
-    if current_user.role == "administrador":
-        # Administradores: solo verificar que el proyecto existe
-        project = db.query(Project).filter(Project.id == task_data.project_id).first()
-    else:
-        # Otros usuarios: verificar que el proyecto les pertenece
-        project = db.query(Project).filter(
-            Project.id == task_data.project_id,
-            Project.owner_id == current_user.id
-        ).first()
+    # Verificar que el proyecto existe y que el usuario puede modificarlo
+    # (administrador, dueño del proyecto o supervisor de su área)
+    project = db.query(Project).filter(
+        Project.id == task_data.project_id,
+        project_modifiable(VisibilityScope.of(current_user))
+    ).first()
 
     if not project:
         raise HTTPException(
@@ -149,7 +430,7 @@ def create_task(
 
     # Verificar que el responsable existe (si se especificó)
     if task_data.responsible_id:
-        responsible = db.query(User).filter(User.id == task_data.responsible_id).first()
+        responsible = loader(db, User).load(task_data.responsible_id)
         if not responsible:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -159,6 +440,7 @@ def create_task(
     # Crear tarea
     db_task = Task(
         project_id=task_data.project_id,
+        area_id=project.area_id,
         title=task_data.title,
         description=task_data.description,
         status=task_data.status,
@@ -170,33 +452,33 @@ def create_task(
     )
 
     db.add(db_task)
+    db.flush()
+
+    # La notificación al responsable la envía el consumidor de eventos
+    events.emit(
+        db, events.TASK_CREATED,
+        task_id=db_task.id,
+        project_id=db_task.project_id,
+        responsible_id=db_task.responsible_id,
+        actor_id=current_user.id,
+    )
+
     db.commit()
     db.refresh(db_task)
 
-    # Enviar notificación Telegram al responsable
-    if task_data.responsible_id:
-        try:
-            send_task_assignment_notification(db_task, responsible, current_user, db)
-        except Exception as e:
-            # Log error pero no fallar la creación de la tarea
-            logger.error(f"Error al enviar notificación de Telegram: {str(e)}")
-
     return db_task
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+@router.get(
+    "/{task_id}",
+    response_model=TaskResponse,
+    dependencies=[Depends(conditional_get("tasks", "projects", "users", scoped=True))],
+)
 def get_task(
-    task_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    task: Task = Depends(can_access_task),
 ):
     """
-    Obtener tarea por ID
-
-    Args:
-        task_id: ID de la tarea
-        current_user: Usuario autenticado
-        db: Sesión de base de datos
+    Obtener tarea por ID (con validación de permisos por rol)
 
     Returns:
         Tarea encontrada
@@ -204,42 +486,22 @@ def get_task(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene acceso
     """
-    # Los administradores pueden ver cualquier tarea
-    # Otros usuarios solo ven tareas de sus proyectos o asignadas a ellos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        )
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada"
-        )
-
     return task
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task(
-    task_id: str,
     task_update: TaskUpdate,
+    task: Task = Depends(can_modify_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Actualizar tarea
+    Actualizar tarea (con validación de permisos por rol)
 
     Args:
-        task_id: ID de la tarea
         task_update: Datos a actualizar
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
@@ -249,41 +511,18 @@ def update_task(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    # Los administradores pueden editar cualquier tarea
-    # Otros usuarios pueden editar tareas de sus proyectos o asignadas a ellos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        )
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada o no tienes permiso para editarla"
-        )
-
     # Actualizar campos - usar exclude_unset para distinguir entre None enviado vs campo no enviado
     update_data = task_update.model_dump(exclude_unset=True)
 
-    # Guardar responsable anterior para notificación
+    # Guardar valores anteriores para los eventos
     old_responsible_id = task.responsible_id
-    old_responsible = None
-    if old_responsible_id:
-        old_responsible = db.query(User).filter(User.id == old_responsible_id).first()
+    old_status = task.status
 
     if 'title' in update_data:
         task.title = update_data['title']
     if 'description' in update_data:
         task.description = update_data['description']
     if 'status' in update_data:
-        old_status = task.status
         task.status = update_data['status']
         # Si se marca como completada, registrar fecha
         if update_data['status'] == TaskStatus.COMPLETADO and old_status != TaskStatus.COMPLETADO:
@@ -294,30 +533,37 @@ def update_task(
         task.priority = update_data['priority']
     if 'responsible_id' in update_data:
         # Validar que el usuario exista si se proporciona un ID (no null)
-        new_responsible = None
         if update_data['responsible_id']:
-            new_responsible = db.query(User).filter(User.id == update_data['responsible_id']).first()
+            new_responsible = loader(db, User).load(update_data['responsible_id'])
             if not new_responsible:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Usuario responsable no encontrado"
                 )
         task.responsible_id = update_data['responsible_id']
-
-        # Enviar notificación si cambió el responsable
-        if old_responsible_id != update_data['responsible_id'] and new_responsible:
-            try:
-                send_task_reassignment_notification(
-                    task, old_responsible, new_responsible, current_user, db
-                )
-            except Exception as e:
-                # Log error pero no fallar la actualización
-                logger.error(f"Error al enviar notificación de Telegram: {str(e)}")
     if 'deadline' in update_data:
         task.deadline = update_data['deadline']
     if 'reminder_hours_before' in update_data:
         task.reminder_hours_before = update_data['reminder_hours_before']
 
+    # Efectos secundarios (notificaciones, contadores) en los consumidores de eventos
+    events.emit(
+        db, events.TASK_UPDATED,
+        task_id=task.id, project_id=task.project_id, actor_id=current_user.id,
+        fields=sorted(update_data),
+    )
+    if task.responsible_id != old_responsible_id:
+        events.emit(
+            db, events.TASK_REASSIGNED,
+            task_id=task.id,
+            project_id=task.project_id,
+            previous_responsible_id=old_responsible_id,
+            responsible_id=task.responsible_id,
+            actor_id=current_user.id,
+        )
+    if task.status != old_status:
+        _emit_status_changed(db, task, old_status, current_user)
+
     db.commit()
     db.refresh(task)
 
@@ -326,17 +572,17 @@ def update_task(
 
 @router.patch("/{task_id}/status", response_model=TaskResponse)
 def update_task_status(
-    task_id: str,
     status_update: TaskStatusUpdate,
+    task: Task = Depends(can_modify_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Actualizar solo el estado de la tarea (responsable, dueño o administrador)
+    Actualizar solo el estado de la tarea (con validación de permisos por rol)
 
     Args:
-        task_id: ID de la tarea
         status_update: Nuevo estado
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
@@ -346,26 +592,6 @@ def update_task_status(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    # Los administradores pueden cambiar el estado de cualquier tarea
-    # Otros usuarios solo pueden cambiar tareas de sus proyectos o asignadas a ellos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        )
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada"
-        )
-
     old_status = task.status
     task.status = status_update.status
 
@@ -375,25 +601,27 @@ def update_task_status(
     elif status_update.status != TaskStatus.COMPLETADO:
         task.completed_at = None
 
+    # La notificación del cambio la envía el consumidor de eventos
+    if task.status != old_status:
+        _emit_status_changed(db, task, old_status, current_user)
+
     db.commit()
     db.refresh(task)
 
-    # TODO: Enviar notificación Telegram si fue completada (Fase 3)
-
     return task
 
 
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
 def complete_task(
-    task_id: str,
+    task: Task = Depends(can_modify_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Marcar tarea como completada (atajo)
+    Marcar tarea como completada (atajo, con validación de permisos por rol)
 
     Args:
-        task_id: ID de la tarea
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
@@ -403,29 +631,13 @@ def complete_task(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    # Los administradores pueden completar cualquier tarea
-    # Otros usuarios solo pueden completar tareas de sus proyectos o asignadas a ellos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Task.responsible_id == current_user.id
-            )
-        )
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada"
-        )
-
+    old_status = task.status
     task.status = TaskStatus.COMPLETADO
     task.completed_at = datetime.utcnow()
 
+    if old_status != TaskStatus.COMPLETADO:
+        _emit_status_changed(db, task, old_status, current_user)
+
     db.commit()
     db.refresh(task)
 
@@ -434,45 +646,25 @@ def complete_task(
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
-    task_id: str,
+    task: Task = Depends(can_modify_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Eliminar tarea (dueño del proyecto, responsable de la tarea o administrador)
+    Eliminar tarea (con validación de permisos por rol)
 
     Args:
-        task_id: ID de la tarea
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    task = db.query(Task).join(Project).filter(Task.id == task_id).first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada"
-        )
-
-    # Verificar permisos:
-    # - Administrador: puede eliminar cualquier tarea
-    # - Dueño del proyecto: puede eliminar tareas de su proyecto
-    # - Responsable: puede eliminar tareas asignadas a él
-    has_permission = (
-        current_user.role == "administrador" or
-        task.project.owner_id == current_user.id or
-        task.responsible_id == current_user.id
+    events.emit(
+        db, events.TASK_DELETED,
+        task_id=task.id, project_id=task.project_id, title=task.title, actor_id=current_user.id,
     )
-
-    if not has_permission:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para eliminar esta tarea"
-        )
-
     db.delete(task)
     db.commit()
 
@@ -481,15 +673,15 @@ def delete_task(
 
 @router.patch("/{task_id}/archive", response_model=TaskResponse)
 def archive_task(
-    task_id: str,
+    task: Task = Depends(can_manage_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Archivar tarea (solo dueño del proyecto o administrador)
+    Archivar tarea (dueño del proyecto, supervisor de su área o administrador)
 
     Args:
-        task_id: ID de la tarea
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
@@ -499,22 +691,8 @@ def archive_task(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    # Los administradores pueden archivar cualquier tarea
-    # Otros usuarios solo pueden archivar tareas de sus proyectos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(Project.owner_id == current_user.id)
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada o no tienes permiso para archivarla"
-        )
-
     task.is_archived = True
+    events.emit(db, events.TASK_ARCHIVED, task_id=task.id, project_id=task.project_id, actor_id=current_user.id)
     db.commit()
     db.refresh(task)
 
@@ -523,15 +701,15 @@ def archive_task(
 
 @router.patch("/{task_id}/unarchive", response_model=TaskResponse)
 def unarchive_task(
-    task_id: str,
+    task: Task = Depends(can_manage_task),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Desarchivar tarea (solo dueño del proyecto o administrador)
+    Desarchivar tarea (dueño del proyecto, supervisor de su área o administrador)
 
     Args:
-        task_id: ID de la tarea
+        task: Tarea validada por permisos
         current_user: Usuario autenticado
         db: Sesión de base de datos
 
@@ -541,22 +719,8 @@ def unarchive_task(
     Raises:
         HTTPException: Si la tarea no existe o el usuario no tiene permiso
     """
-    # Los administradores pueden desarchivar cualquier tarea
-    # Otros usuarios solo pueden desarchivar tareas de sus proyectos
-    query = db.query(Task).join(Project).filter(Task.id == task_id)
-
-    if current_user.role != "administrador":
-        query = query.filter(Project.owner_id == current_user.id)
-
-    task = query.first()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada o no tienes permiso para desarchivarla"
-        )
-
     task.is_archived = False
+    events.emit(db, events.TASK_UNARCHIVED, task_id=task.id, project_id=task.project_id, actor_id=current_user.id)
     db.commit()
     db.refresh(task)
 
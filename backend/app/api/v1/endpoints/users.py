@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.reference_data import reference_data, USERS
 from app.core.security import verify_password, get_password_hash
 from app.api.dependencies import get_current_user
 from app.models import User
@@ -66,8 +67,14 @@ def update_current_user_profile(
         current_user.phone_number = user_update.phone_number
     if user_update.telegram_chat_id is not None:
         current_user.telegram_chat_id = user_update.telegram_chat_id
+    if user_update.timezone is not None:
+        current_user.timezone = user_update.timezone
+    if user_update.digest_time is not None:
+        current_user.digest_time = user_update.digest_time
 
     db.commit()
+    # Los demás procesos se enteran por pub/sub; este, sin esperar el mensaje
+    reference_data.invalidate(USERS)
     db.refresh(current_user)
 
     return current_user
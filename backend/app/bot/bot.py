@@ -2,15 +2,19 @@
 Telegram Bot - Clase principal
 """
 import logging
+from opentelemetry.trace import SpanKind
 from telegram import Update
 from telegram.ext import (
     Application,
+    ApplicationBuilder,
     CommandHandler,
     MessageHandler,
     filters,
     ContextTypes,
 )
 from app.core.config import settings
+from app.bot.telegram_request import InstrumentedRequest
+from app.core.tracing import traced
 from app.bot.handlers import (
     start_command,
     help_command,
@@ -40,25 +44,49 @@ class TelegramBot:
         self.application = None
         logger.info("Inicializando bot de Telegram...")
 
+    def application_builder(self) -> ApplicationBuilder:
+        """
+        Builder de la aplicación del bot (token, URL de la API y clientes HTTP)
+
+        Returns:
+            ApplicationBuilder listo para build(); se puede ajustar antes
+            (ej: otro cliente HTTP en los benchmarks)
+        """
+        # Clientes HTTP con métricas (mismo tamaño de pool que los de PTB por defecto)
+        return (
+            Application.builder()
+            .token(self.token)
+            .base_url(settings.telegram_base_url)
+            .base_file_url(settings.telegram_base_file_url)
+            .request(InstrumentedRequest(connection_pool_size=256))
+            .get_updates_request(InstrumentedRequest())
+        )
+
+    def _add_command(self, command: str, callback):
+        """Registrar un comando; cada ejecución es el span raíz de una traza"""
+        self.application.add_handler(
+            CommandHandler(command, traced(f"bot /{command}", kind=SpanKind.SERVER)(callback))
+        )
+
     def setup_handlers(self):
         """Configurar los manejadores de comandos"""
         logger.info("Configurando handlers del bot...")
 
         # Comandos
-        self.application.add_handler(CommandHandler("start", start_command))
-        self.application.add_handler(CommandHandler("help", help_command))
-        self.application.add_handler(CommandHandler("ayuda", help_command))
-        self.application.add_handler(CommandHandler("tareas", tareas_command))
-        self.application.add_handler(CommandHandler("completar", completar_command))
-        self.application.add_handler(CommandHandler("hoy", hoy_command))
-        self.application.add_handler(CommandHandler("pendientes", pendientes_command))
-        self.application.add_handler(CommandHandler("semana", semana_command))
-        self.application.add_handler(CommandHandler("vencidas", vencidas_command))
+        self._add_command("start", start_command)
+        self._add_command("help", help_command)
+        self._add_command("ayuda", help_command)
+        self._add_command("tareas", tareas_command)
+        self._add_command("completar", completar_command)
+        self._add_command("hoy", hoy_command)
+        self._add_command("pendientes", pendientes_command)
+        self._add_command("semana", semana_command)
+        self._add_command("vencidas", vencidas_command)
 
         # Handler para comandos desconocidos (debe ir al final)
         self.application.add_handler(MessageHandler(
             filters.COMMAND,
-            unknown_command
+            traced("bot comando desconocido", kind=SpanKind.SERVER)(unknown_command)
         ))
 
         logger.info("Handlers configurados correctamente")
@@ -69,7 +97,7 @@ class TelegramBot:
             logger.info("Iniciando bot de Telegram...")
 
             # Crear aplicación
-            self.application = Application.builder().token(self.token).build()
+            self.application = self.application_builder().build()
 
             # Configurar handlers
             self.setup_handlers()
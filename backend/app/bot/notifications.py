@@ -4,12 +4,18 @@ Servicio de notificaciones push via Telegram
 import logging
 from typing import Optional
 from datetime import datetime
+from app.core.config import settings
+from app.core.loaders import loader
+from app.core.tracing import traced
 from app.models.user import User
 from app.models.task import Task, TaskStatus
 from app.models.project import Project
 
 logger = logging.getLogger(__name__)
 
+# Intentos por mensaje en send_telegram_messages cuando Telegram responde 429
+SEND_ATTEMPTS = 3
+
 
 class NotificationService:
     """Servicio para enviar notificaciones push via Telegram"""
@@ -23,6 +29,7 @@ class NotificationService:
         """
         self.bot = bot
 
+    @traced()
     async def notify_new_task(self, task: Task, responsible: User, creator: User):
         """
         Notificar al responsable sobre una nueva tarea asignada
@@ -72,6 +79,7 @@ class NotificationService:
 
         logger.info(f"Notificación de nueva tarea enviada a {responsible.email}")
 
+    @traced()
     async def notify_task_status_change(
         self,
         task: Task,
@@ -162,6 +170,7 @@ class NotificationService:
 
         logger.info(f"Notificación de cambio de estado enviada al chat {chat_id}")
 
+    @traced()
     async def notify_task_completed(self, task: Task, completed_by: User):
         """
         Notificar sobre tarea completada
@@ -192,6 +201,7 @@ class NotificationService:
 
             logger.info(f"Notificación de tarea completada enviada a {task.project.owner.email}")
 
+    @traced()
     async def notify_deadline_reminder(self, task: Task, hours_remaining: int):
         """
         Enviar recordatorio de deadline próximo
@@ -271,6 +281,7 @@ class NotificationService:
 # Helper functions para enviar notificaciones
 # ==============================================================================
 
+@traced()
 async def send_telegram_notification(user_id: str, message: str, db):
     """
     Envía notificación directa por Telegram sin necesidad de instancia del bot.
@@ -287,10 +298,11 @@ async def send_telegram_notification(user_id: str, message: str, db):
     """
     try:
         from telegram import Bot
+        from app.bot.telegram_request import InstrumentedRequest
         import os
 
-        # Obtener usuario
-        user = db.query(User).filter(User.id == user_id).first()
+        # Obtener usuario (de memoria si el llamador ya lo cargó en la sesión)
+        user = loader(db, User).load(user_id)
 
         if not user:
             logger.error(f"Usuario {user_id} no encontrado")
@@ -307,7 +319,7 @@ async def send_telegram_notification(user_id: str, message: str, db):
             return False
 
         # Crear instancia del bot y enviar mensaje
-        bot = Bot(token=bot_token)
+        bot = Bot(token=bot_token, base_url=settings.telegram_base_url, request=InstrumentedRequest())
         await bot.send_message(
             chat_id=user.telegram_chat_id,
             text=message,
@@ -322,6 +334,60 @@ async def send_telegram_notification(user_id: str, message: str, db):
         return False
 
 
+@traced()
+async def send_telegram_messages(messages: list[tuple[int, str]], concurrency: int) -> list[bool]:
+    """
+    Envía muchos mensajes con un solo cliente del bot, hasta `concurrency` a la vez.
+
+    Usada por los shards de los resúmenes. Un 429 (RetryAfter) se respeta
+    esperando lo indicado por Telegram antes de reintentar el mensaje.
+
+    Args:
+        messages: Lista de (chat_id, mensaje HTML)
+        concurrency: Mensajes en vuelo como máximo
+
+    Returns:
+        list[bool]: Resultado de cada mensaje, en el mismo orden
+    """
+    import asyncio
+    import os
+    from telegram import Bot
+    from telegram.error import RetryAfter
+    from app.bot.telegram_request import InstrumentedRequest
+
+    if not messages:
+        return []
+
+    bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not bot_token:
+        logger.error("TELEGRAM_BOT_TOKEN no configurado")
+        return [False] * len(messages)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(bot: "Bot", chat_id: int, text: str) -> bool:
+        async with semaphore:
+            for attempt in range(1, SEND_ATTEMPTS + 1):
+                try:
+                    await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+                    return True
+                except RetryAfter as e:
+                    logger.warning(
+                        f"Telegram limitó el envío al chat {chat_id}: reintento {attempt} en {e.retry_after} s"
+                    )
+                    await asyncio.sleep(e.retry_after)
+                except Exception as e:
+                    logger.error(f"Error al enviar mensaje al chat {chat_id}: {str(e)}")
+                    return False
+            return False
+
+    # Un pool de conexiones del tamaño de la concurrencia (el predeterminado es 1)
+    request = InstrumentedRequest(connection_pool_size=concurrency)
+    async with Bot(token=bot_token, base_url=settings.telegram_base_url, request=request) as bot:
+        return list(await asyncio.gather(*(send(bot, chat_id, text) for chat_id, text in messages)))
+
+
+@traced()
 def send_task_assignment_notification(task: Task, responsible: User, creator: User, db):
     """
     Envía notificación síncrona cuando se asigna una tarea.
@@ -336,6 +402,7 @@ def send_task_assignment_notification(task: Task, responsible: User, creator: Us
     import asyncio
     import os
     from telegram import Bot
+    from app.bot.telegram_request import InstrumentedRequest
 
     try:
         if not responsible.telegram_chat_id:
@@ -356,10 +423,9 @@ def send_task_assignment_notification(task: Task, responsible: User, creator: Us
 
         # Obtener nombre del proyecto
         project_name = "Sin proyecto"
-        if task.project_id:
-            project = db.query(Project).filter(Project.id == task.project_id).first()
-            if project:
-                project_name = project.name
+        project = loader(db, Project).load(task.project_id)
+        if project:
+            project_name = project.name
 
         message = (
             f"📋 <b>Nueva Tarea Asignada</b>\n\n"
@@ -386,7 +452,7 @@ def send_task_assignment_notification(task: Task, responsible: User, creator: Us
 
         # Crear bot y enviar mensaje de forma síncrona
         async def send():
-            bot = Bot(token=bot_token)
+            bot = Bot(token=bot_token, base_url=settings.telegram_base_url, request=InstrumentedRequest())
             await bot.send_message(
                 chat_id=responsible.telegram_chat_id,
                 text=message,
@@ -406,6 +472,7 @@ def send_task_assignment_notification(task: Task, responsible: User, creator: Us
         logger.error(f"Error al enviar notificación de tarea asignada: {str(e)}")
 
 
+@traced()
 def send_task_reassignment_notification(
     task: Task,
     old_responsible: Optional[User],
@@ -426,6 +493,7 @@ def send_task_reassignment_notification(
     import asyncio
     import os
     from telegram import Bot
+    from app.bot.telegram_request import InstrumentedRequest
 
     try:
         if not new_responsible.telegram_chat_id:
@@ -446,10 +514,9 @@ def send_task_reassignment_notification(
 
         # Obtener nombre del proyecto
         project_name = "Sin proyecto"
-        if task.project_id:
-            project = db.query(Project).filter(Project.id == task.project_id).first()
-            if project:
-                project_name = project.name
+        project = loader(db, Project).load(task.project_id)
+        if project:
+            project_name = project.name
 
         # Mensaje diferente si es reasignación o primera asignación
         if old_responsible:
@@ -486,7 +553,7 @@ def send_task_reassignment_notification(
 
         # Crear bot y enviar mensaje de forma síncrona
         async def send():
-            bot = Bot(token=bot_token)
+            bot = Bot(token=bot_token, base_url=settings.telegram_base_url, request=InstrumentedRequest())
             await bot.send_message(
                 chat_id=new_responsible.telegram_chat_id,
                 text=message,
@@ -504,3 +571,69 @@ def send_task_reassignment_notification(
 
     except Exception as e:
         logger.error(f"Error al enviar notificación de tarea reasignada: {str(e)}")
+
+
+@traced()
+def send_task_digest_notifications(digests: list[dict], assigned_by: str):
+    """
+    Envía un único mensaje por responsable con todas las tareas que se le asignaron
+    en una operación masiva (ej: importación CSV), en lugar de un mensaje por tarea.
+
+    Todos los envíos comparten una instancia del bot y un mismo event loop.
+
+    Args:
+        digests: Lista de dicts con chat_id, email y tasks (title, project_name, deadline)
+        assigned_by: Nombre del usuario que realizó la asignación
+    """
+    import asyncio
+    import os
+    from telegram import Bot
+    from app.bot.telegram_request import InstrumentedRequest
+
+    if not digests:
+        return
+
+    bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not bot_token:
+        logger.error("TELEGRAM_BOT_TOKEN no configurado")
+        return
+
+    def build_message(tasks: list[dict]) -> str:
+        message = (
+            f"📋 <b>{len(tasks)} Tarea(s) Nueva(s) Asignada(s)</b>\n\n"
+            f"👤 Asignadas por: {assigned_by}\n\n"
+        )
+
+        for task in tasks[:10]:  # Máximo 10 tareas
+            deadline_text = task['deadline'].strftime('%d/%m/%Y') if task['deadline'] else "Sin deadline"
+            message += (
+                f"• <b>{task['title']}</b>\n"
+                f"   📁 {task['project_name']} | 📅 {deadline_text}\n"
+            )
+
+        if len(tasks) > 10:
+            message += f"\n... y {len(tasks) - 10} tarea(s) más\n"
+
+        message += "\n💡 Usa /tareas para ver todas tus tareas."
+        return message
+
+    async def send_all():
+        bot = Bot(token=bot_token, base_url=settings.telegram_base_url, request=InstrumentedRequest())
+        for digest in digests:
+            try:
+                await bot.send_message(
+                    chat_id=digest['chat_id'],
+                    text=build_message(digest['tasks']),
+                    parse_mode='HTML'
+                )
+                logger.info(f"Resumen de tareas asignadas enviado a {digest['email']}")
+            except Exception as e:
+                logger.error(f"Error al enviar resumen de tareas asignadas a {digest['email']}: {str(e)}")
+
+    # Ejecutar en un nuevo event loop
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(send_all())
+    finally:
+        loop.close()
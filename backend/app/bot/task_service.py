@@ -5,7 +5,10 @@ import logging
 from datetime import datetime, timedelta
 from sqlalchemy import case
 from sqlalchemy.orm import joinedload
-from app.core.database import get_db_context
+from app.core import domain_events as events
+from app.core.database import get_db_context, get_read_db_context
+from app.core.replicas import bind_user
+from app.core.reference_data import reference_data
 from app.models.user import User
 from app.models.area import Area  # Importar Area para evitar error de mapper
 from app.models.task import Task, TaskStatus
@@ -28,18 +31,23 @@ class TaskService:
             dict con datos del usuario o None si no existe
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context() as db:
                 user = db.query(User).filter(User.telegram_chat_id == chat_id).first()
 
-                if not user:
-                    return None
+            if not user:
+                # Cuenta recién vinculada que la réplica aún no tiene
+                with get_db_context() as db:
+                    user = db.query(User).filter(User.telegram_chat_id == chat_id).first()
 
-                return {
-                    'id': user.id,
-                    'email': user.email,
-                    'full_name': user.full_name,
-                    'role': user.role
-                }
+            if not user:
+                return None
+
+            return {
+                'id': user.id,
+                'email': user.email,
+                'full_name': user.full_name,
+                'role': user.role
+            }
 
         except Exception as e:
             logger.error(f"Error al obtener usuario por chat_id: {e}")
@@ -59,7 +67,7 @@ class TaskService:
             Lista de tareas
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context(user_id) as db:
                 if user_role == 'administrador':
                     # Administrador: próximas tareas a vencer de todos
                     now = datetime.utcnow()
@@ -68,8 +76,7 @@ class TaskService:
                         Task.deadline.isnot(None),
                         Task.deadline >= now
                     ).options(
-                        joinedload(Task.project),
-                        joinedload(Task.responsible)
+                        joinedload(Task.project)
                     ).order_by(
                         Task.deadline.asc()
                     ).limit(15).all()
@@ -103,7 +110,7 @@ class TaskService:
             Lista de tareas
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context(user_id) as db:
                 today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
                 today_end = today_start + timedelta(days=1)
 
@@ -136,14 +143,13 @@ class TaskService:
             Lista de tareas
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context(user_id) as db:
                 if user_role == 'administrador':
                     # Administrador: todas las tareas sin empezar
                     tasks = db.query(Task).join(Project).filter(
                         Task.status == TaskStatus.SIN_EMPEZAR
                     ).options(
-                        joinedload(Task.project),
-                        joinedload(Task.responsible)
+                        joinedload(Task.project)
                     ).order_by(
                         case((Task.deadline.is_(None), 1), else_=0),
                         Task.deadline.asc(),
@@ -179,7 +185,7 @@ class TaskService:
             Lista de tareas
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context(user_id) as db:
                 today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
                 week_end = today + timedelta(days=7)
 
@@ -212,7 +218,7 @@ class TaskService:
             Lista de tareas
         """
         try:
-            with get_db_context() as db:
+            with get_read_db_context(user_id) as db:
                 now = datetime.utcnow()
 
                 if user_role == 'administrador':
@@ -221,8 +227,7 @@ class TaskService:
                         Task.deadline < now,
                         Task.status != TaskStatus.COMPLETADO
                     ).options(
-                        joinedload(Task.project),
-                        joinedload(Task.responsible)
+                        joinedload(Task.project)
                     ).order_by(
                         Task.deadline.asc(),
                         Task.priority.desc()
@@ -259,6 +264,9 @@ class TaskService:
         """
         try:
             with get_db_context() as db:
+                # Las siguientes lecturas del usuario verán este cambio
+                bind_user(db, user_id)
+
                 # Buscar tarea por ID completo o por los primeros 8 caracteres
                 if len(task_id) == 8:
                     task = db.query(Task).filter(
@@ -284,9 +292,19 @@ class TaskService:
                     }
 
                 # Completar tarea
+                old_status = task.status
                 task.status = TaskStatus.COMPLETADO
                 task.completed_at = datetime.utcnow()
 
+                # El aviso al dueño del proyecto lo envía el consumidor de eventos
+                events.emit(
+                    db, events.TASK_STATUS_CHANGED,
+                    task_id=task.id,
+                    project_id=task.project_id,
+                    old_status=TaskStatus(old_status).value,
+                    new_status=TaskStatus.COMPLETADO.value,
+                    actor_id=user_id,
+                )
                 db.commit()
 
                 logger.info(f"Tarea completada por bot: {task.id} por usuario {user_id}")
@@ -339,10 +357,8 @@ class TaskService:
                 TaskStatus.COMPLETADO: 'Completado'
             }.get(task.status, 'Sin Empezar')
 
-            # Obtener nombre del responsable (si está cargado)
-            responsible_name = None
-            if hasattr(task, 'responsible') and task.responsible:
-                responsible_name = task.responsible.full_name
+            # Nombre del responsable desde la caché de datos de referencia
+            responsible_name = reference_data.user_name(task.responsible_id)
 
             formatted_tasks.append({
                 'id': task.id,
@@ -0,0 +1,53 @@
+"""
+Cliente HTTP de la API de Telegram con métricas y trazas
+
+Todas las instancias de Bot (bot de comandos, notificaciones de la API, de
+los consumidores de eventos y de los workers) usan este cliente, así que la
+latencia y los errores de cada método (sendMessage, getUpdates...) se miden
+en un único punto, y cada llamada es un span de la traza en curso.
+"""
+import time
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from telegram.error import TimedOut
+from telegram.request import HTTPXRequest
+
+from app.core.metrics import TELEGRAM_REQUEST_DURATION, TELEGRAM_REQUESTS
+from app.core.tracing import tracer
+
+
+def _result(status_code: int) -> str:
+    """Clasificar el código HTTP de una respuesta de Telegram"""
+    if 200 <= status_code < 300:
+        return "ok"
+    if status_code == 429:
+        return "rate_limited"
+    if status_code < 500:
+        return "client_error"
+    return "server_error"
+
+
+class InstrumentedRequest(HTTPXRequest):
+    """HTTPXRequest que registra la duración, el resultado y el span de cada llamada"""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        with tracer.start_as_current_span(f"telegram {api_method}", kind=SpanKind.CLIENT) as span:
+            start = time.perf_counter()
+            try:
+                status_code, payload = await super().do_request(url, method, *args, **kwargs)
+            except TimedOut:
+                TELEGRAM_REQUESTS.labels(api_method, "timeout").inc()
+                raise
+            except Exception:
+                TELEGRAM_REQUESTS.labels(api_method, "network_error").inc()
+                raise
+            finally:
+                TELEGRAM_REQUEST_DURATION.labels(api_method).observe(time.perf_counter() - start)
+
+            result = _result(status_code)
+            TELEGRAM_REQUESTS.labels(api_method, result).inc()
+            span.set_attribute("http.status_code", status_code)
+            if result != "ok":
+                span.set_status(Status(StatusCode.ERROR, result))
+            return status_code, payload
@@ -0,0 +1,199 @@
+"""
+Publicación de cambios de tareas y proyectos en Redis pub/sub
+
+Cada commit que crea, modifica o elimina tareas o proyectos publica un evento
+por fila en el canal `sva:changes`. Los eventos son avisos ligeros (ids y
+alcance de visibilidad, sin el contenido): el stream en vivo de la API los
+filtra por usuario y el cliente obtiene los datos con `GET /tasks/changes`.
+
+Igual que las versiones de datos, se registra con eventos de la sesión de
+SQLAlchemy, por lo que publican por igual la API, el bot y los workers.
+"""
+import json
+import logging
+import time
+
+import redis
+from sqlalchemy import column, event, inspect, select, table
+from sqlalchemy.orm import Session, object_mapper, sessionmaker
+
+from app.core.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sva:changes"
+
+# Clave en session.info con los eventos pendientes de la transacción actual
+_PENDING_EVENTS = "pending_change_events"
+
+_projects = table("projects", column("id"), column("owner_id"), column("area_id"))
+
+
+def _previous(instance, attribute: str):
+    """Valor anterior de un atributo modificado en el flush (None si no cambió)"""
+    history = inspect(instance).attrs[attribute].history
+    if history.has_changes() and history.deleted:
+        return history.deleted[0]
+    return None
+
+
+def _build_event(instance, action: str):
+    """Construir el evento de una instancia de Task o Project (None para otros modelos)"""
+    table_name = object_mapper(instance).local_table.name
+
+    if table_name == "tasks":
+        return {
+            "entity": "task",
+            "action": action,
+            "id": instance.id,
+            "project_id": instance.project_id,
+            "responsible_id": instance.responsible_id,
+            "previous_responsible_id": _previous(instance, "responsible_id") if action == "updated" else None,
+            "created_by": instance.created_by,
+        }
+
+    if table_name == "projects":
+        return {
+            "entity": "project",
+            "action": action,
+            "id": instance.id,
+            "owner_id": instance.owner_id,
+            "area_id": instance.area_id,
+            "previous_owner_id": _previous(instance, "owner_id") if action == "updated" else None,
+            "previous_area_id": _previous(instance, "area_id") if action == "updated" else None,
+        }
+
+    return None
+
+
+def _record_flush(session: Session, flush_context):
+    """Anotar los eventos de las tareas y proyectos escritos en el flush"""
+    pending = session.info.setdefault(_PENDING_EVENTS, [])
+    changes = [(instance, "created") for instance in session.new]
+    changes += [
+        (instance, "updated") for instance in session.dirty
+        if session.is_modified(instance, include_collections=False)
+    ]
+    changes += [(instance, "deleted") for instance in session.deleted]
+
+    for instance, action in changes:
+        change = _build_event(instance, action)
+        if change:
+            pending.append(change)
+
+    _resolve_task_scopes(session, pending)
+
+
+def _record_bulk_statement(orm_execute_state):
+    """Anotar los eventos de tareas insertadas en bloque (ej: importación CSV)"""
+    if not orm_execute_state.is_insert:
+        return
+    target = getattr(orm_execute_state.statement, "table", None)
+    if target is None or target.name != "tasks":
+        return
+
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, dict):
+        parameters = [parameters]
+    if not parameters:
+        return
+
+    pending = orm_execute_state.session.info.setdefault(_PENDING_EVENTS, [])
+    for values in parameters:
+        pending.append({
+            "entity": "task",
+            "action": "created",
+            "id": values.get("id"),
+            "project_id": values.get("project_id"),
+            "responsible_id": values.get("responsible_id"),
+            "previous_responsible_id": None,
+            "created_by": values.get("created_by"),
+        })
+
+
+def _resolve_task_scopes(session: Session, pending: list[dict]):
+    """
+    Completar el dueño y el área del proyecto de los eventos de tareas
+
+    Se usan los proyectos presentes en la sesión (incluidos los recién
+    eliminados); el resto se lee con una sola consulta.
+    """
+    unresolved = [
+        change for change in pending
+        if change["entity"] == "task" and "owner_id" not in change
+    ]
+    if not unresolved:
+        return
+
+    scopes = {
+        instance.id: (instance.owner_id, instance.area_id)
+        for instance in list(session.identity_map.values()) + list(session.deleted)
+        if object_mapper(instance).local_table.name == "projects"
+    }
+    missing = {change["project_id"] for change in unresolved} - scopes.keys()
+    if missing:
+        rows = session.connection().execute(
+            select(_projects.c.id, _projects.c.owner_id, _projects.c.area_id)
+            .where(_projects.c.id.in_(missing))
+        )
+        scopes.update({row.id: (row.owner_id, row.area_id) for row in rows})
+
+    for change in unresolved:
+        change["owner_id"], change["area_id"] = scopes.get(change["project_id"], (None, None))
+
+
+def _resolve_before_commit(session: Session):
+    """Resolver los eventos de sentencias en bloque (no pasan por un flush)"""
+    pending = session.info.get(_PENDING_EVENTS)
+    if pending:
+        _resolve_task_scopes(session, pending)
+
+
+def _publish_after_commit(session: Session):
+    """Publicar los eventos anotados una vez confirmado el commit"""
+    pending = session.info.pop(_PENDING_EVENTS, None)
+    if pending:
+        publish_changes(pending)
+
+
+def _discard_after_rollback(session: Session):
+    """Descartar los eventos anotados si la transacción se revierte"""
+    session.info.pop(_PENDING_EVENTS, None)
+
+
+def track_change_feed(session_factory: sessionmaker):
+    """
+    Registrar los eventos que publican los cambios de tareas y proyectos
+
+    Args:
+        session_factory: sessionmaker cuyas sesiones deben publicar cambios
+    """
+    event.listen(session_factory, "after_flush", _record_flush)
+    event.listen(session_factory, "do_orm_execute", _record_bulk_statement)
+    event.listen(session_factory, "before_commit", _resolve_before_commit)
+    event.listen(session_factory, "after_commit", _publish_after_commit)
+    event.listen(session_factory, "after_rollback", _discard_after_rollback)
+
+
+def publish_changes(changes: list[dict]):
+    """
+    Publicar eventos de cambio en el canal de Redis
+
+    Si Redis no está disponible los eventos se pierden: los clientes en vivo
+    se recuperan con el siguiente `GET /tasks/changes`.
+
+    Args:
+        changes: Eventos a publicar
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    ts = time.time()
+    try:
+        pipe = client.pipeline(transaction=False)
+        for change in changes:
+            pipe.publish(CHANNEL, json.dumps({**change, "ts": ts}, default=str))
+        pipe.execute()
+    except redis.RedisError as e:
+        mark_unavailable(e)
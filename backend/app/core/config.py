@@ -1,9 +1,11 @@
 """
 Configuración central de la aplicación
 """
+from datetime import time
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 
 
 class Settings(BaseSettings):
@@ -18,14 +20,69 @@ class Settings(BaseSettings):
     MYSQL_HOST: str = "mysql"
     MYSQL_PORT: int = 3306
     MYSQL_USER: str = "sva_user"
-    MYSQL_PASSWORD: str
+    MYSQL_PASSWORD: Optional[str] = None  # Obligatoria salvo que se use DATABASE_URL
     MYSQL_DATABASE: str = "proyectos_sva_db"
+    DATABASE_URL: Optional[str] = None  # Reemplaza la URL construida (ej: sqlite:///primario.db)
+
+    # Pool de conexiones (ver app/core/db_pool.py)
+    PROCESS_ROLE: str = "api"  # api | bot | worker | events | beat | script
+    DB_POOL_SIZE: Optional[int] = None  # Reemplazan los valores del perfil del proceso
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_NULL_POOL: Optional[bool] = None  # Sin pool: una conexión por checkout
+    DB_POOL_RECYCLE: int = 1800  # Segundos; menor que wait_timeout de MySQL
+
+    # Perfilado SQL por petición (ver app/core/query_profiler.py)
+    SQL_PROFILER_ENABLED: bool = True
+    SQL_PROFILER_SAMPLE_RATE: float = 0.0  # Fracción de peticiones perfiladas (1.0 en desarrollo, ej: 0.05 en producción)
+    SQL_REPEATED_QUERY_THRESHOLD: int = 10  # Repeticiones de una consulta que se reportan como N+1
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SLOW_QUERIES: bool = False  # Registrar el EXPLAIN de las consultas lentas
+
+    # Métricas de Prometheus (ver app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+    METRICS_PORT: int = 9100  # Exportador HTTP del bot, los consumidores de eventos y los workers
+
+    # Trazas distribuidas (ver app/core/tracing.py)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "console"  # console | file (una línea JSON por span)
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0  # Fracción de trazas nuevas registradas
+
+    # Réplicas de lectura (lista JSON de URLs; vacía = todo va al primario)
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Réplicas más atrasadas no reciben lecturas
+    REPLICA_LAG_CHECK_SECONDS: float = 1.0  # Intervalo del latido de replicación
+    REPLICA_STICKY_SECONDS: float = 10.0  # Lecturas al primario tras escribir (> retraso máximo)
 
     # Redis
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # Segundos; Redis es opcional en el camino de las peticiones
+
+    # Respuestas condicionales (ETag / Last-Modified) en listados y detalles
+    CONDITIONAL_GET_ENABLED: bool = True
+
+    # Sincronización incremental de tareas (GET /tasks/changes)
+    TASK_SYNC_OVERLAP_SECONDS: int = 5  # Margen para commits que terminan después de leer
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30  # Tokens más antiguos requieren recarga completa
+
+    # Stream en vivo de cambios (GET /stream)
+    STREAM_HEARTBEAT_SECONDS: int = 15  # Comentario keep-alive para proxies
+    STREAM_QUEUE_SIZE: int = 200  # Eventos en cola por conexión antes de pedir resincronización
+
+    # Caché en memoria de áreas y usuarios (invalidada por pub/sub)
+    REFERENCE_DATA_CHECK_SECONDS: int = 30  # Comparación periódica de versiones con Redis
+
+    # Eventos de dominio (Redis Streams, ver app/core/domain_events.py)
+    EVENT_STREAM_MAXLEN: int = 100000  # Longitud aproximada máxima del stream
+    EVENT_CONSUMER_BLOCK_MS: int = 5000  # Espera de XREADGROUP sin mensajes
+    EVENT_CLAIM_IDLE_SECONDS: int = 60  # Mensajes sin confirmar que se reintentan
+    EVENT_MAX_DELIVERIES: int = 5  # Intentos antes de mover a sva:events:dead
+    EVENT_OUTBOX_RELAY_SECONDS: int = 5  # Intervalo del relay que publica los eventos que quedaron en el outbox
+    EVENT_OUTBOX_GRACE_SECONDS: int = 30  # Antigüedad mínima para el relay (los recientes los publica quien los emitió)
 
     # JWT y Seguridad
     SECRET_KEY: str
@@ -35,6 +92,7 @@ class Settings(BaseSettings):
     # Telegram
     TELEGRAM_BOT_TOKEN: str
     TELEGRAM_WEBHOOK_URL: Optional[str] = None  # Para producción
+    TELEGRAM_API_URL: str = "https://api.telegram.org"  # Otro servidor: Bot API local o el falso de benchmarks/fake_telegram.py
 
     # Celery
     CELERY_BROKER_URL: Optional[str] = None
@@ -47,6 +105,59 @@ class Settings(BaseSettings):
     # Configuración de recordatorios
     DEFAULT_REMINDER_HOURS: int = 24
 
+    # Resúmenes diarios y semanales (un chord de shards por rango de usuarios)
+    DEFAULT_TIMEZONE: str = "America/Guatemala"  # Zona de los usuarios nuevos y de los horarios de Celery beat
+    DEFAULT_DIGEST_TIME: str = "08:00"  # Hora local del resumen diario de los usuarios nuevos
+    WEEKLY_DIGEST_DELAY_MINUTES: int = 60  # El semanal sale los lunes este tiempo después de la hora del diario
+    DIGEST_RENDER_LEAD_MINUTES: int = 120  # Preparación de los mensajes antes de la hora de envío
+    DIGEST_CATCH_UP_MINUTES: int = 15  # Envíos atrasados (beat detenido) que aún se lanzan
+    DIGEST_JITTER_SECONDS: int = 300  # Ventana en que se reparten los shards de un horario con muchos usuarios
+    DIGEST_SHARD_SIZE: int = 500  # Usuarios por shard; los shards se reparten entre los workers
+    DIGEST_SEND_CONCURRENCY: int = 10  # Mensajes en vuelo por shard o recordatorios (Telegram admite ~30 msg/s por bot)
+
+    # Envíos masivos reanudables (app/workers/checkpoints.py)
+    JOB_CHECKPOINT_BATCH: int = 100  # Destinatarios por lote entre checkpoints
+    JOB_RUN_RETENTION_DAYS: int = 14  # Checkpoints, claves de idempotencia y resúmenes preparados que se conservan
+
+    @field_validator("PROCESS_ROLE")
+    @classmethod
+    def validate_process_role(cls, v: str) -> str:
+        roles = ("api", "bot", "worker", "events", "beat", "script")
+        if v not in roles:
+            raise ValueError(f"PROCESS_ROLE debe ser uno de: {', '.join(roles)}")
+        return v
+
+    @field_validator("DEFAULT_TIMEZONE")
+    @classmethod
+    def validate_default_timezone(cls, v: str) -> str:
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"DEFAULT_TIMEZONE no es una zona horaria válida: {v}")
+        return v
+
+    @field_validator("DEFAULT_DIGEST_TIME")
+    @classmethod
+    def validate_default_digest_time(cls, v: str) -> str:
+        try:
+            time.fromisoformat(v)
+        except ValueError:
+            raise ValueError("DEFAULT_DIGEST_TIME debe tener el formato HH:MM")
+        return v
+
+    @model_validator(mode="after")
+    def validate_database(self) -> "Settings":
+        if self.DATABASE_URL is None and self.MYSQL_PASSWORD is None:
+            raise ValueError("Se requiere MYSQL_PASSWORD (o DATABASE_URL)")
+        return self
+
+    @field_validator("TRACING_EXPORTER")
+    @classmethod
+    def validate_tracing_exporter(cls, v: str) -> str:
+        if v not in ("console", "file"):
+            raise ValueError("TRACING_EXPORTER debe ser 'console' o 'file'")
+        return v
+
     @field_validator("CELERY_BROKER_URL", mode="before")
     @classmethod
     def build_celery_broker(cls, v: Optional[str], info) -> str:
@@ -77,13 +188,25 @@ class Settings(BaseSettings):
 
     @property
     def database_url(self) -> str:
-        """Construir URL de conexión a MySQL"""
+        """Construir URL de conexión a MySQL (o usar DATABASE_URL si está definida)"""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return (
             f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}"
             f"@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
             f"?charset=utf8mb4"
         )
 
+    @property
+    def telegram_base_url(self) -> str:
+        """URL base de los métodos de la API de bots (se le agrega el token)"""
+        return f"{self.TELEGRAM_API_URL.rstrip('/')}/bot"
+
+    @property
+    def telegram_base_file_url(self) -> str:
+        """URL base de descarga de archivos de la API de bots"""
+        return f"{self.TELEGRAM_API_URL.rstrip('/')}/file/bot"
+
     @property
     def redis_url(self) -> str:
         """Construir URL de conexión a Redis"""
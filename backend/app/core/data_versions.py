@@ -0,0 +1,302 @@
+"""
+Versiones de datos por tabla mantenidas en Redis
+
+Cada commit que modifica filas incrementa el contador de las tablas afectadas
+(`sva:data_version:<tabla>`) y guarda el instante del cambio. Los validadores
+HTTP (ETag / Last-Modified) se construyen a partir de estas versiones, por lo
+que comprobar si un listado cambió cuesta una lectura de Redis en lugar de
+reconstruir la respuesta.
+
+Las tablas filtradas por visibilidad (tareas y proyectos) llevan además un
+contador por alcance: `sva:data_version:<tabla>:user:<id>` para cada usuario
+que ve la fila (dueño del proyecto, responsable, creador) y
+`sva:data_version:<tabla>:area:<id>` para el supervisor de su área. Así una
+escritura solo invalida los validadores de quien ve la fila. Las sentencias
+en bloque, cuyas filas no se conocen, incrementan `<tabla>:all`, que forma
+parte del validador de todos los usuarios.
+
+El registro se hace con eventos de la sesión de SQLAlchemy, así que cubre por
+igual a la API, el bot y los workers de Celery.
+"""
+import json
+import logging
+import time
+import uuid
+from typing import Optional
+
+import redis
+from sqlalchemy import column, event, inspect, select, table
+from sqlalchemy.orm import Session, object_mapper, sessionmaker
+
+from app.core.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "sva:data_version:"
+EPOCH_KEY = f"{KEY_PREFIX}epoch"
+
+# Canal pub/sub donde se anuncian las tablas modificadas en cada commit
+# (invalidación de las cachés en memoria, ver app/core/reference_data.py)
+VERSIONS_CHANNEL = "sva:data_versions"
+
+# Vida máxima de una época: acota cuánto puede durar un validador obsoleto si
+# se pierde algún incremento (ej: Redis caído durante un commit)
+EPOCH_TTL_SECONDS = 24 * 60 * 60
+
+# Tablas con contadores por alcance de visibilidad
+SCOPED_TABLES = ("tasks", "projects")
+
+# Alcance de los cambios que no se pueden atribuir a filas concretas
+ALL_SCOPE = "all"
+
+# Clave en session.info con las tablas modificadas en la transacción actual
+_CHANGED_TABLES = "changed_tables"
+
+# Clave en session.info con los (tabla, alcance) modificados en la transacción actual
+_CHANGED_SCOPES = "changed_scopes"
+
+_projects = table("projects", column("id"), column("owner_id"))
+_tasks = table("tasks", column("project_id"), column("responsible_id"), column("created_by"))
+
+# True si este proceso no pudo registrar algún cambio: la época debe rotarse
+_lost_bump = False
+
+
+def _cascaded_tables(instance) -> set[str]:
+    """Tablas que se borran en cascada junto con la instancia (ej: tareas de un proyecto)"""
+    tables = set()
+    for relationship in object_mapper(instance).relationships:
+        if relationship.cascade.delete:
+            tables.add(relationship.mapper.local_table.name)
+    return tables
+
+
+def _values(instance, attribute: str) -> set:
+    """Valor actual y anterior (si cambió en el flush) de un atributo, sin None"""
+    history = inspect(instance).attrs[attribute].history
+    if history.has_changes():
+        values = set(history.added) | set(history.deleted)
+    else:
+        values = {getattr(instance, attribute)}
+    return values - {None}
+
+
+def _project_owners(session: Session, project_ids: set[str]) -> dict[str, str]:
+    """Dueño de cada proyecto: de la sesión (incluidos los eliminados) o de una sola consulta"""
+    owners = {
+        instance.id: instance.owner_id
+        for instance in list(session.identity_map.values()) + list(session.deleted)
+        if object_mapper(instance).local_table.name == "projects"
+    }
+    missing = project_ids - owners.keys()
+    if missing:
+        rows = session.connection().execute(
+            select(_projects.c.id, _projects.c.owner_id).where(_projects.c.id.in_(missing))
+        )
+        owners.update({row.id: row.owner_id for row in rows})
+    return owners
+
+
+def _row_scopes(session: Session, instances: list) -> set[tuple[str, str]]:
+    """
+    Alcances que ven las tareas y proyectos escritos, antes o después del cambio
+
+    Replica las reglas de app/core/visibility.py: una tarea la ven el dueño de
+    su proyecto, su responsable, su creador y el supervisor de su área; un
+    proyecto, su dueño, el supervisor de su área y los responsables y
+    creadores de sus tareas. Un cambio en una tarea también cambia su proyecto
+    para todos ellos (los listados de proyectos incluyen sus estadísticas).
+    """
+    tasks = [i for i in instances if object_mapper(i).local_table.name == "tasks"]
+    projects = [i for i in instances if object_mapper(i).local_table.name == "projects"]
+
+    task_users, task_areas, task_project_ids = set(), set(), set()
+    for task in tasks:
+        task_users |= _values(task, "responsible_id") | _values(task, "created_by")
+        task_areas |= _values(task, "area_id")
+        task_project_ids |= _values(task, "project_id")
+    if task_project_ids:
+        owners = _project_owners(session, task_project_ids)
+        task_users |= {owners.get(project_id) for project_id in task_project_ids} - {None}
+
+    project_users, project_areas = set(task_users), set(task_areas)
+    for project in projects:
+        project_users |= _values(project, "owner_id")
+        project_areas |= _values(project, "area_id")
+
+    # Responsables y creadores de las tareas de los proyectos afectados
+    project_ids = task_project_ids | {project.id for project in projects if project not in session.new}
+    if project_ids:
+        rows = session.connection().execute(
+            select(_tasks.c.responsible_id, _tasks.c.created_by)
+            .where(_tasks.c.project_id.in_(project_ids)).distinct()
+        )
+        project_users |= {user_id for row in rows for user_id in row if user_id}
+
+    scopes = {("tasks", f"user:{user_id}") for user_id in task_users}
+    scopes |= {("tasks", f"area:{area_id}") for area_id in task_areas}
+    scopes |= {("projects", f"user:{user_id}") for user_id in project_users}
+    scopes |= {("projects", f"area:{area_id}") for area_id in project_areas}
+    return scopes
+
+
+def _record_flush(session: Session, flush_context):
+    """Anotar las tablas y los alcances de las instancias nuevas, modificadas o eliminadas"""
+    changed = session.info.setdefault(_CHANGED_TABLES, set())
+    scoped = []
+    for instance in session.new | session.dirty | session.deleted:
+        table_name = object_mapper(instance).local_table.name
+        changed.add(table_name)
+        if table_name in SCOPED_TABLES:
+            scoped.append(instance)
+    for instance in session.deleted:
+        changed.update(_cascaded_tables(instance))
+
+    if scoped:
+        session.info.setdefault(_CHANGED_SCOPES, set()).update(_row_scopes(session, scoped))
+
+
+def _record_bulk_statement(orm_execute_state):
+    """Anotar la tabla de sentencias INSERT/UPDATE/DELETE ejecutadas en bloque"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            info = orm_execute_state.session.info
+            info.setdefault(_CHANGED_TABLES, set()).add(table.name)
+            if table.name in SCOPED_TABLES:
+                # Filas desconocidas: cambian los validadores de todos
+                info.setdefault(_CHANGED_SCOPES, set()).add((table.name, ALL_SCOPE))
+
+
+def _publish_after_commit(session: Session):
+    """Incrementar las versiones de las tablas modificadas una vez confirmado el commit"""
+    changed = session.info.pop(_CHANGED_TABLES, None)
+    scopes = session.info.pop(_CHANGED_SCOPES, None)
+    if changed:
+        bump_versions(changed, scopes or set())
+
+
+def _discard_after_rollback(session: Session):
+    """Descartar las tablas anotadas si la transacción se revierte"""
+    session.info.pop(_CHANGED_TABLES, None)
+    session.info.pop(_CHANGED_SCOPES, None)
+
+
+def track_data_versions(session_factory: sessionmaker):
+    """
+    Registrar los eventos que mantienen las versiones de datos
+
+    Args:
+        session_factory: sessionmaker cuyas sesiones deben notificar cambios
+    """
+    event.listen(session_factory, "after_flush", _record_flush)
+    event.listen(session_factory, "do_orm_execute", _record_bulk_statement)
+    event.listen(session_factory, "after_commit", _publish_after_commit)
+    event.listen(session_factory, "after_rollback", _discard_after_rollback)
+
+
+def bump_versions(tables: set[str], scopes: set[tuple[str, str]] = frozenset()):
+    """
+    Incrementar la versión de las tablas y de los alcances indicados
+
+    Args:
+        tables: Nombres de tabla modificados
+        scopes: (tabla, alcance) modificados, ej: ("tasks", "user:<id>")
+    """
+    global _lost_bump
+
+    client = get_redis()
+    if client is None:
+        _lost_bump = True
+        return
+
+    now = time.time()
+    try:
+        pipe = client.pipeline(transaction=False)
+        if _lost_bump:
+            # Invalidar todos los validadores emitidos: hubo cambios sin registrar
+            pipe.delete(EPOCH_KEY)
+        keys = [f"{KEY_PREFIX}{table_name}" for table_name in sorted(tables)]
+        keys += [f"{KEY_PREFIX}{table_name}:{scope}" for table_name, scope in sorted(scopes)]
+        for key in keys:
+            pipe.hincrby(key, "v", 1)
+            pipe.hset(key, "ts", now)
+        pipe.publish(VERSIONS_CHANNEL, json.dumps(sorted(tables)))
+        pipe.execute()
+        _lost_bump = False
+    except redis.RedisError as e:
+        _lost_bump = True
+        mark_unavailable(e)
+
+
+def version_keys(table_name: str, scope=None) -> list[str]:
+    """
+    Claves de Redis que determinan la versión de una tabla para un alcance
+
+    Args:
+        table_name: Nombre de tabla
+        scope: VisibilityScope del usuario (None o administrador: la tabla completa)
+
+    Returns:
+        Claves cuyas versiones se suman
+    """
+    if scope is None or scope.is_admin or table_name not in SCOPED_TABLES:
+        return [f"{KEY_PREFIX}{table_name}"]
+    keys = [f"{KEY_PREFIX}{table_name}:{ALL_SCOPE}", f"{KEY_PREFIX}{table_name}:user:{scope.user_id}"]
+    if scope.supervised_area_id:
+        keys.append(f"{KEY_PREFIX}{table_name}:area:{scope.supervised_area_id}")
+    return keys
+
+
+def get_versions(tables: tuple[str, ...], scope=None) -> Optional[tuple[str, dict[str, tuple[int, float]]]]:
+    """
+    Leer la versión y el instante del último cambio de cada tabla
+
+    Las versiones se acompañan de una época aleatoria que se regenera si Redis
+    pierde sus datos; así un contador reiniciado nunca reutiliza un ETag antiguo.
+
+    Con un alcance, la versión de las tablas de SCOPED_TABLES es la suma de sus
+    contadores (ver `version_keys`): solo cambia con las filas que ve el usuario.
+
+    Args:
+        tables: Nombres de tabla
+        scope: VisibilityScope del usuario (opcional)
+
+    Returns:
+        (época, dict tabla -> (versión, timestamp)) o None si Redis no está disponible
+    """
+    global _lost_bump
+
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        if _lost_bump:
+            client.delete(EPOCH_KEY)
+            _lost_bump = False
+
+        pipe = client.pipeline(transaction=False)
+        pipe.get(EPOCH_KEY)
+        table_keys = [version_keys(table_name, scope) for table_name in tables]
+        for keys in table_keys:
+            for key in keys:
+                pipe.hmget(key, "v", "ts")
+        epoch, *results = pipe.execute()
+
+        if epoch is None:
+            client.set(EPOCH_KEY, uuid.uuid4().hex, nx=True, ex=EPOCH_TTL_SECONDS)
+            epoch = client.get(EPOCH_KEY)
+    except redis.RedisError as e:
+        mark_unavailable(e)
+        return None
+
+    versions = {}
+    results = iter(results)
+    for table_name, keys in zip(tables, table_keys):
+        values = [next(results) for _ in keys]
+        versions[table_name] = (
+            sum(int(version or 0) for version, _ in values),
+            max(float(ts or 0) for _, ts in values),
+        )
+    return epoch, versions
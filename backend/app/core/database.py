@@ -2,34 +2,65 @@
 Configuración de la base de datos y sesiones SQLAlchemy
 """
 from contextlib import contextmanager
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, Optional
 
 from app.core.config import settings
+from app.core.change_feed import track_change_feed
+from app.core.data_versions import track_data_versions
+from app.core.db_pool import engine_options, register_engine
+from app.core.domain_events import track_domain_events
+from app.core.replicas import READ_ONLY, RoutingSession, bind_user, replicas, track_replica_routing
+from app.core.tracing import track_commits
 
-# Engine de SQLAlchemy
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,  # Verificar conexión antes de usar
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.DEBUG,  # Log SQL queries en modo debug
-)
+# Opciones comunes del primario y las réplicas: pool según el tipo de proceso
+ENGINE_OPTIONS = engine_options()
+
+# Engine de SQLAlchemy (primario)
+engine = create_engine(settings.database_url, **ENGINE_OPTIONS)
+register_engine("primary", engine)
+
+# Réplicas de lectura (ver app/core/replicas.py)
+replicas.configure(engine, settings.DATABASE_REPLICA_URLS, **ENGINE_OPTIONS)
+
+# Métodos HTTP cuyas peticiones pueden leer de una réplica
+READ_METHODS = {"GET", "HEAD"}
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+# Enviar a las réplicas las lecturas de las sesiones de solo lectura
+track_replica_routing(SessionLocal)
+
+# Versionar en Redis las tablas modificadas en cada commit (validadores HTTP)
+track_data_versions(SessionLocal)
+
+# Publicar en Redis pub/sub los cambios de tareas y proyectos (stream en vivo)
+track_change_feed(SessionLocal)
+
+# Agregar al stream de eventos de dominio los emitidos en cada commit
+track_domain_events(SessionLocal)
+
+# Spans de los commits (las sentencias SQL se trazan a nivel de engine)
+track_commits(SessionLocal)
 
 # Base para modelos
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
     """
     Dependency para obtener sesión de base de datos.
     Se usa en endpoints de FastAPI.
 
+    Las peticiones GET/HEAD leen de una réplica si hay alguna al día.
+
+    Args:
+        request: Petición actual
+
     Yields:
         Session: Sesión de SQLAlchemy
 
@@ -39,6 +70,47 @@ def get_db() -> Generator[Session, None, None]:
             return db.query(Item).all()
     """
     db = SessionLocal()
+    if request.method in READ_METHODS:
+        db.info[READ_ONLY] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def read_session(user_id: Optional[str] = None) -> Session:
+    """
+    Crear una sesión de solo lectura (réplica si hay alguna al día)
+
+    Si la sesión llega a escribir, la escritura y las lecturas posteriores
+    de la misma transacción van al primario.
+
+    Args:
+        user_id: Usuario cuyas escrituras recientes deben verse (opcional)
+
+    Returns:
+        Session: Sesión de SQLAlchemy
+    """
+    db = SessionLocal()
+    db.info[READ_ONLY] = True
+    if user_id:
+        bind_user(db, user_id)
+    return db
+
+
+@contextmanager
+def get_read_db_context(user_id: Optional[str] = None):
+    """
+    Context manager de una sesión de solo lectura (ver `read_session()`).
+    Se usa en lecturas del bot, exportaciones y barridos de los workers.
+
+    Args:
+        user_id: Usuario cuyas escrituras recientes deben verse (opcional)
+
+    Yields:
+        Session: Sesión de SQLAlchemy
+    """
+    db = read_session(user_id)
     try:
         yield db
     finally:
@@ -0,0 +1,238 @@
+"""
+Perfiles del pool de conexiones por tipo de proceso y telemetría del pool
+
+La API, el bot, los workers de Celery (un proceso por hijo prefork), Celery
+Beat y los consumidores de eventos importan el mismo `app.core.database`. Un
+pool único de 10+20 conexiones por proceso multiplica las conexiones contra
+max_connections de MySQL, así que cada proceso elige un perfil según
+PROCESS_ROLE:
+
+- api: peticiones síncronas en el threadpool de uvicorn
+- bot: comandos atendidos de uno en uno
+- worker: una tarea a la vez por hijo prefork
+- events: un hilo por grupo de consumidores
+- beat: no usa la BD (NullPool: solo conecta si algo la consulta)
+- script: procesos cortos (importación, init_db) con NullPool
+
+La vida de las conexiones se controla con pool_recycle (menor que
+wait_timeout de MySQL y que el timeout de los proxies) en lugar de un
+`SELECT 1` en cada checkout; si aun así una conexión muerta falla, SQLAlchemy
+invalida el pool y la siguiente petición conecta de nuevo.
+
+Los engines registrados se descartan (sin cerrar las conexiones del padre)
+en los procesos hijos tras un fork, y cada pool registra la espera en el
+checkout, los timeouts y las conexiones de overflow (ver `pool_stats()`).
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """Tamaño del pool de un tipo de proceso"""
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float  # Segundos de espera por una conexión antes de fallar
+    null_pool: bool = False
+
+
+PROFILES = {
+    "api": PoolProfile(pool_size=10, max_overflow=10, pool_timeout=10),
+    "bot": PoolProfile(pool_size=3, max_overflow=2, pool_timeout=10),
+    "worker": PoolProfile(pool_size=2, max_overflow=1, pool_timeout=30),
+    "events": PoolProfile(pool_size=2, max_overflow=2, pool_timeout=30),
+    "beat": PoolProfile(pool_size=0, max_overflow=0, pool_timeout=30, null_pool=True),
+    "script": PoolProfile(pool_size=0, max_overflow=0, pool_timeout=30, null_pool=True),
+}
+
+# Límites (segundos) del histograma de espera en el checkout
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def current_profile() -> PoolProfile:
+    """
+    Perfil del proceso actual con los reemplazos de la configuración
+
+    Returns:
+        PoolProfile según PROCESS_ROLE y las variables DB_*
+    """
+    profile = PROFILES[settings.PROCESS_ROLE]
+    return PoolProfile(
+        pool_size=settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else profile.pool_size,
+        max_overflow=settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else profile.max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT if settings.DB_POOL_TIMEOUT is not None else profile.pool_timeout,
+        null_pool=settings.DB_NULL_POOL if settings.DB_NULL_POOL is not None else profile.null_pool,
+    )
+
+
+def engine_options() -> dict:
+    """
+    Opciones de create_engine del proceso actual (primario y réplicas)
+
+    Returns:
+        dict con poolclass y sus parámetros
+    """
+    profile = current_profile()
+    options = dict(
+        pool_pre_ping=False,  # Liveness con pool_recycle
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=settings.DEBUG,  # Log SQL queries en modo debug
+    )
+    if profile.null_pool:
+        options["poolclass"] = InstrumentedNullPool
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+            pool_timeout=profile.pool_timeout,
+        )
+    return options
+
+
+# ==============================================================================
+# Telemetría
+# ==============================================================================
+
+
+class PoolStats:
+    """Contadores de checkout de un pool (acumulados desde su creación)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_created = 0  # Conexiones abiertas por encima de pool_size
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # Por intervalo; el último es +Inf
+
+    def record_checkout(self, wait: float, overflow_created: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.overflow_created += overflow_created
+            self.wait_seconds_sum += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, wait)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+
+class _InstrumentedPool:
+    """Mide la espera de cada checkout del pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        before = getattr(self, "_overflow", 0)
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        after = getattr(self, "_overflow", 0)
+        self.stats.record_checkout(time.perf_counter() - start, after > max(before, 0))
+        return connection
+
+    def _do_return_conn(self, record):
+        self.stats.record_checkin()
+        super()._do_return_conn(record)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """QueuePool con telemetría de checkout"""
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    """NullPool con telemetría de checkout (cada checkout abre una conexión)"""
+
+
+# Engines del proceso por nombre (primario y réplicas)
+_engines: dict[str, Engine] = {}
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    """
+    Registrar un engine para la telemetría y el descarte tras un fork
+
+    Args:
+        name: Nombre con el que se reporta (ej: "primary")
+        engine: Engine de SQLAlchemy
+    """
+    _engines[name] = engine
+
+
+def pool_stats() -> list[dict]:
+    """
+    Estado y contadores del pool de cada engine registrado
+
+    Returns:
+        Lista de dicts (uno por engine) con tamaño, uso, saturación, espera
+        en el checkout, timeouts y conexiones de overflow
+    """
+    profile = current_profile()
+    result = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        stats: Optional[PoolStats] = getattr(pool, "stats", None)
+        if stats is None:
+            continue
+        capacity = None if profile.null_pool else profile.pool_size + profile.max_overflow
+        result.append({
+            "engine": name,
+            "pool_class": type(pool).__name__,
+            "pool_size": None if profile.null_pool else profile.pool_size,
+            "max_overflow": None if profile.null_pool else profile.max_overflow,
+            "checked_out": stats.checked_out,
+            "peak_checked_out": stats.peak_checked_out,
+            "overflow": max(pool.overflow(), 0) if isinstance(pool, QueuePool) else 0,
+            "saturation": stats.checked_out / capacity if capacity else None,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "overflow_created": stats.overflow_created,
+            "wait_seconds_sum": stats.wait_seconds_sum,
+            "wait_seconds_max": stats.wait_seconds_max,
+            # Conteo por intervalo; la clave es su límite superior
+            "wait_buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], stats.wait_buckets)),
+        })
+    return result
+
+
+# ==============================================================================
+# Fork
+# ==============================================================================
+
+
+def _dispose_after_fork() -> None:
+    """Olvidar en el hijo las conexiones heredadas sin cerrarlas (siguen siendo del padre)"""
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
@@ -0,0 +1,288 @@
+"""
+Bus de eventos de dominio sobre Redis Streams
+
+Los endpoints (y el bot) solo anotan lo que ocurrió —tarea creada, reasignada,
+cambio de estado, proyecto archivado...— y responden. Los efectos secundarios
+(notificaciones de Telegram, contadores) los ejecutan consumidores
+independientes, cada uno con su grupo de consumidores sobre el stream
+`sva:events` (ver app/workers/event_consumer.py).
+
+Los eventos anotados con `emit()` se guardan en `domain_event_outbox` dentro
+de la misma transacción (se descartan si se revierte) y, después del commit,
+se agregan al stream y se borran del outbox. Si Redis no está disponible o
+el proceso termina antes de publicarlos, quedan en el outbox y los publica
+el relay de los consumidores (`relay_outbox`): una notificación no se
+pierde, aunque un evento se puede publicar dos veces.
+
+Cada mensaje lleva el contexto de traza de quien lo emitió (campo `trace`),
+así el consumidor continúa la misma traza (ver app/core/tracing.py).
+"""
+import json
+import logging
+import time
+import uuid
+from typing import Optional
+
+import redis
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, mark_unavailable
+from app.core.tracing import inject_context
+
+logger = logging.getLogger(__name__)
+
+STREAM = "sva:events"
+
+# Tipos de evento
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_REASSIGNED = "task.reassigned"
+TASK_STATUS_CHANGED = "task.status_changed"
+TASK_DELETED = "task.deleted"
+TASK_ARCHIVED = "task.archived"
+TASK_UNARCHIVED = "task.unarchived"
+TASKS_IMPORTED = "tasks.imported"
+PROJECT_CREATED = "project.created"
+PROJECT_UPDATED = "project.updated"
+PROJECT_DELETED = "project.deleted"
+PROJECT_ARCHIVED = "project.archived"
+PROJECT_UNARCHIVED = "project.unarchived"
+
+# Clave en session.info con los eventos pendientes de la transacción actual
+_PENDING_EVENTS = "pending_domain_events"
+
+# Clave en session.info con los ids del outbox de los eventos pendientes
+_OUTBOX_IDS = "domain_event_outbox_ids"
+
+
+def emit(db: Session, event_type: str, **data) -> None:
+    """
+    Anotar un evento para publicarlo cuando la sesión confirme el commit
+
+    Args:
+        db: Sesión cuya transacción produce el evento
+        event_type: Tipo de evento (ej: TASK_CREATED)
+        **data: Datos del evento (ids y valores serializables a JSON)
+    """
+    # El contexto de traza se toma al emitir: el commit puede ocurrir fuera del span
+    db.info.setdefault(_PENDING_EVENTS, []).append((event_type, data, inject_context()))
+
+
+def publish(event_type: str, **data) -> Optional[str]:
+    """
+    Publicar un evento de inmediato (para cambios ya confirmados)
+
+    Args:
+        event_type: Tipo de evento
+        **data: Datos del evento
+
+    Returns:
+        Id del mensaje en el stream o None si quedó en el outbox
+    """
+    events = [(event_type, data, inject_context())]
+    ids = publish_events(events)
+    if ids:
+        return ids[0]
+
+    # El cambio ya está confirmado: el evento queda en el outbox para el relay
+    from app.core.database import engine
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(_outbox_model()), _outbox_rows(events))
+    except SQLAlchemyError as e:
+        logger.error(f"No se pudo guardar el evento {event_type} en el outbox: {e}")
+    return None
+
+
+def publish_events(events: list[tuple[str, dict, dict]]) -> list[str]:
+    """
+    Agregar eventos al stream en un solo round-trip
+
+    Si Redis no está disponible no se publica nada (se registra en el log):
+    el llamador los deja en el outbox.
+
+    Args:
+        events: Lista de (tipo, datos, contexto de traza)
+
+    Returns:
+        Ids de los mensajes agregados (vacía si no se pudo publicar)
+    """
+    ts = time.time()
+    return _xadd([_fields(event_type, data, trace_context, ts) for event_type, data, trace_context in events])
+
+
+def relay_outbox(limit: int = 100) -> int:
+    """
+    Publicar un lote de eventos que quedaron en el outbox
+
+    Solo toma los eventos con más de EVENT_OUTBOX_GRACE_SECONDS, para no
+    competir con la publicación normal después del commit. Las filas se
+    bloquean (SKIP LOCKED) hasta borrarlas: varios relays no publican el
+    mismo evento.
+
+    Args:
+        limit: Eventos por lote
+
+    Returns:
+        Eventos publicados (0 si no hay o Redis no está disponible)
+    """
+    from app.core.database import engine
+
+    outbox = _outbox_model()
+    cutoff = time.time() - settings.EVENT_OUTBOX_GRACE_SECONDS
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(outbox).where(outbox.created_at < cutoff)
+            .order_by(outbox.created_at).limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            return 0
+
+        fields = []
+        for row in rows:
+            entry = {"type": row.type, "ts": row.created_at, "data": row.data}
+            if row.trace:
+                entry["trace"] = row.trace
+            fields.append(entry)
+        if not _xadd(fields):
+            return 0
+        conn.execute(delete(outbox).where(outbox.id.in_([row.id for row in rows])))
+
+    logger.info(f"{len(rows)} evento(s) de dominio publicados desde el outbox")
+    return len(rows)
+
+
+def _fields(event_type: str, data: dict, trace_context: dict, ts: float) -> dict:
+    """Campos del mensaje del stream de un evento"""
+    fields = {"type": event_type, "ts": ts, "data": json.dumps(data, default=str)}
+    if trace_context:
+        fields["trace"] = json.dumps(trace_context)
+    return fields
+
+
+def _xadd(entries: list[dict]) -> list[str]:
+    """
+    Agregar mensajes al stream en un solo round-trip
+
+    Returns:
+        Ids de los mensajes agregados (vacía si Redis no está disponible)
+    """
+    client = get_redis()
+    if client is None:
+        logger.warning(f"Redis no disponible: {len(entries)} evento(s) de dominio quedan en el outbox")
+        return []
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for fields in entries:
+            pipe.xadd(
+                STREAM,
+                fields,
+                maxlen=settings.EVENT_STREAM_MAXLEN,
+                approximate=True,
+            )
+        return pipe.execute()
+    except redis.RedisError as e:
+        mark_unavailable(e)
+        logger.error(f"No se pudieron publicar {len(entries)} evento(s) de dominio (quedan en el outbox): {e}")
+        return []
+
+
+def _outbox_model():
+    """Modelo del outbox (importado al usarlo: app.core.database importa este módulo)"""
+    from app.models.domain_event_outbox import DomainEventOutbox
+
+    return DomainEventOutbox
+
+
+def _outbox_rows(events: list[tuple[str, dict, dict]]) -> list[dict]:
+    """Filas del outbox de una lista de (tipo, datos, contexto de traza)"""
+    ts = time.time()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "type": event_type,
+            "data": json.dumps(data, default=str),
+            "trace": json.dumps(trace_context) if trace_context else None,
+            "created_at": ts,
+        }
+        for event_type, data, trace_context in events
+    ]
+
+
+def decode_event(fields: dict) -> tuple[str, dict]:
+    """
+    Leer un mensaje del stream
+
+    Args:
+        fields: Campos del mensaje devueltos por XREADGROUP
+
+    Returns:
+        (tipo, datos)
+    """
+    return fields["type"], json.loads(fields["data"])
+
+
+def decode_trace(fields: dict) -> dict:
+    """
+    Contexto de traza de un mensaje del stream
+
+    Args:
+        fields: Campos del mensaje
+
+    Returns:
+        dict con `traceparent` (vacío si el emisor no estaba en una traza)
+    """
+    try:
+        return json.loads(fields.get("trace") or "{}")
+    except ValueError:
+        return {}
+
+
+def _write_outbox_before_commit(session: Session):
+    """Guardar los eventos anotados en el outbox, dentro de la transacción que los produce"""
+    pending = session.info.get(_PENDING_EVENTS)
+    if pending:
+        rows = _outbox_rows(pending)
+        session.execute(insert(_outbox_model()), rows)
+        session.info[_OUTBOX_IDS] = [row["id"] for row in rows]
+
+
+def _publish_after_commit(session: Session):
+    """Publicar los eventos anotados una vez confirmado el commit y sacarlos del outbox"""
+    pending = session.info.pop(_PENDING_EVENTS, None)
+    outbox_ids = session.info.pop(_OUTBOX_IDS, None)
+    if pending and publish_events(pending) and outbox_ids:
+        from app.core.database import engine
+
+        # El commit ya se confirmó: un error aquí no debe llegar al llamador.
+        # Las filas que queden las vuelve a publicar el relay (al menos una vez)
+        outbox = _outbox_model()
+        try:
+            with engine.begin() as conn:
+                conn.execute(delete(outbox).where(outbox.id.in_(outbox_ids)))
+        except SQLAlchemyError as e:
+            logger.warning(f"No se pudieron borrar {len(outbox_ids)} evento(s) publicados del outbox: {e}")
+
+
+def _discard_after_rollback(session: Session):
+    """Descartar los eventos anotados si la transacción se revierte (sus filas del outbox también)"""
+    session.info.pop(_PENDING_EVENTS, None)
+    session.info.pop(_OUTBOX_IDS, None)
+
+
+def track_domain_events(session_factory: sessionmaker):
+    """
+    Registrar los eventos de sesión que publican los eventos de dominio
+
+    Args:
+        session_factory: sessionmaker cuyas sesiones pueden emitir eventos
+    """
+    event.listen(session_factory, "before_commit", _write_outbox_before_commit)
+    event.listen(session_factory, "after_commit", _publish_after_commit)
+    event.listen(session_factory, "after_rollback", _discard_after_rollback)
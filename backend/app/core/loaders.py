@@ -0,0 +1,129 @@
+"""
+Carga por lotes de filas por id con memoria por sesión (DataLoader)
+
+Dentro de una petición, un comando del bot o un job de Celery se leen una y
+otra vez los mismos usuarios y proyectos (responsable anterior y nuevo,
+proyecto de la tarea al notificar, usuario destinatario del mensaje...). El
+cargador de cada modelo vive en `session.info`, así que su alcance es el de la
+sesión: la petición (get_db), el bloque `get_db_context()` del bot o el job.
+
+- Los ids anotados con `want()` se resuelven juntos en un `WHERE id IN (...)`
+  la primera vez que se pide cualquiera de ellos.
+- Las filas ya cargadas (también las del identity map de la sesión y las
+  registradas con `prime()`) se sirven de memoria, igual que los ids que no
+  existen.
+
+Ejemplo:
+    users = loader(db, User)
+    users.want(task.responsible_id, task.created_by)
+    responsible = users.load(task.responsible_id)  # una consulta para ambos
+    creator = users.load(task.created_by)          # sin consulta
+"""
+from typing import Generic, Iterable, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+# Clave en session.info con los cargadores de la sesión
+_LOADERS = "entity_loaders"
+
+# Máximo de ids por consulta IN
+BATCH_SIZE = 500
+
+T = TypeVar("T")
+
+
+class EntityLoader(Generic[T]):
+    """Cargador por lotes de un modelo con clave primaria `id`"""
+
+    def __init__(self, db: Session, model: type[T]):
+        self.db = db
+        self.model = model
+        self._cache: dict[str, Optional[T]] = {}
+        self._pending: set[str] = set()
+
+    def prime(self, *instances: Optional[T]) -> None:
+        """Registrar instancias ya cargadas por el llamador"""
+        for instance in instances:
+            if instance is not None:
+                self._cache[instance.id] = instance
+                self._pending.discard(instance.id)
+
+    def want(self, *ids: Optional[str]) -> None:
+        """Anotar ids que se cargarán en la próxima consulta"""
+        self._pending.update(
+            entity_id for entity_id in ids
+            if entity_id and entity_id not in self._cache
+        )
+
+    def load(self, entity_id: Optional[str]) -> Optional[T]:
+        """
+        Obtener una fila por id
+
+        Args:
+            entity_id: Id de la fila (None devuelve None)
+
+        Returns:
+            Instancia del modelo o None si no existe
+        """
+        if not entity_id:
+            return None
+        if entity_id not in self._cache:
+            self.want(entity_id)
+            self._dispatch()
+        return self._cache.get(entity_id)
+
+    def load_many(self, ids: Iterable[Optional[str]]) -> dict[str, T]:
+        """
+        Obtener varias filas por id con una sola consulta para las que faltan
+
+        Args:
+            ids: Ids a cargar (se ignoran los vacíos)
+
+        Returns:
+            dict id -> instancia, solo con las filas existentes
+        """
+        ids = [entity_id for entity_id in ids if entity_id]
+        self.want(*ids)
+        self._dispatch()
+        return {
+            entity_id: self._cache[entity_id]
+            for entity_id in ids
+            if self._cache.get(entity_id) is not None
+        }
+
+    def _dispatch(self) -> None:
+        """Resolver los ids pendientes (identity map primero, luego IN por lotes)"""
+        pending, self._pending = self._pending - self._cache.keys(), set()
+
+        missing = []
+        for entity_id in pending:
+            instance = self.db.identity_map.get(self.db.identity_key(self.model, entity_id))
+            if instance is not None:
+                self._cache[entity_id] = instance
+            else:
+                missing.append(entity_id)
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            chunk = missing[start:start + BATCH_SIZE]
+            rows = self.db.query(self.model).filter(self.model.id.in_(chunk)).all()
+            self._cache.update({row.id: row for row in rows})
+            # Recordar también los que no existen
+            for entity_id in chunk:
+                self._cache.setdefault(entity_id, None)
+
+
+def loader(db: Session, model: type[T]) -> EntityLoader[T]:
+    """
+    Obtener el cargador de un modelo para la sesión (se crea en el primer uso)
+
+    Args:
+        db: Sesión de base de datos (define el alcance de la memoria)
+        model: Modelo con clave primaria `id` (ej: User, Project)
+
+    Returns:
+        EntityLoader del modelo ligado a la sesión
+    """
+    loaders = db.info.setdefault(_LOADERS, {})
+    if model not in loaders:
+        loaders[model] = EntityLoader(db, model)
+    return loaders[model]
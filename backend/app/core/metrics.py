@@ -0,0 +1,354 @@
+"""
+Métricas de Prometheus de la API, el bot, los consumidores de eventos y los
+workers de Celery
+
+- API: `GET /metrics` (app/main.py) con la latencia por ruta, el estado de
+  los pools y la profundidad de las colas (Celery y stream de eventos).
+- Bot, consumidores de eventos y workers: exportador HTTP propio en
+  METRICS_PORT (`start_exporter()`).
+
+Los workers prefork ejecutan las tareas en procesos hijos: con
+PROMETHEUS_MULTIPROC_DIR cada proceso escribe sus contadores en ese directorio
+y el exportador del proceso principal los agrega. El estado del pool y la
+profundidad de las colas no son contadores: se calculan al leer las métricas
+y reflejan solo el proceso que responde.
+
+Las métricas se definen aquí para que cada nombre exista una sola vez; los
+módulos instrumentados importan los objetos (o sus hijos con etiquetas ya
+resueltas, que evitan buscar las etiquetas en el camino caliente).
+"""
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+# El modo multiproceso se decide al importar prometheus_client y sus valores
+# se escriben en el directorio desde que se crea la primera métrica
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROCESS_DIR:
+    os.makedirs(MULTIPROCESS_DIR, exist_ok=True)
+
+import redis
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+from app.core.config import settings
+from app.core.db_pool import pool_stats
+from app.core.replicas import replicas
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# HTTP (API)
+# ==============================================================================
+
+# Etiqueta de las peticiones que no coinciden con ninguna ruta (evita una
+# serie por cada URL inventada)
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "sva_http_request_duration_seconds",
+    "Duración de las peticiones HTTP por ruta",
+    ["method", "route"],
+)
+HTTP_REQUESTS = Counter(
+    "sva_http_requests",
+    "Peticiones HTTP por ruta y código de respuesta",
+    ["method", "route", "status"],
+)
+
+# ==============================================================================
+# Telegram
+# ==============================================================================
+
+TELEGRAM_REQUEST_DURATION = Histogram(
+    "sva_telegram_request_duration_seconds",
+    "Duración de las llamadas a la API de Telegram por método",
+    ["method"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+TELEGRAM_REQUESTS = Counter(
+    "sva_telegram_requests",
+    "Llamadas a la API de Telegram por método y resultado "
+    "(ok, rate_limited, client_error, server_error, timeout, network_error)",
+    ["method", "result"],
+)
+
+# ==============================================================================
+# Tareas programadas y eventos
+# ==============================================================================
+
+JOB_DURATION = Histogram(
+    "sva_job_duration_seconds",
+    "Duración de las tareas de Celery (recordatorios, resúmenes, mantenimiento)",
+    ["job"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+JOB_RUNS = Counter(
+    "sva_job_runs",
+    "Ejecuciones de tareas de Celery por resultado (success, failure, retry)",
+    ["job", "outcome"],
+)
+EVENT_HANDLER_DURATION = Histogram(
+    "sva_event_handler_duration_seconds",
+    "Duración de los manejadores de eventos de dominio",
+    ["group", "event"],
+)
+EVENTS_PROCESSED = Counter(
+    "sva_events_processed",
+    "Eventos de dominio procesados por grupo y resultado (ok, error, dead)",
+    ["group", "event", "outcome"],
+)
+
+# ==============================================================================
+# Cachés
+# ==============================================================================
+
+CACHE_LOOKUPS = Counter(
+    "sva_cache_lookups",
+    "Consultas a cachés por resultado (hit / miss)",
+    ["cache", "result"],
+)
+REFERENCE_DATA_HIT = CACHE_LOOKUPS.labels("reference_data", "hit")
+REFERENCE_DATA_MISS = CACHE_LOOKUPS.labels("reference_data", "miss")
+CONDITIONAL_GET_HIT = CACHE_LOOKUPS.labels("conditional_get", "hit")
+CONDITIONAL_GET_MISS = CACHE_LOOKUPS.labels("conditional_get", "miss")
+
+
+# ==============================================================================
+# Métricas calculadas al leer
+# ==============================================================================
+
+
+class PoolCollector:
+    """Estado y contadores de los pools de conexiones y retraso de las réplicas"""
+
+    def describe(self):
+        # Sin esto el registro llamaría a collect() al registrarlo
+        return []
+
+    def collect(self):
+        labels = ["engine"]
+        checked_out = GaugeMetricFamily(
+            "sva_db_pool_checked_out", "Conexiones en uso", labels=labels
+        )
+        capacity = GaugeMetricFamily(
+            "sva_db_pool_capacity", "Conexiones máximas (pool_size + max_overflow)", labels=labels
+        )
+        overflow = GaugeMetricFamily(
+            "sva_db_pool_overflow", "Conexiones abiertas por encima de pool_size", labels=labels
+        )
+        checkouts = CounterMetricFamily(
+            "sva_db_pool_checkouts", "Checkouts de conexiones", labels=labels
+        )
+        timeouts = CounterMetricFamily(
+            "sva_db_pool_timeouts", "Checkouts que agotaron pool_timeout", labels=labels
+        )
+        overflow_created = CounterMetricFamily(
+            "sva_db_pool_overflow_created", "Conexiones de overflow abiertas", labels=labels
+        )
+        wait = HistogramMetricFamily(
+            "sva_db_pool_checkout_wait_seconds", "Espera en el checkout", labels=labels
+        )
+
+        for pool in pool_stats():
+            engine = [pool["engine"]]
+            checked_out.add_metric(engine, pool["checked_out"])
+            if pool["pool_size"] is not None:
+                capacity.add_metric(engine, pool["pool_size"] + pool["max_overflow"])
+            overflow.add_metric(engine, pool["overflow"])
+            checkouts.add_metric(engine, pool["checkouts"])
+            timeouts.add_metric(engine, pool["timeouts"])
+            overflow_created.add_metric(engine, pool["overflow_created"])
+
+            cumulative, buckets = 0, []
+            for bound, count in pool["wait_buckets"].items():
+                cumulative += count
+                buckets.append((bound, cumulative))
+            wait.add_metric(engine, buckets, pool["wait_seconds_sum"])
+
+        yield from (checked_out, capacity, overflow, checkouts, timeouts, overflow_created, wait)
+
+        lag = GaugeMetricFamily(
+            "sva_db_replica_lag_seconds",
+            "Retraso medido de cada réplica (sin serie si no responde)",
+            labels=["replica"],
+        )
+        up = GaugeMetricFamily(
+            "sva_db_replica_up", "Si la réplica respondió al último latido", labels=["replica"]
+        )
+        for replica in replicas.status():
+            up.add_metric([replica["replica"]], replica["lag"] is not None)
+            if replica["lag"] is not None:
+                lag.add_metric([replica["replica"]], replica["lag"])
+        yield lag
+        yield up
+
+
+# Valores por defecto del transporte Redis de kombu (si broker_transport_options no los cambia)
+KOMBU_PRIORITY_STEPS = [0, 3, 6, 9]
+KOMBU_PRIORITY_SEP = "\x06\x16"
+
+
+class QueueCollector:
+    """Profundidad de las colas de Celery (todas sus prioridades) y del stream de eventos de dominio"""
+
+    def describe(self):
+        # Sin esto el registro llamaría a collect() al registrarlo
+        return []
+
+    def __init__(self):
+        self._clients: dict[str, redis.Redis] = {}
+
+    def _client(self, url: str) -> redis.Redis:
+        if url not in self._clients:
+            self._clients[url] = redis.Redis.from_url(
+                url, decode_responses=True, socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+            )
+        return self._clients[url]
+
+    def collect(self):
+        from app.core.domain_events import STREAM
+        from app.workers.celery_app import celery_app
+        from app.workers.event_consumer import DEAD_LETTER_STREAM
+
+        celery_queue = GaugeMetricFamily(
+            "sva_celery_queue_length", "Mensajes esperando en la cola de Celery", labels=["queue"]
+        )
+        stream_length = GaugeMetricFamily(
+            "sva_event_stream_length", "Entradas en el stream", labels=["stream"]
+        )
+        group_pending = GaugeMetricFamily(
+            "sva_event_group_pending",
+            "Eventos entregados al grupo y aún sin confirmar",
+            labels=["group"],
+        )
+        group_lag = GaugeMetricFamily(
+            "sva_event_group_lag", "Eventos del stream que el grupo aún no leyó", labels=["group"]
+        )
+
+        try:
+            broker = self._client(celery_app.conf.broker_url)
+            queues = _celery_queues(celery_app)
+            pipeline = broker.pipeline(transaction=False)
+            for keys in queues.values():
+                for key in keys:
+                    pipeline.llen(key)
+            lengths = iter(pipeline.execute())
+            for queue, keys in queues.items():
+                celery_queue.add_metric([queue], sum(next(lengths) for _ in keys))
+
+            client = self._client(settings.redis_url)
+            for stream in (STREAM, DEAD_LETTER_STREAM):
+                stream_length.add_metric([stream], client.xlen(stream))
+            for group in client.xinfo_groups(STREAM) if client.exists(STREAM) else []:
+                group_pending.add_metric([group["name"]], group["pending"])
+                # `lag` solo existe desde Redis 7 (None si no se puede calcular)
+                if group.get("lag") is not None:
+                    group_lag.add_metric([group["name"]], group["lag"])
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo medir la profundidad de las colas: {e}")
+
+        yield from (celery_queue, stream_length, group_pending, group_lag)
+
+
+def _celery_queues(celery_app) -> dict[str, list[str]]:
+    """
+    Claves de Redis de cada cola declarada en Celery (la cola por defecto si no hay otras)
+
+    Con prioridades, kombu guarda cada escalón en una lista aparte: la
+    prioridad 0 en la clave de la cola y las demás en `<cola><sep><prioridad>`.
+
+    Returns:
+        Nombre de la cola -> claves de sus listas
+    """
+    queues = celery_app.conf.task_queues
+    names = [queue.name for queue in queues] if queues else [celery_app.conf.task_default_queue]
+
+    options = celery_app.conf.broker_transport_options or {}
+    steps = options.get("priority_steps", KOMBU_PRIORITY_STEPS)
+    sep = options.get("sep", KOMBU_PRIORITY_SEP)
+    return {
+        name: [f"{name}{sep}{step}" if step else name for step in steps]
+        for name in names
+    }
+
+
+# ==============================================================================
+# Exposición
+# ==============================================================================
+
+# Colectores con el estado de este proceso (no se agregan entre procesos)
+_process_collectors: list = []
+
+
+def add_collector(collector) -> None:
+    """
+    Registrar un colector que calcula sus métricas al leerlas
+
+    Args:
+        collector: Objeto con método collect()
+    """
+    _process_collectors.append(collector)
+    if not MULTIPROCESS_DIR:
+        REGISTRY.register(collector)
+
+
+def registry() -> CollectorRegistry:
+    """
+    Registro a exponer por este proceso
+
+    Returns:
+        El registro global o, en modo multiproceso, uno que agrega los
+        valores de todos los procesos más los colectores de este
+    """
+    if not MULTIPROCESS_DIR:
+        return REGISTRY
+    aggregated = CollectorRegistry()
+    multiprocess.MultiProcessCollector(aggregated)
+    for collector in _process_collectors:
+        aggregated.register(collector)
+    return aggregated
+
+
+def render() -> bytes:
+    """Métricas en el formato de texto de Prometheus"""
+    return generate_latest(registry())
+
+
+def start_exporter(port: Optional[int] = None) -> None:
+    """
+    Exponer las métricas en un servidor HTTP propio (bot, consumidores, workers)
+
+    Args:
+        port: Puerto (por defecto METRICS_PORT)
+    """
+    if not settings.METRICS_ENABLED:
+        return
+    port = port or settings.METRICS_PORT
+    start_http_server(port, registry=registry())
+    logger.info(f"Métricas de Prometheus en :{port}/metrics")
+
+
+def clean_multiprocess_dir() -> None:
+    """
+    Borrar los valores de procesos anteriores del directorio multiproceso
+    (al arrancar el proceso principal, antes de crear los hijos)
+    """
+    if not MULTIPROCESS_DIR:
+        return
+    own = f"_{os.getpid()}.db"
+    for path in Path(MULTIPROCESS_DIR).glob("*.db"):
+        if not path.name.endswith(own):
+            path.unlink(missing_ok=True)
+
+
+add_collector(PoolCollector())
@@ -5,10 +5,19 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.loaders import loader
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task
+from app.core.visibility import (
+    VisibilityScope,
+    project_modifiable,
+    project_visible,
+    task_manageable,
+    task_modifiable,
+    task_visible,
+)
 
 
 def require_role(allowed_roles: list[str]):
@@ -61,6 +70,21 @@ def require_supervisor_or_admin(current_user: User = Depends(get_current_user))
     return current_user
 
 
+def _load_in_scope(db: Session, model, object_id: str, predicate):
+    """
+    Cargar una fila junto con el resultado de su predicado de alcance (una sola consulta)
+
+    Returns:
+        (instancia o None si no existe, True si el predicado se cumple)
+    """
+    row = db.query(model, predicate.label("allowed")).filter(model.id == object_id).first()
+    if row is None:
+        return None, False
+    # Disponible para el resto de la petición sin volver a consultarla
+    loader(db, model).prime(row[0])
+    return row[0], bool(row.allowed)
+
+
 def can_access_project(
     project_id: str,
     current_user: User = Depends(get_current_user),
@@ -70,7 +94,7 @@ def can_access_project(
     Verifica si el usuario puede acceder a un proyecto según su rol:
     - Administrador: Acceso a todos los proyectos
     - Supervisor: Acceso a proyectos de su área
-    - Analista: Acceso solo a sus propios proyectos
+    - Analista: Acceso a sus propios proyectos o donde tiene tareas asignadas
 
     Returns:
         El proyecto si el usuario tiene acceso
@@ -79,7 +103,9 @@ def can_access_project(
         HTTPException 403 si no tiene acceso
         HTTPException 404 si el proyecto no existe
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project, allowed = _load_in_scope(
+        db, Project, project_id, project_visible(VisibilityScope.of(current_user))
+    )
 
     if not project:
         raise HTTPException(
@@ -87,27 +113,13 @@ def can_access_project(
             detail="Proyecto no encontrado"
         )
 
-    # Administrador tiene acceso a todo
-    if current_user.role == 'administrador':
-        return project
-
-    # Supervisor tiene acceso a proyectos de su área
-    if current_user.role == 'supervisor':
-        if current_user.area_id and project.area_id == current_user.area_id:
-            return project
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a este proyecto (diferente área)"
+            detail="No tienes acceso a este proyecto"
         )
 
-    # Analista solo tiene acceso a sus propios proyectos
-    if project.owner_id == current_user.id:
-        return project
-
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="No tienes acceso a este proyecto"
-    )
+    return project
 
 
 def can_modify_project(
@@ -121,7 +133,9 @@ def can_modify_project(
     - Supervisor: Puede modificar proyectos de su área
     - Analista: Solo puede modificar sus propios proyectos
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project, allowed = _load_in_scope(
+        db, Project, project_id, project_modifiable(VisibilityScope.of(current_user))
+    )
 
     if not project:
         raise HTTPException(
@@ -129,27 +143,13 @@ def can_modify_project(
             detail="Proyecto no encontrado"
         )
 
-    # Administrador puede modificar todo
-    if current_user.role == 'administrador':
-        return project
-
-    # Supervisor puede modificar proyectos de su área
-    if current_user.role == 'supervisor':
-        if current_user.area_id and project.area_id == current_user.area_id:
-            return project
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="No puedes modificar este proyecto (diferente área)"
+            detail="No puedes modificar este proyecto"
         )
 
-    # Analista solo puede modificar sus propios proyectos
-    if project.owner_id == current_user.id:
-        return project
-
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="No puedes modificar este proyecto"
-    )
+    return project
 
 
 def can_access_task(
@@ -161,9 +161,11 @@ def can_access_task(
     Verifica si el usuario puede acceder a una tarea según su rol:
     - Administrador: Acceso a todas las tareas
     - Supervisor: Acceso a tareas de proyectos de su área
-    - Analista: Acceso a tareas de sus proyectos o tareas asignadas a él
+    - Analista: Acceso a tareas de sus proyectos, creadas por él o asignadas a él
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task, allowed = _load_in_scope(
+        db, Task, task_id, task_visible(VisibilityScope.of(current_user))
+    )
 
     if not task:
         raise HTTPException(
@@ -171,35 +173,13 @@ def can_access_task(
             detail="Tarea no encontrada"
         )
 
-    # Administrador tiene acceso a todo
-    if current_user.role == 'administrador':
-        return task
-
-    # Cargar el proyecto asociado
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-
-    # Supervisor tiene acceso a tareas de proyectos de su área
-    if current_user.role == 'supervisor':
-        if current_user.area_id and project and project.area_id == current_user.area_id:
-            return task
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a esta tarea (diferente área)"
+            detail="No tienes acceso a esta tarea"
         )
 
-    # Analista tiene acceso si:
-    # 1. Es el dueño del proyecto
-    # 2. Es el creador de la tarea
-    # 3. Es el responsable de la tarea
-    if (project and project.owner_id == current_user.id) or \
-       task.created_by == current_user.id or \
-       task.responsible_id == current_user.id:
-        return task
-
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="No tienes acceso a esta tarea"
-    )
+    return task
 
 
 def can_modify_task(
@@ -208,12 +188,14 @@ def can_modify_task(
     db: Session = Depends(get_db)
 ) -> Task:
     """
-    Verifica si el usuario puede modificar una tarea:
+    Verifica si el usuario puede modificar (editar, cambiar estado, eliminar) una tarea:
     - Administrador: Puede modificar todas las tareas
     - Supervisor: Puede modificar tareas de proyectos de su área
     - Analista: Puede modificar tareas de sus proyectos o tareas donde es responsable
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task, allowed = _load_in_scope(
+        db, Task, task_id, task_modifiable(VisibilityScope.of(current_user))
+    )
 
     if not task:
         raise HTTPException(
@@ -221,28 +203,40 @@ def can_modify_task(
             detail="Tarea no encontrada"
         )
 
-    # Administrador puede modificar todo
-    if current_user.role == 'administrador':
-        return task
-
-    # Cargar el proyecto asociado
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-
-    # Supervisor puede modificar tareas de proyectos de su área
-    if current_user.role == 'supervisor':
-        if current_user.area_id and project and project.area_id == current_user.area_id:
-            return task
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="No puedes modificar esta tarea (diferente área)"
+            detail="No puedes modificar esta tarea"
         )
 
-    # Analista puede modificar si es dueño del proyecto o responsable de la tarea
-    if (project and project.owner_id == current_user.id) or \
-       task.responsible_id == current_user.id:
-        return task
+    return task
+
 
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="No puedes modificar esta tarea"
+def can_manage_task(
+    task_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Task:
+    """
+    Verifica si el usuario puede archivar o desarchivar una tarea:
+    - Administrador: Todas las tareas
+    - Supervisor: Tareas de proyectos de su área
+    - Analista: Tareas de sus propios proyectos
+    """
+    task, allowed = _load_in_scope(
+        db, Task, task_id, task_manageable(VisibilityScope.of(current_user))
     )
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarea no encontrada"
+        )
+
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo el dueño del proyecto, su supervisor o un administrador pueden archivar esta tarea"
+        )
+
+    return task
@@ -0,0 +1,173 @@
+"""
+Perfilado de consultas SQL por unidad de trabajo (petición HTTP, tarea...)
+
+Mientras hay un perfil activo (`profile_queries()`), los eventos de cursor de
+todos los engines cuentan las consultas, el tiempo total en la BD y cuántas
+veces se repite cada forma de sentencia. Al cerrar el perfil:
+
+- Si una misma forma se ejecutó más de SQL_REPEATED_QUERY_THRESHOLD veces se
+  registra una advertencia de posible N+1.
+- Las sentencias más lentas que SQL_SLOW_QUERY_MS se registran y, con
+  SQL_EXPLAIN_SLOW_QUERIES, se acompañan de su EXPLAIN (en una conexión
+  aparte, después de la unidad de trabajo).
+
+Sin perfil activo los eventos solo consultan una ContextVar, así que el coste
+en producción lo decide el muestreo (SQL_PROFILER_SAMPLE_RATE).
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Máximo de sentencias lentas que se explican por unidad de trabajo
+MAX_EXPLAINS = 3
+
+# Listas de parámetros de un IN expandido: "(?, ?, ?)" o "(%(id_1_1)s, %(id_1_2)s)"
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|%\([^)]+\)s)(?:\s*,\s*(?:\?|%s|%\([^)]+\)s))+\s*\)")
+
+_EXPLAIN_PREFIX = {"mysql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+@dataclass
+class SlowQuery:
+    """Sentencia lenta pendiente de explicar"""
+    engine: Engine
+    statement: str
+    parameters: Any
+    duration_ms: float
+
+
+@dataclass
+class QueryProfile:
+    """Consultas ejecutadas en una unidad de trabajo"""
+    label: str
+    count: int = 0
+    duration_ms: float = 0.0
+    shapes: dict[str, int] = field(default_factory=dict)
+    slow: list[SlowQuery] = field(default_factory=list)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Formas de sentencia ejecutadas más de `threshold` veces, de más a menos"""
+        return sorted(
+            ((shape, count) for shape, count in self.shapes.items() if count > threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """
+    Normalizar una sentencia para agrupar las que solo difieren en el tamaño
+    de sus listas IN (los valores ya van como parámetros)
+
+    Args:
+        statement: SQL enviado al driver
+
+    Returns:
+        Forma de la sentencia
+    """
+    return _PARAM_LIST.sub("(?)", " ".join(statement.split()))
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """Perfil activo en el contexto actual (None si no se está perfilando)"""
+    return _current.get()
+
+
+@contextmanager
+def profile_queries(label: str, report_on_exit: bool = True):
+    """
+    Perfilar las consultas ejecutadas dentro del bloque
+
+    Args:
+        label: Descripción de la unidad de trabajo (ej: "GET /api/v1/tasks/")
+        report_on_exit: Llamar a `report()` al salir (el middleware HTTP lo
+            hace por su cuenta para no bloquear el event loop con los EXPLAIN)
+
+    Yields:
+        QueryProfile que se completa a medida que se ejecutan consultas
+    """
+    profile = QueryProfile(label)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+        if report_on_exit:
+            report(profile)
+
+
+def report(profile: QueryProfile) -> None:
+    """Registrar las advertencias de N+1 y de sentencias lentas de un perfil"""
+    for shape, count in profile.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD):
+        logger.warning(
+            f"Posible N+1 en {profile.label}: {count} ejecuciones de la misma consulta: {shape[:300]}"
+        )
+
+    for index, slow in enumerate(profile.slow):
+        plan = _explain(slow) if settings.SQL_EXPLAIN_SLOW_QUERIES and index < MAX_EXPLAINS else None
+        message = f"Consulta lenta en {profile.label} ({slow.duration_ms:.1f} ms): {statement_shape(slow.statement)[:300]}"
+        if plan:
+            message += f"\nEXPLAIN:\n{plan}"
+        logger.warning(message)
+
+
+def _explain(slow: SlowQuery) -> Optional[str]:
+    prefix = _EXPLAIN_PREFIX.get(slow.engine.dialect.name)
+    if prefix is None or not slow.statement.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        with slow.engine.connect() as conn:
+            result = conn.exec_driver_sql(prefix + slow.statement, slow.parameters)
+            return "\n".join(" | ".join(str(value) for value in row) for row in result)
+    except SQLAlchemyError as e:
+        logger.debug(f"No se pudo obtener el EXPLAIN: {e}")
+        return None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    profile.count += 1
+    profile.duration_ms += duration_ms
+    shape = statement_shape(statement)
+    profile.shapes[shape] = profile.shapes.get(shape, 0) + 1
+    if duration_ms >= settings.SQL_SLOW_QUERY_MS:
+        profile.slow.append(SlowQuery(conn.engine, statement, parameters, duration_ms))
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # La sentencia falló: after_cursor_execute no se ejecuta
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
@@ -0,0 +1,60 @@
+"""
+Cliente Redis compartido por la API, el bot y los workers
+"""
+import logging
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Segundos durante los que no se reintenta Redis tras un fallo de conexión
+UNAVAILABLE_BACKOFF_SECONDS = 30
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Obtener el cliente Redis del proceso (creado de forma perezosa)
+
+    Tras un error de conexión reportado con `mark_unavailable()` devuelve None
+    durante unos segundos, para que las funciones opcionales basadas en Redis
+    (caché, invalidaciones, eventos) se desactiven sin bloquear las peticiones.
+
+    Returns:
+        Cliente Redis o None si Redis no está disponible
+    """
+    global _client
+
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+    return _client
+
+
+def mark_unavailable(error: Exception):
+    """
+    Registrar un fallo de Redis y desactivar su uso temporalmente
+
+    Args:
+        error: Excepción recibida del cliente
+    """
+    global _unavailable_until
+
+    if time.monotonic() >= _unavailable_until:
+        logger.warning(
+            f"Redis no disponible, se reintentará en {UNAVAILABLE_BACKOFF_SECONDS}s: {error}"
+        )
+    _unavailable_until = time.monotonic() + UNAVAILABLE_BACKOFF_SECONDS
@@ -0,0 +1,267 @@
+"""
+Caché en memoria de datos de referencia (áreas y nombres de usuario)
+
+Las áreas y el nombre/rol de los usuarios se leen en casi todas las peticiones
+y mensajes, pero cambian muy poco. Cada proceso (API, bot, workers de Celery)
+mantiene una copia completa en memoria:
+
+- Se carga en el primer uso, con la versión de datos de Redis de la tabla
+  (ver app/core/data_versions.py) como sello.
+- Cada commit que modifica `areas` o `users` publica las tablas cambiadas en
+  `sva:data_versions`; un hilo por proceso escucha el canal y marca la sección
+  para recargar en el siguiente acceso.
+- Como pub/sub no garantiza la entrega, cada REFERENCE_DATA_CHECK_SECONDS se
+  comparan los sellos con Redis; sin Redis la sección se recarga con esa
+  misma periodicidad.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.data_versions import VERSIONS_CHANNEL, get_versions
+from app.core.metrics import REFERENCE_DATA_HIT, REFERENCE_DATA_MISS
+from app.core.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+AREAS = "areas"
+USERS = "users"
+TABLES = (AREAS, USERS)
+
+# Segundos de espera antes de volver a suscribirse tras un error de Redis
+RECONNECT_DELAY_SECONDS = 5
+
+# Intervalo mínimo entre recargas provocadas por ids desconocidos
+MISS_RELOAD_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class AreaRef:
+    """Copia inmutable de un área"""
+    id: str
+    name: str
+    description: Optional[str]
+    color: str
+    icon: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class UserRef:
+    """Datos de un usuario necesarios para mostrarlo y para su alcance"""
+    id: str
+    full_name: str
+    role: str
+    area_id: Optional[str]
+    is_active: bool
+
+
+def _load_areas() -> dict[str, AreaRef]:
+    from app.core.database import get_db_context
+    from app.models.area import Area
+
+    with get_db_context() as db:
+        rows = db.query(
+            Area.id, Area.name, Area.description, Area.color, Area.icon,
+            Area.is_active, Area.created_at, Area.updated_at,
+        ).order_by(Area.name).all()
+    return {row.id: AreaRef(*row) for row in rows}
+
+
+def _load_users() -> dict[str, UserRef]:
+    from app.core.database import get_db_context
+    from app.models.user import User
+
+    with get_db_context() as db:
+        rows = db.query(
+            User.id, User.full_name, User.role, User.area_id, User.is_active,
+        ).all()
+    return {row.id: UserRef(*row) for row in rows}
+
+
+_LOADERS = {AREAS: _load_areas, USERS: _load_users}
+
+
+class ReferenceData:
+    """Datos de referencia del proceso (ver docstring del módulo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._data: dict[str, dict] = {}
+        self._stamps: dict[str, Optional[tuple]] = {}
+        self._loaded_at: dict[str, float] = {}
+        self._stale: set[str] = set()
+        self._next_check = 0.0
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def areas(self, active_only: bool = False) -> list[AreaRef]:
+        """
+        Listar las áreas ordenadas por nombre
+
+        Args:
+            active_only: Solo las áreas activas
+
+        Returns:
+            Lista de AreaRef
+        """
+        areas = self._section(AREAS).values()
+        return [area for area in areas if area.is_active or not active_only]
+
+    def area(self, area_id: Optional[str]) -> Optional[AreaRef]:
+        """Obtener un área por id (None si no existe)"""
+        return self._lookup(AREAS, area_id)
+
+    def user(self, user_id: Optional[str]) -> Optional[UserRef]:
+        """Obtener los datos de referencia de un usuario por id (None si no existe)"""
+        return self._lookup(USERS, user_id)
+
+    def user_name(self, user_id: Optional[str]) -> Optional[str]:
+        """Nombre completo de un usuario (None si no existe)"""
+        user = self.user(user_id)
+        return user.full_name if user else None
+
+    def invalidate(self, *tables: str) -> None:
+        """
+        Marcar secciones para recargar en el siguiente acceso
+
+        Args:
+            tables: Tablas a invalidar (por defecto todas)
+        """
+        with self._lock:
+            self._stale.update(tables or TABLES)
+
+    def stop(self) -> None:
+        """Detener el hilo de invalidaciones (cierre del proceso)"""
+        self._stopping.set()
+
+    # ------------------------------------------------------------------
+    # Carga y frescura
+    # ------------------------------------------------------------------
+
+    def _lookup(self, table: str, key: Optional[str]):
+        if not key:
+            return None
+        value = self._section(table).get(key)
+        if value is None and time.monotonic() - self._loaded_at.get(table, 0) >= MISS_RELOAD_SECONDS:
+            # Id recién creado cuya invalidación aún no llegó
+            self.invalidate(table)
+            value = self._section(table).get(key)
+        return value
+
+    def _section(self, table: str) -> dict:
+        """Datos de una tabla, recargados si están marcados o su sello cambió"""
+        with self._lock:
+            self._reset_after_fork()
+            self._ensure_listener()
+            self._check_stamps()
+            if table in self._stale or table not in self._data:
+                REFERENCE_DATA_MISS.inc()
+                self._reload(table)
+            else:
+                REFERENCE_DATA_HIT.inc()
+            return self._data[table]
+
+    def _reload(self, table: str) -> None:
+        # El sello se lee antes que los datos: un cambio concurrente deja el
+        # sello atrasado y provoca otra recarga, nunca datos nuevos con sello viejo
+        self._stamps[table] = self._current_stamps().get(table)
+        self._data[table] = _LOADERS[table]()
+        self._loaded_at[table] = time.monotonic()
+        self._stale.discard(table)
+        logger.debug(f"Datos de referencia recargados: {table} ({len(self._data[table])} filas)")
+
+    def _current_stamps(self) -> dict[str, Optional[tuple]]:
+        versions = get_versions(TABLES)
+        if versions is None:
+            return {}
+        epoch, tables = versions
+        return {table: (epoch, version) for table, (version, _ts) in tables.items()}
+
+    def _check_stamps(self) -> None:
+        """Comparar periódicamente los sellos con Redis (red de seguridad de pub/sub)"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + settings.REFERENCE_DATA_CHECK_SECONDS
+
+        current = self._current_stamps()
+        for table in list(self._data):
+            stamp = current.get(table)
+            # Sin Redis (sello None) no hay forma de saberlo: recargar
+            if stamp is None or stamp != self._stamps.get(table):
+                self._stale.add(table)
+
+    def _reset_after_fork(self) -> None:
+        """Descartar el estado heredado del proceso padre (workers prefork)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._data.clear()
+        self._stamps.clear()
+        self._stale.clear()
+        self._next_check = 0.0
+        self._listener = None
+
+    # ------------------------------------------------------------------
+    # Invalidaciones por pub/sub
+    # ------------------------------------------------------------------
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        if self._stopping.is_set():
+            return
+        self._listener = threading.Thread(
+            target=self._listen, name="reference-data-invalidations", daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self) -> None:
+        reconnecting = False
+        while not self._stopping.is_set():
+            client = get_redis()
+            if client is None:
+                self._stopping.wait(RECONNECT_DELAY_SECONDS)
+                continue
+
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(VERSIONS_CHANNEL)
+                if reconnecting:
+                    # Lo publicado mientras no había suscripción se desconoce
+                    self.invalidate()
+                reconnecting = True
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        changed = set(json.loads(message["data"])) & set(TABLES)
+                        if changed:
+                            self.invalidate(*changed)
+            except (redis.RedisError, ValueError) as e:
+                mark_unavailable(e)
+                self._stopping.wait(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    pubsub.close()
+                except redis.RedisError:
+                    pass
+
+
+# Instancia global del proceso
+reference_data = ReferenceData()
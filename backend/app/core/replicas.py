@@ -0,0 +1,310 @@
+"""
+Enrutado de lecturas a réplicas de MySQL
+
+Las sesiones marcadas como de solo lectura (peticiones GET/HEAD, lecturas del
+bot, barridos de los workers) envían sus consultas a una réplica; todo lo
+demás va al primario:
+
+- Escrituras: el flush y las sentencias INSERT/UPDATE/DELETE o
+  SELECT ... FOR UPDATE van siempre al primario, y hasta el commit la sesión
+  sigue leyendo del primario (sus cambios sin confirmar solo existen ahí).
+- Retraso: un hilo por proceso escribe un latido en el primario cada
+  REPLICA_LAG_CHECK_SECONDS y lo lee en cada réplica. El retraso medido es una
+  cota superior con esa resolución; las réplicas que superan
+  REPLICA_MAX_LAG_SECONDS (o no responden) dejan de recibir lecturas. Sin
+  ninguna réplica al día se lee del primario.
+- Leer lo propio: tras un commit con escrituras, las sesiones del mismo
+  usuario leen del primario durante REPLICA_STICKY_SECONDS (marca en Redis,
+  compartida por la API y el bot). Sin Redis no se puede saber y se usa el
+  primario.
+
+Sin DATABASE_REPLICA_URLS todo funciona como antes: una sola base de datos.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import redis
+from sqlalchemy import create_engine, event, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.db_pool import register_engine
+from app.core.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+# Claves en session.info
+READ_ONLY = "read_only"  # La sesión solo lee: puede usar una réplica
+SESSION_USER = "session_user_id"  # Usuario cuyas escrituras recientes debe ver la sesión
+_PENDING_WRITES = "replica_pending_writes"  # Escrituras en la transacción actual
+_BIND = "replica_bind"  # Engine elegido para leer (False = primario)
+
+# Marca en Redis de los usuarios con escrituras recientes
+RECENT_WRITE_PREFIX = "sva:db:recent_write:"
+
+# Fila única de la tabla replica_heartbeat
+HEARTBEAT_ID = 1
+
+
+@dataclass
+class Replica:
+    """Réplica de lectura y su último retraso medido"""
+    engine: Engine
+    lag: Optional[float] = None  # Segundos; None = desconocido o sin respuesta
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """Réplicas de lectura del proceso y monitor de su retraso"""
+
+    def __init__(self):
+        self._primary: Optional[Engine] = None
+        self._replicas: list[Replica] = []
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def configure(self, primary: Engine, urls: list[str], **engine_options) -> None:
+        """
+        Definir el primario y crear los engines de las réplicas
+
+        Args:
+            primary: Engine del primario (donde se escribe el latido)
+            urls: URLs de conexión de las réplicas
+            **engine_options: Opciones de create_engine (las mismas del primario)
+        """
+        self._primary = primary
+        self._replicas = [Replica(create_engine(url, **engine_options)) for url in urls]
+        for index, replica in enumerate(self._replicas):
+            register_engine(f"replica{index}", replica.engine)
+
+    @property
+    def enabled(self) -> bool:
+        """Si hay réplicas configuradas"""
+        return bool(self._replicas)
+
+    def pick(self) -> Optional[Engine]:
+        """
+        Elegir una réplica al día para leer
+
+        Returns:
+            Engine de una réplica con retraso aceptable o None (usar el primario)
+        """
+        if not self._replicas:
+            return None
+        self._reset_after_fork()
+        self._ensure_monitor()
+
+        healthy = [
+            replica for replica in self._replicas
+            if replica.lag is not None and replica.lag <= settings.REPLICA_MAX_LAG_SECONDS
+        ]
+        return random.choice(healthy).engine if healthy else None
+
+    def status(self) -> list[dict]:
+        """
+        Retraso actual de cada réplica (diagnóstico)
+
+        Las réplicas se identifican por su índice, igual que sus pools en
+        pool_stats(): /health/db es público y la URL revela usuario, host y base.
+        """
+        return [{"replica": f"replica{index}", "lag": replica.lag} for index, replica in enumerate(self._replicas)]
+
+    def check(self) -> None:
+        """Medir el retraso de cada réplica y escribir un nuevo latido en el primario"""
+        from app.models.replica_heartbeat import ReplicaHeartbeat
+
+        now = time.time()
+        for replica in self._replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    beat = conn.execute(
+                        select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == HEARTBEAT_ID)
+                    ).scalar()
+                lag = None if beat is None else max(0.0, now - beat)
+            except SQLAlchemyError as e:
+                if replica.lag is not None:
+                    logger.warning(f"Réplica {replica.name} sin respuesta: {e}")
+                lag = None
+            if lag is not None and lag > settings.REPLICA_MAX_LAG_SECONDS and (
+                replica.lag is None or replica.lag <= settings.REPLICA_MAX_LAG_SECONDS
+            ):
+                logger.warning(f"Réplica {replica.name} atrasada {lag:.1f}s, se deja de leer de ella")
+            replica.lag = lag
+
+        try:
+            with self._primary.begin() as conn:
+                updated = conn.execute(
+                    update(ReplicaHeartbeat)
+                    .where(ReplicaHeartbeat.id == HEARTBEAT_ID)
+                    .values(beat_at=now)
+                ).rowcount
+                if not updated:
+                    conn.execute(insert(ReplicaHeartbeat).values(id=HEARTBEAT_ID, beat_at=now))
+        except SQLAlchemyError as e:
+            logger.warning(f"No se pudo escribir el latido de replicación: {e}")
+
+    def stop(self) -> None:
+        """Detener el monitor de retraso (cierre del proceso)"""
+        self._stopping.set()
+
+    def _ensure_monitor(self) -> None:
+        with self._lock:
+            if self._monitor is not None and self._monitor.is_alive():
+                return
+            if self._stopping.is_set():
+                return
+            self._monitor = threading.Thread(
+                target=self._run_monitor, name="replica-lag-monitor", daemon=True
+            )
+            self._monitor.start()
+
+    def _run_monitor(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error midiendo el retraso de las réplicas: {e}")
+            self._stopping.wait(settings.REPLICA_LAG_CHECK_SECONDS)
+
+    def _reset_after_fork(self) -> None:
+        """Descartar las mediciones heredadas del proceso padre (las conexiones las descarta db_pool)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        for replica in self._replicas:
+            replica.lag = None
+        self._monitor = None
+
+
+# Instancia global del proceso (configurada en app/core/database.py)
+replicas = ReplicaSet()
+
+
+# ==============================================================================
+# Leer lo propio
+# ==============================================================================
+
+
+def mark_recent_write(user_id: str) -> None:
+    """Hacer que las lecturas del usuario vayan al primario durante REPLICA_STICKY_SECONDS"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.set(
+            f"{RECENT_WRITE_PREFIX}{user_id}", 1,
+            px=int(settings.REPLICA_STICKY_SECONDS * 1000),
+        )
+    except redis.RedisError as e:
+        mark_unavailable(e)
+
+
+def has_recent_write(user_id: str) -> bool:
+    """Si el usuario escribió hace poco (True también si Redis no responde)"""
+    client = get_redis()
+    if client is None:
+        return True
+    try:
+        return bool(client.exists(f"{RECENT_WRITE_PREFIX}{user_id}"))
+    except redis.RedisError as e:
+        mark_unavailable(e)
+        return True
+
+
+# ==============================================================================
+# Sesión con enrutado
+# ==============================================================================
+
+
+def bind_user(db: Session, user_id: str) -> None:
+    """
+    Asociar la sesión a un usuario: verá sus propias escrituras recientes y
+    sus commits harán que sus siguientes lecturas vayan al primario
+
+    Args:
+        db: Sesión de base de datos
+        user_id: ID del usuario
+    """
+    db.info[SESSION_USER] = user_id
+
+
+def require_primary(db: Session) -> None:
+    """
+    Hacer que el resto de las lecturas de la sesión vayan al primario
+
+    Args:
+        db: Sesión de base de datos
+    """
+    db.info[_BIND] = False
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    return bool(getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None)
+
+
+class RoutingSession(Session):
+    """Sesión que envía las lecturas de las sesiones de solo lectura a una réplica"""
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        primary = super().get_bind(mapper, clause=clause, **kw)
+
+        if self._flushing or _is_write(clause):
+            self.info[_PENDING_WRITES] = True
+            return primary
+        if not self.info.get(READ_ONLY) or self.info.get(_PENDING_WRITES):
+            return primary
+
+        # La réplica se elige una vez por sesión: sus lecturas son coherentes entre sí
+        bind = self.info.get(_BIND)
+        if bind is None:
+            bind = self.info[_BIND] = self._choose_replica()
+        return bind or primary
+
+    def _choose_replica(self):
+        replica = replicas.pick()
+        if replica is None:
+            return False
+        user_id = self.info.get(SESSION_USER)
+        if user_id and has_recent_write(user_id):
+            return False
+        return replica
+
+
+def _after_commit(session: Session):
+    """Recordar las escrituras del usuario: sus lecturas siguientes van al primario"""
+    if session.info.pop(_PENDING_WRITES, False):
+        user_id = session.info.get(SESSION_USER)
+        if user_id:
+            if replicas.enabled:
+                mark_recent_write(user_id)
+            # También en esta sesión (ej: refresh() después del commit)
+            session.info[_BIND] = False
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_WRITES, None)
+
+
+def track_replica_routing(session_factory: sessionmaker):
+    """
+    Registrar los eventos de sesión del enrutado a réplicas
+
+    Args:
+        session_factory: sessionmaker creado con class_=RoutingSession
+    """
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
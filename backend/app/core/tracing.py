@@ -0,0 +1,233 @@
+"""
+Trazas distribuidas con OpenTelemetry
+
+Una traza sigue una operación de punta a punta: la petición HTTP que crea una
+tarea, sus consultas SQL y su commit, el evento de dominio que publica, el
+consumidor que lo procesa y la llamada a Telegram que entrega la
+notificación. Los spans se abren en:
+
+- Peticiones HTTP (app/api/http_tracing.py) y comandos del bot
+- Sentencias SQL y commits de sesión (este módulo)
+- Eventos de dominio: el contexto viaja en el mensaje del stream
+- Tareas de Celery: el contexto viaja en las cabeceras del mensaje
+  (app/workers/monitoring.py)
+- Helpers de notificación y llamadas a la API de Telegram
+
+El contexto se propaga con el formato W3C `traceparent`. Sin
+TRACING_ENABLED el proveedor es el no-op de OpenTelemetry: los spans no se
+registran y su coste es mínimo. Para uso sin colector los spans se escriben
+en consola o en un archivo JSON (una línea por span).
+"""
+import functools
+import inspect
+import json
+import logging
+from typing import Callable, Mapping, Optional
+
+from opentelemetry import context, propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.query_profiler import statement_shape
+
+logger = logging.getLogger(__name__)
+
+# Tracer de la aplicación (no-op hasta que se llame a configure_tracing())
+tracer = trace.get_tracer("sva")
+
+# Longitud máxima de la sentencia guardada en los spans SQL
+MAX_STATEMENT_LENGTH = 1000
+
+# Claves en conn.info / session.info de los spans abiertos
+_QUERY_SPANS = "trace_query_spans"
+_COMMIT_SPAN = "trace_commit_span"
+
+_configured = False
+
+
+def configure_tracing() -> None:
+    """
+    Instalar el proveedor de trazas del proceso según la configuración
+
+    Se llama una vez al arrancar cada proceso (API, bot, consumidores,
+    worker); sin TRACING_ENABLED no hace nada.
+    """
+    global _configured
+    if _configured or not settings.TRACING_ENABLED:
+        return
+    _configured = True
+
+    if settings.TRACING_EXPORTER == "file":
+        # Una línea JSON por span; el archivo se abre en modo append para que
+        # varios procesos (hijos prefork) puedan compartirlo
+        exporter = ConsoleSpanExporter(
+            out=open(settings.TRACING_FILE, "a", buffering=1, encoding="utf-8"),
+            formatter=_span_json_line,
+        )
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": f"sva-{settings.PROCESS_ROLE}",
+            "service.version": settings.APP_VERSION,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATE)),
+    )
+    # BatchSpanProcessor reinicia su hilo en los hijos tras un fork
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Trazas habilitadas ({settings.TRACING_EXPORTER})")
+
+
+def _span_json_line(span: ReadableSpan) -> str:
+    return json.dumps(json.loads(span.to_json()), ensure_ascii=False) + "\n"
+
+
+# ==============================================================================
+# Propagación
+# ==============================================================================
+
+
+def inject_context() -> dict[str, str]:
+    """
+    Contexto de traza actual para enviarlo a otro proceso
+
+    Returns:
+        dict con `traceparent` (y `tracestate`), vacío si no hay traza activa
+    """
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Mapping[str, str]]) -> context.Context:
+    """
+    Contexto de traza recibido de otro proceso
+
+    Args:
+        carrier: dict con `traceparent` (None o vacío = nueva traza)
+
+    Returns:
+        Contexto para usar como padre de los spans
+    """
+    return propagate.extract(carrier or {})
+
+
+def current_trace_id() -> Optional[str]:
+    """Id (hex) de la traza activa si se está registrando"""
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return None
+    return trace.format_trace_id(span.get_span_context().trace_id)
+
+
+def traced(name: Optional[str] = None, kind: SpanKind = SpanKind.INTERNAL):
+    """
+    Decorador que ejecuta la función (síncrona o async) dentro de un span
+
+    Args:
+        name: Nombre del span (por defecto `<módulo>.<función>`)
+        kind: Tipo de span
+
+    Ejemplo:
+        @traced()
+        def send_task_assignment_notification(...):
+            ...
+    """
+    def decorator(func: Callable):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name, kind=kind):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# ==============================================================================
+# SQL
+# ==============================================================================
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context_, executemany):
+    # Solo dentro de una traza: las consultas sueltas (latido, recargas) no abren trazas nuevas
+    if not trace.get_current_span().is_recording():
+        return
+    span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.engine.dialect.name,
+            "db.statement": statement_shape(statement)[:MAX_STATEMENT_LENGTH],
+        },
+    )
+    conn.info.setdefault(_QUERY_SPANS, []).append(span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context_, executemany):
+    spans = conn.info.get(_QUERY_SPANS)
+    if spans:
+        span = spans.pop()
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get(_QUERY_SPANS) if conn is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+def _before_commit(session: Session):
+    if trace.get_current_span().is_recording():
+        session.info[_COMMIT_SPAN] = tracer.start_span("db.commit")
+
+
+def _after_commit(session: Session):
+    span = session.info.pop(_COMMIT_SPAN, None)
+    if span is not None:
+        span.end()
+
+
+def _after_rollback(session: Session):
+    span = session.info.pop(_COMMIT_SPAN, None)
+    if span is not None:
+        span.set_status(Status(StatusCode.ERROR, "rollback"))
+        span.end()
+
+
+def track_commits(session_factory: sessionmaker):
+    """
+    Registrar los eventos de sesión que miden cada commit (flush incluido)
+
+    Args:
+        session_factory: sessionmaker de la aplicación
+    """
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
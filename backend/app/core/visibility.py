@@ -0,0 +1,195 @@
+"""
+Alcances de visibilidad por rol compilados a SQL
+
+Las reglas de acceso del modelo de roles se expresan como predicados de
+SQLAlchemy reutilizables en cualquier consulta (listados, detalles,
+exportaciones, mutaciones), de modo que cada comprobación de permisos es un
+filtro más de la consulta que carga los datos y no una carga seguida de
+comprobaciones en Python.
+
+Reglas:
+- Administrador: acceso total
+- Proyecto visible: dueño, responsable de alguna de sus tareas o supervisor de su área
+- Proyecto modificable: dueño o supervisor de su área
+- Tarea visible: dueño del proyecto, responsable, creador o supervisor del área del proyecto
+- Tarea modificable: dueño del proyecto, responsable o supervisor del área del proyecto
+- Tarea administrable (archivar): la de su proyecto (dueño o supervisor del área)
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import ColumnElement, exists, or_, select, true
+from sqlalchemy.orm import aliased
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone, TombstoneReason
+
+# Alias propios de las subconsultas EXISTS: así no se correlacionan con un
+# Project/Task que la consulta exterior ya tenga en su FROM
+_scope_project = aliased(Project, name="scope_project")
+_scope_task = aliased(Task, name="scope_task")
+
+
+@dataclass(frozen=True)
+class VisibilityScope:
+    """Datos del usuario que determinan su alcance (sin necesidad de la fila User)"""
+    user_id: str
+    role: str
+    area_id: Optional[str] = None
+
+    @classmethod
+    def of(cls, user) -> "VisibilityScope":
+        """
+        Construir el alcance de un usuario
+
+        Args:
+            user: Instancia de User (o cualquier objeto con id, role y area_id)
+
+        Returns:
+            VisibilityScope del usuario
+        """
+        return cls(user_id=user.id, role=user.role, area_id=user.area_id)
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "administrador"
+
+    @property
+    def supervised_area_id(self) -> Optional[str]:
+        """Área cuyos proyectos supervisa el usuario (None si no es supervisor)"""
+        return self.area_id if self.role == "supervisor" else None
+
+
+def _owned_or_supervised(project, scope: VisibilityScope) -> ColumnElement[bool]:
+    """Proyecto del usuario o de su área supervisada"""
+    conditions = [project.owner_id == scope.user_id]
+    if scope.supervised_area_id:
+        conditions.append(project.area_id == scope.supervised_area_id)
+    return or_(*conditions)
+
+
+def project_visible(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre Project: proyectos visibles para el usuario
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter() o como columna
+    """
+    if scope.is_admin:
+        return true()
+    # Semijoin sobre el índice (responsible_id, project_id): se detiene en la
+    # primera tarea asignada, así que el coste no depende del tamaño del proyecto
+    has_assigned_tasks = select(_scope_task.project_id).where(
+        _scope_task.responsible_id == scope.user_id,
+        _scope_task.project_id == Project.id,
+    ).exists()
+    return or_(_owned_or_supervised(Project, scope), has_assigned_tasks)
+
+
+def project_modifiable(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre Project: proyectos que el usuario puede modificar
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter() o como columna
+    """
+    if scope.is_admin:
+        return true()
+    return _owned_or_supervised(Project, scope)
+
+
+def _in_managed_project(scope: VisibilityScope) -> ColumnElement[bool]:
+    """Tarea de un proyecto del usuario o de su área supervisada"""
+    conditions = [
+        exists().where(
+            _scope_project.id == Task.project_id,
+            _scope_project.owner_id == scope.user_id,
+        )
+    ]
+    if scope.supervised_area_id:
+        # tasks.area_id replica el área del proyecto: sin subconsulta
+        conditions.insert(0, Task.area_id == scope.supervised_area_id)
+    return or_(*conditions)
+
+
+def task_visible(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre Task: tareas visibles para el usuario
+
+    No requiere unir Project en la consulta exterior.
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter() o como columna
+    """
+    if scope.is_admin:
+        return true()
+    return or_(
+        Task.responsible_id == scope.user_id,
+        Task.created_by == scope.user_id,
+        _in_managed_project(scope),
+    )
+
+
+def task_modifiable(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre Task: tareas que el usuario puede editar, cambiar de estado o eliminar
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter() o como columna
+    """
+    if scope.is_admin:
+        return true()
+    return or_(Task.responsible_id == scope.user_id, _in_managed_project(scope))
+
+
+def task_manageable(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre Task: tareas que el usuario puede archivar o desarchivar
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter() o como columna
+    """
+    if scope.is_admin:
+        return true()
+    return _in_managed_project(scope)
+
+
+def tombstone_visible(scope: VisibilityScope) -> ColumnElement[bool]:
+    """
+    Predicado sobre TaskTombstone: bajas que afectan a la vista del usuario
+
+    Las lápidas de reasignación solo interesan a quien deja de ver la tarea,
+    por eso el administrador (que ve todas) solo recibe las eliminaciones.
+
+    Args:
+        scope: Alcance del usuario
+
+    Returns:
+        Expresión booleana para usar en filter()
+    """
+    if scope.is_admin:
+        return TaskTombstone.reason == TombstoneReason.ELIMINADA
+    conditions = [
+        TaskTombstone.project_owner_id == scope.user_id,
+        TaskTombstone.responsible_id == scope.user_id,
+        TaskTombstone.created_by == scope.user_id,
+    ]
+    if scope.supervised_area_id:
+        conditions.append(TaskTombstone.area_id == scope.supervised_area_id)
+    return or_(*conditions)
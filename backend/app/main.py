@@ -3,9 +3,23 @@ Aplicación principal FastAPI
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.core.config import settings
+from app.api.conditional import NotModified, not_modified_handler
+from app.api.sql_profiling import SQLProfilerMiddleware
+from app.api.http_metrics import HTTPMetricsMiddleware
+from app.api.http_tracing import TracingMiddleware
+from app.services.live_updates import broadcaster
+from app.core.reference_data import reference_data
+from app.core.replicas import replicas
+from app.core.db_pool import pool_stats
+from app.core.metrics import QueueCollector, add_collector, render
+from app.core.tracing import configure_tracing
+
+# Trazas (no-op sin TRACING_ENABLED)
+configure_tracing()
 
 # Crear app FastAPI
 app = FastAPI(
@@ -16,6 +30,9 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Respuestas 304 para peticiones condicionales (ETag / Last-Modified)
+app.add_exception_handler(NotModified, not_modified_handler)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,8 +40,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Server-Timing", "X-DB-Queries", "X-Trace-Id"],
 )
 
+# Consultas y tiempo de BD por petición (cabeceras Server-Timing / X-DB-Queries)
+app.add_middleware(SQLProfilerMiddleware)
+
+# Latencia y códigos de respuesta por ruta (GET /metrics)
+app.add_middleware(HTTPMetricsMiddleware)
+
+# La profundidad de las colas es global: solo la expone la API
+add_collector(QueueCollector())
+
+# Span raíz de cada petición (cabecera X-Trace-Id); el más externo para
+# que los demás middlewares queden dentro de la traza
+app.add_middleware(TracingMiddleware)
+
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -53,11 +84,41 @@ async def health_check():
     )
 
 
+@app.get("/health/db", tags=["Health"])
+async def database_health():
+    """
+    Estado de los pools de conexiones (espera en el checkout, saturación,
+    overflow) y retraso de las réplicas de lectura de este proceso
+    """
+    return {
+        "process_role": settings.PROCESS_ROLE,
+        "pools": pool_stats(),
+        "replicas": replicas.status(),
+    }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics():
+    """
+    Métricas de Prometheus: latencia por ruta, pools de conexiones, colas,
+    cachés y llamadas a Telegram de este proceso
+    """
+    return Response(content=render(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Incluir routers de la API
 from app.api.v1.api import api_router
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.on_event("shutdown")
+async def stop_background_threads():
+    """Cerrar las suscripciones a Redis (stream en vivo y datos de referencia) y el monitor de réplicas"""
+    await broadcaster.stop()
+    reference_data.stop()
+    replicas.stop()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -5,8 +5,14 @@ from app.models.area import Area
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.task_tombstone import TaskTombstone, TombstoneReason
 from app.models.notification import Notification, NotificationType
 from app.models.telegram_link_code import TelegramLinkCode
+from app.models.replica_heartbeat import ReplicaHeartbeat
+from app.models.job_checkpoint import JobCheckpoint
+from app.models.notification_delivery import NotificationDelivery, DeliveryStatus
+from app.models.digest_payload import DigestPayload
+from app.models.domain_event_outbox import DomainEventOutbox
 
 __all__ = [
     "Area",
@@ -15,7 +21,15 @@ __all__ = [
     "Task",
     "TaskStatus",
     "TaskPriority",
+    "TaskTombstone",
+    "TombstoneReason",
     "Notification",
     "NotificationType",
     "TelegramLinkCode",
+    "ReplicaHeartbeat",
+    "JobCheckpoint",
+    "NotificationDelivery",
+    "DeliveryStatus",
+    "DigestPayload",
+    "DomainEventOutbox",
 ]
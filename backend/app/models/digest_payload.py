@@ -0,0 +1,40 @@
+"""
+Modelo de Resumen Preparado (mensajes de los resúmenes generados antes del envío)
+"""
+import uuid
+from sqlalchemy import Column, String, Text, Enum, TIMESTAMP, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.notification import NotificationType
+
+
+class DigestPayload(Base):
+    """
+    Resumen diario o semanal ya generado para un usuario
+
+    Los shards de preparación (fuera de la hora pico) guardan aquí el mensaje
+    de cada usuario de una ejecución (`run_id`, ej: "daily:2026-10-19"); a la
+    hora programada los shards de envío solo leen y envían.
+    """
+
+    __tablename__ = "digest_payloads"
+    __table_args__ = (
+        UniqueConstraint("run_id", "user_id", name="uq_digest_payloads_run_user"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String(100), nullable=False)
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    type = Column(Enum(NotificationType, values_callable=lambda obj: [e.value for e in obj]), nullable=False)
+    message = Column(Text, nullable=False)  # Mensaje de Telegram (HTML)
+    summary = Column(Text, nullable=False)  # Texto de la notificación que se registra al enviar
+    rendered_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<DigestPayload(run_id={self.run_id}, user_id={self.user_id})>"
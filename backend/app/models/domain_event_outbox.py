@@ -0,0 +1,28 @@
+"""
+Modelo de Outbox de eventos de dominio
+"""
+from sqlalchemy import Column, String, Text, Double
+
+from app.core.database import Base
+
+
+class DomainEventOutbox(Base):
+    """
+    Evento de dominio pendiente de agregar al stream `sva:events`
+
+    Se escribe en la misma transacción que el cambio que lo produce (ver
+    app/core/domain_events.py): si Redis no está disponible o el proceso
+    termina antes de publicarlo, el evento no se pierde. Las filas se borran
+    al publicarlas; las que quedan las publica el relay de los consumidores.
+    """
+
+    __tablename__ = "domain_event_outbox"
+
+    id = Column(String(36), primary_key=True)
+    type = Column(String(50), nullable=False)
+    data = Column(Text, nullable=False)  # JSON
+    trace = Column(Text, nullable=True)  # Contexto de traza en JSON
+    created_at = Column(Double, nullable=False, index=True)  # Epoch en segundos (campo `ts` del stream)
+
+    def __repr__(self):
+        return f"<DomainEventOutbox(id={self.id}, type='{self.type}')>"
@@ -0,0 +1,42 @@
+"""
+Modelo de Checkpoint de Ejecución (progreso de los envíos masivos de los workers)
+"""
+import uuid
+from sqlalchemy import Column, String, Integer, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class JobCheckpoint(Base):
+    """
+    Progreso de un shard de una ejecución de un envío masivo
+
+    Una ejecución (`run_id`, ej: "daily:2026-10-19") se reparte en shards por
+    rango de ids: (start_after, end_at], ambos extremos opcionales. El shard
+    avanza `position` (último id procesado) y sus contadores en la misma
+    transacción en que registra los envíos de cada lote, así que un
+    reintento o un worker reemplazado sigue desde ahí.
+    """
+
+    __tablename__ = "job_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("run_id", "shard", name="uq_job_checkpoints_run_shard"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String(100), nullable=False, index=True)
+    shard = Column(Integer, nullable=False, default=0)
+    start_after = Column(String(36), nullable=True)  # Sin límite inferior si es NULL
+    end_at = Column(String(36), nullable=True)  # Sin límite superior si es NULL
+    position = Column(String(36), nullable=True)  # Último id procesado
+    processed = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)  # Ya reclamados por otra ejecución o intento
+    completed_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<JobCheckpoint(run_id={self.run_id}, shard={self.shard}, position={self.position})>"
@@ -0,0 +1,52 @@
+"""
+Modelo de Entrega de Notificación (claves de idempotencia de los envíos de los workers)
+"""
+import uuid
+from sqlalchemy import Column, String, Enum, TIMESTAMP, ForeignKey
+from sqlalchemy.sql import func
+import enum
+
+from app.core.database import Base
+from app.models.notification import NotificationType
+
+
+class DeliveryStatus(str, enum.Enum):
+    """Estado de una entrega"""
+    PENDIENTE = "pendiente"  # Reclamada; si un intento muere aquí, no se reenvía
+    ENVIADA = "enviada"
+    FALLIDA = "fallida"  # Telegram la rechazó: otro intento puede reclamarla
+
+
+class NotificationDelivery(Base):
+    """
+    Entrega de una notificación de los workers
+
+    La clave de idempotencia (`run_id:user_id:type`) es única: reclamar un
+    envío es un insert-or-skip, así que un reintento, un worker reemplazado o
+    una segunda ejecución no vuelven a enviar lo que otro ya reclamó.
+    """
+
+    __tablename__ = "notification_deliveries"
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    idempotency_key = Column(String(191), nullable=False, unique=True)
+    run_id = Column(String(100), nullable=False, index=True)
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    task_id = Column(String(36), nullable=True)
+    type = Column(Enum(NotificationType, values_callable=lambda obj: [e.value for e in obj]), nullable=False)
+    status = Column(
+        Enum(DeliveryStatus, values_callable=lambda obj: [e.value for e in obj]),
+        default=DeliveryStatus.PENDIENTE,
+        nullable=False
+    )
+    attempt_id = Column(String(36), nullable=False)  # Intento que la reclamó
+    sent_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<NotificationDelivery(key={self.idempotency_key}, status='{self.status.value}')>"
@@ -0,0 +1,24 @@
+"""
+Modelo de Latido de Replicación (medición del retraso de las réplicas de lectura)
+"""
+from sqlalchemy import Column, Integer, Double
+
+from app.core.database import Base
+
+
+class ReplicaHeartbeat(Base):
+    """
+    Latido de replicación
+
+    Una sola fila que el monitor de réplicas (app/core/replicas.py) actualiza
+    en el primario cada REPLICA_LAG_CHECK_SECONDS. El valor que se lee en cada
+    réplica indica hasta qué instante llegó su replicación.
+    """
+
+    __tablename__ = "replica_heartbeat"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    beat_at = Column(Double, nullable=False)  # Epoch en segundos (con fracción)
+
+    def __repr__(self):
+        return f"<ReplicaHeartbeat(beat_at={self.beat_at})>"
@@ -2,12 +2,17 @@
 Modelo de Tarea
 """
 import uuid
-from sqlalchemy import Column, String, Text, Enum, DateTime, TIMESTAMP, ForeignKey, Integer, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, String, Text, Enum, DateTime, TIMESTAMP, ForeignKey, Integer, Boolean, Index,
+    event, inspect, select, update,
+)
+from sqlalchemy.orm import relationship, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 import enum
 
 from app.core.database import Base
+from app.models.project import Project
 
 
 class TaskStatus(str, enum.Enum):
@@ -28,6 +33,13 @@ class Task(Base):
     """Modelo de Tarea"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Índice cubriente de "tareas asignadas por proyecto": resuelve el EXISTS
+        # de visibilidad de proyectos sin leer filas de tareas (ver app/core/visibility.py)
+        Index("ix_tasks_responsible_project", "responsible_id", "project_id"),
+        # Tableros por área y vistas del supervisor sin unir proyectos
+        Index("ix_tasks_area_status_deadline", "area_id", "status", "deadline"),
+    )
 
     id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     project_id = Column(
@@ -36,6 +48,8 @@ class Task(Base):
         nullable=False,
         index=True
     )
+    # Copia de projects.area_id (la mantienen los eventos de abajo)
+    area_id = Column(String(36), ForeignKey("areas.id", ondelete="SET NULL"), nullable=True)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(
@@ -53,8 +67,7 @@ class Task(Base):
     responsible_id = Column(
         String(36),
         ForeignKey("users.id", ondelete="SET NULL"),
-        nullable=True,
-        index=True
+        nullable=True
     )
     deadline = Column(DateTime, nullable=True, index=True)
     reminder_hours_before = Column(Integer, default=24, nullable=True)
@@ -87,3 +100,53 @@ class Task(Base):
 
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status.value}')>"
+
+
+def _project_area_id(connection, target: Task):
+    """Área del proyecto de la tarea (del proyecto en memoria si está cargado)"""
+    project = inspect(target).attrs.project.loaded_value
+    if isinstance(project, Project) and project.id == target.project_id:
+        return project.area_id
+    return connection.execute(
+        select(Project.area_id).where(Project.id == target.project_id)
+    ).scalar()
+
+
+@event.listens_for(Task, "before_insert")
+def _set_area_on_insert(mapper, connection, target: Task):
+    """Copiar el área del proyecto al crear la tarea (si no se indicó)"""
+    if target.area_id is None:
+        target.area_id = _project_area_id(connection, target)
+
+
+@event.listens_for(Task, "before_update")
+def _set_area_on_move(mapper, connection, target: Task):
+    """Actualizar el área cuando la tarea cambia de proyecto"""
+    if inspect(target).attrs.project_id.history.has_changes():
+        target.area_id = _project_area_id(connection, target)
+
+
+@event.listens_for(Project, "after_update")
+def _propagate_project_area(mapper, connection, target: Project):
+    """
+    Propagar el cambio de área de un proyecto a sus tareas
+
+    Una sola sentencia UPDATE dentro del mismo flush (que además renueva
+    `updated_at`, así la sincronización incremental entrega las tareas a los
+    supervisores del área nueva). Las tareas del proyecto ya cargadas en la
+    sesión se actualizan en memoria sin marcarse como modificadas.
+    """
+    if not inspect(target).attrs.area_id.history.has_changes():
+        return
+
+    connection.execute(
+        update(Task.__table__)
+        .where(Task.__table__.c.project_id == target.id)
+        .values(area_id=target.area_id)
+    )
+
+    session = object_session(target)
+    if session is not None:
+        for instance in list(session.identity_map.values()):
+            if isinstance(instance, Task) and instance.project_id == target.id:
+                set_committed_value(instance, "area_id", target.area_id)
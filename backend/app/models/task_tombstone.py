@@ -0,0 +1,149 @@
+"""
+Modelo de Lápida de Tarea (registro de tareas eliminadas para sincronización incremental)
+"""
+import uuid
+from sqlalchemy import Column, String, Enum, TIMESTAMP, event, insert, select, inspect
+from sqlalchemy.sql import func
+import enum
+
+from app.core.database import Base
+from app.models.project import Project
+from app.models.task import Task
+
+
+class TombstoneReason(str, enum.Enum):
+    """Motivo por el que una tarea desaparece de la vista de un usuario"""
+    ELIMINADA = "eliminada"    # Borrado físico (directo o en cascada desde el proyecto)
+    REASIGNADA = "reasignada"  # Quien la veía deja de verla (responsable, proyecto o área anteriores)
+
+
+class TaskTombstone(Base):
+    """
+    Lápida de una tarea eliminada o reasignada
+
+    Las filas de `tasks` borradas no dejan rastro en `updated_at`; la lápida
+    permite a `GET /tasks/changes` informar esas bajas a los clientes que
+    sincronizan de forma incremental. Se guardan el dueño y el área del
+    proyecto, el responsable y el creador del momento para filtrar por
+    visibilidad sin la tarea original.
+    """
+
+    __tablename__ = "task_tombstones"
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    task_id = Column(String(36), nullable=False, index=True)
+    project_id = Column(String(36), nullable=False)
+    project_owner_id = Column(String(36), nullable=True)
+    area_id = Column(String(36), nullable=True)
+    responsible_id = Column(String(36), nullable=True)
+    created_by = Column(String(36), nullable=True)
+    reason = Column(
+        Enum(TombstoneReason, values_callable=lambda obj: [e.value for e in obj]),
+        default=TombstoneReason.ELIMINADA,
+        nullable=False
+    )
+    removed_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TaskTombstone(task_id={self.task_id}, reason='{self.reason.value}')>"
+
+
+def _scope_values(target: Task) -> dict:
+    """Columnas de alcance de la lápida: dueño y área del proyecto, responsable y creador"""
+    return dict(
+        id=str(uuid.uuid4()),
+        task_id=target.id,
+        project_id=target.project_id,
+        project_owner_id=select(Project.owner_id).where(Project.id == target.project_id).scalar_subquery(),
+        area_id=target.area_id,
+        responsible_id=target.responsible_id,
+        created_by=target.created_by,
+    )
+
+
+@event.listens_for(Task, "after_delete")
+def _record_task_deleted(mapper, connection, target: Task):
+    """
+    Registrar la lápida de una tarea eliminada
+
+    Se ejecuta dentro del flush, también para las tareas borradas en cascada
+    al eliminar su proyecto (las tareas se borran antes que el proyecto, así
+    que su dueño todavía se puede leer; el área ya viene en la tarea).
+    """
+    connection.execute(
+        insert(TaskTombstone).values(**_scope_values(target), reason=TombstoneReason.ELIMINADA)
+    )
+
+
+@event.listens_for(Task, "after_update")
+def _record_task_reassigned(mapper, connection, target: Task):
+    """
+    Registrar lápidas para quienes dejan de ver la tarea al modificarla
+
+    - Reasignación: el responsable anterior (con las mismas columnas de
+      alcance que una eliminación).
+    - Cambio de proyecto o de área: el dueño del proyecto anterior y el
+      supervisor del área anterior.
+
+    Quien sigue viendo la tarea recibe también la lápida, pero la tarea
+    vuelve en `updated` de la misma ventana de sincronización, que el cliente
+    aplica después de `deleted`.
+    """
+    state = inspect(target)
+
+    for previous in state.attrs.responsible_id.history.deleted:
+        if previous:
+            connection.execute(
+                insert(TaskTombstone).values(
+                    **{**_scope_values(target), "responsible_id": previous},
+                    reason=TombstoneReason.REASIGNADA,
+                )
+            )
+
+    project_history = state.attrs.project_id.history
+    area_history = state.attrs.area_id.history
+    previous_project_id = project_history.deleted[0] if project_history.deleted else target.project_id
+    previous_area_id = area_history.deleted[0] if area_history.deleted else target.area_id
+    if previous_project_id == target.project_id and previous_area_id == target.area_id:
+        return
+
+    connection.execute(
+        insert(TaskTombstone).values(
+            id=str(uuid.uuid4()),
+            task_id=target.id,
+            project_id=previous_project_id,
+            project_owner_id=select(Project.owner_id).where(Project.id == previous_project_id).scalar_subquery(),
+            area_id=previous_area_id,
+            reason=TombstoneReason.REASIGNADA,
+        )
+    )
+
+
+@event.listens_for(Project, "after_update")
+def _record_project_area_changed(mapper, connection, target: Project):
+    """
+    Registrar una lápida por tarea para el supervisor del área anterior del proyecto
+
+    El cambio de área se propaga a `tasks.area_id` con una sentencia UPDATE
+    (ver app/models/task.py), sin eventos por tarea.
+    """
+    history = inspect(target).attrs.area_id.history
+    previous_area_id = history.deleted[0] if history.deleted else None
+    if not history.has_changes() or previous_area_id is None:
+        return
+
+    task_ids = connection.execute(select(Task.id).where(Task.project_id == target.id)).scalars().all()
+    if task_ids:
+        connection.execute(
+            insert(TaskTombstone),
+            [
+                dict(
+                    id=str(uuid.uuid4()),
+                    task_id=task_id,
+                    project_id=target.id,
+                    area_id=previous_area_id,
+                    reason=TombstoneReason.REASIGNADA,
+                )
+                for task_id in task_ids
+            ],
+        )
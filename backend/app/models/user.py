@@ -2,10 +2,12 @@
 Modelo de Usuario
 """
 import uuid
-from sqlalchemy import Column, String, Boolean, BigInteger, TIMESTAMP, Enum, ForeignKey
+from datetime import time
+from sqlalchemy import Column, String, Boolean, BigInteger, TIMESTAMP, Time, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from app.core.config import settings
 from app.core.database import Base
 
 
@@ -13,6 +15,10 @@ class User(Base):
     """Modelo de Usuario del sistema"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Usuarios de cada horario de resumen (app/workers/summary_tasks.py)
+        Index("ix_users_digest_bucket", "timezone", "digest_time"),
+    )
 
     id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -28,6 +34,16 @@ class User(Base):
         index=True
     )
     area_id = Column(String(36), ForeignKey('areas.id', ondelete='SET NULL'), nullable=True, index=True)
+    # Zona horaria IANA y hora local del resumen diario (el semanal sale los lunes, después)
+    # (server_default: mismo valor que la migración, para filas insertadas fuera del ORM)
+    timezone = Column(
+        String(64), nullable=False,
+        default=lambda: settings.DEFAULT_TIMEZONE, server_default='America/Guatemala'
+    )
+    digest_time = Column(
+        Time, nullable=False,
+        default=lambda: time.fromisoformat(settings.DEFAULT_DIGEST_TIME), server_default='08:00:00'
+    )
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(
         TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False
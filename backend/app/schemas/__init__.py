@@ -23,6 +23,9 @@ from app.schemas.task import (
     TaskStatusUpdate,
     TaskResponse,
     TaskWithDetails,
+    TaskChanges,
+    TaskImportRowError,
+    TaskImportResult,
 )
 from app.schemas.auth import (
     Token,
@@ -52,6 +55,9 @@ __all__ = [
     "TaskStatusUpdate",
     "TaskResponse",
     "TaskWithDetails",
+    "TaskChanges",
+    "TaskImportRowError",
+    "TaskImportResult",
     # Auth
     "Token",
     "TokenData",
@@ -86,3 +86,30 @@ class TaskWithDetails(TaskResponse):
     deadline_status: Optional[str] = None  # "Vencido", "Urgente", "En plazo", etc.
 
     model_config = {"from_attributes": True}
+
+
+class TaskChanges(BaseModel):
+    """Cambios de tareas desde un token de sincronización"""
+    updated: list[TaskWithDetails] = Field(
+        default=[], description="Tareas creadas, modificadas o archivadas (reemplazar en la caché local)"
+    )
+    deleted: list[str] = Field(
+        default=[], description="IDs de tareas eliminadas o que dejaron de ser visibles (aplicar antes que updated)"
+    )
+    next_token: str = Field(..., description="Token para la siguiente llamada")
+    has_more: bool = Field(False, description="Hay más cambios: repetir inmediatamente con next_token")
+
+
+class TaskImportRowError(BaseModel):
+    """Error de validación de una fila durante la importación"""
+    row: int = Field(..., description="Número de línea en el archivo (la cabecera es la línea 1)")
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    """Resultado de una importación masiva de tareas"""
+    total_rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list[TaskImportRowError] = []
+    errors_truncated: bool = False
@@ -2,7 +2,8 @@
 Schemas Pydantic para Usuario
 """
 from typing import Optional, Literal
-from datetime import datetime
+from datetime import datetime, time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
 # Tipos literales para role
@@ -42,6 +43,28 @@ class UserUpdate(BaseModel):
     telegram_chat_id: Optional[int] = None
     role: Optional[UserRole] = Field(None, description="Rol del usuario en el sistema")
     area_id: Optional[str] = Field(None, description="ID del área a la que pertenece el usuario")
+    timezone: Optional[str] = Field(None, max_length=64, description="Zona horaria IANA (ej: America/Guatemala)")
+    digest_time: Optional[time] = Field(None, description="Hora local del resumen diario (HH:MM)")
+
+    @field_validator('timezone')
+    @classmethod
+    def validate_timezone(cls, v: Optional[str]) -> Optional[str]:
+        """Validar que la zona horaria exista"""
+        if v is None:
+            return v
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError('La zona horaria no es válida (ej: America/Guatemala)')
+        return v
+
+    @field_validator('digest_time')
+    @classmethod
+    def validate_digest_time(cls, v: Optional[time]) -> Optional[time]:
+        """Los resúmenes se programan por minuto: sin segundos ni zona"""
+        if v is None:
+            return v
+        return v.replace(second=0, microsecond=0, tzinfo=None)
 
 
 class UserChangePassword(BaseModel):
@@ -66,6 +89,8 @@ class UserResponse(UserBase):
     """Schema de respuesta de usuario"""
     id: str
     telegram_chat_id: Optional[int] = None
+    timezone: str
+    digest_time: time
     is_active: bool
     created_at: datetime
     updated_at: datetime
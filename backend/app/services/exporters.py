@@ -0,0 +1,235 @@
+"""
+Serializadores incrementales para exportación de datos (CSV y XLSX)
+
+Ambos generadores consumen un iterable de filas y producen bloques de bytes
+a medida que avanzan, de modo que la memoria usada no depende del número de
+filas exportadas.
+"""
+import csv
+import enum
+import io
+import re
+import zipfile
+from datetime import datetime, date
+from typing import Any, Iterable, Iterator, Literal, Sequence
+from xml.sax.saxutils import escape
+
+# Formatos de exportación soportados
+ExportFormat = Literal['csv', 'xlsx']
+
+# Tamaño aproximado (bytes) a acumular antes de entregar un bloque al cliente
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def format_value(value: Any) -> Any:
+    """
+    Normalizar un valor de la BD para su exportación
+
+    Args:
+        value: Valor crudo (enum, fecha, booleano, etc.)
+
+    Returns:
+        Valor listo para escribirse en la celda
+    """
+    if value is None:
+        return ''
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, bool):
+        return 'Sí' if value else 'No'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Generar un CSV (UTF-8 con BOM para compatibilidad con Excel) por bloques
+
+    Args:
+        header: Nombres de las columnas
+        rows: Iterable de filas
+
+    Yields:
+        bytes: Bloques del archivo CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write('\ufeff')
+    writer.writerow(header)
+
+    for row in rows:
+        writer.writerow([format_value(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _StreamBuffer:
+    """Destino no posicionable para ZipFile que acumula los bytes escritos"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+
+_XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+
+# Caracteres que XML 1.0 no admite ni escapados (controles salvo \t, \n y \r,
+# sustitutos sueltos, U+FFFE y U+FFFF): Excel rechaza el libro si aparecen
+_XML_ILLEGAL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+def _xml_text(value: str) -> str:
+    """Escapar un texto para XML eliminando los caracteres no admitidos"""
+    return escape(_XML_ILLEGAL_CHARS.sub('', value))
+
+
+def _xlsx_row(values: Sequence[Any]) -> bytes:
+    """Serializar una fila como XML de SpreadsheetML (strings en línea)"""
+    cells = []
+    for value in values:
+        value = format_value(value)
+        if isinstance(value, (int, float)):
+            cells.append(f'<c t="n"><v>{value}</v></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is><t>{_xml_text(str(value))}</t></is></c>')
+    return f'<row>{"".join(cells)}</row>'.encode('utf-8')
+
+
+def iter_xlsx(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    sheet_name: str = 'Datos',
+) -> Iterator[bytes]:
+    """
+    Generar un libro XLSX de una hoja por bloques, sin dependencias externas
+
+    El ZIP se escribe sobre un destino no posicionable (descriptores de datos),
+    por lo que cada bloque comprimido se entrega apenas está disponible.
+
+    Args:
+        header: Nombres de las columnas
+        rows: Iterable de filas
+        sheet_name: Nombre de la hoja
+
+    Yields:
+        bytes: Bloques del archivo XLSX
+    """
+    stream = _StreamBuffer()
+
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _XLSX_WORKBOOK.format(sheet_name=_xml_text(sheet_name)))
+        archive.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+
+        with archive.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True) as sheet:
+            sheet.write(_XLSX_SHEET_HEAD.encode('utf-8'))
+            sheet.write(_xlsx_row(header))
+
+            for row in rows:
+                sheet.write(_xlsx_row(row))
+                if stream.size >= CHUNK_SIZE:
+                    yield stream.drain()
+
+            sheet.write(_XLSX_SHEET_TAIL.encode('utf-8'))
+
+    yield stream.drain()
+
+
+def iter_export(
+    export_format: ExportFormat,
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    sheet_name: str = 'Datos',
+) -> Iterator[bytes]:
+    """
+    Seleccionar el serializador según el formato solicitado
+
+    Args:
+        export_format: 'csv' o 'xlsx'
+        header: Nombres de las columnas
+        rows: Iterable de filas
+        sheet_name: Nombre de la hoja (solo XLSX)
+
+    Returns:
+        Iterador de bloques de bytes del archivo exportado
+    """
+    if export_format == 'xlsx':
+        return iter_xlsx(header, rows, sheet_name=sheet_name)
+    return iter_csv(header, rows)
+
+
+def export_filename(prefix: str, export_format: ExportFormat) -> str:
+    """Construir el nombre de archivo de descarga (ej: tareas_20250101.csv)"""
+    return f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{export_format}"
@@ -0,0 +1,172 @@
+"""
+Distribución en vivo de los cambios publicados en Redis pub/sub
+
+Cada proceso de la API mantiene una sola suscripción al canal de cambios
+(ver app/core/change_feed.py) y reparte los eventos entre las conexiones
+abiertas del stream, filtrando por el alcance de visibilidad de cada usuario.
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.change_feed import CHANNEL
+from app.core.config import settings
+from app.core.visibility import VisibilityScope
+
+logger = logging.getLogger(__name__)
+
+# Segundos de espera antes de volver a suscribirse tras un error de Redis
+RECONNECT_DELAY_SECONDS = 5
+
+# Evento que indica al cliente que pudo perder cambios y debe sincronizar
+RESYNC_EVENT = {"entity": "resync"}
+
+
+def change_visible_to(change: dict, scope: VisibilityScope) -> bool:
+    """
+    Decidir si un evento de cambio corresponde al alcance del usuario
+
+    Es la versión en memoria de los predicados de app/core/visibility.py. Los
+    valores anteriores permiten avisar también a quien deja de ver el registro.
+    Un analista no recibe los cambios de proyectos ajenos donde solo tiene
+    tareas asignadas (el evento no lo indica), pero sí los de esas tareas.
+
+    Args:
+        change: Evento publicado por change_feed
+        scope: Alcance del usuario suscrito
+
+    Returns:
+        True si el evento debe enviarse al usuario
+    """
+    entity = change.get("entity")
+    if entity == "resync" or scope.is_admin:
+        return True
+
+    area_id = scope.supervised_area_id
+
+    if entity == "task":
+        return scope.user_id in (
+            change.get("owner_id"),
+            change.get("responsible_id"),
+            change.get("previous_responsible_id"),
+            change.get("created_by"),
+        ) or (area_id is not None and change.get("area_id") == area_id)
+
+    if entity == "project":
+        return scope.user_id in (
+            change.get("owner_id"),
+            change.get("previous_owner_id"),
+        ) or (area_id is not None and area_id in (change.get("area_id"), change.get("previous_area_id")))
+
+    return False
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Conexión suscrita al stream con su cola de eventos pendientes"""
+    scope: VisibilityScope
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE))
+    overflowed: bool = False
+
+    def offer(self, change: dict):
+        """Encolar un evento; si la cola está llena se descarta y se pedirá resincronizar"""
+        if not change_visible_to(change, self.scope):
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self) -> dict:
+        """Obtener el siguiente evento (RESYNC_EVENT si se descartaron eventos)"""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC_EVENT
+        return await self.queue.get()
+
+
+class ChangeBroadcaster:
+    """Suscripción única a Redis por proceso, repartida entre las conexiones"""
+
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, scope: VisibilityScope) -> AsyncIterator[Subscription]:
+        """
+        Registrar una conexión mientras dure el contexto
+
+        Args:
+            scope: Alcance de visibilidad del usuario
+
+        Yields:
+            Subscription de la que leer los eventos
+        """
+        subscription = Subscription(scope)
+        self._subscriptions.add(subscription)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def stop(self):
+        """Cancelar la suscripción a Redis (al apagar la aplicación)"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _dispatch(self, change: dict):
+        for subscription in list(self._subscriptions):
+            subscription.offer(change)
+
+    async def _listen(self):
+        """Leer el canal de cambios y reconectar tras errores hasta que no queden conexiones"""
+        while self._subscriptions:
+            client = aioredis.Redis.from_url(
+                settings.redis_url,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                health_check_interval=30,
+                decode_responses=True,
+            )
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # Los eventos anteriores a la suscripción no se reciben
+                    self._dispatch(RESYNC_EVENT)
+                    while self._subscriptions:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=settings.STREAM_HEARTBEAT_SECONDS
+                        )
+                        if message is None:
+                            continue
+                        try:
+                            self._dispatch(json.loads(message["data"]))
+                        except (TypeError, ValueError):
+                            logger.warning(f"Evento de cambio inválido descartado: {message['data']!r}")
+                return
+            except (redis.RedisError, OSError) as e:
+                logger.warning(
+                    f"Suscripción a cambios interrumpida, reintento en {RECONNECT_DELAY_SECONDS}s: {e}"
+                )
+            finally:
+                await client.aclose()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+# Instancia del proceso
+broadcaster = ChangeBroadcaster()
@@ -0,0 +1,314 @@
+"""
+Importación masiva de tareas desde CSV
+
+El archivo se procesa como un stream de filas agrupadas en lotes. Por cada lote
+se resuelven proyectos y responsables con una sola consulta `IN (...)` (los
+resultados quedan en mapas en memoria para los lotes siguientes) y las tareas
+válidas se insertan con un único INSERT multi-fila seguido de un commit.
+
+Columnas reconocidas (cabecera obligatoria):
+    project_id, title, description, status, priority,
+    responsible_id | responsible_email, deadline, reminder_hours_before
+"""
+import csv
+import logging
+import uuid
+from typing import Iterable, Iterator, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.visibility import VisibilityScope, project_modifiable
+from app.models import User, Project, Task
+from app.schemas import TaskCreate
+
+logger = logging.getLogger(__name__)
+
+# Filas por lote (una consulta de resolución + un INSERT + un commit por lote)
+DEFAULT_CHUNK_SIZE = 500
+
+# Máximo de errores detallados que se devuelven en el resultado
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_COLUMNS = {"project_id", "title"}
+
+OPTIONAL_COLUMNS = (
+    "description",
+    "status",
+    "priority",
+    "responsible_id",
+    "deadline",
+    "reminder_hours_before",
+)
+
+
+class TaskImportError(Exception):
+    """Error que impide continuar con la importación (cabecera inválida, archivo ilegible)"""
+
+
+class TaskImporter:
+    """
+    Importador de tareas por lotes con mapas de referencia cacheados
+
+    Las notificaciones de asignación no se envían por fila: se acumulan por
+    responsable y se obtienen al final con `pending_digests()`.
+    """
+
+    def __init__(self, db: Session, creator: User, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            db: Sesión de base de datos
+            creator: Usuario que realiza la importación (queda como creador)
+            chunk_size: Filas por lote
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+
+        # Guardar datos del creador: la sesión expira los objetos en cada commit
+        self.creator_id = creator.id
+        self.creator_name = creator.full_name
+        self.scope = VisibilityScope.of(creator)
+
+        # Mapas de referencia: id -> fila (None si no existe)
+        self._projects: dict[str, Optional[Row]] = {}
+        self._users: dict[str, Optional[Row]] = {}
+        self._user_ids_by_email: dict[str, Optional[str]] = {}
+
+        # Asignaciones por responsable para el resumen de notificaciones
+        self._assignments: dict[str, list[dict]] = {}
+
+        self.total_rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def run(self, rows: Iterable[dict]) -> dict:
+        """
+        Importar todas las filas
+
+        Args:
+            rows: Iterable de diccionarios (ej: csv.DictReader)
+
+        Returns:
+            dict con total_rows, created, failed, errors y errors_truncated
+
+        Raises:
+            TaskImportError: Si el archivo no se puede leer
+        """
+        try:
+            for chunk in self._chunks(rows):
+                self._process_chunk(chunk)
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise TaskImportError(
+                f"No se pudo leer el archivo después de la línea {self.total_rows + 1}: {e}"
+            ) from e
+
+        logger.info(
+            f"Importación completada: {self.created} tareas creadas, "
+            f"{self.failed} filas con error, {self.total_rows} filas leídas"
+        )
+
+        return {
+            "total_rows": self.total_rows,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def pending_digests(self) -> list[dict]:
+        """
+        Obtener los resúmenes de asignación pendientes de enviar, uno por responsable
+
+        Returns:
+            Lista de dicts con chat_id, email y tasks (title, project_name, deadline)
+        """
+        digests = []
+        for user_id, tasks in self._assignments.items():
+            user = self._users.get(user_id)
+            if not user or not user.telegram_chat_id:
+                continue
+            digests.append({
+                "chat_id": user.telegram_chat_id,
+                "email": user.email,
+                "tasks": tasks,
+            })
+        return digests
+
+    def _chunks(self, rows: Iterable[dict]) -> Iterator[list[tuple[int, dict]]]:
+        """Agrupar filas en lotes conservando su número de línea"""
+        chunk = []
+        for line, row in enumerate(rows, start=2):
+            self.total_rows += 1
+            chunk.append((line, row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _process_chunk(self, chunk: list[tuple[int, dict]]):
+        """Validar y resolver referencias de un lote e insertarlo en bloque"""
+        self._prefetch(chunk)
+
+        mappings = []
+        for line, raw in chunk:
+            try:
+                mappings.append(self._build_task(raw))
+            except ValueError as e:
+                self._add_error(line, str(e))
+
+        if not mappings:
+            return
+
+        self.db.execute(insert(Task), mappings)
+        self.db.commit()
+        self.created += len(mappings)
+
+        for mapping in mappings:
+            if mapping["responsible_id"]:
+                project = self._projects[mapping["project_id"]]
+                self._assignments.setdefault(mapping["responsible_id"], []).append({
+                    "title": mapping["title"],
+                    "project_name": project.name,
+                    "deadline": mapping["deadline"],
+                })
+
+    def _prefetch(self, chunk: list[tuple[int, dict]]):
+        """Cargar en los mapas los proyectos y usuarios del lote que aún no se conocen"""
+        project_ids = set()
+        user_ids = set()
+        emails = set()
+
+        for _, raw in chunk:
+            project_id = _clean(raw.get("project_id"))
+            if project_id and project_id not in self._projects:
+                project_ids.add(project_id)
+
+            responsible_id = _clean(raw.get("responsible_id"))
+            if responsible_id and responsible_id not in self._users:
+                user_ids.add(responsible_id)
+
+            email = _clean(raw.get("responsible_email"))
+            if email and email.lower() not in self._user_ids_by_email:
+                emails.add(email.lower())
+
+        if project_ids:
+            found = self.db.query(
+                Project.id, Project.name, Project.area_id, project_modifiable(self.scope).label("allowed")
+            ).filter(Project.id.in_(project_ids)).all()
+            for project_id in project_ids:
+                self._projects[project_id] = None
+            for row in found:
+                self._projects[row.id] = row
+
+        if user_ids or emails:
+            columns = (User.id, User.email, User.full_name, User.telegram_chat_id)
+            found = []
+            if user_ids:
+                found += self.db.query(*columns).filter(User.id.in_(user_ids)).all()
+            if emails:
+                found += self.db.query(*columns).filter(User.email.in_(emails)).all()
+            for user_id in user_ids:
+                self._users[user_id] = None
+            for email in emails:
+                self._user_ids_by_email[email] = None
+            for row in found:
+                self._users[row.id] = row
+                self._user_ids_by_email[row.email.lower()] = row.id
+
+    def _build_task(self, raw: dict) -> dict:
+        """
+        Convertir una fila del CSV en los valores de inserción de una tarea
+
+        Raises:
+            ValueError: Si la fila no es válida o referencia datos inexistentes
+        """
+        data = {"project_id": _clean(raw.get("project_id")), "title": _clean(raw.get("title"))}
+        for column in OPTIONAL_COLUMNS:
+            value = _clean(raw.get(column))
+            if value is not None:
+                data[column] = value
+
+        email = _clean(raw.get("responsible_email"))
+        if email and "responsible_id" not in data:
+            responsible_id = self._user_ids_by_email.get(email.lower())
+            if not responsible_id:
+                raise ValueError(f"Usuario responsable no encontrado: {email}")
+            data["responsible_id"] = responsible_id
+
+        try:
+            task_data = TaskCreate(**data)
+        except ValidationError as e:
+            raise ValueError("; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+
+        project = self._projects.get(task_data.project_id)
+        if not project or not project.allowed:
+            raise ValueError("Proyecto no encontrado o no tienes permiso para crear tareas en él")
+
+        if task_data.responsible_id and not self._users.get(task_data.responsible_id):
+            raise ValueError("Usuario responsable no encontrado")
+
+        return {
+            "id": str(uuid.uuid4()),
+            "project_id": task_data.project_id,
+            "area_id": project.area_id,
+            "title": task_data.title,
+            "description": task_data.description,
+            "status": task_data.status,
+            "priority": task_data.priority,
+            "responsible_id": task_data.responsible_id,
+            "deadline": task_data.deadline,
+            "reminder_hours_before": task_data.reminder_hours_before,
+            "is_archived": False,
+            "created_by": self.creator_id,
+        }
+
+    def _add_error(self, line: int, message: str):
+        """Registrar un error de fila respetando el máximo de errores reportados"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": line, "error": message})
+
+
+def open_csv_reader(stream: TextIO) -> csv.DictReader:
+    """
+    Crear un lector CSV sobre un stream de texto y validar su cabecera
+
+    Args:
+        stream: Archivo de texto abierto (se lee de forma incremental)
+
+    Returns:
+        csv.DictReader con los nombres de columna normalizados
+
+    Raises:
+        TaskImportError: Si falta la cabecera o alguna columna obligatoria
+    """
+    reader = csv.DictReader(stream)
+    try:
+        fieldnames = reader.fieldnames
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise TaskImportError(f"No se pudo leer la cabecera del archivo: {e}") from e
+
+    if not fieldnames:
+        raise TaskImportError("El archivo está vacío o no tiene cabecera")
+
+    reader.fieldnames = [name.strip() for name in fieldnames]
+
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames)
+    if missing:
+        raise TaskImportError(f"Faltan columnas obligatorias: {', '.join(sorted(missing))}")
+
+    return reader
+
+
+def _clean(value) -> Optional[str]:
+    """Normalizar celdas vacías a None"""
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
@@ -0,0 +1,128 @@
+"""
+Tokens de sincronización incremental de tareas
+
+Un token es opaco para el cliente (JSON en base64 URL-safe) y describe en qué
+punto del feed de cambios quedó:
+
+    s: inicio de la ventana (None = carga inicial, sin lápidas)
+    u: fin de la ventana (instante de la BD al pedir la primera página)
+    p: fase en curso, "d" (lápidas) o "t" (tareas)
+    c: cursor [timestamp, id] de la última fila entregada en la fase
+
+Al terminar una ventana el siguiente token solo contiene `s`, que es el fin
+de la ventana menos un margen (settings.TASK_SYNC_OVERLAP_SECONDS): los
+commits que terminan después de leerse `u` con un `updated_at` anterior se
+entregan en la siguiente ventana. Reentregar una tarea es inocuo porque el
+cliente reemplaza por id.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query as SAQuery
+
+PHASE_DELETED = "d"
+PHASE_UPDATED = "t"
+
+
+class SyncTokenError(ValueError):
+    """El token de sincronización no es válido"""
+
+
+def encode_token(
+    since: Optional[datetime],
+    until: Optional[datetime] = None,
+    phase: Optional[str] = None,
+    cursor: Optional[tuple[datetime, str]] = None,
+) -> str:
+    """
+    Serializar el estado de sincronización
+
+    Args:
+        since: Inicio de la ventana
+        until: Fin de la ventana (None si la ventana se cerró)
+        phase: Fase en curso dentro de la ventana
+        cursor: Última fila (timestamp, id) entregada en la fase
+
+    Returns:
+        Token opaco URL-safe
+    """
+    state = {"s": since.isoformat() if since else None}
+    if until is not None:
+        state["u"] = until.isoformat()
+        state["p"] = phase
+        state["c"] = [cursor[0].isoformat(), cursor[1]] if cursor else None
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> dict:
+    """
+    Leer un token generado por `encode_token`
+
+    Args:
+        token: Token recibido del cliente
+
+    Returns:
+        dict con since, until, phase y cursor (datetimes ya convertidos)
+
+    Raises:
+        SyncTokenError: Si el token está mal formado
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        state = json.loads(raw)
+        since = datetime.fromisoformat(state["s"]) if state["s"] else None
+        until = datetime.fromisoformat(state["u"]) if state.get("u") else None
+        phase = state.get("p")
+        cursor = state.get("c")
+        if cursor is not None:
+            cursor = (datetime.fromisoformat(cursor[0]), str(cursor[1]))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, IndexError) as e:
+        raise SyncTokenError("Token de sincronización inválido") from e
+
+    if until is not None and phase not in (PHASE_DELETED, PHASE_UPDATED):
+        raise SyncTokenError("Token de sincronización inválido")
+
+    return {"since": since, "until": until, "phase": phase, "cursor": cursor}
+
+
+def window_page(
+    query: SAQuery,
+    ts_column,
+    id_column,
+    since: Optional[datetime],
+    until: datetime,
+    cursor: Optional[tuple[datetime, str]],
+    limit: int,
+) -> tuple[list, bool]:
+    """
+    Obtener una página de filas con `since <= ts <= until` en orden (ts, id)
+
+    Args:
+        query: Consulta base (ya filtrada por visibilidad)
+        ts_column: Columna de timestamp del cambio
+        id_column: Columna id (desempate del orden)
+        since: Inicio de la ventana (None = sin límite inferior)
+        until: Fin de la ventana (incluido)
+        cursor: Última fila entregada (ts, id) o None
+        limit: Máximo de filas
+
+    Returns:
+        (filas, hay_más)
+    """
+    query = query.filter(ts_column <= until)
+    if since is not None:
+        query = query.filter(ts_column >= since)
+    if cursor is not None:
+        cursor_ts, cursor_id = cursor
+        query = query.filter(or_(
+            ts_column > cursor_ts,
+            and_(ts_column == cursor_ts, id_column > cursor_id),
+        ))
+
+    rows = query.order_by(ts_column, id_column).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
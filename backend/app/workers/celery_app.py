@@ -2,14 +2,47 @@
 Configuración de Celery con Redis como broker y backend
 """
 import os
+from typing import NamedTuple
+
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Exchange, Queue
+
+from app.core.config import settings
 
 # Obtener URL de Redis desde variables de entorno
 REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
 REDIS_PORT = os.getenv('REDIS_PORT', '6379')
 REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}/0'
 
+# Colas: el trabajo masivo no comparte workers (ni prefetch) con el interactivo
+QUEUE_INTERACTIVE = 'interactive'  # Notificaciones que un usuario espera (asignaciones, cambios)
+QUEUE_REMINDERS = 'reminders'  # Recordatorios de deadlines
+QUEUE_DIGESTS = 'digests'  # Resúmenes diario y semanal (envío masivo)
+QUEUE_MAINTENANCE = 'maintenance'  # Purgas nocturnas
+
+# Prioridades dentro de una cola (con Redis, 0 es la más alta)
+PRIORITY_HIGH = 0  # Coordinación: programador y callbacks de los resúmenes
+PRIORITY_NORMAL = 3
+PRIORITY_BULK = 6  # Shards de envío
+PRIORITY_BACKGROUND = 9  # Preparación de mensajes (fuera de la hora pico)
+
+
+class WorkerPool(NamedTuple):
+    """Pool de workers de una cola (ver run_worker.py)"""
+    concurrency: int  # Procesos hijos
+    prefetch: int  # Mensajes reservados por proceso (worker_prefetch_multiplier)
+
+
+WORKER_POOLS = {
+    # Tareas cortas: algo de prefetch para no esperar al broker entre mensajes
+    QUEUE_INTERACTIVE: WorkerPool(concurrency=4, prefetch=4),
+    QUEUE_REMINDERS: WorkerPool(concurrency=2, prefetch=1),
+    # Shards largos con acks_late: cada proceso reserva solo el que ejecuta
+    QUEUE_DIGESTS: WorkerPool(concurrency=4, prefetch=1),
+    QUEUE_MAINTENANCE: WorkerPool(concurrency=1, prefetch=1),
+}
+
 # Crear instancia de Celery
 celery_app = Celery(
     'control_proyectos_sva',
@@ -17,14 +50,15 @@ celery_app = Celery(
     backend=REDIS_URL,
     include=[
         'app.workers.reminder_tasks',
-        'app.workers.summary_tasks'
+        'app.workers.summary_tasks',
+        'app.workers.maintenance_tasks'
     ]
 )
 
 # Configuración de Celery
 celery_app.conf.update(
-    # Zona horaria (Centro América - UTC-6)
-    timezone='America/Guatemala',
+    # Zona horaria de los horarios de beat (los resúmenes usan la zona de cada usuario)
+    timezone=settings.DEFAULT_TIMEZONE,
     enable_utc=True,
 
     # Formato de serialización
@@ -36,8 +70,29 @@ celery_app.conf.update(
     result_expires=3600,  # 1 hora
     result_backend_transport_options={'master_name': 'mymaster'},
 
-    # Workers
-    worker_prefetch_multiplier=4,
+    # Colas y enrutamiento (un worker sin -Q consume todas, en este orden)
+    task_queues=[Queue(name, Exchange(name), routing_key=name) for name in WORKER_POOLS],
+    task_default_queue=QUEUE_INTERACTIVE,
+    task_default_priority=PRIORITY_NORMAL,
+    task_routes={
+        # El primer patrón que coincide gana: de más específico a más general
+        'app.workers.notification_tasks.*': {'queue': QUEUE_INTERACTIVE, 'priority': PRIORITY_HIGH},
+        'app.workers.reminder_tasks.*': {'queue': QUEUE_REMINDERS},
+        'app.workers.summary_tasks.schedule_digests': {'queue': QUEUE_DIGESTS, 'priority': PRIORITY_HIGH},
+        'app.workers.summary_tasks.aggregate_summary': {'queue': QUEUE_DIGESTS, 'priority': PRIORITY_HIGH},
+        'app.workers.summary_tasks.render_*': {'queue': QUEUE_DIGESTS, 'priority': PRIORITY_BACKGROUND},
+        'app.workers.summary_tasks.*': {'queue': QUEUE_DIGESTS, 'priority': PRIORITY_BULK},
+        'app.workers.maintenance_tasks.*': {'queue': QUEUE_MAINTENANCE},
+    },
+    # Redis emula las prioridades con una lista por escalón (cola, cola:3, cola:6, cola:9)
+    broker_transport_options={
+        'priority_steps': [PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_BULK, PRIORITY_BACKGROUND],
+        'sep': ':',
+        'queue_order_strategy': 'priority',
+    },
+
+    # Workers (cada pool reemplaza el prefetch y la concurrencia: ver WORKER_POOLS)
+    worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
 
     # Logging
@@ -52,16 +107,23 @@ celery_app.conf.update(
             'schedule': crontab(minute=0),  # Cada hora en punto
         },
 
-        # Resumen diario a las 8:00 AM (hora local Guatemala)
-        'send-daily-summary': {
-            'task': 'app.workers.summary_tasks.send_daily_summary',
-            'schedule': crontab(hour=8, minute=0),  # 8:00 AM
+        # Resúmenes diario y semanal: cada minuto se lanzan los horarios de los
+        # usuarios (zona y hora local) que llegaron a su hora de preparación o envío
+        'schedule-digests': {
+            'task': 'app.workers.summary_tasks.schedule_digests',
+            'schedule': crontab(),  # Cada minuto
         },
 
-        # Resumen semanal los lunes a las 9:00 AM
-        'send-weekly-summary': {
-            'task': 'app.workers.summary_tasks.send_weekly_summary',
-            'schedule': crontab(hour=9, minute=0, day_of_week=1),  # Lunes 9:00 AM
+        # Purgar lápidas de tareas vencidas diariamente a las 3:00 AM
+        'purge-task-tombstones': {
+            'task': 'app.workers.maintenance_tasks.purge_task_tombstones',
+            'schedule': crontab(hour=3, minute=0),  # 3:00 AM
+        },
+
+        # Purgar checkpoints, claves de idempotencia y resúmenes preparados antiguos a las 3:30 AM
+        'purge-job-runs': {
+            'task': 'app.workers.maintenance_tasks.purge_job_runs',
+            'schedule': crontab(hour=3, minute=30),  # 3:30 AM
         },
     },
 )
@@ -69,5 +131,8 @@ celery_app.conf.update(
 # Auto-descubrir tareas en los módulos especificados
 celery_app.autodiscover_tasks(['app.workers'])
 
+# Métricas de las tareas y exportador del worker (señales de Celery)
+import app.workers.monitoring  # noqa: E402,F401
+
 if __name__ == '__main__':
     celery_app.start()
@@ -0,0 +1,253 @@
+"""
+Checkpoints e idempotencia de los envíos masivos de los workers
+
+Un envío masivo (resumen diario o semanal, recordatorios) es una ejecución
+con un `run_id` determinista repartida en shards (`JobCheckpoint`). Cada
+shard procesa lotes en orden de id y, por cada lote:
+
+1. Reclama las entregas (`claim_deliveries`): insert-or-skip de una clave de
+   idempotencia por destinatario; solo envía las que reclamó este intento.
+2. Envía los mensajes.
+3. Registra el resultado (`finish_deliveries`) y avanza el checkpoint en la
+   misma transacción (`advance`).
+
+Un reintento, un worker reemplazado o una segunda ejecución del mismo
+`run_id` siguen desde el checkpoint y nunca vuelven a enviar una entrega ya
+reclamada. Una entrega que quedó pendiente porque el intento murió entre el
+envío y el registro no se reenvía (a lo sumo una vez); las fallidas y las
+que el intento liberó sin enviarlas (`release_deliveries`) sí.
+"""
+import logging
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.job_checkpoint import JobCheckpoint
+from app.models.notification import NotificationType
+from app.models.notification_delivery import NotificationDelivery, DeliveryStatus
+
+logger = logging.getLogger(__name__)
+
+# Entrega a reclamar: (run_id, user_id, task_id)
+Claim = Tuple[str, str, Optional[str]]
+
+
+def insert_or_skip(model):
+    """INSERT que ignora las filas que violan una restricción única (MySQL y SQLite)"""
+    return insert(model).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+
+def delivery_key(run_id: str, user_id: str, type: NotificationType) -> str:
+    """Clave de idempotencia de una entrega"""
+    return f"{run_id}:{user_id}:{type.value}"
+
+
+def new_attempt() -> str:
+    """Identificador de un intento de envío (distinto en cada reintento del mismo task)"""
+    return str(uuid.uuid4())
+
+
+def create_checkpoints(db: Session, run_id: str, ranges: List[Tuple[Optional[str], Optional[str]]]) -> List[JobCheckpoint]:
+    """
+    Crear los shards de una ejecución, si no existen
+
+    Si la ejecución ya se había lanzado se conservan sus shards y su progreso
+    (los rangos nuevos se ignoran), así que relanzarla la reanuda.
+
+    Args:
+        db: Sesión del primario
+        run_id: Identificador de la ejecución
+        ranges: (start_after, end_at) de cada shard
+
+    Returns:
+        Checkpoints de la ejecución, por número de shard
+    """
+    existing = checkpoints(db, run_id)
+    if existing:
+        return existing
+
+    if ranges:
+        db.execute(insert_or_skip(JobCheckpoint), [
+            {"id": str(uuid.uuid4()), "run_id": run_id, "shard": shard, "start_after": start_after, "end_at": end_at}
+            for shard, (start_after, end_at) in enumerate(ranges)
+        ])
+        db.commit()
+    return checkpoints(db, run_id)
+
+
+def checkpoints(db: Session, run_id: str) -> List[JobCheckpoint]:
+    """Checkpoints de una ejecución, por número de shard"""
+    return db.query(JobCheckpoint).filter(JobCheckpoint.run_id == run_id).order_by(JobCheckpoint.shard).all()
+
+
+def checkpoint(db: Session, run_id: str, shard: int = 0) -> JobCheckpoint:
+    """
+    Checkpoint de un shard (se crea sin rango si no existe, ej: recordatorios)
+
+    Args:
+        db: Sesión del primario
+        run_id: Identificador de la ejecución
+        shard: Número de shard
+
+    Returns:
+        JobCheckpoint
+    """
+    query = db.query(JobCheckpoint).filter(JobCheckpoint.run_id == run_id, JobCheckpoint.shard == shard)
+    found = query.first()
+    if found is None:
+        db.execute(insert_or_skip(JobCheckpoint).values(id=str(uuid.uuid4()), run_id=run_id, shard=shard))
+        db.commit()
+        found = query.one()
+    return found
+
+
+def claim_deliveries(db: Session, type: NotificationType, claims: Iterable[Claim], attempt_id: str) -> Set[str]:
+    """
+    Reclamar entregas para este intento (insert-or-skip)
+
+    Se reclaman las claves nuevas y las que fallaron en un intento anterior.
+    Se confirma antes de enviar: la reclamación debe sobrevivir al intento.
+
+    Args:
+        db: Sesión del primario
+        type: Tipo de notificación
+        claims: Entregas a reclamar (run_id, user_id, task_id)
+        attempt_id: Intento que reclama (ver `new_attempt`)
+
+    Returns:
+        Claves de idempotencia reclamadas por este intento
+    """
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "idempotency_key": delivery_key(run_id, user_id, type),
+            "run_id": run_id,
+            "user_id": user_id,
+            "task_id": task_id,
+            "type": type,
+            "status": DeliveryStatus.PENDIENTE,
+            "attempt_id": attempt_id,
+        }
+        for run_id, user_id, task_id in claims
+    ]
+    if not rows:
+        return set()
+    keys = [row["idempotency_key"] for row in rows]
+
+    db.execute(insert_or_skip(NotificationDelivery), rows)
+    db.execute(
+        update(NotificationDelivery).where(
+            NotificationDelivery.idempotency_key.in_(keys),
+            NotificationDelivery.status == DeliveryStatus.FALLIDA
+        ).values(status=DeliveryStatus.PENDIENTE, attempt_id=attempt_id)
+    )
+    claimed = set(db.scalars(
+        select(NotificationDelivery.idempotency_key).where(
+            NotificationDelivery.idempotency_key.in_(keys),
+            NotificationDelivery.attempt_id == attempt_id,
+            NotificationDelivery.status == DeliveryStatus.PENDIENTE
+        )
+    ))
+    db.commit()
+    return claimed
+
+
+def finish_deliveries(db: Session, sent: List[str], failed: List[str], sent_at: datetime) -> None:
+    """
+    Registrar el resultado de las entregas reclamadas (sin confirmar: ver `advance`)
+
+    Args:
+        db: Sesión del primario
+        sent: Claves entregadas
+        failed: Claves que Telegram rechazó (otro intento puede reclamarlas)
+        sent_at: Momento del envío
+    """
+    if sent:
+        db.execute(
+            update(NotificationDelivery).where(NotificationDelivery.idempotency_key.in_(sent))
+            .values(status=DeliveryStatus.ENVIADA, sent_at=sent_at)
+        )
+    if failed:
+        db.execute(
+            update(NotificationDelivery).where(NotificationDelivery.idempotency_key.in_(failed))
+            .values(status=DeliveryStatus.FALLIDA)
+        )
+
+
+def release_deliveries(db: Session, keys: List[str]) -> None:
+    """
+    Liberar entregas reclamadas que no se llegaron a enviar (confirma)
+
+    Quedan como fallidas: el siguiente intento las vuelve a reclamar.
+
+    Args:
+        db: Sesión del primario
+        keys: Claves reclamadas por este intento
+    """
+    db.rollback()
+    if keys:
+        db.execute(
+            update(NotificationDelivery).where(
+                NotificationDelivery.idempotency_key.in_(keys),
+                NotificationDelivery.status == DeliveryStatus.PENDIENTE
+            ).values(status=DeliveryStatus.FALLIDA)
+        )
+        db.commit()
+
+
+def advance(
+    db: Session,
+    checkpoint: JobCheckpoint,
+    position: str,
+    processed: int,
+    sent: int,
+    errors: int,
+    skipped: int
+) -> None:
+    """
+    Avanzar el checkpoint tras un lote y confirmar (junto con lo registrado del lote)
+
+    Args:
+        db: Sesión del primario
+        checkpoint: Checkpoint del shard
+        position: Último id procesado
+        processed: Elementos del lote
+        sent: Envíos correctos del lote
+        errors: Envíos fallidos del lote
+        skipped: Entregas ya reclamadas por otro intento
+    """
+    checkpoint.position = position
+    checkpoint.processed += processed
+    checkpoint.sent += sent
+    checkpoint.errors += errors
+    checkpoint.skipped += skipped
+    db.commit()
+
+    if skipped:
+        logger.warning(f"{skipped} entrega(s) de {checkpoint.run_id} ya reclamadas por otro intento, omitidas")
+
+
+def complete(db: Session, checkpoint: JobCheckpoint) -> dict:
+    """
+    Marcar un shard como terminado
+
+    Returns:
+        dict: Contadores acumulados del shard (todos sus intentos)
+    """
+    if checkpoint.completed_at is None:
+        checkpoint.completed_at = datetime.utcnow()
+        db.commit()
+    return counters(checkpoint)
+
+
+def counters(checkpoint: JobCheckpoint) -> dict:
+    """Contadores acumulados de un shard"""
+    return {
+        'processed': checkpoint.processed,
+        'sent': checkpoint.sent,
+        'errors': checkpoint.errors,
+        'skipped': checkpoint.skipped,
+    }
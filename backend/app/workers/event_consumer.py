@@ -0,0 +1,224 @@
+"""
+Consumidor de eventos de dominio del stream `sva:events`
+
+Cada grupo de consumidores (notificaciones, contadores...) recibe todos los
+eventos y lleva su propio avance; dentro de un grupo los mensajes se reparten
+entre sus consumidores, así que se pueden levantar varias réplicas.
+
+Un mensaje se confirma (XACK) cuando su manejador termina sin error. Los que
+fallan quedan pendientes y se reclaman (XAUTOCLAIM) tras
+EVENT_CLAIM_IDLE_SECONDS; después de EVENT_MAX_DELIVERIES intentos se mueven
+a `sva:events:dead` para no bloquear el grupo.
+
+`run_outbox_relay` publica los eventos que quedaron en `domain_event_outbox`
+porque Redis no estaba disponible al confirmar la transacción.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+import redis
+from sqlalchemy.exc import SQLAlchemyError
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.config import settings
+from app.core.domain_events import STREAM, decode_event, decode_trace, relay_outbox
+from app.core.metrics import EVENT_HANDLER_DURATION, EVENTS_PROCESSED
+from app.core.tracing import extract_context, tracer
+
+logger = logging.getLogger(__name__)
+
+DEAD_LETTER_STREAM = f"{STREAM}:dead"
+
+# Mensajes leídos por llamada a XREADGROUP / XAUTOCLAIM
+BATCH_SIZE = 50
+
+# Clave de manejador que recibe cualquier tipo de evento
+ANY_EVENT = "*"
+
+Handler = Callable[[str, dict], None]
+
+
+class EventConsumer:
+    """Consumidor de un grupo sobre el stream de eventos de dominio"""
+
+    def __init__(
+        self,
+        group: str,
+        handlers: dict[str, Handler],
+        name: Optional[str] = None,
+        client: Optional[redis.Redis] = None,
+    ):
+        """
+        Args:
+            group: Nombre del grupo de consumidores
+            handlers: Tipo de evento -> función que recibe (tipo, datos)
+                (ANY_EVENT para todos los tipos)
+            name: Nombre del consumidor dentro del grupo (por defecto host-pid)
+            client: Cliente Redis (por defecto uno propio sin timeout de lectura
+                corto, ya que XREADGROUP bloquea esperando mensajes)
+        """
+        self.group = group
+        self.handlers = handlers
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.client = client or redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.EVENT_CONSUMER_BLOCK_MS / 1000 + 5,
+        )
+        self._next_claim = 0.0
+
+    def ensure_group(self) -> None:
+        """Crear el grupo (y el stream) si no existen, leyendo desde los eventos nuevos"""
+        try:
+            self.client.xgroup_create(STREAM, self.group, id="$", mkstream=True)
+            logger.info(f"Grupo de consumidores '{self.group}' creado en {STREAM}")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Procesar eventos hasta que se active `stop`
+
+        Args:
+            stop: Señal de parada
+        """
+        logger.info(f"Consumidor '{self.name}' del grupo '{self.group}' iniciado")
+        while not stop.is_set():
+            try:
+                self.ensure_group()
+                while not stop.is_set():
+                    self.process_pending()
+                    self.process_new()
+            except redis.RedisError as e:
+                logger.error(f"Error de Redis en el grupo '{self.group}': {e}")
+                stop.wait(5)
+        logger.info(f"Consumidor '{self.name}' del grupo '{self.group}' detenido")
+
+    def process_new(self, block_ms: Optional[int] = None) -> int:
+        """
+        Leer y procesar un lote de mensajes nuevos
+
+        Args:
+            block_ms: Milisegundos de espera si no hay mensajes
+                (por defecto EVENT_CONSUMER_BLOCK_MS)
+
+        Returns:
+            Número de mensajes leídos
+        """
+        response = self.client.xreadgroup(
+            self.group, self.name, {STREAM: ">"},
+            count=BATCH_SIZE,
+            block=settings.EVENT_CONSUMER_BLOCK_MS if block_ms is None else block_ms,
+        )
+        messages = response[0][1] if response else []
+        for message_id, fields in messages:
+            self._handle(message_id, fields)
+        return len(messages)
+
+    def process_pending(self, force: bool = False) -> int:
+        """
+        Reintentar los mensajes que llevan demasiado tiempo sin confirmarse
+
+        Args:
+            force: Ignorar el intervalo entre revisiones
+
+        Returns:
+            Número de mensajes reclamados
+        """
+        now = time.monotonic()
+        if not force and now < self._next_claim:
+            return 0
+        self._next_claim = now + settings.EVENT_CLAIM_IDLE_SECONDS
+
+        idle_ms = 0 if force else settings.EVENT_CLAIM_IDLE_SECONDS * 1000
+        _, messages, *_ = self.client.xautoclaim(
+            STREAM, self.group, self.name, min_idle_time=idle_ms, start_id="0-0", count=BATCH_SIZE
+        )
+        for message_id, fields in messages:
+            if fields is None:
+                # El mensaje se recortó del stream (MAXLEN) antes de procesarse
+                self.client.xack(STREAM, self.group, message_id)
+                continue
+            if self._deliveries(message_id) > settings.EVENT_MAX_DELIVERIES:
+                self._dead_letter(message_id, fields)
+                continue
+            self._handle(message_id, fields)
+        return len(messages)
+
+    def _handle(self, message_id: str, fields: dict) -> None:
+        try:
+            event_type, data = decode_event(fields)
+        except (KeyError, ValueError) as e:
+            logger.error(f"Evento {message_id} mal formado: {e}")
+            self._dead_letter(message_id, fields)
+            return
+
+        handler = self.handlers.get(event_type) or self.handlers.get(ANY_EVENT)
+        if handler is not None:
+            start = time.perf_counter()
+            # Continúa la traza de quien emitió el evento
+            with tracer.start_as_current_span(
+                f"event {event_type}",
+                context=extract_context(decode_trace(fields)),
+                kind=SpanKind.CONSUMER,
+                attributes={"messaging.consumer.group": self.group, "messaging.message.id": message_id},
+            ) as span:
+                try:
+                    handler(event_type, data)
+                except Exception as e:
+                    # Queda pendiente: se reintenta al reclamarlo
+                    span.record_exception(e)
+                    span.set_status(Status(StatusCode.ERROR))
+                    EVENTS_PROCESSED.labels(self.group, event_type, "error").inc()
+                    logger.error(f"[{self.group}] Error procesando {event_type} ({message_id}): {e}")
+                    return
+                finally:
+                    EVENT_HANDLER_DURATION.labels(self.group, event_type).observe(time.perf_counter() - start)
+
+        EVENTS_PROCESSED.labels(self.group, event_type, "ok").inc()
+        self.client.xack(STREAM, self.group, message_id)
+
+    def _deliveries(self, message_id: str) -> int:
+        pending = self.client.xpending_range(
+            STREAM, self.group, min=message_id, max=message_id, count=1
+        )
+        return pending[0]["times_delivered"] if pending else 0
+
+    def _dead_letter(self, message_id: str, fields: dict) -> None:
+        logger.error(f"[{self.group}] Evento {message_id} descartado tras varios intentos")
+        EVENTS_PROCESSED.labels(self.group, fields.get("type", "unknown"), "dead").inc()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xadd(
+            DEAD_LETTER_STREAM,
+            {**fields, "group": self.group, "source_id": message_id},
+            maxlen=settings.EVENT_STREAM_MAXLEN,
+            approximate=True,
+        )
+        pipe.xack(STREAM, self.group, message_id)
+        pipe.execute()
+
+
+def run_outbox_relay(stop: threading.Event) -> None:
+    """
+    Publicar los eventos del outbox hasta que se active `stop`
+
+    Vacía el outbox por lotes y espera EVENT_OUTBOX_RELAY_SECONDS entre
+    revisiones. Con varias réplicas cada lote lo toma una sola (SKIP LOCKED).
+
+    Args:
+        stop: Señal de parada
+    """
+    logger.info("Relay del outbox de eventos iniciado")
+    while not stop.is_set():
+        try:
+            while relay_outbox() and not stop.is_set():
+                pass
+        except (redis.RedisError, SQLAlchemyError) as e:
+            logger.error(f"Error publicando el outbox de eventos: {e}")
+        stop.wait(settings.EVENT_OUTBOX_RELAY_SECONDS)
+    logger.info("Relay del outbox de eventos detenido")
@@ -0,0 +1,164 @@
+"""
+Manejadores de eventos de dominio por grupo de consumidores
+
+- notifications: mensajes de Telegram (asignación, reasignación, cambios de
+  estado, resumen de importación)
+- counters: contadores diarios por tipo de evento en Redis
+
+Los eventos llevan ids; cada manejador lee el estado actual con una sesión
+propia. Si la tarea ya no existe cuando llega el evento, no se notifica.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.core import domain_events as events
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.core.loaders import loader
+from app.core.redis_client import get_redis
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.workers.event_consumer import ANY_EVENT
+from app.bot.notifications import (
+    NotificationService,
+    send_task_assignment_notification,
+    send_task_reassignment_notification,
+    send_task_digest_notifications,
+)
+
+logger = logging.getLogger(__name__)
+
+# Días que se conservan los contadores diarios
+COUNTER_RETENTION_DAYS = 90
+
+# ==============================================================================
+# Notificaciones
+# ==============================================================================
+
+# Event loop y servicio de notificaciones del hilo consumidor (el cliente HTTP
+# del bot queda ligado a un loop, así que se reutiliza el mismo)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_service: Optional[NotificationService] = None
+
+
+def _notification_service() -> tuple[asyncio.AbstractEventLoop, NotificationService]:
+    global _loop, _service
+    if _service is None:
+        from telegram.constants import ParseMode
+        from telegram.ext import Defaults, ExtBot
+
+        from app.bot.telegram_request import InstrumentedRequest
+
+        _loop = asyncio.new_event_loop()
+        _service = NotificationService(
+            ExtBot(
+                token=settings.TELEGRAM_BOT_TOKEN,
+                base_url=settings.telegram_base_url,
+                defaults=Defaults(parse_mode=ParseMode.HTML),
+                request=InstrumentedRequest(),
+            )
+        )
+    return _loop, _service
+
+
+def notify_task_created(event_type: str, data: dict) -> None:
+    """Avisar al responsable de una tarea nueva"""
+    if not data.get("responsible_id"):
+        return
+    with get_db_context() as db:
+        task = db.get(Task, data["task_id"])
+        if task is None:
+            return
+        users = loader(db, User)
+        users.want(data["responsible_id"], data["actor_id"])
+        responsible = users.load(data["responsible_id"])
+        creator = users.load(data["actor_id"])
+        if responsible and creator:
+            send_task_assignment_notification(task, responsible, creator, db)
+
+
+def notify_task_reassigned(event_type: str, data: dict) -> None:
+    """Avisar al nuevo responsable de una tarea reasignada"""
+    if not data.get("responsible_id"):
+        return
+    with get_db_context() as db:
+        task = db.get(Task, data["task_id"])
+        if task is None:
+            return
+        users = loader(db, User)
+        users.want(data["responsible_id"], data.get("previous_responsible_id"), data["actor_id"])
+        new_responsible = users.load(data["responsible_id"])
+        changed_by = users.load(data["actor_id"])
+        if new_responsible and changed_by:
+            send_task_reassignment_notification(
+                task, users.load(data.get("previous_responsible_id")), new_responsible, changed_by, db
+            )
+
+
+def notify_task_status_changed(event_type: str, data: dict) -> None:
+    """Avisar del cambio de estado al responsable y al dueño del proyecto (o de la tarea completada)"""
+    with get_db_context() as db:
+        task = db.get(Task, data["task_id"])
+        changed_by = loader(db, User).load(data.get("actor_id"))
+        if task is None or changed_by is None:
+            return
+
+        loop, service = _notification_service()
+        new_status = TaskStatus(data["new_status"])
+        if new_status == TaskStatus.COMPLETADO:
+            loop.run_until_complete(service.notify_task_completed(task, changed_by))
+        else:
+            old_status = TaskStatus(data["old_status"])
+            loop.run_until_complete(
+                service.notify_task_status_change(task, old_status, new_status, changed_by)
+            )
+
+
+def notify_tasks_imported(event_type: str, data: dict) -> None:
+    """Enviar el resumen de tareas asignadas en una importación, uno por responsable"""
+    digests = data.get("digests") or []
+    for digest in digests:
+        for task in digest["tasks"]:
+            task["deadline"] = datetime.fromisoformat(task["deadline"]) if task["deadline"] else None
+    send_task_digest_notifications(digests, data.get("assigned_by", ""))
+
+
+NOTIFICATION_HANDLERS = {
+    events.TASK_CREATED: notify_task_created,
+    events.TASK_REASSIGNED: notify_task_reassigned,
+    events.TASK_STATUS_CHANGED: notify_task_status_changed,
+    events.TASKS_IMPORTED: notify_tasks_imported,
+}
+
+# ==============================================================================
+# Contadores
+# ==============================================================================
+
+
+def count_event(event_type: str, data: dict) -> None:
+    """Incrementar el contador diario del tipo de evento"""
+    client = get_redis()
+    if client is None:
+        raise RuntimeError("Redis no disponible")
+
+    key = f"sva:counters:{time.strftime('%Y-%m-%d', time.gmtime())}"
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby(key, event_type, data.get("count", 1))
+    if event_type == events.TASK_STATUS_CHANGED and data.get("new_status") == TaskStatus.COMPLETADO.value:
+        pipe.hincrby(key, "task.completed", 1)
+    pipe.expire(key, COUNTER_RETENTION_DAYS * 24 * 60 * 60)
+    pipe.execute()
+
+
+COUNTER_HANDLERS = {
+    ANY_EVENT: count_event,
+}
+
+# Grupos de consumidores disponibles
+GROUPS = {
+    "notifications": NOTIFICATION_HANDLERS,
+    "counters": COUNTER_HANDLERS,
+}
@@ -0,0 +1,104 @@
+"""
+Tareas de Celery de mantenimiento de la base de datos
+"""
+import logging
+from datetime import timedelta
+from sqlalchemy import func
+
+from app.workers.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.task_tombstone import TaskTombstone
+from app.models.job_checkpoint import JobCheckpoint
+from app.models.notification_delivery import NotificationDelivery
+from app.models.digest_payload import DigestPayload
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name='app.workers.maintenance_tasks.purge_task_tombstones')
+def purge_task_tombstones(self):
+    """
+    Elimina las lápidas de tareas más antiguas que el periodo de retención.
+
+    Los tokens de sincronización anteriores a ese periodo son rechazados por
+    GET /tasks/changes (410), así que sus lápidas ya no son necesarias.
+
+    Returns:
+        dict: Resumen de la purga
+    """
+    db = SessionLocal()
+    try:
+        # Usar el reloj de la BD, el mismo que fija removed_at
+        now = db.query(func.now()).scalar()
+        cutoff = now - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+
+        deleted = db.query(TaskTombstone).filter(
+            TaskTombstone.removed_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"🧹 {deleted} lápidas de tareas eliminadas (anteriores a {cutoff.isoformat()})")
+
+        return {
+            'status': 'completed',
+            'deleted': deleted,
+            'cutoff': cutoff.isoformat()
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error en purge_task_tombstones: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name='app.workers.maintenance_tasks.purge_job_runs')
+def purge_job_runs(self):
+    """
+    Elimina los checkpoints, las claves de idempotencia y los resúmenes
+    preparados de los envíos masivos más antiguos que el periodo de retención.
+
+    Pasado ese periodo ninguna ejecución vuelve a usar sus run_id (resúmenes
+    de días anteriores, recordatorios de deadlines vencidos).
+
+    Returns:
+        dict: Resumen de la purga
+    """
+    db = SessionLocal()
+    try:
+        # Usar el reloj de la BD, el mismo que fija created_at
+        now = db.query(func.now()).scalar()
+        cutoff = now - timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+
+        deliveries = db.query(NotificationDelivery).filter(
+            NotificationDelivery.created_at < cutoff
+        ).delete(synchronize_session=False)
+        runs = db.query(JobCheckpoint).filter(
+            JobCheckpoint.created_at < cutoff
+        ).delete(synchronize_session=False)
+        payloads = db.query(DigestPayload).filter(
+            DigestPayload.rendered_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(
+            f"🧹 {runs} checkpoints, {deliveries} entregas y {payloads} resúmenes preparados eliminados "
+            f"(anteriores a {cutoff.isoformat()})"
+        )
+
+        return {
+            'status': 'completed',
+            'deleted_checkpoints': runs,
+            'deleted_deliveries': deliveries,
+            'deleted_payloads': payloads,
+            'cutoff': cutoff.isoformat()
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error en purge_job_runs: {str(e)}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+"""
+Métricas y trazas de las tareas de Celery
+
+Las señales de Celery miden cada tarea (duración y resultado) en el proceso
+hijo que la ejecuta; el proceso principal del worker expone el agregado de
+todos los hijos (ver app/core/metrics.py, modo multiproceso).
+
+Cada tarea se ejecuta dentro de un span que continúa la traza de quien la
+encoló: el contexto viaja en las cabeceras del mensaje (`traceparent`).
+"""
+import time
+
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_init,
+)
+from opentelemetry import context, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.metrics import JOB_DURATION, JOB_RUNS, clean_multiprocess_dir, start_exporter
+from app.core.tracing import configure_tracing, extract_context, inject_context, tracer
+
+# Cabeceras del mensaje con el contexto de traza
+TRACE_HEADERS = ("traceparent", "tracestate")
+
+# Tareas en curso de este proceso por id: (inicio, span, token del contexto)
+_running: dict[str, tuple[float, trace.Span, object]] = {}
+
+
+def _job_name(task) -> str:
+    """Nombre corto de la tarea (ej: check_upcoming_deadlines)"""
+    return task.name.rsplit(".", 1)[-1]
+
+
+@worker_init.connect
+def _start_worker_monitoring(**kwargs):
+    # Proceso principal del worker, antes de crear los hijos
+    clean_multiprocess_dir()
+    start_exporter()
+    configure_tracing()
+
+
+@before_task_publish.connect
+def _inject_trace_context(headers=None, **kwargs):
+    if headers is not None:
+        headers.update(inject_context())
+
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **kwargs):
+    carrier = {
+        key: value
+        for key in TRACE_HEADERS
+        if (value := getattr(task.request, key, None))
+    }
+    span = tracer.start_span(
+        f"celery {_job_name(task)}",
+        context=extract_context(carrier),
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id},
+    )
+    token = context.attach(trace.set_span_in_context(span))
+    _running[task_id] = (time.perf_counter(), span, token)
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **kwargs):
+    running = _running.pop(task_id, None)
+    if running is not None:
+        start, span, token = running
+        JOB_DURATION.labels(_job_name(task)).observe(time.perf_counter() - start)
+        span.set_attribute("celery.state", state or "")
+        context.detach(token)
+        span.end()
+    if state == "SUCCESS":
+        JOB_RUNS.labels(_job_name(task), "success").inc()
+
+
+@task_failure.connect
+def _task_failed(sender=None, task_id=None, exception=None, **kwargs):
+    JOB_RUNS.labels(_job_name(sender), "failure").inc()
+    running = _running.get(task_id)
+    if running is not None and exception is not None:
+        running[1].record_exception(exception)
+        running[1].set_status(Status(StatusCode.ERROR))
+
+
+@task_retry.connect
+def _task_retried(sender=None, **kwargs):
+    JOB_RUNS.labels(_job_name(sender), "retry").inc()
@@ -1,34 +1,122 @@
 """
 Tareas de Celery para recordatorios de deadlines
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.sql.functions import FunctionElement
+from typing import List, Optional, Tuple
 
 from app.workers.celery_app import celery_app
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import SessionLocal, read_session
+from app.core.loaders import loader
 from app.models.task import Task
 from app.models.user import User
-from app.models.notification import Notification
-from app.bot.notifications import send_telegram_notification
+from app.models.project import Project
+from app.models.notification import Notification, NotificationType
+from app.bot.notifications import send_telegram_messages
+from app.workers import checkpoints
 
 logger = logging.getLogger(__name__)
 
 
-def get_db():
-    """Obtener sesión de base de datos"""
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        pass  # No cerrar aquí, se cierra en el task
+class hours_before(FunctionElement):
+    """Fecha menos un número de horas (columna o valor) calculada en SQL"""
+    type = DateTime()
+    name = "hours_before"
+    inherit_cache = True
 
 
-import asyncio
+@compiles(hours_before)
+def _hours_before_mysql(element, compiler, **kw):
+    moment, hours = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"DATE_SUB({moment}, INTERVAL {hours} HOUR)"
+
+
+@compiles(hours_before, "sqlite")
+def _hours_before_sqlite(element, compiler, **kw):
+    # Mismo formato de texto con que SQLAlchemy guarda los DateTime en SQLite
+    moment, hours = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"strftime('%Y-%m-%d %H:%M:%f', {moment}, '-' || {hours} || ' hours')"
+
 
-@celery_app.task(bind=True, name='app.workers.reminder_tasks.check_upcoming_deadlines')
-def check_upcoming_deadlines(self):
+def _due_tasks_query(db: Session, now_utc: datetime):
+    """
+    Tareas pendientes en su ventana de recordatorio
+
+    La ventana va desde la hora del recordatorio (deadline menos
+    reminder_hours_before) hasta 1 hora después; se filtra en SQL para no
+    cargar todas las tareas pendientes con deadline.
+    """
+    reminder_time = hours_before(Task.deadline, Task.reminder_hours_before)
+    return db.query(Task).filter(
+        Task.deadline.isnot(None),
+        Task.status != 'completado',
+        Task.reminder_hours_before.isnot(None),
+        Task.responsible_id.isnot(None),
+        reminder_time <= now_utc,
+        reminder_time > now_utc - timedelta(hours=1),
+    )
+
+
+def _reminder_message(task: Task, project: Optional[Project], now_utc: datetime) -> Tuple[str, str]:
+    """
+    Mensaje del recordatorio de una tarea
+
+    Returns:
+        (mensaje, tiempo restante en texto)
+    """
+    # Calcular tiempo restante
+    time_left = task.deadline - now_utc
+    hours_left = int(time_left.total_seconds() / 3600)
+
+    # Construir mensaje
+    if hours_left <= 1:
+        urgency = "⚠️ URGENTE"
+        time_msg = "menos de 1 hora"
+    elif hours_left <= 24:
+        urgency = "⏰"
+        time_msg = f"{hours_left} horas"
+    else:
+        days_left = hours_left // 24
+        urgency = "📅"
+        time_msg = f"{days_left} día{'s' if days_left > 1 else ''}"
+
+    message = (
+        f"{urgency} <b>Recordatorio de Tarea</b>\n\n"
+        f"<b>Tarea:</b> {task.title}\n"
+        f"<b>Proyecto:</b> {project.name if project else 'Sin proyecto'}\n"
+        f"<b>Prioridad:</b> {task.priority.capitalize()}\n"
+        f"<b>Deadline:</b> {task.deadline.strftime('%d/%m/%Y %H:%M')}\n"
+        f"<b>Tiempo restante:</b> {time_msg}\n\n"
+    )
+
+    if task.description:
+        message += f"<b>Descripción:</b> {task.description[:200]}{'...' if len(task.description) > 200 else ''}\n\n"
+
+    message += "💡 Usa /tareas para ver todas tus tareas pendientes."
+    return message, time_msg
+
+
+def _reminder_run_id(task: Task) -> str:
+    """Clave del recordatorio de una tarea: uno por deadline y anticipación configurados"""
+    reminder_time = task.deadline - timedelta(hours=task.reminder_hours_before)
+    return f"reminder:{task.id}:{reminder_time:%Y-%m-%dT%H:%M}"
+
+
+@celery_app.task(
+    bind=True,
+    name='app.workers.reminder_tasks.check_upcoming_deadlines',
+    # Un worker que muere a mitad del barrido devuelve el mensaje a la cola: se reanuda
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=3
+)
+def check_upcoming_deadlines(self, timestamp: Optional[str] = None):
     """
     Verifica tareas con deadlines próximos y envía recordatorios.
 
@@ -36,148 +124,166 @@ def check_upcoming_deadlines(self):
     - Tienen deadline configurado
     - No están completadas
     - El deadline está dentro del rango reminder_hours_before
-    - No se ha enviado recordatorio previamente
+    - No se ha enviado recordatorio previamente (clave de idempotencia por
+      tarea y deadline, ver app/workers/checkpoints.py)
+
+    Las tareas se leen por lotes en orden de id (paginación por clave desde
+    el checkpoint de la hora): un reintento sigue después del último lote
+    registrado.
+
+    Args:
+        timestamp: Momento de la verificación en ISO 8601 (lo fijan los reintentos)
 
     Returns:
         dict: Resumen de recordatorios enviados
     """
-    db = SessionLocal()
+    # Obtener hora actual en UTC
+    now_utc = datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
+    run_id = f"reminders:{now_utc:%Y-%m-%dT%H}"
+
+    # Barrido de lectura en la réplica; checkpoint, entregas y notificaciones en el primario
+    # (el checkpoint solo lo escribe este intento: no hace falta releerlo tras cada commit)
+    primary = SessionLocal(expire_on_commit=False)
+    db = read_session()
     try:
         logger.info("🔔 Iniciando verificación de deadlines próximos...")
 
-        # Obtener hora actual en UTC
-        now_utc = datetime.utcnow()
-
-        # Buscar todas las tareas con deadline y no completadas
-        tasks_with_deadline = db.query(Task).filter(
-            Task.deadline.isnot(None),
-            Task.status != 'completado',
-            Task.reminder_hours_before.isnot(None),
-            Task.responsible_id.isnot(None)
-        ).all()
-
-        reminders_sent = 0
-        errors = 0
-
-        for task in tasks_with_deadline:
-            try:
-                # Calcular cuándo enviar el recordatorio
-                reminder_time = task.deadline - timedelta(hours=task.reminder_hours_before)
-
-                # Verificar si es momento de enviar el recordatorio
-                # Rango: entre la hora del recordatorio y 1 hora después
-                if reminder_time <= now_utc < (reminder_time + timedelta(hours=1)):
-
-                    # Verificar si ya se envió recordatorio para esta tarea
-                    existing_reminder = db.query(Notification).filter(
-                        Notification.task_id == task.id,
-                        Notification.type == 'recordatorio',
-                        Notification.sent_at >= reminder_time - timedelta(hours=1)
-                    ).first()
-
-                    if existing_reminder:
-                        logger.debug(f"Recordatorio ya enviado para tarea {task.id}")
-                        continue
-
-                    # Obtener usuario responsable
-                    user = db.query(User).filter(User.id == task.responsible_id).first()
-
-                    if not user:
-                        logger.warning(f"Usuario responsable no encontrado para tarea {task.id}")
-                        continue
-
-                    if not user.telegram_chat_id:
-                        logger.info(f"Usuario {user.email} no tiene Telegram vinculado, omitiendo recordatorio")
-                        continue
-
-                    # Calcular tiempo restante
-                    time_left = task.deadline - now_utc
-                    hours_left = int(time_left.total_seconds() / 3600)
-
-                    # Construir mensaje
-                    if hours_left <= 1:
-                        urgency = "⚠️ URGENTE"
-                        time_msg = "menos de 1 hora"
-                    elif hours_left <= 24:
-                        urgency = "⏰"
-                        time_msg = f"{hours_left} horas"
-                    else:
-                        days_left = hours_left // 24
-                        urgency = "📅"
-                        time_msg = f"{days_left} día{'s' if days_left > 1 else ''}"
-
-                    message = (
-                        f"{urgency} <b>Recordatorio de Tarea</b>\n\n"
-                        f"<b>Tarea:</b> {task.title}\n"
-                        f"<b>Proyecto:</b> {task.project.name if task.project else 'Sin proyecto'}\n"
-                        f"<b>Prioridad:</b> {task.priority.capitalize()}\n"
-                        f"<b>Deadline:</b> {task.deadline.strftime('%d/%m/%Y %H:%M')}\n"
-                        f"<b>Tiempo restante:</b> {time_msg}\n\n"
-                    )
-
-                    if task.description:
-                        message += f"<b>Descripción:</b> {task.description[:200]}{'...' if len(task.description) > 200 else ''}\n\n"
-
-                    message += f"💡 Usa /tareas para ver todas tus tareas pendientes."
-
-                    # Enviar notificación por Telegram (ejecutar async de forma síncrona)
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        success = loop.run_until_complete(
-                            send_telegram_notification(
-                                user_id=user.id,
-                                message=message,
-                                db=db
-                            )
-                        )
-                    finally:
-                        loop.close()
-
-                    if success:
-                        # Registrar notificación en BD
-                        notification = Notification(
-                            user_id=user.id,
-                            task_id=task.id,
-                            type='recordatorio',
-                            message=f"Recordatorio: {task.title} - Deadline en {time_msg}",
-                            sent_at=now_utc
-                        )
-                        db.add(notification)
-                        db.commit()
-
-                        reminders_sent += 1
-                        logger.info(f"✅ Recordatorio enviado para tarea '{task.title}' a {user.email}")
-                    else:
-                        errors += 1
-                        logger.error(f"❌ Error al enviar recordatorio para tarea {task.id}")
-
-            except Exception as e:
-                errors += 1
-                logger.error(f"Error procesando tarea {task.id}: {str(e)}")
-                continue
-
-        # Resumen final
+        checkpoint = checkpoints.checkpoint(primary, run_id)
+        tasks_checked = 0
+
+        if checkpoint.completed_at is None:
+            query = _due_tasks_query(db, now_utc)
+            attempt_id = checkpoints.new_attempt()
+            position = checkpoint.position
+            while True:
+                # Siguiente lote después del último registrado
+                batch_query = query if position is None else query.filter(Task.id > position)
+                batch = batch_query.order_by(Task.id).limit(settings.JOB_CHECKPOINT_BATCH).all()
+                if not batch:
+                    break
+
+                # Responsables y proyectos del lote: una consulta por modelo
+                users = loader(db, User)
+                users.want(*(task.responsible_id for task in batch))
+                projects = loader(db, Project)
+                projects.want(*(task.project_id for task in batch))
+
+                sent, errors, skipped = _send_reminders(primary, batch, users, projects, now_utc, attempt_id)
+                checkpoints.advance(primary, checkpoint, batch[-1].id, len(batch), sent, errors, skipped)
+                position = batch[-1].id
+                tasks_checked += len(batch)
+
+            checkpoints.complete(primary, checkpoint)
+
+        # Resumen final (contadores de todos los intentos de esta hora)
         summary = {
             'status': 'completed',
-            'reminders_sent': reminders_sent,
-            'errors': errors,
-            'total_tasks_checked': len(tasks_with_deadline),
+            'reminders_sent': checkpoint.sent,
+            'errors': checkpoint.errors,
+            'skipped': checkpoint.skipped,
+            'total_tasks_checked': tasks_checked,
             'timestamp': now_utc.isoformat()
         }
 
         logger.info(
-            f"✅ Verificación completada: {reminders_sent} recordatorios enviados, "
-            f"{errors} errores, {len(tasks_with_deadline)} tareas verificadas"
+            f"✅ Verificación completada: {checkpoint.sent} recordatorios enviados, "
+            f"{checkpoint.errors} errores, {tasks_checked} tareas verificadas"
         )
 
         return summary
 
     except Exception as e:
+        primary.rollback()
         logger.error(f"❌ Error en check_upcoming_deadlines: {str(e)}")
-        raise
+        # Reintentar con el mismo momento: misma hora de checkpoint y mismos recordatorios
+        raise self.retry(exc=e, kwargs={'timestamp': now_utc.isoformat()}, countdown=30 * 2 ** self.request.retries)
     finally:
         db.close()
+        primary.close()
+
+
+def _send_reminders(
+    primary: Session,
+    tasks: List[Task],
+    users,
+    projects,
+    now_utc: datetime,
+    attempt_id: str
+) -> Tuple[int, int, int]:
+    """
+    Enviar los recordatorios de un lote de tareas (solo los que reclama este intento)
+
+    Args:
+        primary: Sesión del primario
+        tasks: Tareas en su ventana de recordatorio
+        users: Loader de los responsables
+        projects: Loader de los proyectos
+        now_utc: Momento de la verificación
+        attempt_id: Intento que reclama las entregas
 
+    Returns:
+        (enviados, errores, omitidos por estar ya reclamados)
+    """
+    recipients = []
+    for task in tasks:
+        # Obtener usuario responsable
+        user = users.load(task.responsible_id)
+
+        if not user:
+            logger.warning(f"Usuario responsable no encontrado para tarea {task.id}")
+            continue
+
+        if not user.telegram_chat_id:
+            logger.info(f"Usuario {user.email} no tiene Telegram vinculado, omitiendo recordatorio")
+            continue
+
+        recipients.append((task, user))
+
+    claimed = checkpoints.claim_deliveries(
+        primary,
+        NotificationType.RECORDATORIO,
+        [(_reminder_run_id(task), user.id, task.id) for task, user in recipients],
+        attempt_id
+    )
+    pending = [
+        (task, user) for task, user in recipients
+        if checkpoints.delivery_key(_reminder_run_id(task), user.id, NotificationType.RECORDATORIO) in claimed
+    ]
+
+    messages = [
+        _reminder_message(task, projects.load(task.project_id), now_utc)
+        for task, _ in pending
+    ]
+    try:
+        results = asyncio.run(send_telegram_messages(
+            [(user.telegram_chat_id, message) for (_, user), (message, _) in zip(pending, messages)],
+            settings.DIGEST_SEND_CONCURRENCY
+        ))
+    except Exception:
+        # No se llegó a enviar: liberar las entregas para el reintento
+        checkpoints.release_deliveries(primary, [
+            checkpoints.delivery_key(_reminder_run_id(task), user.id, NotificationType.RECORDATORIO)
+            for task, user in pending
+        ])
+        raise
 
-# Ya no necesitamos estas funciones wrapper
+    sent, failed = [], []
+    for (task, user), (_, time_msg), success in zip(pending, messages, results):
+        key = checkpoints.delivery_key(_reminder_run_id(task), user.id, NotificationType.RECORDATORIO)
+        if success:
+            # Registrar notificación en BD
+            primary.add(Notification(
+                user_id=user.id,
+                task_id=task.id,
+                type=NotificationType.RECORDATORIO,
+                message=f"Recordatorio: {task.title} - Deadline en {time_msg}",
+                sent_at=now_utc
+            ))
+            sent.append(key)
+            logger.info(f"✅ Recordatorio enviado para tarea '{task.title}' a {user.email}")
+        else:
+            failed.append(key)
+            logger.error(f"❌ Error al enviar recordatorio para tarea {task.id}")
+    checkpoints.finish_deliveries(primary, sent, failed, now_utc)
+
+    return len(sent), len(failed), len(recipients) - len(pending)
@@ -1,342 +1,1044 @@
 """
 Tareas de Celery para resúmenes diarios y semanales
+
+Cada resumen se reparte en shards por rango de ids de usuario: la tarea
+programada (coordinadora) lanza un chord con un shard por cada
+DIGEST_SHARD_SIZE usuarios vinculados, cada shard arma sus mensajes con unas
+pocas consultas agregadas y los envía en paralelo, y el callback del chord
+suma los resultados en el mismo resumen de envíos de siempre. Con más
+workers, los shards se procesan a la vez.
+
+Cada resumen es una ejecución con `run_id` por día (o semana) y un
+checkpoint por shard (ver app/workers/checkpoints.py): un shard reintentado
+o relanzado sigue desde su último lote y no reenvía a quien ya lo recibió.
+
+El trabajo pesado se hace antes de la hora pico: `render_daily_summary` y
+`render_weekly_summary` generan los mensajes de la ejecución en
+`digest_payloads`, y a la hora programada los shards de envío solo leen esos
+mensajes y los envían (los usuarios sin mensaje preparado, p. ej. vinculados
+después, se generan al enviar).
+
+Cada usuario elige su zona horaria y la hora local de su resumen. Los
+usuarios con la misma zona y hora forman un horario (`Bucket`) que se
+prepara y se envía por separado: `schedule_digests` corre cada minuto y
+lanza los horarios que llegaron a su hora, así que la carga se reparte a lo
+largo del día y "hoy" y "esta semana" son los del usuario. Los shards de un
+horario con muchos usuarios se escalonan en DIGEST_JITTER_SECONDS.
 """
 import logging
 import asyncio
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Dict, List
+from sqlalchemy import func, case
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from celery import chord, group
 
 from app.workers.celery_app import celery_app
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import SessionLocal, read_session
 from app.models.task import Task, TaskStatus
 from app.models.user import User
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationType
+from app.models.digest_payload import DigestPayload
+from app.models.job_checkpoint import JobCheckpoint
 from app.models.project import Project
-from app.bot.notifications import send_telegram_notification
+from app.bot.notifications import send_telegram_messages
+from app.workers import checkpoints
 
 logger = logging.getLogger(__name__)
 
+PRIORITY_EMOJI = {
+    'alta': '🔴',
+    'media': '🟡',
+    'baja': '🟢'
+}
 
-@celery_app.task(bind=True, name='app.workers.summary_tasks.send_daily_summary')
-def send_daily_summary(self):
+UTC = ZoneInfo("UTC")
+
+# Mensajes de un shard: user_id -> (mensaje de Telegram, texto de la notificación)
+Digests = Dict[str, Tuple[str, str]]
+
+
+class Bucket(NamedTuple):
+    """Horario de resumen: usuarios con la misma zona horaria y hora local"""
+    timezone: str
+    digest_time: str  # 'HH:MM'
+
+
+def _bucket(timezone: Optional[str], digest_time: Optional[str]) -> Optional[Bucket]:
+    """Horario de los argumentos de un task (None = todos los usuarios)"""
+    if timezone is None:
+        return None
+    return Bucket(timezone, digest_time or settings.DEFAULT_DIGEST_TIME)
+
+
+def _to_local(moment: datetime, tz: ZoneInfo) -> datetime:
+    """Momento en UTC sin zona (como en la BD) en la hora local de `tz`"""
+    return moment.replace(tzinfo=UTC).astimezone(tz)
+
+
+def _to_utc(moment: datetime) -> datetime:
+    """Momento local con zona en UTC sin zona (como en la BD)"""
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+
+def _linked_users(db: Session, bucket: Optional[Bucket] = None):
+    """Consulta de usuarios activos con Telegram vinculado (de un horario, si se indica)"""
+    query = db.query(User).filter(
+        User.telegram_chat_id.isnot(None),
+        User.is_active == True
+    )
+    if bucket is not None:
+        query = query.filter(
+            User.timezone == bucket.timezone,
+            User.digest_time == time.fromisoformat(bucket.digest_time)
+        )
+    return query
+
+
+def _buckets(db: Session) -> List[Bucket]:
+    """Horarios con al menos un usuario vinculado"""
+    return [
+        Bucket(timezone, f"{digest_time:%H:%M}")
+        for timezone, digest_time in _linked_users(db).with_entities(User.timezone, User.digest_time).distinct()
+    ]
+
+
+def _shard_ranges(user_ids: List[str], size: int) -> List[Tuple[Optional[str], Optional[str]]]:
     """
-    Envía resumen diario de tareas a todos los usuarios con Telegram vinculado.
+    Dividir ids de usuario ordenados en rangos contiguos de `size` usuarios
 
-    Se ejecuta diariamente a las 8:00 AM y envía:
-    - Tareas con deadline hoy
-    - Tareas pendientes sin deadline
-    - Resumen de estado de tareas del usuario
+    El primer rango no tiene límite inferior y el último no tiene límite
+    superior: los usuarios vinculados después también caen en algún shard.
 
     Returns:
-        dict: Resumen de envíos realizados
+        Lista de (start_after, end_at): ids mayores que start_after y hasta end_at
     """
-    db = SessionLocal()
-    try:
-        logger.info("📊 Iniciando envío de resúmenes diarios...")
+    if not user_ids:
+        return [(None, None)]
+    ends = [user_ids[i - 1] for i in range(size, len(user_ids), size)]
+    return list(zip([None] + ends, ends + [None]))
+
+
+def _week_start(now: datetime) -> datetime:
+    """Inicio de la semana de `now` (lunes 00:00, en la zona de `now`)"""
+    week_start = now - timedelta(days=now.weekday())
+    return week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+
 
-        now = datetime.utcnow()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
+def _daily_digests(db: Session, users: List[User], now: datetime, tz: ZoneInfo) -> Digests:
+    """
+    Mensajes del resumen diario de un grupo de usuarios de una zona horaria
+
+    Args:
+        db: Sesión de base de datos
+        users: Usuarios del shard
+        now: Momento del resumen en UTC (el mismo para todos los shards)
+        tz: Zona horaria de los usuarios (define "hoy")
+
+    Returns:
+        user_id -> (mensaje, texto de la notificación)
+    """
+    # Día local del usuario, en UTC como los deadlines
+    local_start = datetime.combine(_to_local(now, tz).date(), time(), tzinfo=tz)
+    today_start = _to_utc(local_start)
+    today_end = _to_utc(local_start + timedelta(days=1))
+    user_ids = [user.id for user in users]
+
+    # Conteos por usuario: sin empezar, en curso y vencidas (deadline pasado y no completadas)
+    counts = {
+        row.responsible_id: row
+        for row in db.query(
+            Task.responsible_id,
+            func.sum(case((Task.status == TaskStatus.SIN_EMPEZAR, 1), else_=0)).label('not_started'),
+            func.sum(case((Task.status == TaskStatus.EN_CURSO, 1), else_=0)).label('in_progress'),
+            func.sum(case(
+                ((Task.status != TaskStatus.COMPLETADO) & (Task.deadline < now), 1), else_=0
+            )).label('overdue'),
+        ).filter(
+            Task.responsible_id.in_(user_ids)
+        ).group_by(Task.responsible_id)
+    }
+
+    # Tareas con deadline hoy, con el nombre de su proyecto
+    tasks_today: Dict[str, list] = {}
+    for row in db.query(
+        Task.responsible_id, Task.title, Task.priority, Task.deadline, Project.name.label('project_name')
+    ).outerjoin(
+        Project, Task.project_id == Project.id
+    ).filter(
+        Task.responsible_id.in_(user_ids),
+        Task.status != TaskStatus.COMPLETADO,
+        Task.deadline >= today_start,
+        Task.deadline < today_end
+    ).order_by(Task.deadline):
+        tasks_today.setdefault(row.responsible_id, []).append(row)
+
+    digests = {}
+    for user in users:
+        row = counts.get(user.id)
+        tasks_not_started = int(row.not_started or 0) if row else 0
+        tasks_in_progress = int(row.in_progress or 0) if row else 0
+        tasks_overdue = int(row.overdue or 0) if row else 0
+        today = tasks_today.get(user.id, [])
+
+        # Construir mensaje
+        message = f"🌅 <b>Buenos días, {user.full_name}!</b>\n\n"
+        message += f"📋 <b>Resumen Diario</b> - {local_start.strftime('%d/%m/%Y')}\n\n"
+
+        # Estadísticas generales
+        message += "📊 <b>Estado de tus tareas:</b>\n"
+        message += f"• Sin empezar: {tasks_not_started}\n"
+        message += f"• En curso: {tasks_in_progress}\n"
+
+        if tasks_overdue > 0:
+            message += f"• ⚠️ Vencidas: {tasks_overdue}\n"
+
+        message += "\n"
+
+        # Tareas con deadline hoy
+        if today:
+            message += f"⏰ <b>Tareas para hoy ({len(today)}):</b>\n\n"
+
+            for task in today[:5]:  # Máximo 5 tareas
+                priority_emoji = PRIORITY_EMOJI.get(task.priority, '⚪')
+                time_str = _to_local(task.deadline, tz).strftime('%H:%M') if task.deadline else ''
+                message += f"{priority_emoji} <b>{task.title}</b>\n"
+                message += f"   🕐 {time_str} | {task.project_name or 'Sin proyecto'}\n"
+
+            if len(today) > 5:
+                message += f"\n... y {len(today) - 5} tarea(s) más\n"
+        else:
+            message += "✅ <b>No tienes tareas con deadline para hoy.</b>\n"
+
+        message += "\n💡 Usa /tareas para ver todas tus tareas o /hoy para las de hoy."
+
+        digests[user.id] = (message, f"Resumen diario: {len(today)} tareas hoy, {tasks_overdue} vencidas")
+
+    return digests
+
+
+def _weekly_digests(db: Session, users: List[User], now: datetime, tz: ZoneInfo) -> Digests:
+    """
+    Mensajes del resumen semanal de un grupo de usuarios de una zona horaria
+
+    Args:
+        db: Sesión de base de datos
+        users: Usuarios del shard
+        now: Momento del resumen en UTC (el mismo para todos los shards)
+        tz: Zona horaria de los usuarios (define "esta semana")
+
+    Returns:
+        user_id -> (mensaje, texto de la notificación)
+    """
+    # Inicio de esta semana (lunes 00:00 local), en UTC como los deadlines
+    local_week_start = _week_start(_to_local(now, tz))
+    week_start = _to_utc(local_week_start)
+
+    # Fin de esta semana (domingo 23:59)
+    week_end = _to_utc(local_week_start + timedelta(days=7))
+
+    # Inicio de semana pasada
+    last_week_start = _to_utc(local_week_start - timedelta(days=7))
+
+    user_ids = [user.id for user in users]
+
+    # Conteos por usuario: completadas la semana pasada, vencidas, total y completadas (histórico)
+    counts = {
+        row.responsible_id: row
+        for row in db.query(
+            Task.responsible_id,
+            func.sum(case((
+                (Task.status == TaskStatus.COMPLETADO)
+                & (Task.completed_at >= last_week_start)
+                & (Task.completed_at < week_start), 1
+            ), else_=0)).label('completed_last_week'),
+            func.sum(case(
+                ((Task.status != TaskStatus.COMPLETADO) & (Task.deadline < now), 1), else_=0
+            )).label('overdue'),
+            func.count(Task.id).label('total'),
+            func.sum(case((Task.status == TaskStatus.COMPLETADO, 1), else_=0)).label('completed'),
+        ).filter(
+            Task.responsible_id.in_(user_ids)
+        ).group_by(Task.responsible_id)
+    }
+
+    # Tareas para esta semana, con el nombre de su proyecto
+    tasks_week: Dict[str, list] = {}
+    for row in db.query(
+        Task.responsible_id, Task.title, Task.priority, Task.deadline, Project.name.label('project_name')
+    ).outerjoin(
+        Project, Task.project_id == Project.id
+    ).filter(
+        Task.responsible_id.in_(user_ids),
+        Task.status != TaskStatus.COMPLETADO,
+        Task.deadline >= week_start,
+        Task.deadline < week_end
+    ).order_by(Task.deadline):
+        tasks_week.setdefault(row.responsible_id, []).append(row)
+
+    digests = {}
+    for user in users:
+        row = counts.get(user.id)
+        tasks_completed_last_week = int(row.completed_last_week or 0) if row else 0
+        tasks_overdue = int(row.overdue or 0) if row else 0
+        total_tasks = int(row.total or 0) if row else 0
+        total_completed = int(row.completed or 0) if row else 0
+        this_week = tasks_week.get(user.id, [])
+
+        # Tasa de completación
+        completion_rate = (total_completed / total_tasks * 100) if total_tasks > 0 else 0
+
+        # Construir mensaje
+        message = "📈 <b>Resumen Semanal</b>\n\n"
+        message += f"Hola {user.full_name},\n\n"
+
+        # Semana pasada
+        message += "📅 <b>Semana Pasada:</b>\n"
+        message += f"✅ Completaste {tasks_completed_last_week} tarea(s)\n\n"
+
+        # Esta semana
+        if this_week:
+            message += f"📋 <b>Esta Semana ({len(this_week)} tareas):</b>\n\n"
+
+            for task in this_week[:7]:  # Máximo 7 tareas
+                priority_emoji = PRIORITY_EMOJI.get(task.priority, '⚪')
+                day_name = _to_local(task.deadline, tz).strftime('%A %d/%m') if task.deadline else 'Sin fecha'
+                message += f"{priority_emoji} <b>{task.title}</b>\n"
+                message += f"   📅 {day_name} | {task.project_name or 'Sin proyecto'}\n"
+
+            if len(this_week) > 7:
+                message += f"\n... y {len(this_week) - 7} tarea(s) más\n"
+        else:
+            message += "✅ <b>No tienes tareas programadas para esta semana.</b>\n"
+
+        message += "\n"
+
+        # Estadísticas
+        message += "📊 <b>Estadísticas Generales:</b>\n"
+        message += f"• Total de tareas: {total_tasks}\n"
+        message += f"• Completadas: {total_completed} ({completion_rate:.1f}%)\n"
+
+        if tasks_overdue > 0:
+            message += f"• ⚠️ Vencidas: {tasks_overdue}\n"
+
+        message += "\n💡 Usa /semana para ver detalles de la semana actual."
+
+        digests[user.id] = (
+            message,
+            f"Resumen semanal: {tasks_completed_last_week} completadas, {len(this_week)} para esta semana"
+        )
+
+    return digests
 
-        # Obtener usuarios con Telegram vinculado
-        users_with_telegram = db.query(User).filter(
-            User.telegram_chat_id.isnot(None),
-            User.is_active == True
-        ).all()
 
-        summaries_sent = 0
-        errors = 0
+class DigestKind(NamedTuple):
+    """Un tipo de resumen"""
+    build: Callable[[Session, List[User], datetime, ZoneInfo], Digests]  # Mensajes de usuarios de una zona
+    type: NotificationType
+    label: str  # Nombre en los logs
+    run_id: Callable[[datetime], str]  # Periodo al que pertenece un momento (en hora local)
+    weekday: Optional[int]  # Día local de envío (None = todos los días)
+    delay_minutes: int  # Envío después de la hora del resumen del usuario
+
+
+DIGEST_KINDS: Dict[str, DigestKind] = {
+    'daily': DigestKind(
+        _daily_digests, NotificationType.RESUMEN_DIARIO, 'diario',
+        lambda now: f"daily:{now:%Y-%m-%d}",
+        None, 0
+    ),
+    'weekly': DigestKind(
+        _weekly_digests, NotificationType.RESUMEN_SEMANAL, 'semanal',
+        lambda now: f"weekly:{_week_start(now):%Y-%m-%d}",
+        0, settings.WEEKLY_DIGEST_DELAY_MINUTES
+    ),
+}
+
+
+def _build_digests(db: Session, digest: DigestKind, users: List[User], now: datetime) -> Digests:
+    """Mensajes de un lote de usuarios (cada zona horaria con sus propios días)"""
+    by_timezone: Dict[str, List[User]] = {}
+    for user in users:
+        by_timezone.setdefault(user.timezone, []).append(user)
+
+    digests = {}
+    for timezone, timezone_users in by_timezone.items():
+        digests.update(digest.build(db, timezone_users, now, ZoneInfo(timezone)))
+    return digests
+
+
+def _period_run_id(digest: DigestKind, bucket: Bucket, moment: datetime) -> str:
+    """Periodo (día o semana local del horario) de un momento en UTC"""
+    return digest.run_id(_to_local(moment, ZoneInfo(bucket.timezone)))
+
+
+def _bucket_run_id(run_id: str, bucket: Optional[Bucket]) -> str:
+    """
+    Ejecución (checkpoints) de un horario dentro de un periodo
+
+    Las entregas y los mensajes preparados se identifican por el periodo
+    (`run_id`): un usuario que cambia de horario no recibe el resumen dos
+    veces el mismo día.
+    """
+    if bucket is None:
+        return run_id
+    return f"{run_id}:{bucket.timezone}:{bucket.digest_time}"
 
-        for user in users_with_telegram:
+
+def _render_run_id(run_id: str) -> str:
+    """Ejecución de la preparación de los mensajes de un resumen"""
+    return f"render:{run_id}"
+
+
+def _send_instants(digest: DigestKind, bucket: Bucket, start: datetime, end: datetime) -> List[datetime]:
+    """
+    Momentos de envío de un horario en el intervalo (start, end]
+
+    Args:
+        digest: Tipo de resumen
+        bucket: Horario
+        start: Inicio del intervalo en UTC (excluido)
+        end: Fin del intervalo en UTC (incluido)
+
+    Returns:
+        Momentos de envío en UTC, en orden
+    """
+    tz = ZoneInfo(bucket.timezone)
+    at = time.fromisoformat(bucket.digest_time)
+    last_day = _to_local(end, tz).date()
+
+    instants = []
+    # El retraso del semanal puede pasar el envío al día siguiente: se revisan tres días locales
+    for days in (2, 1, 0):
+        day = last_day - timedelta(days=days)
+        if digest.weekday is not None and day.weekday() != digest.weekday:
+            continue
+        send_at = _to_utc(datetime.combine(day, at, tzinfo=tz) + timedelta(minutes=digest.delay_minutes))
+        if start < send_at <= end:
+            instants.append(send_at)
+    return instants
+
+
+def _run_shards(run_id: str, bucket: Optional[Bucket] = None) -> List[JobCheckpoint]:
+    """
+    Checkpoints de los shards de una ejecución (se crean si no existen)
+
+    Args:
+        run_id: Ejecución (ver `_bucket_run_id`)
+        bucket: Horario de la ejecución (None = todos los usuarios)
+
+    Returns:
+        JobCheckpoint de cada shard, por número
+    """
+    primary = SessionLocal()
+    try:
+        shards = checkpoints.checkpoints(primary, run_id)
+        if not shards:
+            # Solo los ids: cada shard lee sus usuarios por lotes
+            db = read_session()
             try:
-                # Tareas con deadline hoy
-                tasks_today = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status != TaskStatus.COMPLETADO,
-                    Task.deadline >= today_start,
-                    Task.deadline < today_end
-                ).order_by(Task.deadline).all()
-
-                # Tareas sin empezar
-                tasks_not_started = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status == TaskStatus.SIN_EMPEZAR
-                ).count()
-
-                # Tareas en curso
-                tasks_in_progress = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status == TaskStatus.EN_CURSO
-                ).count()
-
-                # Tareas vencidas (deadline pasado y no completadas)
-                tasks_overdue = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status != TaskStatus.COMPLETADO,
-                    Task.deadline < now
-                ).count()
-
-                # Construir mensaje
-                message = f"🌅 <b>Buenos días, {user.full_name}!</b>\n\n"
-                message += f"📋 <b>Resumen Diario</b> - {today_start.strftime('%d/%m/%Y')}\n\n"
-
-                # Estadísticas generales
-                message += f"📊 <b>Estado de tus tareas:</b>\n"
-                message += f"• Sin empezar: {tasks_not_started}\n"
-                message += f"• En curso: {tasks_in_progress}\n"
-
-                if tasks_overdue > 0:
-                    message += f"• ⚠️ Vencidas: {tasks_overdue}\n"
-
-                message += "\n"
-
-                # Tareas con deadline hoy
-                if tasks_today:
-                    message += f"⏰ <b>Tareas para hoy ({len(tasks_today)}):</b>\n\n"
-
-                    for task in tasks_today[:5]:  # Máximo 5 tareas
-                        priority_emoji = {
-                            'alta': '🔴',
-                            'media': '🟡',
-                            'baja': '🟢'
-                        }.get(task.priority, '⚪')
-
-                        time_str = task.deadline.strftime('%H:%M') if task.deadline else ''
-                        message += f"{priority_emoji} <b>{task.title}</b>\n"
-                        message += f"   🕐 {time_str} | {task.project.name if task.project else 'Sin proyecto'}\n"
-
-                    if len(tasks_today) > 5:
-                        message += f"\n... y {len(tasks_today) - 5} tarea(s) más\n"
-                else:
-                    message += "✅ <b>No tienes tareas con deadline para hoy.</b>\n"
-
-                message += "\n💡 Usa /tareas para ver todas tus tareas o /hoy para las de hoy."
-
-                # Enviar notificación (ejecutar async de forma síncrona)
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    success = loop.run_until_complete(
-                        send_telegram_notification(user.id, message, db)
-                    )
-                finally:
-                    loop.close()
-
-                if success:
-                    # Registrar en BD
-                    notification = Notification(
-                        user_id=user.id,
-                        type='resumen_diario',
-                        message=f"Resumen diario: {tasks_today.__len__()} tareas hoy, {tasks_overdue} vencidas",
-                        sent_at=now
-                    )
-                    db.add(notification)
-                    db.commit()
-
-                    summaries_sent += 1
-                    logger.info(f"✅ Resumen diario enviado a {user.email}")
-                else:
-                    errors += 1
-                    logger.error(f"❌ Error al enviar resumen diario a {user.email}")
+                user_ids = [
+                    user_id for (user_id,) in _linked_users(db, bucket).with_entities(User.id).order_by(User.id)
+                ]
+            finally:
+                db.close()
+            shards = checkpoints.create_checkpoints(
+                primary, run_id, _shard_ranges(user_ids, settings.DIGEST_SHARD_SIZE)
+            )
+        return shards
+    finally:
+        primary.close()
 
-            except Exception as e:
-                errors += 1
-                logger.error(f"Error procesando resumen para usuario {user.id}: {str(e)}")
-                continue
 
-        summary = {
-            'status': 'completed',
-            'summaries_sent': summaries_sent,
-            'errors': errors,
-            'total_users': len(users_with_telegram),
-            'timestamp': now.isoformat()
-        }
+def _shard_users(db: Session, checkpoint: JobCheckpoint, bucket: Optional[Bucket] = None):
+    """
+    Lotes de usuarios vinculados del rango de un shard, desde su checkpoint
 
+    El siguiente lote empieza después de `checkpoint.position`: el llamador
+    avanza el checkpoint después de procesar cada lote.
+
+    Yields:
+        Listas de hasta JOB_CHECKPOINT_BATCH usuarios (del horario), en orden de id
+    """
+    while True:
+        query = _linked_users(db, bucket)
+        position = checkpoint.position or checkpoint.start_after
+        if position is not None:
+            query = query.filter(User.id > position)
+        if checkpoint.end_at is not None:
+            query = query.filter(User.id <= checkpoint.end_at)
+        users = query.order_by(User.id).limit(settings.JOB_CHECKPOINT_BATCH).all()
+        if not users:
+            return
+        yield users
+
+
+def _dispatch_render(kind: str, bucket: Bucket, scheduled_at: datetime) -> dict:
+    """
+    Lanzar los shards que preparan los mensajes de un resumen de un horario
+
+    Args:
+        kind: 'daily' o 'weekly'
+        bucket: Horario
+        scheduled_at: Momento del envío en UTC (los mensajes se arman para ese momento)
+
+    Returns:
+        dict: Shards lanzados
+    """
+    digest = DIGEST_KINDS[kind]
+    run_id = _period_run_id(digest, bucket, scheduled_at)
+    bucket_run_id = _bucket_run_id(run_id, bucket)
+
+    shards = _run_shards(_render_run_id(bucket_run_id), bucket)
+    pending = [shard.shard for shard in shards if shard.completed_at is None]
+
+    if pending:
         logger.info(
-            f"✅ Resúmenes diarios completados: {summaries_sent} enviados, "
-            f"{errors} errores, {len(users_with_telegram)} usuarios"
+            f"🧮 Preparando resúmenes {digest.label}s ({bucket_run_id}): "
+            f"{len(pending)} de {len(shards)} shard(s) pendientes"
         )
+        group(
+            render_summary_shard.s(kind, run_id, shard, scheduled_at.isoformat(), *bucket)
+            for shard in pending
+        ).apply_async()
+
+    return {
+        'status': 'dispatched' if pending else 'completed',
+        'run_id': bucket_run_id,
+        'shards': len(pending),
+        'timestamp': scheduled_at.isoformat()
+    }
+
+
+def _dispatch_summary(kind: str, bucket: Bucket, scheduled_at: datetime) -> dict:
+    """
+    Lanzar el chord de shards de un resumen de un horario (o reanudar los que no terminaron)
+
+    Si el horario tiene varios shards, sus inicios se reparten en
+    DIGEST_JITTER_SECONDS para no enviar todos los mensajes en el mismo
+    instante.
+
+    Args:
+        kind: 'daily' o 'weekly'
+        bucket: Horario
+        scheduled_at: Momento del envío en UTC
+
+    Returns:
+        dict: Shards lanzados (el resumen de envíos lo produce aggregate_summary)
+    """
+    digest = DIGEST_KINDS[kind]
+    run_id = _period_run_id(digest, bucket, scheduled_at)
+    bucket_run_id = _bucket_run_id(run_id, bucket)
+    timestamp = scheduled_at.isoformat()
+
+    shards = _run_shards(bucket_run_id, bucket)
+    pending = [shard.shard for shard in shards if shard.completed_at is None]
+
+    if not pending:
+        logger.info(f"Resumen {digest.label} {bucket_run_id} ya completado, no se reenvía")
+        return aggregate_summary([], kind, bucket_run_id, timestamp)
+
+    logger.info(
+        f"📊 Iniciando envío de resúmenes {digest.label}s ({bucket_run_id}): "
+        f"{len(pending)} de {len(shards)} shard(s) pendientes"
+    )
+
+    jitter = settings.DIGEST_JITTER_SECONDS if len(pending) > 1 else 0
+    result = chord(
+        send_summary_shard.s(kind, run_id, shard, timestamp, *bucket).set(
+            countdown=jitter * position // len(pending)
+        )
+        for position, shard in enumerate(pending)
+    )(aggregate_summary.s(kind, bucket_run_id, timestamp))
+
+    return {
+        'status': 'dispatched',
+        'run_id': bucket_run_id,
+        'shards': len(pending),
+        'aggregate_task_id': result.id,
+        'timestamp': timestamp
+    }
+
+
+def _dispatch_buckets(
+    dispatch: Callable[[str, Bucket, datetime], dict],
+    kind: str,
+    timezone: Optional[str],
+    digest_time: Optional[str]
+) -> dict:
+    """
+    Lanzar ya un resumen de uno o de todos los horarios (periodo local actual)
+
+    Args:
+        dispatch: `_dispatch_summary` o `_dispatch_render`
+        kind: 'daily' o 'weekly'
+        timezone: Zona del horario (None = todos los horarios con usuarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: Resultado de cada horario
+    """
+    now = datetime.utcnow()
+    bucket = _bucket(timezone, digest_time)
+    if bucket is not None:
+        buckets = [bucket]
+    else:
+        db = read_session()
+        try:
+            buckets = _buckets(db)
+        finally:
+            db.close()
+
+    runs = [dispatch(kind, bucket, now) for bucket in buckets]
+    return {
+        'status': 'completed' if all(run['status'] == 'completed' for run in runs) else 'dispatched',
+        'runs': runs,
+        'timestamp': now.isoformat()
+    }
+
+
+def _staged_digests(db: Session, run_id: str, users: List[User]) -> Digests:
+    """Mensajes preparados de una ejecución para un lote de usuarios"""
+    if not users:
+        return {}
+    return {
+        row.user_id: (row.message, row.summary)
+        for row in db.query(DigestPayload.user_id, DigestPayload.message, DigestPayload.summary).filter(
+            DigestPayload.run_id == run_id,
+            DigestPayload.user_id.in_([user.id for user in users])
+        )
+    }
+
+
+def _send_batch(
+    primary: Session,
+    db: Session,
+    digest: DigestKind,
+    run_id: str,
+    users: List[User],
+    now: datetime,
+    attempt_id: str
+) -> Tuple[int, int, int]:
+    """
+    Enviar el resumen a un lote de usuarios (solo a los que reclama este intento)
 
-        return summary
+    Returns:
+        (enviados, errores, omitidos por estar ya reclamados)
+    """
+    claimed = checkpoints.claim_deliveries(
+        primary, digest.type, [(run_id, user.id, None) for user in users], attempt_id
+    )
+    pending = [user for user in users if checkpoints.delivery_key(run_id, user.id, digest.type) in claimed]
+
+    digests = _staged_digests(db, run_id, pending)
+    missing = [user for user in pending if user.id not in digests]
+    if missing:
+        # Sin mensaje preparado (vinculados después de la preparación, o sin preparación)
+        digests.update(_build_digests(db, digest, missing, now))
+        logger.info(f"{len(missing)} resumen(es) {digest.label}(es) sin preparar, generados al enviar")
+    try:
+        results = asyncio.run(send_telegram_messages(
+            [(user.telegram_chat_id, digests[user.id][0]) for user in pending],
+            settings.DIGEST_SEND_CONCURRENCY
+        ))
+    except Exception:
+        # No se llegó a enviar (los errores por mensaje no salen de send_telegram_messages):
+        # liberar las entregas para el reintento
+        checkpoints.release_deliveries(primary, [
+            checkpoints.delivery_key(run_id, user.id, digest.type) for user in pending
+        ])
+        raise
+
+    sent, failed = [], []
+    for user, success in zip(pending, results):
+        key = checkpoints.delivery_key(run_id, user.id, digest.type)
+        if success:
+            primary.add(Notification(
+                user_id=user.id,
+                type=digest.type,
+                message=digests[user.id][1],
+                sent_at=now
+            ))
+            sent.append(key)
+            logger.info(f"✅ Resumen {digest.label} enviado a {user.email}")
+        else:
+            failed.append(key)
+            logger.error(f"❌ Error al enviar resumen {digest.label} a {user.email}")
+    checkpoints.finish_deliveries(primary, sent, failed, now)
+
+    return len(sent), len(failed), len(users) - len(pending)
+
+
+@celery_app.task(
+    bind=True,
+    name='app.workers.summary_tasks.send_summary_shard',
+    # Un worker que muere a mitad del shard devuelve el mensaje a la cola: se reanuda
+    acks_late=True,
+    reject_on_worker_lost=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3
+)
+def send_summary_shard(
+    self,
+    kind: str,
+    run_id: str,
+    shard: int,
+    timestamp: str,
+    timezone: Optional[str] = None,
+    digest_time: Optional[str] = None
+):
+    """
+    Envía un resumen a los usuarios vinculados del rango de un shard.
+
+    Procesa los usuarios por lotes de JOB_CHECKPOINT_BATCH en orden de id.
+    Cada lote lee sus mensajes preparados (o los arma con consultas
+    agregadas si faltan), los envía en paralelo con un solo cliente del bot
+    y registra las notificaciones y el checkpoint en una transacción. Un
+    reintento empieza después del último lote registrado.
+
+    Args:
+        kind: 'daily' o 'weekly'
+        run_id: Periodo del resumen (entregas y mensajes preparados)
+        shard: Número de shard (su rango está en el checkpoint)
+        timestamp: Momento del resumen en ISO 8601 (UTC), común a todos los shards
+        timezone: Zona del horario (None = todos los usuarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: processed, sent, errors y skipped del shard (todos sus intentos)
+    """
+    digest = DIGEST_KINDS[kind]
+    bucket = _bucket(timezone, digest_time)
+    now = datetime.fromisoformat(timestamp)
+    attempt_id = checkpoints.new_attempt()
+
+    # Barrido de lectura en la réplica; checkpoints, entregas y notificaciones en el primario
+    # (el checkpoint solo lo escribe este intento: no hace falta releerlo tras cada commit)
+    primary = SessionLocal(expire_on_commit=False)
+    db = read_session()
+    try:
+        checkpoint = checkpoints.checkpoint(primary, _bucket_run_id(run_id, bucket), shard)
+        if checkpoint.completed_at is not None:
+            return checkpoints.counters(checkpoint)
+
+        for users in _shard_users(db, checkpoint, bucket):
+            sent, errors, skipped = _send_batch(primary, db, digest, run_id, users, now, attempt_id)
+            checkpoints.advance(primary, checkpoint, users[-1].id, len(users), sent, errors, skipped)
+
+        return checkpoints.complete(primary, checkpoint)
 
     except Exception as e:
-        logger.error(f"❌ Error en send_daily_summary: {str(e)}")
+        primary.rollback()
+        logger.error(f"❌ Error en el shard {shard} del resumen {digest.label} {run_id}: {str(e)}")
         raise
     finally:
         db.close()
+        primary.close()
+
+
+@celery_app.task(
+    bind=True,
+    name='app.workers.summary_tasks.render_summary_shard',
+    acks_late=True,
+    reject_on_worker_lost=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3
+)
+def render_summary_shard(
+    self,
+    kind: str,
+    run_id: str,
+    shard: int,
+    timestamp: str,
+    timezone: Optional[str] = None,
+    digest_time: Optional[str] = None
+):
+    """
+    Prepara los mensajes de un resumen para los usuarios del rango de un shard.
 
+    Arma los mensajes por lotes (consultas agregadas) y los guarda en
+    digest_payloads sin enviarlos. Un mensaje ya preparado no se reemplaza.
 
-@celery_app.task(bind=True, name='app.workers.summary_tasks.send_weekly_summary')
-def send_weekly_summary(self):
+    Args:
+        kind: 'daily' o 'weekly'
+        run_id: Periodo del resumen que enviará los mensajes
+        shard: Número de shard de la preparación
+        timestamp: Momento del envío en ISO 8601 (UTC)
+        timezone: Zona del horario (None = todos los usuarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: processed y sent (mensajes preparados) del shard
     """
-    Envía resumen semanal de tareas a todos los usuarios con Telegram vinculado.
+    digest = DIGEST_KINDS[kind]
+    bucket = _bucket(timezone, digest_time)
+    now = datetime.fromisoformat(timestamp)
 
-    Se ejecuta los lunes a las 9:00 AM y envía:
-    - Tareas completadas la semana pasada
-    - Tareas pendientes para esta semana
-    - Estadísticas de productividad
+    primary = SessionLocal(expire_on_commit=False)
+    db = read_session()
+    try:
+        checkpoint = checkpoints.checkpoint(primary, _render_run_id(_bucket_run_id(run_id, bucket)), shard)
+        if checkpoint.completed_at is not None:
+            return checkpoints.counters(checkpoint)
+
+        for users in _shard_users(db, checkpoint, bucket):
+            digests = _build_digests(db, digest, users, now)
+            primary.execute(checkpoints.insert_or_skip(DigestPayload), [
+                {
+                    'id': str(uuid.uuid4()),
+                    'run_id': run_id,
+                    'user_id': user_id,
+                    'type': digest.type,
+                    'message': message,
+                    'summary': summary,
+                }
+                for user_id, (message, summary) in digests.items()
+            ])
+            checkpoints.advance(primary, checkpoint, users[-1].id, len(users), len(digests), 0, 0)
+
+        return checkpoints.complete(primary, checkpoint)
+
+    except Exception as e:
+        primary.rollback()
+        logger.error(f"❌ Error preparando el shard {shard} del resumen {digest.label} {run_id}: {str(e)}")
+        raise
+    finally:
+        db.close()
+        primary.close()
+
+
+@celery_app.task(bind=True, name='app.workers.summary_tasks.aggregate_summary')
+def aggregate_summary(self, results: List[dict], kind: str, run_id: str, timestamp: str):
+    """
+    Callback del chord: suma los checkpoints de todos los shards de un resumen.
+
+    Se leen los checkpoints (no solo `results`) para incluir los shards que
+    terminó una ejecución anterior del mismo `run_id`.
+
+    Args:
+        results: Resultados de send_summary_shard
+        kind: 'daily' o 'weekly'
+        run_id: Ejecución del resumen (de un horario)
+        timestamp: Momento del resumen en ISO 8601
 
     Returns:
         dict: Resumen de envíos realizados
     """
-    db = SessionLocal()
+    label = DIGEST_KINDS[kind].label
+    primary = SessionLocal()
     try:
-        logger.info("📊 Iniciando envío de resúmenes semanales...")
-
-        now = datetime.utcnow()
-
-        # Inicio de esta semana (lunes 00:00)
-        week_start = now - timedelta(days=now.weekday())
-        week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        shards = checkpoints.checkpoints(primary, run_id)
+    finally:
+        primary.close()
+
+    summaries_sent = sum(shard.sent for shard in shards)
+    errors = sum(shard.errors for shard in shards)
+    skipped = sum(shard.skipped for shard in shards)
+    total_users = sum(shard.processed for shard in shards)
+
+    summary = {
+        'status': 'completed',
+        'summaries_sent': summaries_sent,
+        'errors': errors,
+        'skipped': skipped,
+        'total_users': total_users,
+        'shards': len(shards),
+        'run_id': run_id,
+        'timestamp': timestamp
+    }
+
+    logger.info(
+        f"✅ Resúmenes {label}s completados ({run_id}): {summaries_sent} enviados, "
+        f"{errors} errores, {skipped} omitidos, {total_users} usuarios"
+    )
+
+    return summary
+
+
+@celery_app.task(bind=True, name='app.workers.summary_tasks.schedule_digests')
+def schedule_digests(self, timestamp: Optional[str] = None):
+    """
+    Lanza la preparación y el envío de los horarios que llegaron a su hora.
 
-        # Fin de esta semana (domingo 23:59)
-        week_end = week_start + timedelta(days=7)
+    Se ejecuta cada minuto. Agrupa a los usuarios vinculados por horario
+    (zona y hora local) y, para cada resumen, lanza:
+    - La preparación DIGEST_RENDER_LEAD_MINUTES antes del envío
+    - El envío a la hora local del horario (el semanal, los lunes y
+      WEEKLY_DIGEST_DELAY_MINUTES después)
 
-        # Inicio de semana pasada
-        last_week_start = week_start - timedelta(days=7)
+    Las horas que pasaron en los últimos DIGEST_CATCH_UP_MINUTES también se
+    lanzan (beat detenido o atrasado); una ejecución que ya tiene
+    checkpoints no se vuelve a lanzar.
 
-        # Obtener usuarios con Telegram vinculado
-        users_with_telegram = db.query(User).filter(
-            User.telegram_chat_id.isnot(None),
-            User.is_active == True
-        ).all()
+    Args:
+        timestamp: Momento de la verificación en ISO 8601 (UTC); por defecto, ahora
 
-        summaries_sent = 0
-        errors = 0
+    Returns:
+        dict: Ejecuciones lanzadas
+    """
+    now = datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
+    catch_up = timedelta(minutes=settings.DIGEST_CATCH_UP_MINUTES)
+    lead = timedelta(minutes=settings.DIGEST_RENDER_LEAD_MINUTES)
 
-        for user in users_with_telegram:
+    try:
+        db = read_session()
+        try:
+            buckets = _buckets(db)
+        finally:
+            db.close()
+
+        # Ejecución -> (lanzador, tipo, horario, momento del envío)
+        due = {}
+        for bucket in buckets:
+            for kind, digest in DIGEST_KINDS.items():
+                # La preparación de un envío vence DIGEST_RENDER_LEAD_MINUTES antes que él
+                for send_at in _send_instants(digest, bucket, now + lead - catch_up, now + lead):
+                    run_id = _bucket_run_id(_period_run_id(digest, bucket, send_at), bucket)
+                    due[_render_run_id(run_id)] = (_dispatch_render, kind, bucket, send_at)
+                for send_at in _send_instants(digest, bucket, now - catch_up, now):
+                    run_id = _bucket_run_id(_period_run_id(digest, bucket, send_at), bucket)
+                    due[run_id] = (_dispatch_summary, kind, bucket, send_at)
+
+        started = set()
+        if due:
+            primary = SessionLocal()
             try:
-                # Tareas completadas la semana pasada
-                tasks_completed_last_week = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status == TaskStatus.COMPLETADO,
-                    Task.completed_at >= last_week_start,
-                    Task.completed_at < week_start
-                ).count()
-
-                # Tareas para esta semana
-                tasks_this_week = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status != TaskStatus.COMPLETADO,
-                    Task.deadline >= week_start,
-                    Task.deadline < week_end
-                ).order_by(Task.deadline).all()
-
-                # Tareas vencidas
-                tasks_overdue = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status != TaskStatus.COMPLETADO,
-                    Task.deadline < now
-                ).count()
-
-                # Total de tareas asignadas
-                total_tasks = db.query(Task).filter(
-                    Task.responsible_id == user.id
-                ).count()
-
-                # Total completadas (histórico)
-                total_completed = db.query(Task).filter(
-                    Task.responsible_id == user.id,
-                    Task.status == TaskStatus.COMPLETADO
-                ).count()
-
-                # Tasa de completación
-                completion_rate = (total_completed / total_tasks * 100) if total_tasks > 0 else 0
-
-                # Construir mensaje
-                message = f"📈 <b>Resumen Semanal</b>\n\n"
-                message += f"Hola {user.full_name},\n\n"
-
-                # Semana pasada
-                message += f"📅 <b>Semana Pasada:</b>\n"
-                message += f"✅ Completaste {tasks_completed_last_week} tarea(s)\n\n"
-
-                # Esta semana
-                if tasks_this_week:
-                    message += f"📋 <b>Esta Semana ({len(tasks_this_week)} tareas):</b>\n\n"
-
-                    for task in tasks_this_week[:7]:  # Máximo 7 tareas
-                        priority_emoji = {
-                            'alta': '🔴',
-                            'media': '🟡',
-                            'baja': '🟢'
-                        }.get(task.priority, '⚪')
-
-                        day_name = task.deadline.strftime('%A %d/%m') if task.deadline else 'Sin fecha'
-                        message += f"{priority_emoji} <b>{task.title}</b>\n"
-                        message += f"   📅 {day_name} | {task.project.name if task.project else 'Sin proyecto'}\n"
-
-                    if len(tasks_this_week) > 7:
-                        message += f"\n... y {len(tasks_this_week) - 7} tarea(s) más\n"
-                else:
-                    message += "✅ <b>No tienes tareas programadas para esta semana.</b>\n"
-
-                message += "\n"
-
-                # Estadísticas
-                message += f"📊 <b>Estadísticas Generales:</b>\n"
-                message += f"• Total de tareas: {total_tasks}\n"
-                message += f"• Completadas: {total_completed} ({completion_rate:.1f}%)\n"
-
-                if tasks_overdue > 0:
-                    message += f"• ⚠️ Vencidas: {tasks_overdue}\n"
-
-                message += "\n💡 Usa /semana para ver detalles de la semana actual."
-
-                # Enviar notificación (ejecutar async de forma síncrona)
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    success = loop.run_until_complete(
-                        send_telegram_notification(user.id, message, db)
-                    )
-                finally:
-                    loop.close()
-
-                if success:
-                    # Registrar en BD
-                    notification = Notification(
-                        user_id=user.id,
-                        type='resumen_semanal',
-                        message=f"Resumen semanal: {tasks_completed_last_week} completadas, {len(tasks_this_week)} para esta semana",
-                        sent_at=now
-                    )
-                    db.add(notification)
-                    db.commit()
-
-                    summaries_sent += 1
-                    logger.info(f"✅ Resumen semanal enviado a {user.email}")
-                else:
-                    errors += 1
-                    logger.error(f"❌ Error al enviar resumen semanal a {user.email}")
-
-            except Exception as e:
-                errors += 1
-                logger.error(f"Error procesando resumen semanal para usuario {user.id}: {str(e)}")
+                started = {
+                    run_id for (run_id,) in primary.query(JobCheckpoint.run_id).filter(
+                        JobCheckpoint.run_id.in_(list(due))
+                    ).distinct()
+                }
+            finally:
+                primary.close()
+
+        dispatched = []
+        for run_id, (dispatch, kind, bucket, send_at) in due.items():
+            if run_id in started:
                 continue
+            try:
+                dispatch(kind, bucket, send_at)
+                dispatched.append(run_id)
+            except Exception as e:
+                # Sin checkpoints se reintenta el minuto siguiente (dentro de DIGEST_CATCH_UP_MINUTES)
+                logger.error(f"❌ Error lanzando {run_id}: {str(e)}")
 
-        summary = {
+        if dispatched:
+            logger.info(f"⏰ {len(dispatched)} ejecución(es) de resúmenes lanzadas: {', '.join(dispatched)}")
+
+        return {
             'status': 'completed',
-            'summaries_sent': summaries_sent,
-            'errors': errors,
-            'total_users': len(users_with_telegram),
+            'buckets': len(buckets),
+            'dispatched': dispatched,
             'timestamp': now.isoformat()
         }
 
-        logger.info(
-            f"✅ Resúmenes semanales completados: {summaries_sent} enviados, "
-            f"{errors} errores, {len(users_with_telegram)} usuarios"
-        )
+    except Exception as e:
+        logger.error(f"❌ Error en schedule_digests: {str(e)}")
+        raise
 
-        return summary
 
+@celery_app.task(bind=True, name='app.workers.summary_tasks.send_daily_summary')
+def send_daily_summary(self, timezone: Optional[str] = None, digest_time: Optional[str] = None):
+    """
+    Envía ya el resumen diario de hoy a los usuarios de uno o de todos los
+    horarios (zona horaria + hora local del resumen).
+
+    El envío programado lo lanza schedule_digests a la hora local de cada
+    horario; esta tarea sirve para lanzarlo o reanudarlo a mano. "Hoy" es el
+    día local de la zona de cada horario. Envía:
+    - Tareas sin empezar, en curso y vencidas del usuario
+    - Tareas con deadline hoy (hasta 5, con su hora local)
+
+    Por cada horario reparte sus usuarios en shards (send_summary_shard); el
+    resumen de envíos lo devuelve el callback del chord (aggregate_summary).
+    Relanzarla en el mismo día local reanuda los shards pendientes sin reenviar.
+
+    Args:
+        timezone: Zona de un horario (por defecto, todos los horarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: Shards lanzados por horario
+    """
+    try:
+        return _dispatch_buckets(_dispatch_summary, 'daily', timezone, digest_time)
+    except Exception as e:
+        logger.error(f"❌ Error en send_daily_summary: {str(e)}")
+        raise
+
+
+@celery_app.task(bind=True, name='app.workers.summary_tasks.send_weekly_summary')
+def send_weekly_summary(self, timezone: Optional[str] = None, digest_time: Optional[str] = None):
+    """
+    Envía ya el resumen semanal de esta semana (semana local de cada horario).
+
+    El envío programado lo lanza schedule_digests los lunes; esta tarea
+    sirve para lanzarlo o reanudarlo a mano. Envía:
+    - Tareas completadas la semana pasada
+    - Tareas pendientes para esta semana
+    - Estadísticas de productividad
+
+    Reparte los usuarios en shards (send_summary_shard); el resumen de envíos
+    lo devuelve el callback del chord (aggregate_summary). Relanzarla en el
+    mismo periodo reanuda los shards pendientes sin reenviar.
+
+    Args:
+        timezone: Zona de un horario (por defecto, todos los horarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: Shards lanzados por horario
+    """
+    try:
+        return _dispatch_buckets(_dispatch_summary, 'weekly', timezone, digest_time)
     except Exception as e:
         logger.error(f"❌ Error en send_weekly_summary: {str(e)}")
         raise
-    finally:
-        db.close()
 
 
-# Ya no necesitamos el wrapper
+@celery_app.task(bind=True, name='app.workers.summary_tasks.render_daily_summary')
+def render_daily_summary(self, timezone: Optional[str] = None, digest_time: Optional[str] = None):
+    """
+    Prepara ya los mensajes del resumen diario de hoy.
+
+    Los envía después send_daily_summary, sin volver a consultar las tareas.
+
+    Args:
+        timezone: Zona de un horario (por defecto, todos los horarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: Shards lanzados por horario
+    """
+    try:
+        return _dispatch_buckets(_dispatch_render, 'daily', timezone, digest_time)
+    except Exception as e:
+        logger.error(f"❌ Error en render_daily_summary: {str(e)}")
+        raise
+
+
+@celery_app.task(bind=True, name='app.workers.summary_tasks.render_weekly_summary')
+def render_weekly_summary(self, timezone: Optional[str] = None, digest_time: Optional[str] = None):
+    """
+    Prepara ya los mensajes del resumen semanal de esta semana.
+
+    Los envía después send_weekly_summary, sin volver a consultar las tareas.
+
+    Args:
+        timezone: Zona de un horario (por defecto, todos los horarios)
+        digest_time: Hora del horario ('HH:MM')
+
+    Returns:
+        dict: Shards lanzados por horario
+    """
+    try:
+        return _dispatch_buckets(_dispatch_render, 'weekly', timezone, digest_time)
+    except Exception as e:
+        logger.error(f"❌ Error en render_weekly_summary: {str(e)}")
+        raise
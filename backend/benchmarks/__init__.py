@@ -0,0 +1,21 @@
+"""
+Benchmarks reproducibles del backend
+
+- `data`: generador de datos sintéticos (áreas, usuarios, proyectos, tareas
+  y notificaciones) con inserciones masivas y semilla fija.
+- `scenarios`: endpoints medidos y el usuario con el que se llaman.
+- `runner`: ejecuta la app FastAPI en el mismo proceso, mide la latencia y
+  las consultas SQL de cada petición y guarda los resultados en JSON.
+- `fake_telegram`: servidor falso de la API de bots de Telegram (latencia,
+  429 y errores configurables).
+- `workers`: rendimiento de las tareas de Celery que envían resúmenes y
+  recordatorios, contra el servidor falso.
+- `bot_commands`: carga de comandos del bot con miles de chats simultáneos
+  (latencia por comando y tiempo bloqueado del event loop).
+
+Uso (desde backend/):
+    python -m benchmarks --database-url sqlite:///benchmark.db --tasks 20000
+    python -m benchmarks --compare benchmarks/results/<anterior>.json
+    python -m benchmarks.workers --users 1000 --latency-ms 80 --max-per-second 30
+    python -m benchmarks.bot_commands --chats 2000 --concurrent-updates 64
+"""
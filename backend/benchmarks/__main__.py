@@ -0,0 +1,128 @@
+"""
+CLI de los benchmarks (ver benchmarks/__init__.py)
+
+La base de datos de benchmark se indica siempre de forma explícita
+(--database-url): su contenido se borra al generar los datos, así que nunca
+se usa la configurada para la aplicación.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks del backend")
+    parser.add_argument(
+        "--database-url", default="sqlite:///benchmark.db",
+        help="Base de datos de benchmark (SQLite o un MySQL local; se borra su contenido)",
+    )
+    parser.add_argument("--areas", type=int, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--notifications", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador de datos")
+    parser.add_argument(
+        "--reuse-data", action="store_true",
+        help="No regenerar: usar los datos ya cargados con los mismos volúmenes y semilla",
+    )
+    parser.add_argument("--iterations", type=int, default=50, help="Peticiones medidas por escenario")
+    parser.add_argument("--warmup", type=int, default=5, help="Peticiones previas sin medir")
+    parser.add_argument("--scenario", action="append", help="Ejecutar solo estos escenarios (repetible)")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto en benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="Resultados de referencia con los que comparar")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Aumento relativo del p95 que se considera regresión (por defecto 0.2)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    # La configuración se lee al importar la app: primero el entorno del benchmark
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("PROCESS_ROLE", "api")
+    os.environ["SQL_PROFILER_ENABLED"] = "true"
+    os.environ["SQL_PROFILER_SAMPLE_RATE"] = "1.0"
+    os.environ["SQL_EXPLAIN_SLOW_QUERIES"] = "false"
+    os.environ["TRACING_ENABLED"] = "false"
+    os.environ["DEBUG"] = "false"
+
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.WARNING)
+    # Los avisos de N+1 se repetirían en cada iteración: el número de consultas ya va al informe
+    logging.getLogger("app.core.query_profiler").setLevel(logging.ERROR)
+
+    from fastapi.testclient import TestClient
+
+    from app.core.database import engine
+    from app.core.redis_client import get_redis
+    from app.main import app
+    from benchmarks import data, runner
+    from benchmarks.scenarios import SCENARIOS
+
+    scenarios = SCENARIOS
+    if args.scenario:
+        unknown = set(args.scenario) - {scenario.name for scenario in SCENARIOS}
+        if unknown:
+            print(f"Escenarios desconocidos: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.scenario]
+
+    volumes = data.Volumes(
+        areas=args.areas, users=args.users, projects=args.projects,
+        tasks=args.tasks, notifications=args.notifications,
+    )
+    rows, dataset = data.build(volumes, args.seed)
+    if not args.reuse_data:
+        print(f"Generando datos en {engine.url.render_as_string(hide_password=True)}: {volumes.as_dict()}")
+        data.load(engine, rows)
+    del rows
+
+    redis_client = get_redis()
+    try:
+        redis_available = bool(redis_client and redis_client.ping())
+    except Exception:
+        redis_available = False
+    if not redis_available:
+        print("Aviso: Redis no disponible; sin versiones de datos ni 304", file=sys.stderr)
+
+    with TestClient(app) as client:
+        results = runner.run(client, scenarios, dataset, args.iterations, args.warmup)
+
+    report = {
+        "environment": {**runner.environment(args.database_url), "redis": redis_available},
+        "volumes": volumes.as_dict(),
+        "seed": args.seed,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "dataset": asdict(dataset),
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Resultados guardados en {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("volumes") != report["volumes"]:
+            print("Aviso: los volúmenes de la referencia son distintos", file=sys.stderr)
+        regressions = runner.compare(report, baseline, args.threshold)
+        if regressions:
+            print("Regresiones:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Carga de comandos del bot con miles de chats simultáneos
+
+Construye la `Application` del bot igual que `TelegramBot.start()` (mismos
+handlers de `setup_handlers()`), pero con un cliente HTTP en memoria
+(`FakeTransport`) en lugar de la API de Telegram y sin polling: los updates
+sintéticos se encolan directamente en `application.update_queue`.
+
+Cada chat simulado envía sus comandos de uno en uno (el siguiente cuando
+recibe la respuesta del anterior), así que la latencia medida por comando
+incluye la espera en la cola del bot. En paralelo, un monitor mide cuánto
+tarda el event loop en despertar una corrutina: es el tiempo que el loop
+pasa bloqueado (consultas a la BD síncronas dentro de los handlers).
+
+Uso (desde backend/):
+    python -m benchmarks.bot_commands --database-url sqlite:///benchmark.db --chats 2000
+    python -m benchmarks.bot_commands --chats 2000 --reuse-data --concurrent-updates 64
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from benchmarks import fake_telegram
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Comandos que envían los chats simulados (/completar recibe una tarea del usuario)
+COMMANDS = ("/tareas", "/hoy", "/semana", "/pendientes", "/vencidas", "/completar")
+
+# Intervalo del monitor del event loop (segundos)
+MONITOR_INTERVAL = 0.005
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bot_commands", description="Carga del bot")
+    parser.add_argument(
+        "--database-url", default="sqlite:///benchmark.db",
+        help="Base de datos de benchmark (SQLite o un MySQL local; se borra su contenido)",
+    )
+    parser.add_argument("--chats", type=int, default=1000, help="Chats simultáneos (usuarios vinculados)")
+    parser.add_argument("--commands-per-chat", type=int, default=len(COMMANDS))
+    parser.add_argument("--command", action="append", choices=COMMANDS, help="Limitar a estos comandos (repetible)")
+    parser.add_argument("--tasks-per-user", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pausa máxima (al azar) entre comandos de un chat")
+    parser.add_argument(
+        "--concurrent-updates", type=int, default=1,
+        help="Updates procesados a la vez por la Application (1 = en serie, como en producción)",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Segundos máximos de espera por respuesta")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reuse-data", action="store_true",
+        help="No regenerar: usar los datos ya cargados con los mismos volúmenes y semilla",
+    )
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto en benchmarks/results/)")
+    fake_telegram.add_arguments(parser)
+    # La API en memoria responde sin demora salvo que se indique
+    parser.set_defaults(latency_ms=0.0)
+    return parser.parse_args()
+
+
+class LoopMonitor:
+    """Retraso con que el event loop despierta a una corrutina que duerme MONITOR_INTERVAL"""
+
+    def __init__(self):
+        self.lags: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(MONITOR_INTERVAL)
+            self.lags.append(max(time.perf_counter() - start - MONITOR_INTERVAL, 0.0))
+
+    def summary(self, wall: float) -> dict:
+        from benchmarks.runner import percentile
+
+        lags = sorted(self.lags)
+        blocked = sum(lags)
+        return {
+            "samples": len(lags),
+            "lag_ms": {
+                "p50": round(percentile(lags, 50) * 1000, 2),
+                "p99": round(percentile(lags, 99) * 1000, 2),
+                "max": round(lags[-1] * 1000, 2) if lags else 0.0,
+            },
+            "blocked_s": round(blocked, 3),
+            "blocked_ratio": round(blocked / wall, 3) if wall else 0.0,
+        }
+
+
+class Replies:
+    """Espera de la respuesta del bot a cada chat (un comando pendiente por chat)"""
+
+    def __init__(self):
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def expect(self, chat_id: int) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending[str(chat_id)] = future
+        return future
+
+    def delivered(self, params: dict) -> None:
+        future = self._pending.pop(str(params.get("chat_id")), None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+
+def make_update(bot, update_id: int, chat_id: int, text: str):
+    """Update de Telegram con un comando de un chat privado"""
+    from telegram import Update
+
+    command = text.split()[0]
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": f"Usuario {chat_id}"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+            },
+        },
+        bot,
+    )
+
+
+def chat_scripts(rows: dict, chats: int, commands: tuple, per_chat: int, rng: random.Random) -> dict[int, list[str]]:
+    """
+    Comandos que enviará cada chat
+
+    Returns:
+        chat_id -> lista de textos de comandos
+    """
+    from app.models import Task, User
+
+    users = [user for user in rows[User] if user["telegram_chat_id"]][:chats]
+    task_of = {}
+    for task in rows[Task]:
+        task_of.setdefault(task["responsible_id"], task["id"])
+
+    scripts = {}
+    for user in users:
+        texts = []
+        for command in itertools.islice(itertools.cycle(rng.sample(commands, len(commands))), per_chat):
+            if command == "/completar":
+                command += f" {task_of.get(user['id'], '00000000')[:8]}"
+            texts.append(command)
+        scripts[user["telegram_chat_id"]] = texts
+    return scripts
+
+
+async def run_load(args: argparse.Namespace, scripts: dict[int, list[str]]) -> dict:
+    from app.bot.bot import TelegramBot
+    from app.core.query_profiler import profile_queries
+    from benchmarks.runner import PERCENTILES, percentile
+
+    replies = Replies()
+    telegram = fake_telegram.FakeTelegram(
+        fake_telegram.config_from_args(args, seed=args.seed), on_message=replies.delivered
+    )
+
+    bot = TelegramBot()
+    bot.application = (
+        bot.application_builder()
+        .request(fake_telegram.FakeTransport(telegram))
+        .get_updates_request(fake_telegram.FakeTransport(telegram))
+        .concurrent_updates(args.concurrent_updates if args.concurrent_updates > 1 else False)
+        .build()
+    )
+    bot.setup_handlers()
+    application = bot.application
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    timeouts: dict[str, int] = defaultdict(int)
+    update_ids = itertools.count(1)
+    rng = random.Random(args.seed)
+
+    async def chat(chat_id: int, texts: list[str]) -> None:
+        for text in texts:
+            if args.think_ms:
+                await asyncio.sleep(rng.uniform(0, args.think_ms) / 1000)
+            command = text.split()[0]
+            reply = replies.expect(chat_id)
+            start = time.perf_counter()
+            await application.update_queue.put(make_update(application.bot, next(update_ids), chat_id, text))
+            try:
+                await asyncio.wait_for(reply, args.timeout)
+            except asyncio.TimeoutError:
+                timeouts[command] += 1
+                continue
+            latencies[command].append(time.perf_counter() - start)
+
+    # El perfil se hereda en las tareas de la Application: se activa antes de start()
+    with profile_queries("benchmark bot", report_on_exit=False) as profile:
+        await application.initialize()
+        await application.start()
+        telegram.stats.reset()
+        monitor = LoopMonitor()
+        monitor.start()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(chat(chat_id, texts) for chat_id, texts in scripts.items()))
+        wall = time.perf_counter() - start
+
+        await monitor.stop()
+        await application.stop()
+        await application.shutdown()
+
+    total = sum(len(values) for values in latencies.values())
+    commands = {}
+    for command in sorted(set(latencies) | set(timeouts)):
+        values = sorted(latencies[command])
+        commands[command] = {
+            "completed": len(values),
+            "timeouts": timeouts[command],
+            "latency_ms": {
+                "mean": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+                **{f"p{p}": round(percentile(values, p) * 1000, 2) for p in PERCENTILES},
+                "max": round(values[-1] * 1000, 2) if values else 0.0,
+            },
+        }
+    return {
+        "wall_s": round(wall, 3),
+        "commands_per_s": round(total / wall, 2) if wall else 0.0,
+        "commands": commands,
+        "event_loop": monitor.summary(wall),
+        "queries": {
+            "count": profile.count,
+            "per_command": round(profile.count / total, 2) if total else 0.0,
+            "db_s": round(profile.duration_ms / 1000, 3),
+        },
+        "telegram": telegram.stats.snapshot(),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+
+    os.environ["TELEGRAM_BOT_TOKEN"] = "123456:benchmark"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["PROCESS_ROLE"] = "bot"
+    os.environ["TRACING_ENABLED"] = "false"
+    os.environ["METRICS_ENABLED"] = "false"
+    os.environ["SQL_EXPLAIN_SLOW_QUERIES"] = "false"
+
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.WARNING)
+
+    from app.core.database import engine
+    from benchmarks import data, runner
+
+    volumes = data.Volumes(
+        areas=10,
+        users=args.chats + 1,
+        projects=max(args.chats // 4, 1),
+        tasks=args.chats * args.tasks_per_user,
+        notifications=0,
+        telegram_linked=1.0,
+    )
+    rows, _ = data.build(volumes, args.seed)
+    if not args.reuse_data:
+        print(f"Generando datos en {engine.url.render_as_string(hide_password=True)}: {volumes.as_dict()}")
+        data.load(engine, rows)
+    scripts = chat_scripts(
+        rows, args.chats, tuple(args.command or COMMANDS), args.commands_per_chat, random.Random(args.seed)
+    )
+    del rows
+
+    result = asyncio.run(run_load(args, scripts))
+
+    for command, stats in result["commands"].items():
+        print(
+            f"{command:<12} p50 {stats['latency_ms']['p50']:>9.2f} ms  p95 {stats['latency_ms']['p95']:>9.2f} ms  "
+            f"completados {stats['completed']}  sin respuesta {stats['timeouts']}"
+        )
+    loop = result["event_loop"]
+    print(
+        f"{result['commands_per_s']} comandos/s en {result['wall_s']} s; event loop bloqueado "
+        f"{loop['blocked_s']} s ({loop['blocked_ratio']:.0%}), retraso máximo {loop['lag_ms']['max']} ms; "
+        f"{result['queries']['per_command']} consultas por comando"
+    )
+
+    report = {
+        "environment": runner.environment(args.database_url),
+        "volumes": volumes.as_dict(),
+        "seed": args.seed,
+        "chats": len(scripts),
+        "commands_per_chat": args.commands_per_chat,
+        "concurrent_updates": args.concurrent_updates,
+        "telegram_config": fake_telegram.asdict(fake_telegram.config_from_args(args)),
+        **result,
+    }
+    output = args.output or RESULTS_DIR / f"bot-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Resultados guardados en {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
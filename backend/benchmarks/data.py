@@ -0,0 +1,209 @@
+"""
+Generador de datos sintéticos para los benchmarks
+
+Los datos se generan con una semilla fija (mismos volúmenes y semilla =
+mismos datos e ids; las fechas son relativas al momento de la ejecución) y
+se insertan en lotes con `executemany`, sin pasar por el ORM. Los usuarios se
+reparten entre las áreas y cada tarea se asigna a un usuario del área de su
+proyecto, como en el uso real.
+"""
+import random
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base
+from app.core.security import get_password_hash
+from app.models import Area, Notification, Project, Task, User
+from app.models.notification import NotificationType
+from app.models.task import TaskPriority, TaskStatus
+
+# Filas por sentencia INSERT
+BATCH_SIZE = 1000
+
+# Contraseña de todos los usuarios generados
+PASSWORD = "benchmark"
+
+
+@dataclass(frozen=True)
+class Volumes:
+    """Cantidad de filas a generar por tabla"""
+    areas: int = 10
+    users: int = 200
+    projects: int = 500
+    tasks: int = 20000
+    notifications: int = 20000
+    telegram_linked: float = 0.5  # Fracción de usuarios con Telegram vinculado
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Ids de referencia de los datos generados (usuarios de cada rol y recursos visibles para ellos)"""
+    admin_id: str
+    supervisor_id: str
+    analyst_id: str
+    area_id: str
+    project_id: str  # Proyecto del área del analista
+    task_id: str  # Tarea del analista
+
+
+def build(volumes: Volumes, seed: int = 42) -> tuple[dict, Dataset]:
+    """
+    Generar en memoria las filas de cada tabla
+
+    Args:
+        volumes: Filas a generar por tabla
+        seed: Semilla del generador
+
+    Returns:
+        (modelo -> lista de filas, Dataset con los ids que usan los escenarios)
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def moment(days_back: int) -> datetime:
+        return now - timedelta(seconds=rng.randint(0, days_back * 86400))
+
+    areas = [
+        {
+            "id": new_id(), "name": f"Área {index + 1}", "description": None,
+            "color": "#3B82F6", "icon": "📁", "is_active": True,
+            "created_at": now, "updated_at": now,
+        }
+        for index in range(max(volumes.areas, 1))
+    ]
+
+    password_hash = get_password_hash(PASSWORD)
+    users = []
+    for index in range(max(volumes.users, len(areas) + 2)):
+        # El primero es administrador y los siguientes, un supervisor por área
+        role = "administrador" if index == 0 else "supervisor" if index <= len(areas) else "analista"
+        users.append({
+            "id": new_id(),
+            "email": f"usuario{index}@benchmark.example.com",
+            "password_hash": password_hash,
+            "full_name": f"Usuario {index}",
+            "telegram_chat_id": 100000 + index if _linked(index, volumes.telegram_linked) else None,
+            "is_active": True,
+            "role": role,
+            "area_id": None if role == "administrador" else areas[index % len(areas)]["id"],
+        })
+    users_by_area: dict[str, list[dict]] = {}
+    for user in users:
+        if user["area_id"]:
+            users_by_area.setdefault(user["area_id"], []).append(user)
+
+    projects = []
+    for index in range(max(volumes.projects, 1)):
+        area = areas[index % len(areas)]
+        owner = rng.choice(users_by_area.get(area["id"]) or users)
+        projects.append({
+            "id": new_id(),
+            "name": f"Proyecto {index}",
+            "description": f"Proyecto sintético {index}",
+            "emoji_icon": "📁",
+            "owner_id": owner["id"],
+            "area_id": area["id"],
+            "is_archived": rng.random() < 0.05,
+        })
+
+    statuses = [status.value for status in TaskStatus]
+    priorities = [priority.value for priority in TaskPriority]
+    tasks = []
+    for index in range(volumes.tasks):
+        project = rng.choice(projects)
+        members = users_by_area.get(project["area_id"]) or users
+        status = rng.choice(statuses)
+        created_at = moment(90)
+        tasks.append({
+            "id": new_id(),
+            "project_id": project["id"],
+            "area_id": project["area_id"],
+            "title": f"Tarea {index}",
+            "description": "Descripción de la tarea sintética " * rng.randint(0, 5) or None,
+            "status": status,
+            "priority": rng.choice(priorities),
+            "responsible_id": rng.choice(members)["id"] if rng.random() < 0.9 else None,
+            "deadline": now + timedelta(hours=rng.randint(-720, 720)) if rng.random() < 0.7 else None,
+            "reminder_hours_before": 24,
+            "completed_at": created_at + timedelta(days=1) if status == TaskStatus.COMPLETADO.value else None,
+            "is_archived": rng.random() < 0.05,
+            "created_by": project["owner_id"],
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+
+    types = [notification_type.value for notification_type in NotificationType]
+    notifications = []
+    for _ in range(volumes.notifications if tasks else 0):
+        task = rng.choice(tasks)
+        sent_at = moment(30)
+        notifications.append({
+            "id": new_id(),
+            "user_id": task["responsible_id"] or task["created_by"],
+            "task_id": task["id"],
+            "type": rng.choice(types),
+            "message": f"Notificación de {task['title']}",
+            "sent_at": sent_at,
+            "read_at": sent_at + timedelta(hours=1) if rng.random() < 0.5 else None,
+            "created_at": sent_at,
+        })
+
+    # Un analista con tareas y recursos que puede ver
+    users_by_id = {user["id"]: user for user in users}
+    sample_task = next(
+        (
+            task for task in tasks
+            if task["responsible_id"] and not task["is_archived"]
+            and users_by_id[task["responsible_id"]]["role"] == "analista"
+        ),
+        None,
+    )
+    analyst = (
+        users_by_id[sample_task["responsible_id"]]
+        if sample_task else next(user for user in users if user["role"] == "analista")
+    )
+    supervisor = next(
+        user for user in users if user["role"] == "supervisor" and user["area_id"] == analyst["area_id"]
+    )
+    project = next(project for project in projects if project["area_id"] == analyst["area_id"])
+
+    rows = {Area: areas, User: users, Project: projects, Task: tasks, Notification: notifications}
+    return rows, Dataset(
+        admin_id=users[0]["id"],
+        supervisor_id=supervisor["id"],
+        analyst_id=analyst["id"],
+        area_id=analyst["area_id"],
+        project_id=project["id"],
+        task_id=sample_task["id"] if sample_task else "",
+    )
+
+
+def _linked(index: int, ratio: float) -> bool:
+    """Si el usuario `index` tiene Telegram vinculado (repartidos de forma uniforme)"""
+    return int((index + 1) * ratio) > int(index * ratio)
+
+
+def load(engine: Engine, rows: dict) -> None:
+    """
+    Recrear el esquema e insertar las filas generadas (se borra el contenido previo)
+
+    Args:
+        engine: Engine de la base de datos de benchmark
+        rows: Filas por modelo devueltas por `build()`
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for model, model_rows in rows.items():
+            for start in range(0, len(model_rows), BATCH_SIZE):
+                conn.execute(insert(model.__table__), model_rows[start:start + BATCH_SIZE])
@@ -0,0 +1,334 @@
+"""
+Servidor falso de la API de bots de Telegram
+
+Responde a los métodos que usan el bot y los workers (sendMessage, getMe,
+getUpdates...) con la forma de las respuestas reales, sin salir de la
+máquina. Permite simular:
+
+- Latencia de cada llamada (media y variación)
+- Respuestas 429 (RetryAfter) al azar o al superar un límite global de
+  mensajes por segundo, como el de Telegram (~30 msg/s por bot)
+- Errores 500 al azar
+
+Cuenta las llamadas por método y resultado, y los mensajes entregados a
+cada chat (para detectar resúmenes duplicados). Se usa por HTTP (servidor en
+un hilo o independiente) o en memoria con `FakeTransport`.
+
+Uso (la app lo usa con TELEGRAM_API_URL):
+    python -m benchmarks.fake_telegram --port 8081 --latency-ms 80 --max-per-second 30
+    TELEGRAM_API_URL=http://127.0.0.1:8081 python run_bot.py
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+import uvicorn
+from telegram.request import BaseRequest, RequestData
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+BOT_USER = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "SVA Benchmark",
+    "username": "sva_benchmark_bot",
+    "can_join_groups": False,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": False,
+}
+
+
+@dataclass
+class FakeTelegramConfig:
+    """Comportamiento simulado de la API"""
+    latency_ms: float = 50.0  # Latencia media de cada llamada
+    jitter_ms: float = 0.0  # Variación uniforme (±) de la latencia
+    rate_limit: float = 0.0  # Probabilidad de responder 429 a un mensaje
+    retry_after: int = 1  # Segundos indicados en las respuestas 429
+    failure_rate: float = 0.0  # Probabilidad de responder 500 a un mensaje
+    max_per_second: Optional[int] = None  # Límite global de mensajes por segundo
+    seed: int = 0
+
+
+class FakeTelegramStats:
+    """Contadores de las llamadas recibidas (seguro entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: Counter = Counter()  # (método, resultado) -> llamadas
+            self.messages: Counter = Counter()  # chat_id -> mensajes entregados
+            self.first_delivery: Optional[float] = None
+            self.last_delivery: Optional[float] = None
+
+    def record(self, method: str, result: str, chat_id=None) -> None:
+        with self._lock:
+            self.requests[(method, result)] += 1
+            if result == "ok" and method == "sendMessage":
+                self.messages[str(chat_id)] += 1
+                now = time.monotonic()
+                self.first_delivery = self.first_delivery or now
+                self.last_delivery = now
+
+    def snapshot(self) -> dict:
+        """Resumen de los contadores (serializable a JSON)"""
+        with self._lock:
+            delivered = sum(self.messages.values())
+            return {
+                "requests": {f"{method} {result}": count for (method, result), count in sorted(self.requests.items())},
+                "messages_delivered": delivered,
+                "chats": len(self.messages),
+                # En un resumen (un mensaje por usuario) son envíos duplicados
+                "repeated_chat_messages": delivered - len(self.messages),
+                "max_messages_per_chat": max(self.messages.values(), default=0),
+                "delivery_span_s": (
+                    round(self.last_delivery - self.first_delivery, 3) if self.first_delivery else 0.0
+                ),
+            }
+
+
+class FakeTelegram:
+    """
+    Servidor falso de la API de bots
+
+    Ejemplo:
+        server = FakeTelegram(FakeTelegramConfig(latency_ms=80, rate_limit=0.01))
+        url = server.start()  # http://127.0.0.1:<puerto>
+        ...
+        print(server.stats.snapshot())
+        server.stop()
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeTelegramConfig] = None,
+        on_message: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        Args:
+            config: Comportamiento simulado
+            on_message: Llamada con los parámetros de cada mensaje entregado
+        """
+        self.config = config or FakeTelegramConfig()
+        self.on_message = on_message
+        self.stats = FakeTelegramStats()
+        self._random = random.Random(self.config.seed)
+        self._message_ids = itertools.count(1)
+        self._window: deque[float] = deque()  # Momentos de los mensajes del último segundo
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = Starlette(routes=[
+            Route("/bot{token}/{method}", self._handle, methods=["GET", "POST"]),
+        ])
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Arrancar el servidor en un hilo propio
+
+        Args:
+            host: Interfaz
+            port: Puerto (0 = uno libre)
+
+        Returns:
+            URL base para TELEGRAM_API_URL
+        """
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="fake-telegram", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("No se pudo iniciar el servidor falso de Telegram")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        """Detener el servidor"""
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    async def _handle(self, request: Request) -> JSONResponse:
+        status_code, payload = await self.respond(request.path_params["method"], await _parameters(request))
+        return JSONResponse(payload, status_code=status_code)
+
+    async def respond(self, method: str, params: dict) -> tuple[int, dict]:
+        """
+        Respuesta simulada a una llamada (la usan el servidor HTTP y FakeTransport)
+
+        Args:
+            method: Método de la API (sendMessage, getMe...)
+            params: Parámetros de la llamada
+
+        Returns:
+            (código HTTP, cuerpo JSON)
+        """
+        if method == "getUpdates":
+            # Long polling sin actualizaciones (acotado para no bloquear el cierre)
+            await asyncio.sleep(min(float(params.get("timeout") or 0), 1.0))
+            self.stats.record(method, "ok")
+            return _ok([])
+
+        await asyncio.sleep(self._latency())
+
+        if method == "sendMessage":
+            error = self._injected_error()
+            if error is not None:
+                self.stats.record(method, "rate_limited" if error[0] == 429 else "server_error")
+                return error
+            self.stats.record(method, "ok", params.get("chat_id"))
+            if self.on_message is not None:
+                self.on_message(params)
+            return _ok(self._message(params))
+
+        self.stats.record(method, "ok")
+        if method == "getMe":
+            return _ok(BOT_USER)
+        if method in ("editMessageText", "editMessageReplyMarkup"):
+            return _ok(self._message(params))
+        return _ok(True)
+
+    def _latency(self) -> float:
+        config = self.config
+        jitter = self._random.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0.0
+        return max(config.latency_ms + jitter, 0.0) / 1000
+
+    def _injected_error(self) -> Optional[tuple[int, dict]]:
+        """Respuesta de error simulada para un mensaje (None = entregarlo)"""
+        config = self.config
+        if config.max_per_second:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= config.max_per_second:
+                return _rate_limited(config.retry_after)
+            self._window.append(now)
+        if config.rate_limit and self._random.random() < config.rate_limit:
+            return _rate_limited(config.retry_after)
+        if config.failure_rate and self._random.random() < config.failure_rate:
+            return 500, {"ok": False, "error_code": 500, "description": "Internal Server Error"}
+        return None
+
+    def _message(self, params: dict) -> dict:
+        chat_id = params.get("chat_id")
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id) if str(chat_id).lstrip("-").isdigit() else 0, "type": "private"},
+            "text": params.get("text", ""),
+        }
+
+
+class FakeTransport(BaseRequest):
+    """
+    Cliente HTTP de PTB que responde en memoria con un FakeTelegram, sin red
+    (ApplicationBuilder.request() / Bot(request=...))
+    """
+
+    def __init__(self, server: FakeTelegram):
+        self._server = server
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None, **kwargs):
+        params = request_data.json_parameters if request_data else {}
+        status_code, payload = await self._server.respond(url.rsplit("/", 1)[-1], params)
+        return status_code, json.dumps(payload).encode()
+
+
+async def _parameters(request: Request) -> dict:
+    """Parámetros de la llamada (PTB los envía como formulario; también se acepta JSON)"""
+    if request.headers.get("content-type", "").startswith("application/json"):
+        return await request.json()
+    if request.method == "POST":
+        return dict(await request.form())
+    return dict(request.query_params)
+
+
+def _ok(result) -> tuple[int, dict]:
+    return 200, {"ok": True, "result": result}
+
+
+def _rate_limited(retry_after: int) -> tuple[int, dict]:
+    return 429, {
+        "ok": False,
+        "error_code": 429,
+        "description": f"Too Many Requests: retry after {retry_after}",
+        "parameters": {"retry_after": retry_after},
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opciones de línea de comandos de FakeTelegramConfig"""
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia media de la API (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Variación de la latencia (± ms)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probabilidad de 429 por mensaje")
+    parser.add_argument("--retry-after", type=int, default=1, help="Segundos de las respuestas 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probabilidad de 500 por mensaje")
+    parser.add_argument("--max-per-second", type=int, help="Límite global de mensajes por segundo")
+
+
+def config_from_args(args: argparse.Namespace, seed: int = 0) -> FakeTelegramConfig:
+    return FakeTelegramConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        failure_rate=args.failure_rate,
+        max_per_second=args.max_per_second,
+        seed=seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_telegram", description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+    server = FakeTelegram(config_from_args(args))
+    url = server.start(args.host, args.port)
+    logger.info(f"API falsa de Telegram en {url} ({asdict(server.config)})")
+    try:
+        while True:
+            time.sleep(10)
+            logger.info(json.dumps(server.stats.snapshot(), ensure_ascii=False))
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Ejecución de los escenarios contra la app FastAPI en el mismo proceso
+
+Cada petición pasa por la pila completa (middlewares, dependencias,
+serialización) con `TestClient`; no hay red ni servidor de por medio, así que
+la latencia medida es la de la aplicación y la base de datos. Las consultas
+por petición se leen de la cabecera `X-DB-Queries` del perfilador SQL.
+"""
+import math
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from benchmarks.data import Dataset
+from benchmarks.scenarios import Scenario
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def run_scenario(
+    client: TestClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    iterations: int,
+    warmup: int,
+) -> dict:
+    """
+    Repetir la petición de un escenario y resumir latencia y consultas
+
+    Args:
+        client: Cliente de la app
+        scenario: Escenario a medir
+        dataset: Ids de los datos generados
+        iterations: Peticiones medidas
+        warmup: Peticiones previas sin medir (cachés, conexiones)
+
+    Returns:
+        dict con peticiones, errores, percentiles de latencia (ms) y consultas
+    """
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": getattr(dataset, scenario.user)})}
+    url, body = scenario.url(dataset), scenario.body(dataset)
+
+    if scenario.revalidate:
+        first = client.request(scenario.method, url, headers=headers, json=body)
+        if first.headers.get("etag"):
+            headers["If-None-Match"] = first.headers["etag"]
+
+    latencies, queries, errors, statuses = [], [], 0, {}
+    for index in range(warmup + iterations):
+        start = time.perf_counter()
+        response = client.request(scenario.method, url, headers=headers, json=body)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if index < warmup:
+            continue
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        if response.status_code not in scenario.expected_status:
+            errors += 1
+        latencies.append(elapsed_ms)
+        if "x-db-queries" in response.headers:
+            queries.append(int(response.headers["x-db-queries"]))
+
+    latencies.sort()
+    return {
+        "method": scenario.method,
+        "url": url,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            **{f"p{p}": round(percentile(latencies, p), 3) for p in PERCENTILES},
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "queries": {
+            "min": min(queries),
+            "max": max(queries),
+            "mean": round(statistics.fmean(queries), 2),
+        } if queries else None,
+    }
+
+
+def run(
+    client: TestClient,
+    scenarios: list[Scenario],
+    dataset: Dataset,
+    iterations: int,
+    warmup: int,
+    progress=print,
+) -> dict[str, dict]:
+    """
+    Ejecutar varios escenarios en orden
+
+    Returns:
+        Nombre del escenario -> resultado de `run_scenario()`
+    """
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = result = run_scenario(client, scenario, dataset, iterations, warmup)
+        queries = result["queries"]["max"] if result["queries"] else "?"
+        progress(
+            f"{scenario.name:<24} p50 {result['latency_ms']['p50']:>8.2f} ms  "
+            f"p95 {result['latency_ms']['p95']:>8.2f} ms  consultas {queries}  errores {result['errors']}"
+        )
+    return results
+
+
+def environment(database_url: str) -> dict:
+    """Datos de la ejecución que permiten comparar resultados entre sí"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database_url.split(":", 1)[0],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Comparar dos resultados escenario por escenario
+
+    Args:
+        current: Resultados de esta ejecución
+        baseline: Resultados de referencia (JSON de una ejecución anterior)
+        threshold: Aumento relativo del p95 que se considera regresión (0.2 = 20%)
+
+    Returns:
+        Lista de regresiones (p95 por encima del umbral o más consultas)
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        p95, previous_p95 = result["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        change = (p95 - previous_p95) / previous_p95 if previous_p95 else 0.0
+        queries = (result["queries"] or {}).get("max")
+        previous_queries = (previous["queries"] or {}).get("max")
+        print(
+            f"{name:<24} p95 {previous_p95:>8.2f} -> {p95:>8.2f} ms ({change:+.0%})  "
+            f"consultas {previous_queries} -> {queries}"
+        )
+        if change > threshold:
+            regressions.append(f"{name}: p95 {previous_p95:.2f} -> {p95:.2f} ms ({change:+.0%})")
+        if queries is not None and previous_queries is not None and queries > previous_queries:
+            regressions.append(f"{name}: consultas {previous_queries} -> {queries}")
+    return regressions
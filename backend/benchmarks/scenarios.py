@@ -0,0 +1,56 @@
+"""
+Escenarios de benchmark: endpoints medidos y usuario que los llama
+
+Los escenarios de lectura se repiten sin validadores (If-None-Match), así
+que miden la respuesta completa; `tasks.list.revalidate` mide el camino del
+304 (requiere Redis para las versiones de datos).
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+from benchmarks.data import Dataset
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Petición que se repite en un escenario"""
+    name: str
+    method: str
+    path: str  # Con campos de Dataset entre llaves (ej: /tasks/{task_id})
+    user: str  # Campo de Dataset con el id del usuario autenticado
+    json: Optional[dict] = None
+    revalidate: bool = False  # Enviar el ETag de la primera respuesta
+    expected_status: tuple[int, ...] = field(default=(200,))
+
+    def url(self, dataset: Dataset) -> str:
+        return self.path.format(**vars(dataset))
+
+    def body(self, dataset: Dataset) -> Optional[dict]:
+        if self.json is None:
+            return None
+        return {
+            key: value.format(**vars(dataset)) if isinstance(value, str) else value
+            for key, value in self.json.items()
+        }
+
+
+SCENARIOS = [
+    Scenario("tasks.list", "GET", "/api/v1/tasks/?limit=100", "analyst_id"),
+    Scenario("tasks.list.admin", "GET", "/api/v1/tasks/?limit=500", "admin_id"),
+    Scenario(
+        "tasks.list.revalidate", "GET", "/api/v1/tasks/?limit=100", "analyst_id",
+        revalidate=True, expected_status=(200, 304),
+    ),
+    Scenario("tasks.detail", "GET", "/api/v1/tasks/{task_id}", "analyst_id"),
+    Scenario("projects.list", "GET", "/api/v1/projects/", "supervisor_id"),
+    Scenario("projects.with_stats", "GET", "/api/v1/projects/with-stats", "admin_id"),
+    Scenario("areas.with_stats", "GET", "/api/v1/areas/with-stats", "admin_id"),
+    Scenario("users.list", "GET", "/api/v1/users/", "admin_id"),
+    Scenario("users.me", "GET", "/api/v1/users/me", "analyst_id"),
+    Scenario(
+        # El supervisor del área puede crear tareas en sus proyectos
+        "tasks.create", "POST", "/api/v1/tasks/", "supervisor_id",
+        json={"project_id": "{project_id}", "title": "Tarea de benchmark", "responsible_id": "{analyst_id}"},
+        expected_status=(201,),
+    ),
+]
@@ -0,0 +1,235 @@
+"""
+Rendimiento de las tareas de Celery que envían mensajes por Telegram
+
+Ejecuta la preparación y el envío de los resúmenes diario y semanal y
+`check_upcoming_deadlines` en el mismo proceso (`task.apply()`, como en un
+worker pero sin broker) contra N usuarios sintéticos con Telegram vinculado.
+Las subtareas (shards de los resúmenes y su chord) también corren en el
+proceso, una tras otra: el tiempo medido es el de un solo worker.
+Las llamadas a Telegram van al servidor falso (benchmarks/fake_telegram.py),
+con latencia, 429 y errores configurables.
+
+Por tarea se reporta: tiempo total, mensajes entregados por segundo,
+llamadas a Telegram por resultado, consultas SQL (y las más repetidas),
+tiempo en la BD y pico de memoria.
+
+Uso (desde backend/):
+    python -m benchmarks.workers --database-url sqlite:///benchmark.db --users 1000 --latency-ms 80
+    python -m benchmarks.workers --users 1000 --reuse-data --job daily --max-per-second 30
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import fake_telegram
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Tareas medidas: nombre -> (módulo, tarea de Celery)
+JOBS = {
+    # La preparación va antes del envío: "daily" mide solo el envío de lo preparado
+    "render-daily": ("app.workers.summary_tasks", "render_daily_summary"),
+    "daily": ("app.workers.summary_tasks", "send_daily_summary"),
+    "render-weekly": ("app.workers.summary_tasks", "render_weekly_summary"),
+    "weekly": ("app.workers.summary_tasks", "send_weekly_summary"),
+    "reminders": ("app.workers.reminder_tasks", "check_upcoming_deadlines"),
+}
+
+# Formas de sentencia más repetidas que se incluyen en el informe
+TOP_STATEMENTS = 5
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.workers", description="Rendimiento de los workers")
+    parser.add_argument(
+        "--database-url", default="sqlite:///benchmark.db",
+        help="Base de datos de benchmark (SQLite o un MySQL local; se borra su contenido)",
+    )
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios (todos con Telegram vinculado)")
+    parser.add_argument("--tasks-per-user", type=int, default=10)
+    parser.add_argument("--due-reminders", type=int, default=500, help="Tareas en su ventana de recordatorio")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reuse-data", action="store_true",
+        help="No regenerar: usar los datos ya cargados con los mismos volúmenes y semilla",
+    )
+    parser.add_argument(
+        "--job", action="append", choices=list(JOBS),
+        help="Tareas a medir (repetible; sin la preparación, el envío genera los mensajes)",
+    )
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto en benchmarks/results/)")
+    fake_telegram.add_arguments(parser)
+    return parser.parse_args()
+
+
+def prepare_reminders(engine, count: int) -> int:
+    """
+    Dejar `count` tareas en su ventana de recordatorio y sin recordatorio enviado
+
+    Returns:
+        Tareas preparadas
+    """
+    from datetime import timedelta
+
+    from sqlalchemy import delete, select, update
+
+    from app.models import Notification, Task
+    from app.models.task import TaskStatus
+
+    deadline = datetime.utcnow() + timedelta(hours=23, minutes=30)
+    with engine.begin() as conn:
+        ids = conn.execute(
+            select(Task.id).where(Task.responsible_id.isnot(None)).order_by(Task.id).limit(count)
+        ).scalars().all()
+        if ids:
+            conn.execute(
+                update(Task).where(Task.id.in_(ids)).values(
+                    deadline=deadline, reminder_hours_before=24, status=TaskStatus.SIN_EMPEZAR.value,
+                )
+            )
+            conn.execute(delete(Notification).where(Notification.task_id.in_(ids)))
+    return len(ids)
+
+
+def reset_runs(engine, keep_payloads: bool) -> None:
+    """
+    Borrar checkpoints y claves de idempotencia: cada medición envía a todos de nuevo
+
+    Args:
+        engine: Engine de la base de benchmark
+        keep_payloads: Conservar los resúmenes preparados (el envío mide solo el envío)
+    """
+    from sqlalchemy import delete
+
+    from app.models import DigestPayload, JobCheckpoint, NotificationDelivery
+
+    with engine.begin() as conn:
+        conn.execute(delete(NotificationDelivery))
+        conn.execute(delete(JobCheckpoint))
+        if not keep_payloads:
+            conn.execute(delete(DigestPayload))
+
+
+def run_job(name: str, task, telegram: fake_telegram.FakeTelegram) -> dict:
+    """
+    Ejecutar una tarea de Celery y medirla
+
+    Returns:
+        dict con tiempo, mensajes, llamadas a Telegram, consultas y memoria
+    """
+    from app.core.query_profiler import profile_queries
+
+    telegram.stats.reset()
+    tracemalloc.reset_peak()
+    memory_before, _ = tracemalloc.get_traced_memory()
+
+    with profile_queries(f"benchmark {name}", report_on_exit=False) as profile:
+        start = time.perf_counter()
+        outcome = task.apply()
+        wall = time.perf_counter() - start
+
+    _, memory_peak = tracemalloc.get_traced_memory()
+    stats = telegram.stats.snapshot()
+    return {
+        "task": task.name,
+        "state": outcome.state,
+        "result": outcome.result if outcome.successful() else repr(outcome.result),
+        "wall_s": round(wall, 3),
+        "messages_per_s": round(stats["messages_delivered"] / wall, 2) if wall else 0.0,
+        "telegram": stats,
+        "queries": {
+            "count": profile.count,
+            "db_ms": round(profile.duration_ms, 1),
+            "top": [
+                {"statement": shape[:300], "count": count}
+                for shape, count in profile.repeated(0)[:TOP_STATEMENTS]
+            ],
+        },
+        "memory": {
+            "peak_mb": round((memory_peak - memory_before) / 2**20, 2),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+    }
+
+
+def main() -> int:
+    args = parse_args()
+
+    # El servidor falso arranca antes de importar la app: su URL es parte de la configuración
+    telegram = fake_telegram.FakeTelegram(fake_telegram.config_from_args(args, seed=args.seed))
+    os.environ["TELEGRAM_API_URL"] = telegram.start()
+    os.environ["TELEGRAM_BOT_TOKEN"] = "benchmark"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["PROCESS_ROLE"] = "worker"
+    os.environ["TRACING_ENABLED"] = "false"
+    os.environ["METRICS_ENABLED"] = "false"
+    os.environ["SQL_EXPLAIN_SLOW_QUERIES"] = "false"
+
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.WARNING)
+
+    import importlib
+
+    from app.core.database import engine
+    from app.workers.celery_app import celery_app
+    from benchmarks import data, runner
+
+    # Sin broker: los chords y subtareas que lancen las tareas se ejecutan en el proceso
+    celery_app.conf.task_always_eager = True
+
+    volumes = data.Volumes(
+        areas=10,
+        users=args.users,
+        projects=max(args.users // 4, 1),
+        tasks=args.users * args.tasks_per_user,
+        notifications=0,
+        telegram_linked=1.0,
+    )
+    rows, _ = data.build(volumes, args.seed)
+    if not args.reuse_data:
+        print(f"Generando datos en {engine.url.render_as_string(hide_password=True)}: {volumes.as_dict()}")
+        data.load(engine, rows)
+    del rows
+    due = prepare_reminders(engine, args.due_reminders)
+
+    tracemalloc.start()
+    results = {}
+    try:
+        jobs = args.job or list(JOBS)
+        for name in jobs:
+            module, task_name = JOBS[name]
+            task = getattr(importlib.import_module(module), task_name)
+            reset_runs(engine, keep_payloads=f"render-{name}" in jobs)
+            results[name] = result = run_job(name, task, telegram)
+            print(
+                f"{name:<14} {result['wall_s']:>8.2f} s  {result['messages_per_s']:>8.2f} msg/s  "
+                f"entregados {result['telegram']['messages_delivered']}  "
+                f"consultas {result['queries']['count']}  pico {result['memory']['peak_mb']} MB"
+            )
+    finally:
+        tracemalloc.stop()
+        telegram.stop()
+
+    report = {
+        "environment": runner.environment(args.database_url),
+        "volumes": volumes.as_dict(),
+        "seed": args.seed,
+        "due_reminders": due,
+        "telegram": fake_telegram.asdict(telegram.config),
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"workers-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+    print(f"Resultados guardados en {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
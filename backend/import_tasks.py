@@ -0,0 +1,96 @@
+"""
+Script de importación masiva de tareas desde CSV
+
+Uso:
+    python import_tasks.py tareas.csv --creator admin@empresa.com
+    python import_tasks.py tareas.csv --creator admin@empresa.com --chunk-size 1000 --no-notify
+
+El archivo se lee en streaming y se inserta por lotes (ver app/services/task_import.py).
+Las tareas quedan registradas como creadas por el usuario indicado en --creator,
+con los mismos permisos que tendría desde la API.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Proceso corto: sin pool de conexiones (ver app/core/db_pool.py)
+os.environ.setdefault("PROCESS_ROLE", "script")
+
+from app.core.database import get_db_context
+from app.models import User
+from app.services.task_import import (
+    DEFAULT_CHUNK_SIZE,
+    TaskImporter,
+    TaskImportError,
+    open_csv_reader,
+)
+from app.bot.notifications import send_task_digest_notifications
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Leer argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Importar tareas desde un archivo CSV")
+    parser.add_argument("path", help="Ruta del archivo CSV (UTF-8, con cabecera)")
+    parser.add_argument(
+        "--creator",
+        required=True,
+        help="Email del usuario que figurará como creador de las tareas",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Filas por lote (por defecto {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--no-notify",
+        action="store_true",
+        help="No enviar notificaciones de Telegram a los responsables",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Función principal de importación"""
+    args = parse_args()
+
+    with get_db_context() as db:
+        creator = db.query(User).filter(User.email == args.creator).first()
+        if not creator:
+            logger.error(f"✗ Usuario creador no encontrado: {args.creator}")
+            sys.exit(1)
+
+        importer = TaskImporter(db, creator, chunk_size=args.chunk_size)
+
+        try:
+            with open(args.path, encoding="utf-8-sig", newline="") as stream:
+                result = importer.run(open_csv_reader(stream))
+        except (OSError, TaskImportError) as e:
+            logger.error(f"✗ Error al importar: {e}")
+            sys.exit(1)
+
+    if not args.no_notify:
+        send_task_digest_notifications(importer.pending_digests(), importer.creator_name)
+
+    logger.info(
+        f"✓ {result['created']} tareas creadas, {result['failed']} filas con error "
+        f"({result['total_rows']} filas leídas)"
+    )
+
+    if result["errors"]:
+        print(json.dumps(result["errors"], ensure_ascii=False, indent=2))
+
+    sys.exit(0 if result["failed"] == 0 else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,20 @@ Script para iniciar el bot de Telegram
 """
 import asyncio
 import logging
+import os
 import sys
 from pathlib import Path
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Perfil del pool de conexiones (ver app/core/db_pool.py)
+os.environ.setdefault("PROCESS_ROLE", "bot")
+
 from app.bot.bot import TelegramBot
 from app.core.config import settings
+from app.core.metrics import start_exporter
+from app.core.tracing import configure_tracing
 
 # Configurar logging
 logging.basicConfig(
@@ -32,6 +38,10 @@ async def main():
         logger.error("Por favor, configura el token en el archivo .env")
         return
 
+    # Métricas de Prometheus en METRICS_PORT y trazas (si TRACING_ENABLED)
+    start_exporter()
+    configure_tracing()
+
     # Crear e iniciar el bot
     bot = TelegramBot()
 
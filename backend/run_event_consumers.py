@@ -0,0 +1,97 @@
+"""
+Script para iniciar los consumidores de eventos de dominio
+
+Uso:
+    python run_event_consumers.py                  # todos los grupos
+    python run_event_consumers.py notifications    # solo los indicados
+
+Además de los grupos corre el relay que publica los eventos que quedaron en
+el outbox (ver app/core/domain_events.py).
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Perfil del pool de conexiones (ver app/core/db_pool.py)
+os.environ.setdefault("PROCESS_ROLE", "events")
+
+from app.core.metrics import start_exporter
+from app.core.tracing import configure_tracing
+from app.workers.event_consumer import EventConsumer, run_outbox_relay
+from app.workers.event_handlers import GROUPS
+
+# Configurar logging
+logging.basicConfig(
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    level=logging.INFO
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Leer los argumentos de la línea de comandos
+
+    Args:
+        argv: Argumentos (por defecto, los del proceso)
+
+    Returns:
+        Namespace con `groups` (todos los grupos si no se indica ninguno)
+    """
+    parser = argparse.ArgumentParser(description="Consumidores de eventos de dominio")
+    # Sin `choices`: con nargs="*" argparse valida la lista vacía contra ellos y falla
+    parser.add_argument(
+        "groups", nargs="*", metavar="GROUP",
+        help=f"Grupos a consumir: {', '.join(sorted(GROUPS))} (por defecto todos)",
+    )
+    args = parser.parse_args(argv)
+    unknown = [group for group in args.groups if group not in GROUPS]
+    if unknown:
+        parser.error(f"grupo(s) desconocido(s): {', '.join(unknown)} (opciones: {', '.join(sorted(GROUPS))})")
+    args.groups = args.groups or sorted(GROUPS)
+    return args
+
+
+def main():
+    """Función principal: un hilo por grupo de consumidores y uno para el relay del outbox"""
+    args = parse_args()
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("🛑 Deteniendo consumidores de eventos...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    # Métricas de Prometheus en METRICS_PORT y trazas (si TRACING_ENABLED)
+    start_exporter()
+    configure_tracing()
+
+    threads = [threading.Thread(target=run_outbox_relay, args=(stop,), name="events-outbox")]
+    threads[0].start()
+    for group in args.groups:
+        consumer = EventConsumer(group, GROUPS[group])
+        thread = threading.Thread(target=consumer.run, args=(stop,), name=f"events-{group}")
+        thread.start()
+        threads.append(thread)
+
+    logger.info(f"✅ Consumidores de eventos iniciados: {', '.join(args.groups)}")
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
+
+    logger.info("✅ Consumidores de eventos detenidos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Script para iniciar el pool de workers de Celery de una cola
+
+Cada cola (ver WORKER_POOLS en app/workers/celery_app.py) corre en su propio
+pool, con su concurrencia y su prefetch: un resumen masivo no reserva los
+mensajes de las notificaciones interactivas ni les quita procesos.
+
+Uso:
+    python run_worker.py digests
+    python run_worker.py interactive --concurrency 8
+    celery -A app.workers.celery_app worker        # todas las colas en un solo pool
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Perfil del pool de conexiones (ver app/core/db_pool.py)
+os.environ.setdefault("PROCESS_ROLE", "worker")
+
+from app.workers.celery_app import celery_app, WORKER_POOLS
+
+
+def main():
+    """Función principal: un worker que consume solo la cola indicada"""
+    parser = argparse.ArgumentParser(description="Pool de workers de Celery de una cola")
+    parser.add_argument("queue", choices=list(WORKER_POOLS), help="Cola a consumir")
+    parser.add_argument("--concurrency", type=int, help="Procesos hijos (reemplaza el valor del pool)")
+    parser.add_argument("--prefetch", type=int, help="Mensajes reservados por proceso (reemplaza el valor del pool)")
+    parser.add_argument("--loglevel", default="info")
+    args = parser.parse_args()
+
+    pool = WORKER_POOLS[args.queue]
+    celery_app.worker_main([
+        "worker",
+        f"--queues={args.queue}",
+        f"--concurrency={args.concurrency or pool.concurrency}",
+        f"--prefetch-multiplier={args.prefetch or pool.prefetch}",
+        f"--hostname={args.queue}@%h",
+        f"--loglevel={args.loglevel}",
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Fixtures comunes de los tests del backend
+
+La configuración se lee al importar la app, así que el entorno de los tests
+se fija antes de cualquier import de `app`:
+
+- Base de datos SQLite en un archivo temporal, con datos sintéticos del
+  generador de los benchmarks (benchmarks/data.py).
+- Sin Redis: las funciones opcionales (versiones de datos, eventos, caché)
+  se desactivan como en producción cuando Redis no responde.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+_TMP_DIR = tempfile.mkdtemp(prefix="sva-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_TMP_DIR) / 'tests.db'}"
+os.environ.setdefault("SECRET_KEY", "tests")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "tests")
+# Puerto sin servidor: la conexión se rechaza al instante
+os.environ["REDIS_HOST"] = "127.0.0.1"
+os.environ["REDIS_PORT"] = "1"
+os.environ["TRACING_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["SQL_EXPLAIN_SLOW_QUERIES"] = "false"
+# Sin Redis los datos de referencia se recargan con esta periodicidad
+os.environ["REFERENCE_DATA_CHECK_SECONDS"] = "3600"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine
+from app.core.reference_data import AREAS, USERS, reference_data
+from app.core.security import create_access_token
+from app.main import app
+from benchmarks import data
+
+# Volúmenes de los datos sembrados: varias páginas de tareas y proyectos
+# para comprobar que las consultas no crecen con el tamaño del resultado
+VOLUMES = data.Volumes(areas=3, users=30, projects=40, tasks=600, notifications=0)
+
+
+class QueryCounter:
+    """Sentencias SQL ejecutadas en cualquier engine mientras está activo"""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture(scope="session")
+def dataset() -> data.Dataset:
+    """Datos sintéticos cargados en la base de los tests (ids de referencia)"""
+    rows, dataset = data.build(VOLUMES)
+    data.load(engine, rows)
+    # Cargar la caché de datos de referencia: su primera carga no es parte del presupuesto
+    reference_data.invalidate(AREAS, USERS)
+    reference_data.areas()
+    reference_data.user(dataset.admin_id)
+    return dataset
+
+
+@pytest.fixture(scope="session")
+def client(dataset) -> TestClient:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers():
+    """Cabeceras de autenticación de un usuario: auth_headers(user_id)"""
+    def headers(user_id: str) -> dict:
+        return {"Authorization": "Bearer " + create_access_token({"sub": user_id})}
+    return headers
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Comprobar el máximo de sentencias SQL de un bloque
+
+    Ejemplo:
+        with query_budget(3):
+            client.get("/api/v1/tasks/", headers=...)
+    """
+    @contextmanager
+    def budget(max_statements: int):
+        with QueryCounter() as counter:
+            yield counter
+        listing = "\n".join(f"  {statement}" for statement in counter.statements)
+        assert counter.count <= max_statements, (
+            f"{counter.count} sentencias SQL (máximo {max_statements}):\n{listing}"
+        )
+    return budget
@@ -0,0 +1,83 @@
+"""
+Versiones de datos por alcance de visibilidad (validadores ETag)
+
+Una escritura solo debe cambiar los validadores de los usuarios que ven la
+fila modificada; los demás siguen recibiendo 304.
+"""
+import pytest
+
+from app.core import data_versions
+from app.core.database import get_db_context
+from app.core.visibility import VisibilityScope, task_visible
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+def bumped(monkeypatch):
+    """Claves de Redis que incrementaría cada commit"""
+    keys: set[str] = set()
+
+    def capture(tables, scopes=frozenset()):
+        keys.update(f"{data_versions.KEY_PREFIX}{table}" for table in tables)
+        keys.update(f"{data_versions.KEY_PREFIX}{table}:{scope}" for table, scope in scopes)
+
+    monkeypatch.setattr(data_versions, "bump_versions", capture)
+    return keys
+
+
+def validator_keys(user: User) -> set[str]:
+    scope = VisibilityScope.of(user)
+    return {key for table in ("tasks", "projects") for key in data_versions.version_keys(table, scope)}
+
+
+def test_task_update_only_bumps_users_who_see_it(dataset, bumped):
+    with get_db_context() as db:
+        task = db.get(Task, dataset.task_id)
+        task.title = f"{task.title} (editada)"
+        db.commit()
+
+        users = db.query(User).all()
+        for user in users:
+            scope = VisibilityScope.of(user)
+            sees_task = db.query(Task.id).filter(Task.id == task.id, task_visible(scope)).first() is not None
+            if sees_task:
+                assert validator_keys(user) & bumped, f"{user.role} ve la tarea y su validador no cambió"
+
+        # Un usuario ajeno (que no ve la tarea ni su proyecto) conserva su validador
+        project = db.get(Project, task.project_id)
+        participants = {
+            user_id for row in db.query(Task.responsible_id, Task.created_by).filter(Task.project_id == project.id)
+            for user_id in row
+        }
+        unrelated = [
+            user for user in users
+            if user.role != "administrador"
+            and user.id not in participants | {project.owner_id}
+            and not (user.role == "supervisor" and user.area_id in (project.area_id, task.area_id))
+        ]
+        assert unrelated
+        for user in unrelated:
+            assert not validator_keys(user) & bumped
+
+
+def test_bulk_statement_bumps_every_scope(dataset, bumped):
+    with get_db_context() as db:
+        db.query(Task).filter(Task.id == dataset.task_id).update({Task.title: Task.title})
+        db.commit()
+
+    assert f"{data_versions.KEY_PREFIX}tasks:{data_versions.ALL_SCOPE}" in bumped
+
+
+def test_version_keys_by_role(dataset):
+    with get_db_context() as db:
+        admin = VisibilityScope.of(db.get(User, dataset.admin_id))
+        supervisor = VisibilityScope.of(db.get(User, dataset.supervisor_id))
+        analyst = VisibilityScope.of(db.get(User, dataset.analyst_id))
+
+    prefix = data_versions.KEY_PREFIX
+    assert data_versions.version_keys("tasks", admin) == [f"{prefix}tasks"]
+    assert data_versions.version_keys("users", analyst) == [f"{prefix}users"]
+    assert f"{prefix}tasks:area:{supervisor.area_id}" in data_versions.version_keys("tasks", supervisor)
+    assert data_versions.version_keys("tasks", analyst) == [
+        f"{prefix}tasks:all", f"{prefix}tasks:user:{analyst.user_id}",
+    ]
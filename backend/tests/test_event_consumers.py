@@ -0,0 +1,151 @@
+"""
+Arranque de los consumidores de eventos de dominio (run_event_consumers.py)
+y outbox de los eventos que no se pudieron publicar
+"""
+import json
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import run_event_consumers
+from app.core import database, domain_events
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.models import DomainEventOutbox
+from app.workers.event_handlers import GROUPS
+
+
+def test_parse_args_without_groups_consumes_all():
+    """docker-compose lo inicia sin argumentos"""
+    assert run_event_consumers.parse_args([]).groups == sorted(GROUPS)
+
+
+def test_parse_args_with_groups():
+    assert run_event_consumers.parse_args(["notifications"]).groups == ["notifications"]
+
+
+def test_parse_args_rejects_unknown_group():
+    with pytest.raises(SystemExit):
+        run_event_consumers.parse_args(["desconocido"])
+
+
+class FakeRedis:
+    """Cliente Redis mínimo: guarda los mensajes agregados al stream"""
+
+    def __init__(self):
+        self.entries: list[tuple[str, dict]] = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.pending: list[tuple[str, dict]] = []
+
+    def xadd(self, stream, fields, **kwargs):
+        self.pending.append((stream, fields))
+
+    def execute(self):
+        self.client.entries.extend(self.pending)
+        return [f"{len(self.client.entries)}-{i}" for i, _ in enumerate(self.pending)]
+
+
+@pytest.fixture
+def outbox(dataset):
+    """Filas del outbox (vacío al empezar y al terminar el test)"""
+    def rows() -> list[DomainEventOutbox]:
+        with get_db_context() as db:
+            return db.query(DomainEventOutbox).order_by(DomainEventOutbox.created_at).all()
+
+    def clear():
+        with get_db_context() as db:
+            db.query(DomainEventOutbox).delete()
+            db.commit()
+
+    clear()
+    yield rows
+    clear()
+
+
+def emit_and_commit(event_type: str, rollback: bool = False, **data):
+    with get_db_context() as db:
+        domain_events.emit(db, event_type, **data)
+        if rollback:
+            db.rollback()
+        else:
+            db.commit()
+
+
+def test_commit_without_redis_keeps_events_in_outbox(outbox):
+    """Sin Redis el evento queda guardado con la transacción que lo produjo"""
+    emit_and_commit(domain_events.TASK_CREATED, task_id="t-1")
+
+    rows = outbox()
+    assert [(row.type, json.loads(row.data)) for row in rows] == [
+        (domain_events.TASK_CREATED, {"task_id": "t-1"})
+    ]
+
+
+def test_rollback_leaves_outbox_empty(outbox):
+    emit_and_commit(domain_events.TASK_CREATED, rollback=True, task_id="t-1")
+
+    assert outbox() == []
+
+
+def test_commit_with_redis_publishes_and_clears_outbox(outbox, monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(domain_events, "get_redis", lambda: client)
+
+    emit_and_commit(domain_events.TASK_CREATED, task_id="t-1")
+
+    assert [fields["type"] for _, fields in client.entries] == [domain_events.TASK_CREATED]
+    assert outbox() == []
+
+
+def test_relay_publishes_outbox_when_redis_returns(outbox, monkeypatch):
+    emit_and_commit(domain_events.TASK_CREATED, task_id="t-1")
+    emit_and_commit(domain_events.TASK_UPDATED, task_id="t-1")
+    assert len(outbox()) == 2
+
+    client = FakeRedis()
+    monkeypatch.setattr(domain_events, "get_redis", lambda: client)
+    monkeypatch.setattr(settings, "EVENT_OUTBOX_GRACE_SECONDS", -60)
+
+    assert domain_events.relay_outbox() == 2
+    assert [domain_events.decode_event(fields) for _, fields in client.entries] == [
+        (domain_events.TASK_CREATED, {"task_id": "t-1"}),
+        (domain_events.TASK_UPDATED, {"task_id": "t-1"}),
+    ]
+    assert outbox() == []
+    assert domain_events.relay_outbox() == 0
+
+
+def test_relay_skips_recent_events(outbox, monkeypatch):
+    """Los eventos recientes los publica quien los emitió, no el relay"""
+    emit_and_commit(domain_events.TASK_CREATED, task_id="t-1")
+    monkeypatch.setattr(domain_events, "get_redis", lambda: FakeRedis())
+
+    assert domain_events.relay_outbox() == 0
+    assert len(outbox()) == 1
+
+
+class BrokenEngine:
+    """Engine cuyo checkout de conexión falla"""
+
+    def begin(self):
+        raise OperationalError("DELETE", {}, Exception("sin conexiones"))
+
+
+def test_commit_succeeds_when_outbox_cleanup_fails(outbox, monkeypatch):
+    """El commit ya se confirmó: el fallo al limpiar el outbox no llega al llamador"""
+    client = FakeRedis()
+    monkeypatch.setattr(domain_events, "get_redis", lambda: client)
+    monkeypatch.setattr(database, "engine", BrokenEngine())
+
+    emit_and_commit(domain_events.TASK_CREATED, task_id="t-1")
+
+    assert len(client.entries) == 1
+    monkeypatch.undo()
+    assert len(outbox()) == 1  # La publica de nuevo el relay
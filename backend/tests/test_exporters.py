@@ -0,0 +1,69 @@
+"""
+Exportación de tareas a XLSX
+
+El libro debe abrirse con cualquier lector de ZIP y de XML aunque los datos
+contengan caracteres de control que XML 1.0 no admite.
+"""
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from app.core.database import get_db_context
+from app.models import Task
+from app.services.exporters import iter_xlsx
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def sheet_texts(content: bytes) -> list[list[str]]:
+    """Textos de cada fila de la hoja del libro"""
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert archive.testzip() is None
+        ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    return [
+        [cell.findtext("s:is/s:t", default="", namespaces=SHEET_NS) for cell in row.findall("s:c", SHEET_NS)]
+        for row in sheet.iterfind("s:sheetData/s:row", SHEET_NS)
+    ]
+
+
+def test_xlsx_strips_illegal_xml_characters():
+    content = b"".join(iter_xlsx(
+        ["Título", "Notas"],
+        [["Informe\x00 final\x0b", "línea 1\nlínea 2\tfin \x1f<ok> & \x08"]],
+        sheet_name="Hoja\x01",
+    ))
+
+    assert sheet_texts(content) == [
+        ["Título", "Notas"],
+        ["Informe final", "línea 1\nlínea 2\tfin <ok> & "],
+    ]
+
+
+@pytest.fixture
+def task_with_control_chars(dataset):
+    """Tarea cuya descripción trae caracteres de control (se restaura al terminar)"""
+    with get_db_context() as db:
+        task = db.get(Task, dataset.task_id)
+        previous = task.description
+        task.description = "Pegado desde otra app\x0c\x1b[0m con controles\x00"
+        db.commit()
+        yield task.id, task.project_id
+        task.description = previous
+        db.commit()
+
+
+def test_export_tasks_xlsx_is_well_formed(client, dataset, auth_headers, task_with_control_chars):
+    task_id, project_id = task_with_control_chars
+    response = client.get(
+        "/api/v1/tasks/export",
+        params={"format": "xlsx", "project_id": project_id},
+        headers=auth_headers(dataset.admin_id),
+    )
+    assert response.status_code == 200
+
+    rows = sheet_texts(response.content)
+    [row] = [row for row in rows[1:] if row[0] == task_id]
+    assert "Pegado desde otra app[0m con controles" in row
@@ -0,0 +1,17 @@
+"""
+Endpoints de salud públicos: no deben revelar datos de conexión
+"""
+from sqlalchemy import create_engine
+
+from app.core.replicas import Replica, replicas
+
+
+def test_health_db_hides_replica_urls(client, monkeypatch):
+    engine = create_engine("sqlite:///replica-secreta.db")
+    monkeypatch.setattr(replicas, "_replicas", [Replica(engine, lag=0.5)])
+
+    response = client.get("/health/db")
+
+    assert response.status_code == 200
+    assert response.json()["replicas"] == [{"replica": "replica0", "lag": 0.5}]
+    assert "replica-secreta" not in response.text
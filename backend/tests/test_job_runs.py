@@ -0,0 +1,199 @@
+"""
+Envíos masivos reanudables e idempotentes
+
+Un intento que falla o muere a mitad de un resumen o de los recordatorios
+se reanuda desde su checkpoint sin volver a enviar a nadie, y relanzar una
+ejecución ya terminada no envía nada.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.models import Task, User
+from app.models.task import TaskStatus
+from app.workers import checkpoints, reminder_tasks, summary_tasks
+from app.workers.celery_app import celery_app
+
+TIMESTAMP = "2026-01-05T08:00:00"
+
+
+class FakeSender:
+    """Reemplazo de send_telegram_messages que cuenta los mensajes por chat"""
+
+    def __init__(self, fail_on_call: int = 0):
+        self.calls = 0
+        self.fail_on_call = fail_on_call  # Llamada que falla sin enviar (1 = la primera)
+        self.messages: Counter = Counter()
+        self.texts: list[str] = []
+
+    async def __call__(self, messages, concurrency):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("Conexión con Telegram perdida")
+        for chat_id, text in messages:
+            self.messages[chat_id] += 1
+            self.texts.append(text)
+        return [True] * len(messages)
+
+
+@pytest.fixture
+def linked_users(dataset) -> int:
+    with get_db_context() as db:
+        return summary_tasks._linked_users(db).count()
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_CHECKPOINT_BATCH", 4)
+
+
+def run_shard(run_id: str):
+    with get_db_context() as db:
+        checkpoints.create_checkpoints(db, run_id, [(None, None)])
+    return summary_tasks.send_summary_shard.apply(args=("daily", run_id, 0, TIMESTAMP))
+
+
+def test_shard_resumes_after_failed_send(linked_users, small_batches, monkeypatch):
+    """El reintento sigue desde el lote que falló y cada usuario recibe un solo resumen"""
+    sender = FakeSender(fail_on_call=2)
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sender)
+
+    result = run_shard("resume-failed-send").get()
+
+    assert result == {"processed": linked_users, "sent": linked_users, "errors": 0, "skipped": 0}
+    assert len(sender.messages) == linked_users
+    assert max(sender.messages.values()) == 1
+
+
+def test_shard_never_resends_after_lost_attempt(linked_users, small_batches, monkeypatch):
+    """Si el intento muere después de enviar un lote y antes de registrarlo, ese lote no se reenvía"""
+    sender = FakeSender()
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sender)
+    finish = checkpoints.finish_deliveries
+    calls = []
+
+    def dies_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("Worker terminado")
+        return finish(*args, **kwargs)
+
+    monkeypatch.setattr(checkpoints, "finish_deliveries", dies_once)
+
+    result = run_shard("resume-lost-attempt").get()
+
+    assert max(sender.messages.values()) == 1
+    assert result["processed"] == linked_users
+    assert result["skipped"] == settings.JOB_CHECKPOINT_BATCH
+    assert result["sent"] == linked_users - settings.JOB_CHECKPOINT_BATCH
+
+
+def test_rerun_completed_summary_sends_nothing(linked_users, monkeypatch):
+    sender = FakeSender()
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sender)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    summary_tasks.send_weekly_summary.apply().get()
+    assert sum(sender.messages.values()) == linked_users
+
+    summary = summary_tasks.send_weekly_summary.apply().get()
+    assert sum(sender.messages.values()) == linked_users
+    assert summary["status"] == "completed"
+    assert sum(run["summaries_sent"] for run in summary["runs"]) == linked_users
+
+
+def test_reminder_sent_once_across_runs(dataset, monkeypatch):
+    """Dos verificaciones (horas distintas) dentro de la ventana del recordatorio envían uno solo"""
+    sender = FakeSender()
+    monkeypatch.setattr(reminder_tasks, "send_telegram_messages", sender)
+    first = datetime(2026, 3, 2, 10, 50)
+
+    with get_db_context() as db:
+        task = db.query(Task).join(User, Task.responsible_id == User.id).filter(
+            User.telegram_chat_id.isnot(None),
+            User.is_active == True,
+            Task.status != TaskStatus.COMPLETADO
+        ).order_by(Task.id).first()
+        task.deadline = first + timedelta(hours=24) - timedelta(minutes=10)
+        task.reminder_hours_before = 24
+        db.commit()
+        title = task.title
+
+    for moment in (first, first + timedelta(minutes=20)):
+        reminder_tasks.check_upcoming_deadlines.apply(kwargs={"timestamp": moment.isoformat()}).get()
+
+    assert sum(1 for text in sender.texts if f"<b>Tarea:</b> {title}\n" in text) == 1
+
+
+def test_reminder_window_filtered_in_sql(dataset):
+    """La ventana va de la hora del recordatorio (incluida) a 1 hora después (excluida)"""
+    now = datetime(2026, 3, 2, 10, 0)
+    with get_db_context() as db:
+        tasks = db.query(Task).filter(
+            Task.status != TaskStatus.COMPLETADO, Task.responsible_id.isnot(None)
+        ).order_by(Task.id).limit(4).all()
+        offsets = [timedelta(0), timedelta(minutes=59), timedelta(hours=1), timedelta(minutes=-1)]
+        for task, offset in zip(tasks, offsets):
+            task.reminder_hours_before = 2
+            task.deadline = now + timedelta(hours=2) - offset
+        db.flush()
+
+        due = {task.id for task in reminder_tasks._due_tasks_query(db, now).filter(Task.id.in_([t.id for t in tasks]))}
+        assert due == {tasks[0].id, tasks[1].id}
+        db.rollback()
+
+
+@pytest.fixture
+def tokyo_users(linked_users):
+    """Dos usuarios vinculados con resumen a las 7:30 hora de Tokio"""
+    with get_db_context() as db:
+        users = summary_tasks._linked_users(db).order_by(User.id).limit(2).all()
+        previous = [(user, user.timezone, user.digest_time) for user in users]
+        for user in users:
+            user.timezone = "Asia/Tokyo"
+            user.digest_time = time(7, 30)
+        db.commit()
+        ids = {user.id for user in users}
+    yield ids
+    with get_db_context() as db:
+        for user, timezone, digest_time in previous:
+            db.query(User).filter(User.id == user.id).update({"timezone": timezone, "digest_time": digest_time})
+        db.commit()
+
+
+def test_send_instants_use_local_time():
+    daily, weekly = summary_tasks.DIGEST_KINDS["daily"], summary_tasks.DIGEST_KINDS["weekly"]
+    guatemala = summary_tasks.Bucket("America/Guatemala", "08:00")
+    tokyo = summary_tasks.Bucket("Asia/Tokyo", "07:30")
+    monday = datetime(2026, 1, 5)
+
+    assert summary_tasks._send_instants(daily, guatemala, monday, monday + timedelta(days=1)) == [
+        datetime(2026, 1, 5, 14, 0)
+    ]
+    # Lunes 7:30 en Tokio es domingo 22:30 UTC
+    assert summary_tasks._send_instants(daily, tokyo, monday - timedelta(days=1), monday) == [
+        datetime(2026, 1, 4, 22, 30)
+    ]
+    # El semanal sale solo los lunes, WEEKLY_DIGEST_DELAY_MINUTES después
+    assert summary_tasks._send_instants(weekly, guatemala, monday - timedelta(days=3), monday + timedelta(days=3)) == [
+        datetime(2026, 1, 5, 14, 0) + timedelta(minutes=settings.WEEKLY_DIGEST_DELAY_MINUTES)
+    ]
+
+
+def test_schedule_dispatches_due_bucket_once(tokyo_users, monkeypatch):
+    """A las 7:30 de Tokio solo se envía a ese horario, con su día local, y una sola vez"""
+    sender = FakeSender()
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sender)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    moment = "2026-01-04T22:30:00"
+
+    first = summary_tasks.schedule_digests.apply(kwargs={"timestamp": moment}).get()
+    second = summary_tasks.schedule_digests.apply(kwargs={"timestamp": "2026-01-04T22:31:00"}).get()
+
+    assert first["dispatched"] == ["daily:2026-01-05:Asia/Tokyo:07:30"]
+    assert second["dispatched"] == []
+    assert sum(sender.messages.values()) == len(tokyo_users)
+    assert all("05/01/2026" in text for text in sender.texts)
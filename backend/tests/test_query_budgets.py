@@ -0,0 +1,123 @@
+"""
+Presupuestos de consultas SQL por endpoint
+
+Cada listado debe resolverse con un número fijo de sentencias, sin importar
+cuántas filas devuelva (autenticación incluida). Un N+1 que vuelva a aparecer
+(una consulta por tarea, proyecto o área) hace fallar estos tests.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.bot.handlers import tareas_command
+from app.core.database import get_db_context
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+
+# Tamaños de página: el número de sentencias no debe depender de ellos
+PAGE_SIZES = [1, 20, 500]
+
+
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+@pytest.mark.parametrize("user", ["admin_id", "supervisor_id", "analyst_id"])
+def test_list_tasks(client, dataset, auth_headers, query_budget, user, limit):
+    headers = auth_headers(getattr(dataset, user))
+    with query_budget(3):
+        response = client.get(f"/api/v1/tasks/?limit={limit}", headers=headers)
+    assert response.status_code == 200
+    if user == "admin_id":
+        assert len(response.json()) == limit
+
+
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+@pytest.mark.parametrize("user", ["admin_id", "supervisor_id", "analyst_id"])
+def test_list_projects_with_stats(client, dataset, auth_headers, query_budget, user, limit):
+    headers = auth_headers(getattr(dataset, user))
+    with query_budget(3):
+        response = client.get(f"/api/v1/projects/with-stats?limit={limit}", headers=headers)
+    assert response.status_code == 200
+    if user == "admin_id":
+        with get_db_context() as db:
+            active = db.query(Project).filter(Project.is_archived == False).count()
+        assert len(response.json()) == min(limit, active)
+
+
+def test_list_projects_with_stats_counts(client, dataset, auth_headers):
+    """Las estadísticas agregadas coinciden con las tareas del proyecto"""
+    response = client.get("/api/v1/projects/with-stats?limit=500", headers=auth_headers(dataset.admin_id))
+    stats = {project["id"]: project for project in response.json()}
+
+    with get_db_context() as db:
+        tasks = db.query(Task.status).filter(Task.project_id == dataset.project_id).all()
+    project = stats[dataset.project_id]
+    assert project["total_tasks"] == len(tasks)
+    assert project["completed_tasks"] == sum(1 for (status,) in tasks if status == TaskStatus.COMPLETADO)
+    assert project["in_progress_tasks"] == sum(1 for (status,) in tasks if status == TaskStatus.EN_CURSO)
+    assert project["pending_tasks"] == sum(1 for (status,) in tasks if status == TaskStatus.SIN_EMPEZAR)
+
+
+@pytest.mark.parametrize("limit", [1, 100])
+def test_list_areas_with_stats(client, dataset, auth_headers, query_budget, limit):
+    with query_budget(3):
+        response = client.get(f"/api/v1/areas/with-stats?limit={limit}", headers=auth_headers(dataset.admin_id))
+    assert response.status_code == 200
+    assert len(response.json()) == min(limit, 3)
+
+
+@pytest.mark.parametrize("role", ["analista", "administrador"])
+def test_bot_tareas(dataset, query_budget, role):
+    with get_db_context() as db:
+        chat_id = db.query(User.telegram_chat_id).filter(
+            User.role == role, User.telegram_chat_id.isnot(None)
+        ).order_by(User.telegram_chat_id).limit(1).scalar()
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        message=SimpleNamespace(reply_text=AsyncMock()),
+    )
+
+    with query_budget(2):
+        asyncio.run(tareas_command(update, None))
+
+    update.message.reply_text.assert_awaited_once()
+    assert "Tareas" in update.message.reply_text.await_args.args[0]
+
+
+@pytest.mark.parametrize("kind", ["daily", "weekly"])
+def test_summary_shard(dataset, query_budget, monkeypatch, kind):
+    from app.workers import checkpoints, summary_tasks
+
+    sent = AsyncMock(side_effect=lambda messages, concurrency: [True] * len(messages))
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sent)
+    run_id = f"budget-{kind}"
+    with get_db_context() as db:
+        linked = summary_tasks._linked_users(db).count()
+        checkpoints.create_checkpoints(db, run_id, [(None, None)])
+
+    # Un lote sin mensajes preparados: checkpoint, usuarios, reclamación (3), mensajes
+    # preparados, mensajes (2), notificaciones, entregas, avance, lote vacío y cierre
+    with query_budget(13):
+        result = summary_tasks.send_summary_shard.apply(args=(kind, run_id, 0, "2026-01-05T08:00:00")).get()
+
+    assert result == {"processed": linked, "sent": linked, "errors": 0, "skipped": 0}
+    assert len(sent.await_args.args[0]) == linked
+
+
+def test_summary_shard_prerendered(dataset, query_budget, monkeypatch):
+    """Con los mensajes preparados, el envío no vuelve a consultar las tareas"""
+    from app.workers import checkpoints, summary_tasks
+
+    sent = AsyncMock(side_effect=lambda messages, concurrency: [True] * len(messages))
+    monkeypatch.setattr(summary_tasks, "send_telegram_messages", sent)
+    run_id = "budget-prerendered"
+    with get_db_context() as db:
+        checkpoints.create_checkpoints(db, summary_tasks._render_run_id(run_id), [(None, None)])
+        checkpoints.create_checkpoints(db, run_id, [(None, None)])
+    rendered = summary_tasks.render_summary_shard.apply(args=("daily", run_id, 0, "2026-01-05T06:00:00")).get()
+
+    with query_budget(11) as counter:
+        result = summary_tasks.send_summary_shard.apply(args=("daily", run_id, 0, "2026-01-05T08:00:00")).get()
+
+    assert not any("FROM tasks" in statement for statement in counter.statements)
+    assert result["sent"] == rendered["sent"] == rendered["processed"]
@@ -0,0 +1,92 @@
+"""
+Permisos por rol de los endpoints de tareas
+
+Cada actor tiene un único vínculo con la tarea de prueba: dueño del
+proyecto, responsable, creador, supervisor de su área o de otra área, o
+ninguno (un analista de la misma área).
+"""
+import pytest
+
+from app.core.database import get_db_context
+from app.models import Project, Task, User
+
+# Actor -> (listado/detalle, edición, archivado)
+EXPECTED = {
+    "admin": (True, True, True),
+    "supervisor_in_area": (True, True, True),
+    "supervisor_out_of_area": (False, False, False),
+    "owner": (True, True, True),
+    "responsible": (True, True, False),
+    "creator": (True, False, False),
+    "unrelated": (False, False, False),
+}
+
+
+@pytest.fixture(scope="module")
+def actors(dataset) -> dict:
+    """Proyecto y tarea propios (se eliminan al terminar) y un usuario por actor"""
+    with get_db_context() as db:
+        analysts = db.query(User).filter(User.role == "analista", User.area_id == dataset.area_id).limit(4).all()
+        owner, responsible, creator, unrelated = (user.id for user in analysts)
+        supervisors = db.query(User).filter(User.role == "supervisor").all()
+
+        project = Project(name="Permisos", owner_id=owner, area_id=dataset.area_id)
+        db.add(project)
+        db.flush()
+        task = Task(project_id=project.id, title="Tarea de permisos", responsible_id=responsible, created_by=creator)
+        db.add(task)
+        db.commit()
+        ids = {
+            "task_id": task.id,
+            "project_id": project.id,
+            "admin": dataset.admin_id,
+            "supervisor_in_area": next(user.id for user in supervisors if user.area_id == dataset.area_id),
+            "supervisor_out_of_area": next(user.id for user in supervisors if user.area_id != dataset.area_id),
+            "owner": owner,
+            "responsible": responsible,
+            "creator": creator,
+            "unrelated": unrelated,
+        }
+
+    yield ids
+
+    with get_db_context() as db:
+        db.delete(db.get(Project, ids["project_id"]))
+        db.commit()
+
+
+@pytest.mark.parametrize("actor", EXPECTED)
+def test_list_tasks(client, auth_headers, actors, actor):
+    response = client.get(
+        "/api/v1/tasks/", params={"project_id": actors["project_id"], "limit": 500},
+        headers=auth_headers(actors[actor]),
+    )
+    assert response.status_code == 200
+    listed = actors["task_id"] in {task["id"] for task in response.json()}
+    assert listed == EXPECTED[actor][0]
+
+
+@pytest.mark.parametrize("actor", EXPECTED)
+def test_get_task(client, auth_headers, actors, actor):
+    response = client.get(f"/api/v1/tasks/{actors['task_id']}", headers=auth_headers(actors[actor]))
+    assert response.status_code == (200 if EXPECTED[actor][0] else 403)
+
+
+@pytest.mark.parametrize("actor", EXPECTED)
+def test_update_task(client, auth_headers, actors, actor):
+    with get_db_context() as db:
+        title = db.get(Task, actors["task_id"]).title
+    response = client.put(
+        f"/api/v1/tasks/{actors['task_id']}", json={"title": title}, headers=auth_headers(actors[actor]),
+    )
+    assert response.status_code == (200 if EXPECTED[actor][1] else 403)
+
+
+@pytest.mark.parametrize("actor", EXPECTED)
+def test_archive_task(client, auth_headers, actors, actor):
+    headers = auth_headers(actors[actor])
+    response = client.patch(f"/api/v1/tasks/{actors['task_id']}/archive", headers=headers)
+    assert response.status_code == (200 if EXPECTED[actor][2] else 403)
+    if response.status_code == 200:
+        assert response.json()["is_archived"] is True
+        assert client.patch(f"/api/v1/tasks/{actors['task_id']}/unarchive", headers=headers).status_code == 200
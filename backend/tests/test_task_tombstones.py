@@ -0,0 +1,63 @@
+"""
+Lápidas de tareas para la sincronización incremental (GET /tasks/changes)
+
+Cada cambio que saca una tarea de la vista de alguien deja una lápida con
+el alcance que la veía. Los tests escriben dentro de una transacción que se
+revierte al final para no alterar los datos compartidos.
+"""
+from app.core.database import get_db_context
+from app.models import Area, Project, Task, TaskTombstone, User
+from app.models.task_tombstone import TombstoneReason
+
+
+def tombstones(db, task_id: str) -> list[TaskTombstone]:
+    return db.query(TaskTombstone).filter(TaskTombstone.task_id == task_id).all()
+
+
+def test_reassignment_keeps_scope_columns(dataset):
+    with get_db_context() as db:
+        task = db.get(Task, dataset.task_id)
+        project = db.get(Project, task.project_id)
+        previous = task.responsible_id
+        task.responsible_id = db.query(User.id).filter(User.id != previous).limit(1).scalar()
+        db.flush()
+
+        [tombstone] = tombstones(db, task.id)
+        assert tombstone.reason == TombstoneReason.REASIGNADA
+        assert tombstone.responsible_id == previous
+        assert tombstone.project_owner_id == project.owner_id
+        assert tombstone.area_id == task.area_id
+        assert tombstone.created_by == task.created_by
+        db.rollback()
+
+
+def test_moved_task_leaves_tombstone_for_previous_project(dataset):
+    with get_db_context() as db:
+        task = db.get(Task, dataset.task_id)
+        previous = db.get(Project, task.project_id)
+        target = db.query(Project).filter(
+            Project.area_id != previous.area_id, Project.owner_id != previous.owner_id
+        ).first()
+        task.project_id = target.id
+        db.flush()
+
+        [tombstone] = tombstones(db, task.id)
+        assert tombstone.project_id == previous.id
+        assert tombstone.project_owner_id == previous.owner_id
+        assert tombstone.area_id == previous.area_id
+        assert task.area_id == target.area_id
+        db.rollback()
+
+
+def test_project_area_change_leaves_tombstones_for_previous_area(dataset):
+    with get_db_context() as db:
+        project = db.get(Project, dataset.project_id)
+        previous_area_id = project.area_id
+        task_ids = {task_id for task_id, in db.query(Task.id).filter(Task.project_id == project.id)}
+        project.area_id = db.query(Area.id).filter(Area.id != previous_area_id).limit(1).scalar()
+        db.flush()
+
+        rows = db.query(TaskTombstone).filter(TaskTombstone.project_id == project.id).all()
+        assert {row.task_id for row in rows} == task_ids
+        assert {(row.area_id, row.reason) for row in rows} == {(previous_area_id, TombstoneReason.REASIGNADA)}
+        db.rollback()
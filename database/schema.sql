@@ -46,6 +46,8 @@ CREATE TABLE IF NOT EXISTS `users` (
   `is_active` BOOLEAN NOT NULL DEFAULT TRUE,
   `role` ENUM('administrador', 'supervisor', 'analista') NOT NULL DEFAULT 'analista' COMMENT 'Rol del usuario en el sistema',
   `area_id` CHAR(36) DEFAULT NULL COMMENT 'Área a la que pertenece el usuario',
+  `timezone` VARCHAR(64) NOT NULL DEFAULT 'America/Guatemala' COMMENT 'Zona horaria IANA del usuario',
+  `digest_time` TIME NOT NULL DEFAULT '08:00:00' COMMENT 'Hora local del resumen diario',
   `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
@@ -55,6 +57,7 @@ CREATE TABLE IF NOT EXISTS `users` (
   INDEX `ix_users_is_active` (`is_active`),
   INDEX `ix_users_role` (`role`),
   INDEX `ix_users_area_id` (`area_id`),
+  INDEX `ix_users_digest_bucket` (`timezone`, `digest_time`),
   INDEX `ix_users_id` (`id`),
   CONSTRAINT `fk_users_area`
     FOREIGN KEY (`area_id`)
@@ -101,6 +104,7 @@ CREATE TABLE IF NOT EXISTS `projects` (
 CREATE TABLE IF NOT EXISTS `tasks` (
   `id` CHAR(36) NOT NULL,
   `project_id` CHAR(36) NOT NULL,
+  `area_id` CHAR(36) DEFAULT NULL COMMENT 'Área del proyecto (copia de projects.area_id)',
   `title` VARCHAR(500) NOT NULL,
   `description` TEXT DEFAULT NULL,
   `status` ENUM('sin_empezar', 'en_curso', 'completado') NOT NULL DEFAULT 'sin_empezar',
@@ -116,7 +120,8 @@ CREATE TABLE IF NOT EXISTS `tasks` (
   INDEX `ix_tasks_project_id` (`project_id`),
   INDEX `ix_tasks_status` (`status`),
   INDEX `ix_tasks_priority` (`priority`),
-  INDEX `ix_tasks_responsible_id` (`responsible_id`),
+  INDEX `ix_tasks_responsible_project` (`responsible_id`, `project_id`),
+  INDEX `ix_tasks_area_status_deadline` (`area_id`, `status`, `deadline`),
   INDEX `ix_tasks_deadline` (`deadline`),
   INDEX `ix_tasks_created_by` (`created_by`),
   INDEX `ix_tasks_id` (`id`),
@@ -125,6 +130,11 @@ CREATE TABLE IF NOT EXISTS `tasks` (
     REFERENCES `projects` (`id`)
     ON DELETE CASCADE
     ON UPDATE CASCADE,
+  CONSTRAINT `fk_tasks_area`
+    FOREIGN KEY (`area_id`)
+    REFERENCES `areas` (`id`)
+    ON DELETE SET NULL
+    ON UPDATE CASCADE,
   CONSTRAINT `fk_tasks_responsible`
     FOREIGN KEY (`responsible_id`)
     REFERENCES `users` (`id`)
@@ -137,6 +147,26 @@ CREATE TABLE IF NOT EXISTS `tasks` (
     ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Tareas del sistema';
 
+-- ============================================================================
+-- Tabla: task_tombstones
+-- Descripción: Tareas eliminadas o reasignadas (sincronización incremental)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `task_tombstones` (
+  `id` CHAR(36) NOT NULL,
+  `task_id` CHAR(36) NOT NULL COMMENT 'Tarea eliminada (sin FK: la fila ya no existe)',
+  `project_id` CHAR(36) NOT NULL,
+  `project_owner_id` CHAR(36) DEFAULT NULL COMMENT 'Dueño del proyecto al eliminarse la tarea',
+  `area_id` CHAR(36) DEFAULT NULL COMMENT 'Área del proyecto al eliminarse la tarea',
+  `responsible_id` CHAR(36) DEFAULT NULL COMMENT 'Responsable al eliminarse o reasignarse la tarea',
+  `created_by` CHAR(36) DEFAULT NULL COMMENT 'Creador de la tarea eliminada',
+  `reason` ENUM('eliminada', 'reasignada') NOT NULL DEFAULT 'eliminada',
+  `removed_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  INDEX `ix_task_tombstones_task_id` (`task_id`),
+  INDEX `ix_task_tombstones_removed_at` (`removed_at`),
+  INDEX `ix_task_tombstones_id` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Lápidas de tareas';
+
 -- ============================================================================
 -- Tabla: notifications
 -- Descripción: Registro de notificaciones enviadas
@@ -192,6 +222,109 @@ CREATE TABLE IF NOT EXISTS `telegram_link_codes` (
     ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Códigos de vinculación Telegram';
 
+-- ============================================================================
+-- Tabla: replica_heartbeat
+-- Descripción: Latido escrito en el primario para medir el retraso de las réplicas
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `replica_heartbeat` (
+  `id` INT NOT NULL,
+  `beat_at` DOUBLE NOT NULL COMMENT 'Epoch (segundos) del último latido',
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Latido de replicación';
+
+-- ============================================================================
+-- Tabla: job_checkpoints
+-- Descripción: Progreso de cada shard de un envío masivo (reanudable)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `job_checkpoints` (
+  `id` CHAR(36) NOT NULL,
+  `run_id` VARCHAR(100) NOT NULL COMMENT 'Ejecución (ej: daily:2026-01-05)',
+  `shard` INT NOT NULL,
+  `start_after` CHAR(36) DEFAULT NULL COMMENT 'Rango de ids del shard (exclusivo)',
+  `end_at` CHAR(36) DEFAULT NULL COMMENT 'Rango de ids del shard (inclusivo)',
+  `position` CHAR(36) DEFAULT NULL COMMENT 'Último id procesado',
+  `processed` INT NOT NULL DEFAULT 0,
+  `sent` INT NOT NULL DEFAULT 0,
+  `errors` INT NOT NULL DEFAULT 0,
+  `skipped` INT NOT NULL DEFAULT 0,
+  `completed_at` TIMESTAMP NULL DEFAULT NULL,
+  `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_job_checkpoints_run_shard` (`run_id`, `shard`),
+  INDEX `ix_job_checkpoints_id` (`id`),
+  INDEX `ix_job_checkpoints_run_id` (`run_id`),
+  INDEX `ix_job_checkpoints_created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Checkpoints de envíos masivos';
+
+-- ============================================================================
+-- Tabla: notification_deliveries
+-- Descripción: Entregas de envíos masivos (la clave única hace idempotente el
+-- INSERT IGNORE con que cada intento reclama sus entregas)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `notification_deliveries` (
+  `id` CHAR(36) NOT NULL,
+  `idempotency_key` VARCHAR(191) NOT NULL COMMENT 'run_id:user_id:tipo',
+  `run_id` VARCHAR(100) NOT NULL,
+  `user_id` CHAR(36) NOT NULL,
+  `task_id` CHAR(36) DEFAULT NULL,
+  `type` ENUM('nueva_tarea', 'recordatorio', 'completada', 'resumen_diario', 'resumen_semanal', 'cambio_estado') NOT NULL,
+  `status` ENUM('pendiente', 'enviada', 'fallida') NOT NULL DEFAULT 'pendiente',
+  `attempt_id` CHAR(36) NOT NULL COMMENT 'Intento que reclamó la entrega',
+  `sent_at` TIMESTAMP NULL DEFAULT NULL,
+  `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `idempotency_key` (`idempotency_key`),
+  INDEX `ix_notification_deliveries_id` (`id`),
+  INDEX `ix_notification_deliveries_run_id` (`run_id`),
+  INDEX `ix_notification_deliveries_user_id` (`user_id`),
+  INDEX `ix_notification_deliveries_created_at` (`created_at`),
+  CONSTRAINT `fk_notification_deliveries_user`
+    FOREIGN KEY (`user_id`)
+    REFERENCES `users` (`id`)
+    ON DELETE CASCADE
+    ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Entregas de envíos masivos';
+
+-- ============================================================================
+-- Tabla: digest_payloads
+-- Descripción: Resúmenes preparados antes de su hora de envío
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `digest_payloads` (
+  `id` CHAR(36) NOT NULL,
+  `run_id` VARCHAR(100) NOT NULL COMMENT 'Periodo del resumen (ej: daily:2026-01-05)',
+  `user_id` CHAR(36) NOT NULL,
+  `type` ENUM('nueva_tarea', 'recordatorio', 'completada', 'resumen_diario', 'resumen_semanal', 'cambio_estado') NOT NULL,
+  `message` TEXT NOT NULL COMMENT 'Mensaje de Telegram ya formateado',
+  `summary` TEXT NOT NULL COMMENT 'Texto del historial de notificaciones',
+  `rendered_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_digest_payloads_run_user` (`run_id`, `user_id`),
+  INDEX `ix_digest_payloads_id` (`id`),
+  INDEX `ix_digest_payloads_user_id` (`user_id`),
+  INDEX `ix_digest_payloads_rendered_at` (`rendered_at`),
+  CONSTRAINT `fk_digest_payloads_user`
+    FOREIGN KEY (`user_id`)
+    REFERENCES `users` (`id`)
+    ON DELETE CASCADE
+    ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Resúmenes preparados';
+
+-- ============================================================================
+-- Tabla: domain_event_outbox
+-- Descripción: Eventos de dominio guardados en la transacción que los produce
+-- (los que no se pudieron publicar en Redis los publica el relay)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS `domain_event_outbox` (
+  `id` VARCHAR(36) NOT NULL,
+  `type` VARCHAR(50) NOT NULL,
+  `data` TEXT NOT NULL COMMENT 'Datos del evento en JSON',
+  `trace` TEXT DEFAULT NULL COMMENT 'Contexto de traza en JSON',
+  `created_at` DOUBLE NOT NULL COMMENT 'Epoch (segundos) del evento',
+  PRIMARY KEY (`id`),
+  INDEX `ix_domain_event_outbox_created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Outbox de eventos de dominio';
+
 -- ============================================================================
 -- Triggers
 -- ============================================================================